@@ -24,6 +24,9 @@ def create_app():
     app.config['DEBUG'] = True
     
     CORS(app)
+
+    from app.compression import init_compression
+    init_compression(app)
     
     # Initialize database connection function
     from app.services.database_service import get_db_connection
@@ -46,6 +49,7 @@ def create_app():
     from app.services.session_service import SessionService
     from app.services.model_service import ModelService
     from app.services.raw_dataset_service import RawDatasetService
+    from app.services.upload_job_service import UploadJobService
     
     session_service = SessionService(
         get_db_connection=get_db_connection, # TODO: get rid of eventually when repository layer is fully implemented
@@ -63,6 +67,7 @@ def create_app():
         model_repository=model_repository  # Add this line
     )
     raw_dataset_service = RawDatasetService(raw_dataset_repository=raw_dataset_repository)
+    upload_job_service = UploadJobService()
 
     # Register blueprints
     from app.routes import main, models, projects, sessions, labelings, raw_datasets
@@ -70,7 +75,7 @@ def create_app():
     main.init_controller(session_service=session_service, project_service=project_service)
     app.register_blueprint(main.main_bp)
 
-    projects.init_controller(session_service=session_service, project_service=project_service)
+    projects.init_controller(session_service=session_service, project_service=project_service, upload_job_service=upload_job_service)
     app.register_blueprint(projects.projects_bp)
 
     sessions.init_controller(session_service=session_service, project_service=project_service, model_service=model_service)
@@ -0,0 +1,148 @@
+"""
+Negotiated compression of HTTP responses.
+
+Session data and the export endpoints return large JSON (or columnar) bodies that
+compress well. An after_request hook encodes them with the best encoding the client
+accepts: brotli when the optional brotli package is installed, then gzip, then
+deflate. Buffered responses are compressed when they are larger than a threshold;
+streamed (generator) responses are compressed chunk by chunk as they are sent.
+"""
+
+import os
+import gzip
+import zlib
+from flask import request
+from app.logging_config import get_logger
+from app.services.signal_store import COLUMNS_MIMETYPE
+
+try:
+    import brotli  # optional: better ratios than gzip at similar speed
+except ImportError:
+    brotli = None
+
+logger = get_logger(__name__)
+
+# Buffered responses smaller than this (bytes) are sent as they are
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+# zlib level for gzip/deflate (1-9) and brotli quality (0-11); bodies are generated
+# per request, so neither defaults to its slowest, densest setting
+COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '4'))
+
+COMPRESSIBLE_MIMETYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    COLUMNS_MIMETYPE,
+)
+
+
+def available_encodings():
+    """Content codings this server can produce, in order of preference"""
+    return (['br'] if brotli is not None else []) + ['gzip', 'deflate']
+
+
+def compress_body(data, encoding):
+    """
+    Compress a complete body.
+
+    Args:
+        data: Body bytes
+        encoding: 'br', 'gzip' or 'deflate'
+
+    Returns:
+        bytes: Encoded body
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        # mtime=0 keeps the output of identical bodies identical
+        return gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+    return zlib.compress(data, COMPRESS_LEVEL)
+
+
+def compress_stream(chunks, encoding):
+    """
+    Compress a body as it is produced.
+
+    Each chunk is flushed once compressed so that progressively generated
+    responses reach the client as promptly as without compression.
+
+    Args:
+        chunks: Iterable of body bytes
+        encoding: 'br', 'gzip' or 'deflate'
+
+    Yields:
+        bytes: Encoded body pieces
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            piece = compressor.process(chunk) + compressor.flush()
+            if piece:
+                yield piece
+        yield compressor.finish()
+        return
+
+    # wbits 31 writes a gzip container, 15 the zlib container HTTP calls deflate
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31 if encoding == 'gzip' else 15)
+    for chunk in chunks:
+        piece = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if piece:
+            yield piece
+    yield compressor.flush()
+
+
+def is_compressible(response):
+    return response.mimetype.startswith(COMPRESSIBLE_MIMETYPES)
+
+
+def compress_response(response):
+    """
+    Compress a response when it is worth it and the client accepts an encoding.
+
+    Args:
+        response: Flask response about to be sent
+
+    Returns:
+        Response: The same response, possibly with an encoded body
+    """
+    if request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    # send_file responses (static files) stream straight from disk, and bodies that
+    # are already encoded must not be encoded twice
+    if response.direct_passthrough or 'Content-Encoding' in response.headers or not is_compressible(response):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        compressed = compress_body(data, encoding)
+        if len(compressed) >= len(data):
+            return response
+        response.set_data(compressed)
+        logger.debug(f"Compressed {request.path} with {encoding}: {len(data)} -> {len(compressed)} bytes")
+
+    response.headers['Content-Encoding'] = encoding
+    # A strong validator names exact bytes; the encoded body still matches the
+    # resource, so downgrade it to a weak one (If-None-Match compares weakly)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Compress the app's responses after each request"""
+    app.after_request(compress_response)
+    logger.info(f"Response compression enabled: {', '.join(available_encodings())} above {COMPRESS_MIN_BYTES} bytes")
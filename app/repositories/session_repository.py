@@ -1,3 +1,4 @@
+import json
 from .base_repository import BaseRepository
 from app.logging_config import get_logger
 
@@ -158,4 +159,83 @@ class SessionRepository(BaseRepository):
         """
         query = "SELECT COUNT(*) as count FROM sessions WHERE session_name = %s AND project_id = %s"
         result = self._execute_query(query, (session_name, project_id), fetch_one=True)
-        return result['count'] if result else 0
\ No newline at end of file
+        return result['count'] if result else 0
+
+    def save_summary(self, project_id, session_name, summary):
+        """
+        Store (or replace) the signal summary of a session.
+
+        Args:
+            project_id: ID of the project the session belongs to
+            session_name: Name of the session
+            summary: Result of session_summaries.summarize_signals
+
+        Returns:
+            int: Number of affected rows (0 when the session does not exist)
+        """
+        query = """
+            INSERT INTO session_summaries (session_id, row_count, duration_seconds, sample_rate_hz, gap_count, axis_stats)
+            SELECT session_id, %s, %s, %s, %s, %s
+            FROM sessions
+            WHERE project_id = %s AND session_name = %s
+            ON DUPLICATE KEY UPDATE
+                row_count = VALUES(row_count),
+                duration_seconds = VALUES(duration_seconds),
+                sample_rate_hz = VALUES(sample_rate_hz),
+                gap_count = VALUES(gap_count),
+                axis_stats = VALUES(axis_stats)
+        """
+        params = (summary['row_count'], summary['duration_seconds'], summary['sample_rate_hz'],
+                  summary['gap_count'], json.dumps(summary['axis_stats']), project_id, session_name)
+        return self._execute_query(query, params, commit=True)
+
+    def get_sessions_without_summary(self, project_id=None):
+        """
+        List visible sessions that have no signal summary yet.
+
+        Args:
+            project_id: Optional project to restrict the search to
+
+        Returns:
+            list: Dicts with session_id, session_name and project_id
+        """
+        query = """
+            SELECT s.session_id, s.session_name, s.project_id
+            FROM sessions s
+            LEFT JOIN session_summaries ss ON ss.session_id = s.session_id
+            WHERE ss.session_id IS NULL AND (s.status != 'Split' OR s.status IS NULL)
+        """
+        params = ()
+        if project_id is not None:
+            query += " AND s.project_id = %s"
+            params = (project_id,)
+        return self._execute_query(query + " ORDER BY s.session_id", params, fetch_all=True)
+
+    def get_scoring_targets(self, project_id=None, session_ids=None):
+        """
+        List sessions to score in a batch with where their files live.
+
+        A project's visible sessions are listed, leaving out split parents and
+        discarded sessions; explicitly listed sessions are taken as they are.
+
+        Args:
+            project_id: Project whose sessions to list
+            session_ids: Optional explicit list of session IDs (takes precedence)
+
+        Returns:
+            list: Dicts with session_id, session_name and project_path
+        """
+        query = """
+            SELECT s.session_id, s.session_name, p.path AS project_path
+            FROM sessions s
+            JOIN projects p ON s.project_id = p.project_id
+        """
+        if session_ids:
+            placeholders = ', '.join(['%s'] * len(session_ids))
+            query += f" WHERE s.session_id IN ({placeholders})"
+            params = tuple(session_ids)
+        else:
+            query += """ WHERE s.project_id = %s AND (s.status != 'Split' OR s.status IS NULL)
+                AND (s.keep != 0 OR s.keep IS NULL)"""
+            params = (project_id,)
+        return self._execute_query(query + " ORDER BY s.session_name", params, fetch_all=True)
@@ -228,6 +228,73 @@ class ModelController:
             logging.error(f"error getting scoring status: {e}")
             return jsonify({'error': str(e)}), 500
         
+    def score_batch_with_model(self):
+        """Score all sessions of a project, or a list of sessions, with one model"""
+        try:
+            data = request.get_json()
+            if not data:
+                return jsonify({'error': 'no data provided'}), 400
+            
+            model_id = data.get('model_id')
+            project_id = data.get('project_id')
+            session_ids = data.get('session_ids')
+            device = data.get('device', 'cpu')
+            append_to_current = data.get('append_to_current', True)
+            current_labeling_name = data.get('current_labeling_name')
+            
+            if not model_id or not (project_id or session_ids):
+                return jsonify({'error': 'missing required fields: model_id and project_id or session_ids'}), 400
+            if session_ids is not None and not isinstance(session_ids, list):
+                return jsonify({'error': 'session_ids must be a list'}), 400
+            
+            logging.info(f"batch scoring with model {model_id}: project {project_id}, sessions {session_ids}")
+            result = self.model_service.score_batch_with_model(
+                model_id, project_id=project_id, session_ids=session_ids, device=device,
+                append_to_current=append_to_current, current_labeling_name=current_labeling_name
+            )
+            
+            return jsonify({
+                'success': True,
+                'message': f"scoring {result['sessions_total']} sessions with model",
+                'batch_id': result['batch_id'],
+                'scoring_id': result['batch_id'],
+                'sessions_total': result['sessions_total']
+            }), 200
+            
+        except DatabaseError as e:
+            logging.error(f"database error in score_batch_with_model: {e}")
+            return jsonify({'error': str(e)}), 500
+        except Exception as e:
+            logging.error(f"unexpected error in score_batch_with_model: {e}")
+            traceback.print_exc()
+            return jsonify({'error': f'failed to start batch scoring: {str(e)}'}), 500
+
+    def resume_batch_scoring(self, batch_id):
+        """Resume an interrupted or cancelled batch, skipping sessions already scored"""
+        try:
+            result = self.model_service.resume_batch_scoring(batch_id)
+            if result is None:
+                return jsonify({'error': 'batch not found'}), 404
+            return jsonify({'success': True, 'scoring_id': batch_id, **result}), 200
+        except DatabaseError as e:
+            logging.error(f"database error in resume_batch_scoring: {e}")
+            return jsonify({'error': str(e)}), 409
+        except Exception as e:
+            logging.error(f"unexpected error in resume_batch_scoring: {e}")
+            return jsonify({'error': f'failed to resume batch scoring: {str(e)}'}), 500
+
+    def cancel_scoring(self, scoring_id):
+        """Cancel a queued or running scoring operation"""
+        try:
+            logging.info(f"cancelling scoring {scoring_id}")
+            status = self.model_service.cancel_scoring(scoring_id)
+            if status is None:
+                return jsonify({'error': 'scoring not found'}), 404
+            return jsonify(status), 200
+        except Exception as e:
+            logging.error(f"error cancelling scoring: {e}")
+            return jsonify({'error': str(e)}), 500
+        
     def get_gpu_status(self):
         """Check if GPU is available for PyTorch"""
         try:
@@ -239,7 +306,9 @@ class ModelController:
                 'gpu_available': gpu_available,
                 'gpu_count': gpu_count,
                 'gpu_name': gpu_name,
-                'cuda_version': self.model_service.get_cuda_version()
+                'cuda_version': self.model_service.get_cuda_version(),
+                'model_cache': self.model_service.get_model_cache_stats(),
+                'scoring_queue': self.model_service.get_scoring_queue_stats()
             }), 200
             
         except Exception as e:
@@ -334,10 +403,22 @@ def score_session_with_model():
 def score_range_with_model():
     return controller.score_range_with_model(device='cpu')
 
+@models_bp.route('/api/models/score_batch', methods=['POST'])
+def score_batch_with_model():
+    return controller.score_batch_with_model()
+
+@models_bp.route('/api/models/score_batch/<batch_id>/resume', methods=['POST'])
+def resume_batch_scoring(batch_id):
+    return controller.resume_batch_scoring(batch_id)
+
 @models_bp.route('/api/scoring_status/<scoring_id>')
 def get_scoring_status(scoring_id):
     return controller.get_scoring_status(scoring_id)
 
+@models_bp.route('/api/scoring_status/<scoring_id>/cancel', methods=['POST'])
+def cancel_scoring(scoring_id):
+    return controller.cancel_scoring(scoring_id)
+
 @models_bp.route('/api/gpu_status', methods=['GET'])
 def get_gpu_status():
     return controller.get_gpu_status()
@@ -1,6 +1,5 @@
 from flask import Blueprint, request, jsonify
 import os
-import uuid
 import shutil
 import json
 from datetime import datetime
@@ -9,6 +8,7 @@ from app.logging_config import get_logger
 import traceback
 from app.services.project_service import ProjectService
 from app.services.session_service import SessionService
+from app.services.upload_job_service import UploadJobService
 
 logger = get_logger(__name__)
 
@@ -17,9 +17,17 @@ DATA_DIR = os.getenv('DATA_DIR', '~/.delta/data')
 projects_bp = Blueprint('projects', __name__)
 
 class ProjectController:
-    def __init__(self, project_service, session_service):
+    def __init__(self, project_service, session_service, upload_job_service):
         self.project_service: ProjectService = project_service
         self.session_service: SessionService = session_service
+        self.upload_job_service: UploadJobService = upload_job_service
+
+    def get_upload_status(self, upload_id):
+        """Get the progress of a background upload or session discovery job"""
+        status = self.upload_job_service.get_status(upload_id)
+        if status is None:
+            return jsonify({'error': 'Upload job not found'}), 404
+        return jsonify(status)
 
     def list_projects(self):
         try:
@@ -38,74 +46,87 @@ class ProjectController:
             if not all([project_name, participant_code, project_path]):
                 return jsonify({'error': 'Missing required fields: name, participant, or folderName'}), 400 
             
-            project_result = self.project_service.create_project_with_files(
-                project_name, participant_code, project_path, DATA_DIR
+            # Copying and preprocessing can take many minutes; run it as a background job
+            upload_id = self.upload_job_service.start(
+                'project_upload', f"Upload project {project_name}",
+                self._run_project_upload, project_name, participant_code, project_path
             )
-
-            logger.info(f"Project upload result: {project_result}")
-            project_id = project_result['project_id']
-            participant_id = project_result['participant_id']
-            new_project_path = project_result['project_path']
-
-            sessions = self.project_service.discover_project_sessions(new_project_path)
-            logger.info(f"Discovered {len(sessions) if sessions else 0} sessions in project {project_name} at {new_project_path}")
-            
-            # Ensure sessions is always a list
-            if not isinstance(sessions, list):
-                logger.warning(f"Sessions discovery returned non-list: {type(sessions)}, using empty list")
-                sessions = []
-            
-            print(sessions)
-            upload_id = str(uuid.uuid4())
-            logger.info(f"Generated upload ID: {upload_id}")
-            
-            skipped_sessions = self.session_service.validate_sessions(sessions, new_project_path)
-            sessions = [s for s in sessions if s['name'] not in skipped_sessions]
-
-            all_labels = []
-
-            for session in sessions:
-                logger.info(f"Processing session: {session['name']}")
-                bouts = self.session_service.load_bouts_from_labels_json(new_project_path, session)
-                
-                # Ensure bouts is always a list to prevent iteration errors
-                if not isinstance(bouts, list):
-                    logger.warning(f"Bouts for session {session['name']} is not a list: {type(bouts)}, using empty list")
-                    bouts = []
-                
-                for bout in bouts:
-                    if 'label' not in bout:
-                        bout['label'] = 'SELF REPORTED SMOKING'
-
-                    if bout['label'] not in all_labels:
-                        all_labels.append(bout['label'])
-
-                created_sessions = self.session_service.preprocess_and_split_session_on_upload(
-                    session_name=session['name'],
-                    project_path=new_project_path,
-                    project_id=project_id,
-                    parent_bouts=bouts
-                )
-
-            # Log all labels
-            logger.info(f"All labels found in project {project_name}: {all_labels}")
-
-            # Add labels to project metadata
-            self.project_service.add_list_of_labeling_names_to_project(project_id, all_labels)
+            logger.info(f"Started upload job {upload_id} for project {project_name}")
             
             return jsonify({
                 'message': 'Project upload started',
-                'project_id': project_id,
-                'participant_id': participant_id,
-                'central_path': new_project_path,
                 'upload_id': upload_id,
-                'sessions_found': len(sessions)
-            })
+                'status_url': f'/api/upload_status/{upload_id}'
+            }), 202
             
         except Exception as e:
             logger.error(f"Error in upload_new_project: {str(e)}")
             logger.error(f"Stack trace: {traceback.format_exc()}")
             return jsonify({'error': f'Upload failed: {str(e)}'}), 500
+
+    def _run_project_upload(self, project_name, participant_code, project_path, job=None):
+        """Upload job: copy the project, then preprocess and register its sessions"""
+        project_result = self.project_service.create_project_with_files(
+            project_name, participant_code, project_path, DATA_DIR
+        )
+
+        logger.info(f"Project upload result: {project_result}")
+        project_id = project_result['project_id']
+        participant_id = project_result['participant_id']
+        new_project_path = project_result['project_path']
+
+        sessions = self.project_service.discover_project_sessions(new_project_path)
+        logger.info(f"Discovered {len(sessions) if sessions else 0} sessions in project {project_name} at {new_project_path}")
+        
+        # Ensure sessions is always a list
+        if not isinstance(sessions, list):
+            logger.warning(f"Sessions discovery returned non-list: {type(sessions)}, using empty list")
+            sessions = []
+        
+        validation_reports = self.session_service.validate_sessions(sessions, new_project_path)
+        skipped_sessions = [report['session_name'] for report in validation_reports if not report['valid']]
+        sessions = [s for s in sessions if s['name'] not in skipped_sessions]
+
+        all_labels = []
+        session_bouts = []
+
+        for session in sessions:
+            logger.info(f"Processing session: {session['name']}")
+            bouts = self.session_service.load_bouts_from_labels_json(new_project_path, session)
+            
+            # Ensure bouts is always a list to prevent iteration errors
+            if not isinstance(bouts, list):
+                logger.warning(f"Bouts for session {session['name']} is not a list: {type(bouts)}, using empty list")
+                bouts = []
+            
+            for bout in bouts:
+                if 'label' not in bout:
+                    bout['label'] = 'SELF REPORTED SMOKING'
+
+                if bout['label'] not in all_labels:
+                    all_labels.append(bout['label'])
+
+            session_bouts.append((session['name'], bouts))
+
+        # Preprocess sessions in parallel worker processes; inserts happen here in order
+        ingest_results = self.session_service.preprocess_sessions_on_upload(new_project_path, project_id, session_bouts, job=job)
+        session_errors = {result['session_name']: result['error'] for result in ingest_results if result['error']}
+
+        # Log all labels
+        logger.info(f"All labels found in project {project_name}: {all_labels}")
+
+        # Add labels to project metadata
+        self.project_service.add_list_of_labeling_names_to_project(project_id, all_labels)
+        
+        return {
+            'project_id': project_id,
+            'participant_id': participant_id,
+            'central_path': new_project_path,
+            'sessions_found': len(sessions),
+            'sessions_skipped': skipped_sessions,
+            'session_validation': validation_reports,
+            'session_errors': session_errors
+        }
         
     def delete_project(self, project_id):
         try:
@@ -400,88 +421,89 @@ class ProjectController:
                 logger.error(f"Error handling bulk upload participant: {e}")
                 return jsonify({'error': f'Failed to create bulk upload participant: {str(e)}'}), 500
 
-            # Start uploading each project
-            upload_results = []
-            upload_ids = []
-            
-            projects = os.listdir(bulkUploadFolderPath)
-            logger.info(f"Found {len(projects)} projects to upload in {bulkUploadFolderPath}")
-            for project_name in projects:
-                logger.info(f"Uploading project: {project_name}")
-                try:
-                    project_result = self.project_service.create_project_with_bulk_files(
-                        project_name=project_name,
-                        participant_code=participant_code,
-                        bulkUploadFolderPath=bulkUploadFolderPath,
-                        data_dir=DATA_DIR
-                    )
-                    project_id = project_result['project_id']
-                    new_project_path = project_result['project_path']
-
-                    # Discover sessions in the uploaded project using service layer
-                    sessions = self.project_service.discover_project_sessions(new_project_path)
-
-                    # Generate unique upload ID for progress tracking
-                    upload_id = str(uuid.uuid4())
-                    upload_ids.append(upload_id)
-                    
-                    all_labels = []
-
-                    for session in sessions:
-                        logger.info(f"Processing session: {session['name']}")
-                        bouts = self.session_service.load_bouts_from_labels_json(new_project_path, session)
-
-                        for bout in bouts:
-                            if 'label' not in bout:
-                                bout['label'] = 'SELF REPORTED SMOKING'
-
-                            if bout['label'] not in all_labels:
-                                all_labels.append(bout['label'])
-
-                        created_sessions = self.session_service.preprocess_and_split_session_on_upload(
-                            session_name=session['name'],
-                            project_path=new_project_path,
-                            project_id=project_id,
-                            parent_bouts=bouts
-                        )
-                    # Log all labels
-                    logger.info(f"All labels found in project {project_name}: {all_labels}")
-
-                    # Add labels to project metadata
-                    self.project_service.add_list_of_labeling_names_to_project(project_id, all_labels)
-                    
-                    upload_results.append({
-                        'project_name': project_name,
-                        'project_id': project_id,
-                        'upload_id': upload_id,
-                        'sessions_found': len(sessions),
-                        'status': 'success'
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error uploading project {project_name}: {e}")
-                    upload_results.append({
-                        'project_name': project_name,
-                        'project_id': None,
-                        'upload_id': None,
-                        'sessions_found': 0,
-                        'status': 'error',
-                        'error': str(e)
-                    })
+            upload_id = self.upload_job_service.start(
+                'bulk_upload', f"Bulk upload from {bulkUploadFolderPath}",
+                self._run_bulk_upload, bulkUploadFolderPath, participant_code
+            )
                         
             return jsonify({
                 'message': 'Bulk upload started',
                 'participant_id': participant_id,
                 'participant_code': participant_code,
-                'upload_results': upload_results,
-                'upload_ids': upload_ids
-            })
+                'upload_id': upload_id,
+                'status_url': f'/api/upload_status/{upload_id}'
+            }), 202
             
         except Exception as e:
             logger.error(f"Error in bulk_upload_projects: {str(e)}")
             logger.error(f"Stack trace: {traceback.format_exc()}")
             return jsonify({'error': f'Bulk upload failed: {str(e)}'}), 500
 
+    def _run_bulk_upload(self, bulkUploadFolderPath, participant_code, job=None):
+        """Bulk upload job: upload each project folder; a failing project does not stop the rest"""
+        upload_results = []
+        
+        projects = os.listdir(bulkUploadFolderPath)
+        logger.info(f"Found {len(projects)} projects to upload in {bulkUploadFolderPath}")
+        for project_name in projects:
+            logger.info(f"Uploading project: {project_name}")
+            try:
+                project_result = self.project_service.create_project_with_bulk_files(
+                    project_name=project_name,
+                    participant_code=participant_code,
+                    bulkUploadFolderPath=bulkUploadFolderPath,
+                    data_dir=DATA_DIR
+                )
+                project_id = project_result['project_id']
+                new_project_path = project_result['project_path']
+
+                # Discover sessions in the uploaded project using service layer
+                sessions = self.project_service.discover_project_sessions(new_project_path)
+
+                all_labels = []
+                session_bouts = []
+
+                for session in sessions:
+                    logger.info(f"Processing session: {session['name']}")
+                    bouts = self.session_service.load_bouts_from_labels_json(new_project_path, session)
+
+                    for bout in bouts:
+                        if 'label' not in bout:
+                            bout['label'] = 'SELF REPORTED SMOKING'
+
+                        if bout['label'] not in all_labels:
+                            all_labels.append(bout['label'])
+
+                    session_bouts.append((session['name'], bouts))
+
+                ingest_results = self.session_service.preprocess_sessions_on_upload(new_project_path, project_id, session_bouts, job=job)
+                session_errors = {result['session_name']: result['error'] for result in ingest_results if result['error']}
+                # Log all labels
+                logger.info(f"All labels found in project {project_name}: {all_labels}")
+
+                # Add labels to project metadata
+                self.project_service.add_list_of_labeling_names_to_project(project_id, all_labels)
+                
+                upload_results.append({
+                    'project_name': project_name,
+                    'project_id': project_id,
+                    'sessions_found': len(sessions),
+                    'session_errors': session_errors,
+                    'status': 'success'
+                })
+                
+            except Exception as e:
+                logger.error(f"Error uploading project {project_name}: {e}")
+                upload_results.append({
+                    'project_name': project_name,
+                    'project_id': None,
+                    'sessions_found': 0,
+                    'status': 'error',
+                    'error': str(e)
+                })
+
+        return {'upload_results': upload_results}
+
     def create_dataset_based_project(self):
         """Create a new project that references raw datasets instead of copying files"""
         try:
@@ -514,17 +536,13 @@ class ProjectController:
             
             logger.info(f"Dataset-based project creation result: {result}")
             
-            # Automatically create sessions from the linked datasets with time gap splitting and bout detection
-            try:
-                logger.info(f"Attempting to auto-create sessions for dataset-based project {result['project_id']}")
-                session_result = self.project_service.discover_and_create_dataset_sessions(result['project_id'])
-                logger.info(f"Session result: {session_result}")
-                logger.info(f"Auto-created {session_result['sessions_created']} sessions for dataset-based project {result['project_id']}")
-            except Exception as e:
-                import traceback
-                logger.error(f"Failed to auto-create sessions for dataset-based project {result['project_id']}: {e}")
-                logger.error(f"Full traceback: {traceback.format_exc()}")
-                # Don't fail the entire project creation if session discovery fails
+            # Automatically create sessions from the linked datasets with time gap splitting and bout detection,
+            # in the background; a failure there does not fail the project creation
+            logger.info(f"Starting session discovery for dataset-based project {result['project_id']}")
+            upload_id = self.upload_job_service.start(
+                'dataset_session_discovery', f"Discover sessions for project {result['project_name']}",
+                self.project_service.discover_and_create_dataset_sessions, result['project_id']
+            )
             
             return jsonify({
                 'message': 'Dataset-based project created successfully',
@@ -533,8 +551,9 @@ class ProjectController:
                 'project_name': result['project_name'],
                 'dataset_count': result['dataset_count'],
                 'project_type': result['project_type'],
-                'sessions_created': session_result.get('sessions_created', 0) if 'session_result' in locals() else 0
-            })
+                'upload_id': upload_id,
+                'status_url': f'/api/upload_status/{upload_id}'
+            }), 202
             
         except Exception as e:
             logger.error(f"Error in create_dataset_based_project: {str(e)}")
@@ -838,17 +857,19 @@ class ProjectController:
             return jsonify({'error': str(e)}), 500
 
     def discover_project_sessions(self, project_id):
-        """Discover and create sessions for a dataset-based project"""
+        """Start discovering and creating sessions for a dataset-based project"""
         try:
-            result = self.project_service.discover_and_create_dataset_sessions(project_id)
+            upload_id = self.upload_job_service.start(
+                'dataset_session_discovery', f"Discover sessions for project {project_id}",
+                self.project_service.discover_and_create_dataset_sessions, project_id
+            )
             
             return jsonify({
                 'success': True,
-                'sessions_created': result['sessions_created'],
-                'datasets_processed': result.get('datasets_processed', 0),
-                'labels_discovered': result.get('labels_discovered', []),
-                'message': result['message']
-            })
+                'upload_id': upload_id,
+                'status_url': f'/api/upload_status/{upload_id}',
+                'message': 'Session discovery started'
+            }), 202
             
         except Exception as e:
             logger.error(f"Error discovering project sessions: {e}")
@@ -863,6 +884,14 @@ def list_projects():
 def upload_new_project():
     return controller.upload_new_project()
 
+@projects_bp.route('/api/projects/bulk-upload', methods=['POST'])
+def bulk_upload_projects():
+    return controller.bulk_upload_projects()
+
+@projects_bp.route('/api/upload_status/<upload_id>')
+def get_upload_status(upload_id):
+    return controller.get_upload_status(upload_id)
+
 @projects_bp.route('/api/project/<int:project_id>', methods=['DELETE'])
 def delete_project(project_id):
     return controller.delete_project(project_id)
@@ -914,6 +943,6 @@ def discover_project_sessions(project_id):
 
 controller = None
 
-def init_controller(session_service, project_service):
+def init_controller(session_service, project_service, upload_job_service):
     global controller
-    controller = ProjectController(session_service=session_service, project_service=project_service)
\ No newline at end of file
+    controller = ProjectController(session_service=session_service, project_service=project_service, upload_job_service=upload_job_service)
\ No newline at end of file
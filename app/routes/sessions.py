@@ -1,15 +1,95 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from app.services.session_service import SessionService
 from app.exceptions import DatabaseError
+from app.logging_config import get_logger
+from app.services.utils import read_signal_csv, load_signal_time_range
+from app.services.signal_pyramid import query_signal_view
+from app.services.bout_intervals import assign_bouts_to_segments
+from app.services.session_splits import nearest_row_indices, split_segments
+from app.services.signal_store import encode_columns, source_identity, COLUMNS_MIMETYPE
+from app.services.frame_cache import frame_cache, disk_frame_cache
 import os
 import pandas as pd
 import json
+import hashlib
+from datetime import datetime, timezone
 import shutil
 import logging
 import traceback
 
+logger = get_logger(__name__)
+
 sessions_bp = Blueprint('sessions', __name__)
 
+# Signal file behind each channel of the /window endpoint
+WINDOW_CHANNEL_FILES = {'accel': 'accelerometer_data.csv', 'gyro': 'gyroscope_data.csv'}
+
+def wants_columnar_response():
+    """Whether the client prefers the binary columnar format over JSON (JSON wins ties such as */*)"""
+    return request.accept_mimetypes.best_match(['application/json', COLUMNS_MIMETYPE]) == COLUMNS_MIMETYPE
+
+def columnar_response(df, columns, meta):
+    """
+    Encode samples as little-endian typed columns (float64 timestamps, float32 axes).
+
+    Timestamps are float64 so browsers can view them as a Float64Array; meta is
+    stored in the JSON header.
+    """
+    encoded = {}
+    for name in columns:
+        encoded[name] = (df[name].to_numpy(), '<f8' if name == 'ns_since_reboot' else '<f4')
+    body = encode_columns(encoded, extra_header={'meta': meta}, default=str)
+    return Response(body, mimetype=COLUMNS_MIMETYPE)
+
+def signal_etag(csv_path, source):
+    """
+    Entity tag of a session's signal view: the data file's identity (path, size,
+    mtime), the part of it the session covers and the requested representation.
+    """
+    size, mtime_ns = source_identity(csv_path)
+    bounds = (source['start_row'], source['end_row'], source['start_ns'], source['end_ns'])
+    representation = COLUMNS_MIMETYPE if wants_columnar_response() else 'application/json'
+    return _digest(os.path.abspath(csv_path), size, mtime_ns, bounds, representation)
+
+def bouts_etag(session_info):
+    """Entity tag of a session's bouts and details; a label edit changes the bouts and so the tag"""
+    return _digest(json.dumps(session_info, sort_keys=True, default=str))
+
+def combined_etag(*etags):
+    return _digest(*etags)
+
+def _digest(*parts):
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+def signal_last_modified(csv_path):
+    return datetime.fromtimestamp(int(os.path.getmtime(csv_path)), tz=timezone.utc)
+
+def not_modified(etag, last_modified=None):
+    """
+    Return a 304 response when the client's cached copy is current, otherwise None.
+
+    If-None-Match decides when present; If-Modified-Since is only consulted without it.
+    """
+    if request.if_none_match:
+        current = request.if_none_match.contains_weak(etag)
+    else:
+        current = last_modified is not None and request.if_modified_since is not None and last_modified <= request.if_modified_since
+    if not current:
+        return None
+    return Response(status=304)
+
+def revalidated(response, etag, last_modified=None):
+    """Tag a response so browsers keep it but revalidate it on every use"""
+    if isinstance(response, tuple):
+        # Error responses are not cached
+        return response
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    response.vary.add('Accept')
+    return response
+
 class SessionController:
     def __init__(self, project_service, session_service, model_service):
         self.project_service = project_service
@@ -58,133 +138,186 @@ class SessionController:
             print(f"Error starting session scoring: {e}")
             return jsonify({'error': f'Failed to start scoring: {str(e)}'}), 500
         
+    def _session_signal_file(self, session_id):
+        """
+        Look up a session and the accelerometer file its signal view reads.
+
+        Returns:
+            tuple: (session_info, source, csv_path, None) or (None, None, None, error response)
+        """
+        session_info = self.session_service.get_session_details(session_id)
+        if not session_info:
+            return None, None, None, (jsonify({'error': 'Session not found'}), 404)
+
+        source = self.session_service.get_signal_source(session_id, session_info)
+        if not source:
+            return None, None, None, (jsonify({'error': 'Dataset-based session missing virtual split information'}), 500)
+
+        csv_path = os.path.join(source['data_dir'], 'accelerometer_data.csv')
+        if not os.path.exists(csv_path):
+            return None, None, None, (jsonify({'error': f'CSV file not found at {csv_path}'}), 404)
+        return session_info, source, csv_path, None
+
+    def _signal_payload(self, source, csv_path, meta):
+        """Build the signal view response (columnar or JSON records) with meta alongside the samples"""
+        # Answer from the level-of-detail pyramid so the cost stays constant and
+        # short spikes survive downsampling
+        df, bucket_rows = query_signal_view(
+            csv_path,
+            column_prefix='accel',
+            start_ns=source['start_ns'],
+            end_ns=source['end_ns'],
+            start_row=source['start_row'],
+            end_row=source['end_row']
+        )
+        logger.debug(f"Loaded {len(df)} points at {bucket_rows} rows per bucket from {csv_path}")
+
+        expected_columns = ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']
+        if not all(col in df.columns for col in expected_columns):
+            return jsonify({'error': f'Invalid CSV format. Expected columns: {expected_columns}, Found: {list(df.columns)}'}), 400
+
+        if wants_columnar_response():
+            # Typed columns instead of one JSON object per sample; metadata rides in the header
+            return columnar_response(df, expected_columns, meta)
+        return jsonify({**meta, 'data': df[expected_columns].to_dict(orient='records')})
+
     def get_session_data(self, session_id):
+        """Return a session's signal view together with its bouts and details"""
         try:
-            session_info = self.session_service.get_session_details(session_id)
+            session_info, source, csv_path, error = self._session_signal_file(session_id)
+            if error:
+                return error
+            logger.debug(f"Session {session_id} - project_path: {session_info['project_path']}, session_name: {session_info['session_name']}")
+
+            etag = combined_etag(signal_etag(csv_path, source), bouts_etag(session_info))
+            response = not_modified(etag)
+            if response is None:
+                response = self._signal_payload(source, csv_path, {'bouts': session_info['bouts'], 'session_info': session_info})
+            return revalidated(response, etag)
+        except Exception as e:
+            print(f"Error retrieving session data: {e}")
+            return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+    def get_session_signal(self, session_id):
+        """Return only a session's signal view; it changes when the data file does, not with labels"""
+        try:
+            session_info, source, csv_path, error = self._session_signal_file(session_id)
+            if error:
+                return error
+
+            etag = signal_etag(csv_path, source)
+            last_modified = signal_last_modified(csv_path)
+            response = not_modified(etag, last_modified)
+            if response is None:
+                response = self._signal_payload(source, csv_path, {'session_id': session_id})
+            return revalidated(response, etag, last_modified)
+        except Exception as e:
+            logging.error(f"Error retrieving session signal: {str(e)}")
+            logging.error(f"Stack trace: {traceback.format_exc()}")
+            return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+    def get_session_bouts(self, session_id):
+        """Return only a session's bouts and details, so label refreshes skip the signal"""
+        try:
+            try:
+                session_info = self.session_service.get_session_details(session_id)
+            except DatabaseError as e:
+                return jsonify({'error': str(e)}), 500
             if not session_info:
                 return jsonify({'error': 'Session not found'}), 404
 
-            project_path = session_info['project_path']
-            session_name = session_info['session_name']
-            
-            print(f"DEBUG: Session {session_id} - project_path: {project_path}, session_name: {session_name}")
-            
-            # Check if this is a virtual split session
-            split_info = self.session_service.session_repo.get_session_split_info(session_id)
-            print(f"DEBUG: Split info: {split_info}")
-            
-            # Also check if session has a dataset_id for dataset-based sessions
-            print(f"DEBUG: Checking session dataset info...")
-            dataset_id = session_info.get('dataset_id')
-            raw_session_name = session_info.get('raw_session_name')
-            print(f"DEBUG: Session dataset_id: {dataset_id}, raw_session_name: {raw_session_name}")
-            
-            # Handle dataset-based sessions that need path correction
-            if dataset_id and (not split_info or not split_info.get('parent_data_path') or 'raw_datasets/raw_datasets' in str(split_info.get('parent_data_path', '')) or not os.path.exists(str(split_info.get('parent_data_path', '')))):
-                print(f"DEBUG: Dataset-based session needs path setup/correction...")
-                # Get correct dataset path using current server's DATA_DIR
-                try:
-                    from app.services.raw_dataset_service import RawDatasetService
-                    raw_dataset_service = RawDatasetService()
-                    dataset = raw_dataset_service.raw_dataset_repo.find_by_id(dataset_id)
-                    if dataset:
-                        # Use current DATA_DIR instead of stored path
-                        current_data_dir = os.path.expanduser(os.getenv('DATA_DIR', '~/.delta/data'))
-                        dataset_dir_name = os.path.basename(dataset['file_path'])
-                        corrected_dataset_path = os.path.join(current_data_dir, 'raw_datasets', dataset_dir_name)
-                        
-                        # If we don't have raw_session_name, try to infer it from session name
-                        if not raw_session_name:
-                            session_name = session_info['session_name']
-                            # Remove split suffix (.1, .2, etc) to get original session name
-                            inferred_session_name = session_name.split('.')[0] if '.' in session_name else session_name
-                            print(f"DEBUG: No raw_session_name, inferring from session_name: {inferred_session_name}")
-                            corrected_path = os.path.join(corrected_dataset_path, inferred_session_name)
-                        else:
-                            corrected_path = os.path.join(corrected_dataset_path, raw_session_name)
-                        
-                        print(f"DEBUG: Setting corrected path: {corrected_path}")
-                        print(f"DEBUG: Dataset info - ID: {dataset_id}, stored path: {dataset['file_path']}, corrected to: {corrected_dataset_path}")
-                        
-                        # Ensure split_info exists and set the path
-                        if not split_info:
-                            split_info = {}
-                        split_info['parent_data_path'] = corrected_path
-                except Exception as e:
-                    print(f"DEBUG: Could not correct path: {e}")
-            
-            if split_info and split_info.get('parent_data_path'):
-                # Virtual split session (including dataset-based sessions) - load from parent with offsets
-                csv_path = os.path.join(split_info['parent_data_path'], 'accelerometer_data.csv')
-                if not os.path.exists(csv_path):
-                    return jsonify({'error': f'Parent CSV file not found at {csv_path}'}), 404
-                
-                from app.services.utils import load_dataframe_from_csv
-                
-                # Check if we have valid offsets (new virtual splits)
-                if split_info['data_start_offset'] is not None and split_info['data_end_offset'] is not None:
-                    # Use efficient loading with offsets
-                    df = load_dataframe_from_csv(
-                        csv_path,
-                        column_prefix='accel',
-                        start_offset=split_info['data_start_offset'],
-                        end_offset=split_info['data_end_offset']
-                    )
-                else:
-                    # Fallback for old virtual splits without offsets - filter by time range
-                    print(f"DEBUG: Loading full CSV and filtering by time range")
-                    df = pd.read_csv(csv_path)
-                    print(f"DEBUG: Loaded CSV with {len(df)} rows")
-                    if 'x' in df.columns:
-                        df = df.rename(columns={'x': 'accel_x', 'y': 'accel_y', 'z': 'accel_z'})
-                    
-                    # Filter by session time range
-                    start_ns = session_info['start_ns']
-                    stop_ns = session_info['stop_ns']
-                    print(f"DEBUG: Filtering by time range: {start_ns} to {stop_ns}")
-                    if 'ns_since_reboot' in df.columns:
-                        print(f"DEBUG: Data time range: {df['ns_since_reboot'].min()} to {df['ns_since_reboot'].max()}")
-                        df = df[(df['ns_since_reboot'] >= start_ns) & (df['ns_since_reboot'] <= stop_ns)]
-                        print(f"DEBUG: After filtering: {len(df)} rows")
-                    else:
-                        print(f"DEBUG: No 'ns_since_reboot' column found. Columns: {list(df.columns)}")
-                        return jsonify({'error': 'Dataset missing ns_since_reboot column'}), 500
-                
-                # Apply downsampling for visualization
-                df = df.iloc[::50]
-            elif project_path:
-                # Regular session with project path - load from session directory
-                csv_path = os.path.join(project_path, session_name, 'accelerometer_data.csv')
-                if not os.path.exists(csv_path):
-                    return jsonify({'error': f'CSV file not found at {csv_path}'}), 404
-                
-                df = pd.read_csv(csv_path)
-                df = df.iloc[::50]
-                
-                # If the CSV has 'x', 'y', 'z' columns, rename them to 'accel_x', 'accel_y', 'accel_z'
-                if 'x' in df.columns:
-                    df = df.rename(columns={'x': 'accel_x', 'y': 'accel_y', 'z': 'accel_z'})
-            else:
-                # Dataset-based session without virtual split info - this shouldn't happen
-                return jsonify({'error': 'Dataset-based session missing virtual split information'}), 500
-
-            bouts = session_info['bouts']
-            expected_columns = ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']
+            etag = bouts_etag(session_info)
+            response = not_modified(etag)
+            if response is None:
+                response = jsonify({'bouts': session_info['bouts'], 'session_info': session_info})
+            return revalidated(response, etag)
+        except Exception as e:
+            logging.error(f"Error retrieving session bouts: {str(e)}")
+            logging.error(f"Stack trace: {traceback.format_exc()}")
+            return jsonify({'error': f'Server error: {str(e)}'}), 500
 
-            if not all(col in df.columns for col in expected_columns):
-                return jsonify({'error': f'Invalid CSV format. Expected columns: {expected_columns}, Found: {list(df.columns)}'}), 400
+    def _load_signal_source(self, session_id):
+        """
+        Look up a session and the signal files behind it.
 
-            data = df[expected_columns].to_dict(orient='records')
-            data = {
-                'bouts': bouts,
-                'data': data,
-                'session_info': session_info
-            }
-            
-            return jsonify(data)
+        Returns:
+            tuple: (source dict, None) or (None, error response)
+        """
+        try:
+            session_info = self.session_service.get_session_details(session_id)
+            if not session_info:
+                return None, (jsonify({'error': 'Session not found'}), 404)
+        except DatabaseError as e:
+            return None, (jsonify({'error': str(e)}), 500)
+
+        source = self.session_service.get_signal_source(session_id, session_info)
+        if not source:
+            return None, (jsonify({'error': 'Dataset-based session missing virtual split information'}), 500)
+        return source, None
+
+    def _query_channel(self, source, csv_path, channel, start_ns, end_ns, max_points):
+        """
+        Downsample one channel of a session to max_points over [start_ns, end_ns].
+
+        Returns:
+            tuple: (DataFrame, bucket_rows)
+        """
+        # Keep the requested window inside the session's own bounds
+        if source['start_ns'] is not None:
+            start_ns = source['start_ns'] if start_ns is None else max(start_ns, source['start_ns'])
+        if source['end_ns'] is not None:
+            end_ns = source['end_ns'] if end_ns is None else min(end_ns, source['end_ns'])
+
+        return query_signal_view(
+            csv_path,
+            column_prefix=channel,
+            start_ns=start_ns,
+            end_ns=end_ns,
+            start_row=source['start_row'],
+            end_row=source['end_row'],
+            max_points=max_points
+        )
+
+    def get_session_window(self, session_id):
+        """Return the visible slice of one of a session's signals (accel by default, or gyro)"""
+        try:
+            try:
+                start_ns = request.args.get('start_ns', type=float)
+                end_ns = request.args.get('end_ns', type=float)
+                max_points = int(request.args.get('max_points', 4000))
+            except ValueError:
+                return jsonify({'error': 'start_ns, end_ns and max_points must be numeric'}), 400
+            if max_points < 2:
+                return jsonify({'error': 'max_points must be at least 2'}), 400
+            if start_ns is not None and end_ns is not None and start_ns > end_ns:
+                return jsonify({'error': 'start_ns must not be after end_ns'}), 400
+            channel = request.args.get('channel', 'accel')
+            if channel not in WINDOW_CHANNEL_FILES:
+                return jsonify({'error': f"channel must be one of {list(WINDOW_CHANNEL_FILES)}"}), 400
+
+            source, error = self._load_signal_source(session_id)
+            if error:
+                return error
+            csv_path = os.path.join(source['data_dir'], WINDOW_CHANNEL_FILES[channel])
+            if not os.path.exists(csv_path):
+                return jsonify({'error': f'No {channel} data found for session {session_id}'}), 404
+
+            # The window changes with the data file and with every query parameter
+            etag = _digest(signal_etag(csv_path, source), channel, start_ns, end_ns, max_points)
+            last_modified = signal_last_modified(csv_path)
+            response = not_modified(etag, last_modified)
+            if response is None:
+                df, bucket_rows = self._query_channel(source, csv_path, channel, start_ns, end_ns, max_points)
+                columns = ['ns_since_reboot', f'{channel}_x', f'{channel}_y', f'{channel}_z']
+                meta = {'channel': channel, 'bucket_rows': bucket_rows, 'start_ns': start_ns, 'end_ns': end_ns}
+                if wants_columnar_response():
+                    response = columnar_response(df, columns, meta)
+                else:
+                    response = jsonify({**meta, 'data': df[columns].to_dict(orient='records')})
+            return revalidated(response, etag, last_modified)
         except Exception as e:
-            print(f"Error retrieving session data: {e}")
+            logging.error(f"Error retrieving session window: {str(e)}")
+            logging.error(f"Stack trace: {traceback.format_exc()}")
             return jsonify({'error': f'Server error: {str(e)}'}), 500
 
     def get_session_metadata(self, session_name):
@@ -267,16 +400,11 @@ class SessionController:
                         end_offset=split_info['data_end_offset']
                     )
                 else:
-                    # Fallback for old virtual splits - filter by time range
-                    df = pd.read_csv(csv_path)
+                    # Fallback for old virtual splits - select this virtual split's data by time range
+                    df = load_signal_time_range(csv_path, session_info['start_ns'], session_info['stop_ns'])
                     if 'x' in df.columns:
                         df = df.rename(columns={'x': 'accel_x', 'y': 'accel_y', 'z': 'accel_z'})
                     
-                    # Filter by session time range to get only this virtual split's data
-                    start_ns = session_info['start_ns']
-                    stop_ns = session_info['stop_ns']
-                    df = df[(df['ns_since_reboot'] >= start_ns) & (df['ns_since_reboot'] <= stop_ns)]
-                    
                 # IMPORTANT: Reset index so split point calculations work correctly
                 # The split points are relative to the filtered dataframe, not the original
                 df = df.reset_index(drop=True)
@@ -286,94 +414,29 @@ class SessionController:
                 if not os.path.exists(csv_path):
                     return jsonify({'error': f'CSV file not found at {csv_path}'}), 404
                 
-                df = pd.read_csv(csv_path)
+                df = read_signal_csv(csv_path)
             expected_columns = ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']
             if not all(col in df.columns for col in expected_columns):
                 return jsonify({'error': f'Invalid CSV format. Expected columns: {expected_columns}, Found: {list(df.columns)}'}), 400
 
-            # Find split indices
-            split_points = sorted(set(float(p) for p in split_points))  # Ensure unique and sorted
-            split_indices = []
-            split_timestamps = []  # Store the actual timestamps at split points
-            for point in split_points:
-                df['time_diff'] = abs(df['ns_since_reboot'] - point)
-                split_index = df['time_diff'].idxmin()
-                if split_index == 0 or split_index == len(df) - 1:
-                    continue  # Skip points at start or end
-                split_indices.append(split_index)
-                split_timestamps.append(df.loc[split_index, 'ns_since_reboot'])
-            split_indices = sorted(set(split_indices))  # Ensure unique and sorted
-            split_timestamps = sorted(set(split_timestamps))  # Ensure unique and sorted
-
-            if not split_indices:
+            # Find the rows nearest each split point and cut the session there
+            ns = df['ns_since_reboot'].to_numpy()
+            split_indices = nearest_row_indices(ns, sorted(set(float(p) for p in split_points)))
+            split_indices = split_indices[(split_indices > 0) & (split_indices < len(df) - 1)]  # Skip points at start or end
+
+            if len(split_indices) == 0:
                 return jsonify({'error': 'No valid split points provided'}), 400
 
-            # Calculate virtual split segments with offsets
-            segment_offsets = []
-            start_idx = 0
-            for idx in split_indices:
-                if start_idx < idx:  # Only add if segment has data
-                    segment_offsets.append((start_idx, idx))
-                start_idx = idx
-            # Add final segment
-            if start_idx < len(df):
-                segment_offsets.append((start_idx, len(df)))
-
-            if len(segment_offsets) < 2:
+            # Calculate virtual split segments with offsets and time ranges
+            segments = split_segments(ns, split_indices)
+            if len(segments) < 2:
                 return jsonify({'error': 'Split would not create multiple valid recordings'}), 400
 
-            # Define time ranges for each segment
-            segment_ranges = []
-            for start_offset, end_offset in segment_offsets:
-                segment_df = df.iloc[start_offset:end_offset]
-                start_time = segment_df['ns_since_reboot'].min()
-                end_time = segment_df['ns_since_reboot'].max()
-                segment_ranges.append((start_time, end_time))
+            segment_offsets = [(segment['start_offset'], segment['end_offset']) for segment in segments]
+            segment_ranges = [(segment['start_ns'], segment['stop_ns']) for segment in segments]
             
-            # Assign bouts to segments based on time ranges
-            segment_bouts = [[] for _ in segment_ranges]
-            
-            for bout in parent_bouts:
-                """
-                Each bout is represented as a dictionary with 'start', 'end', and 'label' keys.
-
-                Example:
-                bout = {
-                    'start': 1234567890.0,
-                    'end': 1234567895.0,
-                    'label': 'smoking'
-                }
-
-                bout['start'] and bout['end'] are in ns_since_reboot format.
-                bout['label'] is a string representing the label of the bout.
-                """
-                bout_start = bout['start']
-                bout_end = bout['end']
-                bout_label = bout['label']
-
-                for i, (segment_start, segment_end) in enumerate(segment_ranges):
-                    # If bout is entirely within segment
-                    if segment_start <= bout_start <= segment_end and segment_start <= bout_end <= segment_end:
-                        segment_bouts[i].append(bout)
-                        break
-                    # If bout overlaps with segment start
-                    elif bout_start < segment_start and segment_start <= bout_end <= segment_end:
-                        # Adjust bout to start at segment boundary
-                        adjusted_bout = {'start': float(segment_start), 'end': float(bout_end), 'label': bout_label}
-                        segment_bouts[i].append(adjusted_bout)
-                        break
-                    # If bout overlaps with segment end
-                    elif segment_start <= bout_start <= segment_end and bout_end > segment_end:
-                        # Adjust bout to end at segment boundary
-                        adjusted_bout = {'start': float(bout_start), 'end': float(segment_end), 'label': bout_label}
-                        segment_bouts[i].append(adjusted_bout)
-                        break
-                    # If bout spans entire segment
-                    elif bout_start < segment_start and bout_end > segment_end:
-                        # Create a bout for the entire segment
-                        adjusted_bout = {'start': float(segment_start), 'end': float(segment_end), 'label': bout_label}
-                        segment_bouts[i].append(adjusted_bout)
-                        break
+            # Clip bouts to every segment they overlap
+            segment_bouts = assign_bouts_to_segments(segment_ranges, parent_bouts)
 
             # Pre-generate all unique names to avoid transaction conflicts
             generated_names = []
@@ -443,6 +506,12 @@ class SessionController:
             print(f"Error splitting session: {e}")
             return jsonify({'error': str(e)}), 500
 
+    def get_frame_cache_stats(self):
+        """Return the decoded session frame caches' usage and hit/miss/eviction counters"""
+        stats = frame_cache.stats()
+        stats['disk'] = disk_frame_cache.stats()
+        return jsonify(stats)
+
 controller = None
 
 def init_controller(project_service, session_service, model_service):
@@ -461,6 +530,18 @@ def score_session():
 def get_session_data(session_id):
     return controller.get_session_data(session_id)
 
+@sessions_bp.route('/api/session/<int:session_id>/signal')
+def get_session_signal(session_id):
+    return controller.get_session_signal(session_id)
+
+@sessions_bp.route('/api/session/<int:session_id>/bouts')
+def get_session_bouts(session_id):
+    return controller.get_session_bouts(session_id)
+
+@sessions_bp.route('/api/session/<int:session_id>/window')
+def get_session_window(session_id):
+    return controller.get_session_window(session_id)
+
 @sessions_bp.route('/api/session/<int:session_id>/metadata', methods=['PUT'])
 def update_session_metadata(session_id):
     return controller.update_session_metadata(session_id)
@@ -471,4 +552,8 @@ def get_session_metadata(session_name):
 
 @sessions_bp.route('/api/session/<int:session_id>/split', methods=['POST'])
 def split_session(session_id):
-    return controller.split_session(session_id)
\ No newline at end of file
+    return controller.split_session(session_id)
+
+@sessions_bp.route('/api/sessions/frame_cache')
+def get_frame_cache_stats():
+    return controller.get_frame_cache_stats()
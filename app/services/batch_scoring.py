@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import uuid
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# A batch scores many sessions with one loaded model. Its state (the sessions to
+# score and each one's result) is written to SCORING_BATCH_DIR after every session,
+# so a batch interrupted by a cancellation or a restart resumes where it stopped.
+SCORING_BATCH_DIR = os.path.join(os.path.expanduser(os.getenv('DATA_DIR', '~/.delta/data')), '.scoring_batches')
+# Sessions loaded ahead of the one being scored, overlapping file reads with inference
+BATCH_PREFETCH = int(os.getenv('BATCH_SCORING_PREFETCH', '1'))
+
+
+def new_batch_state(model_config, sessions, device, labeling_name):
+    """
+    Describe a batch before it runs.
+
+    Args:
+        model_config: Model configuration dictionary
+        sessions: Dicts with session_id, session_name and project_path, in scoring order
+        device: Target device ('cpu' or 'cuda')
+        labeling_name: Label given to the bouts found
+
+    Returns:
+        dict: Batch state with no results yet
+    """
+    return {
+        'batch_id': str(uuid.uuid4()),
+        'kind': 'batch',
+        'status': 'queued',
+        'model_id': model_config['id'],
+        'model_name': model_config['name'],
+        'device': device,
+        'labeling_name': labeling_name,
+        'sessions': [{'session_id': s['session_id'], 'session_name': s['session_name'], 'project_path': s['project_path']} for s in sessions],
+        'results': {},
+        'sessions_total': len(sessions),
+        'sessions_done': 0,
+        'sessions_failed': 0,
+        'bouts_count': 0,
+        'queued_time': time.time(),
+        'start_time': None,
+        'end_time': None,
+        'error': None
+    }
+
+
+def batch_state_path(batch_id, directory=None):
+    return os.path.join(directory or SCORING_BATCH_DIR, f'{batch_id}.json')
+
+
+def save_batch_state(state, directory=None):
+    """Write a batch's state atomically (temporary file, then rename)"""
+    path = batch_state_path(state['batch_id'], directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp_', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f, default=str)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_batch_state(batch_id, directory=None):
+    """Read a batch's saved state, or None if there is none"""
+    try:
+        # Batch IDs arrive in URLs; only UUIDs name state files
+        batch_id = str(uuid.UUID(batch_id))
+    except ValueError:
+        return None
+    try:
+        with open(batch_state_path(batch_id, directory)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def update_totals(state):
+    results = state['results'].values()
+    state['sessions_done'] = sum(1 for r in results if r['status'] == 'completed')
+    state['sessions_failed'] = sum(1 for r in results if r['status'] == 'error')
+    state['bouts_count'] = sum(r.get('bouts_count') or 0 for r in results)
+
+
+def run_batch(state, load, score, save, cancelled=None, directory=None, prefetch=BATCH_PREFETCH):
+    """
+    Score a batch's remaining sessions, loading upcoming sessions in a background
+    thread while the current one is scored.
+
+    Sessions already completed (when resuming) are skipped; failed ones are retried.
+    A failure is recorded against its session and the batch carries on.
+
+    Args:
+        state: Batch state from new_batch_state or load_batch_state; updated in place
+        load: Function (session) returning the session's data
+        score: Function (session, data) returning the bouts found
+        save: Function (session, bouts) storing them
+        cancelled: Optional Event; the batch stops before its next session once set
+        directory: Directory the state is saved to (defaults to SCORING_BATCH_DIR)
+        prefetch: Sessions loaded ahead of the one being scored
+
+    Returns:
+        dict: The batch state
+    """
+    pending = [s for s in state['sessions'] if state['results'].get(str(s['session_id']), {}).get('status') != 'completed']
+    state.update({'status': 'running', 'start_time': state['start_time'] or time.time(), 'end_time': None, 'error': None})
+    save_batch_state(state, directory)
+    logger.info(f"batch {state['batch_id']}: scoring {len(pending)} of {state['sessions_total']} sessions with model {state['model_name']}")
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='batch-prefetch') as loader:
+        loads = [loader.submit(load, session) for session in pending[:prefetch + 1]]
+        for i, session in enumerate(pending):
+            if cancelled is not None and cancelled.is_set():
+                for future in loads[i:]:
+                    future.cancel()
+                state['status'] = 'cancelled'
+                break
+            if i + prefetch + 1 < len(pending):
+                loads.append(loader.submit(load, pending[i + prefetch + 1]))
+
+            start = time.perf_counter()
+            try:
+                data = loads[i].result()
+                loads[i] = None
+                bouts = score(session, data)
+                save(session, bouts)
+                result = {'status': 'completed', 'bouts_count': len(bouts)}
+            except Exception as e:
+                logger.error(f"batch {state['batch_id']}: session {session['session_id']} failed: {e}")
+                result = {'status': 'error', 'error': str(e)}
+            result.update({'session_name': session['session_name'], 'seconds': round(time.perf_counter() - start, 3)})
+            state['results'][str(session['session_id'])] = result
+            update_totals(state)
+            save_batch_state(state, directory)
+        else:
+            state['status'] = 'completed'
+
+    state['end_time'] = time.time()
+    save_batch_state(state, directory)
+    logger.info(f"batch {state['batch_id']} {state['status']}: {state['sessions_done']} scored, {state['sessions_failed']} failed")
+    return state
@@ -0,0 +1,97 @@
+import numpy as np
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Model predictions are one value per sample; a bout is a run of consecutive samples
+# predicted positive (> 0), from the timestamp of its first sample to that of its
+# last. Runs are found with a diff over the positive mask rather than by walking
+# the samples, so extraction stays well below the cost of inference.
+
+
+def prediction_runs(positive):
+    """
+    Find runs of True in a boolean array.
+
+    Args:
+        positive: Boolean array
+
+    Returns:
+        tuple: (first, last) index arrays, inclusive, one entry per run
+    """
+    edges = np.diff(positive.astype(np.int8), prepend=0, append=0)
+    first = np.flatnonzero(edges == 1)
+    last = np.flatnonzero(edges == -1) - 1
+    return first, last
+
+
+def merge_close_runs(first, last, ns, max_gap_ns):
+    """
+    Merge runs separated by less than max_gap_ns, measured from the end of one run
+    to the start of the next.
+
+    Args:
+        first, last: Run bounds from prediction_runs
+        ns: Sample timestamps
+        max_gap_ns: Gaps shorter than this are closed
+
+    Returns:
+        tuple: Merged (first, last) index arrays
+    """
+    if len(first) < 2 or max_gap_ns <= 0:
+        return first, last
+    gaps = ns[first[1:]] - ns[last[:-1]]
+    # A run starts a merged bout unless the gap before it is short
+    starts_bout = np.concatenate([[True], gaps >= max_gap_ns])
+    ends_bout = np.concatenate([gaps >= max_gap_ns, [True]])
+    return first[starts_bout], last[ends_bout]
+
+
+def extract_bouts(ns, predictions, label='smoking', min_duration_ns=0, merge_gap_ns=0, confidence=None):
+    """
+    Turn per-sample predictions into bouts.
+
+    Predictions shorter than the timestamps are padded with negatives and longer
+    ones are truncated. Runs closer than merge_gap_ns are merged first, then bouts
+    shorter than min_duration_ns are dropped.
+
+    Args:
+        ns: Sample timestamps (ns_since_reboot); integer timestamps are kept as int64
+            so bounds stay exact above 2**53
+        predictions: Thresholded per-sample predictions; values > 0 are positive
+        label: Label given to every bout
+        min_duration_ns: Minimum end - start of a kept bout
+        merge_gap_ns: Runs separated by less than this are merged (0 keeps them apart)
+        confidence: Optional per-sample scores (e.g. probabilities); each bout then
+            carries the mean score over its samples as 'confidence'
+
+    Returns:
+        list: Bout dictionaries with integer 'start' and 'end' and the label
+    """
+    ns = np.asarray(ns)
+    ns = ns.astype(np.int64, copy=False) if np.issubdtype(ns.dtype, np.integer) else ns.astype(np.float64, copy=False)
+    predictions = np.asarray(predictions)
+    positive = np.zeros(len(ns), dtype=bool)
+    count = min(len(ns), len(predictions))
+    positive[:count] = predictions[:count] > 0
+
+    first, last = prediction_runs(positive)
+    raw_count = len(first)
+    first, last = merge_close_runs(first, last, ns, merge_gap_ns)
+    # Bounds are whole nanoseconds, and durations are measured between them; only
+    # the comparison with min_duration_ns is done in floating point
+    starts = ns[first].astype(np.int64)
+    ends = ns[last].astype(np.int64)
+    keep = (ends - starts) >= min_duration_ns
+    first, last = first[keep], last[keep]
+    starts, ends = starts[keep].tolist(), ends[keep].tolist()
+    logger.debug(f"extracted {len(first)} bouts from {raw_count} runs (min duration {min_duration_ns} ns, merge gap {merge_gap_ns} ns)")
+
+    if confidence is None:
+        return [{'start': start, 'end': end, 'label': label} for start, end in zip(starts, ends)]
+
+    scores = np.zeros(len(ns), dtype=np.float64)
+    scores[:min(len(ns), len(confidence))] = np.asarray(confidence, dtype=np.float64)[:len(ns)]
+    totals = np.concatenate([[0.0], np.cumsum(scores)])
+    means = ((totals[last + 1] - totals[first]) / (last - first + 1)).tolist()
+    return [{'start': start, 'end': end, 'label': label, 'confidence': mean} for start, end, mean in zip(starts, ends, means)]
@@ -0,0 +1,91 @@
+import numpy as np
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# A bout is a dictionary with 'start' and 'end' in ns_since_reboot and a 'label':
+#   {'start': 1234567890.0, 'end': 1234567895.0, 'label': 'smoking'}
+# Segments are closed [start_ns, stop_ns] ranges, as produced by session_splits.
+
+
+def clip_intervals(starts, ends, range_starts, range_ends):
+    """
+    Clip intervals to every range they overlap.
+
+    Intervals and ranges are closed, so touching endpoints count as overlap.
+
+    Args:
+        starts, ends: Interval bounds
+        range_starts, range_ends: Range bounds
+
+    Returns:
+        tuple: (interval index, range index, clipped start, clipped end) arrays with
+        one entry per overlapping pair, ordered by range and then by interval
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    range_starts = np.asarray(range_starts, dtype=np.float64)
+    range_ends = np.asarray(range_ends, dtype=np.float64)
+
+    if np.all(np.diff(range_starts) >= 0) and np.all(np.diff(range_ends) >= 0):
+        # Sorted ranges: each interval overlaps a contiguous run of them
+        first = np.searchsorted(range_ends, starts, side='left')
+        last = np.searchsorted(range_starts, ends, side='right') - 1
+        counts = np.maximum(last - first + 1, 0)
+        interval_index = np.repeat(np.arange(len(starts)), counts)
+        run_offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        range_index = np.repeat(first, counts) + run_offsets
+    else:
+        overlaps = (range_starts[:, None] <= ends[None, :]) & (range_ends[:, None] >= starts[None, :])
+        range_index, interval_index = np.nonzero(overlaps)
+
+    order = np.lexsort((interval_index, range_index))
+    interval_index = interval_index[order]
+    range_index = range_index[order]
+    clipped_starts = np.maximum(starts[interval_index], range_starts[range_index])
+    clipped_ends = np.minimum(ends[interval_index], range_ends[range_index])
+    return interval_index, range_index, clipped_starts, clipped_ends
+
+
+def assign_bouts_to_segments(segment_ranges, bouts, default_label='smoking'):
+    """
+    Clip each bout to every segment it overlaps.
+
+    A bout spanning several segments appears, clipped, in each of them. Other keys
+    of a bout are kept as they are.
+
+    Args:
+        segment_ranges: List of (start_ns, stop_ns) per segment
+        bouts: Parent bouts
+        default_label: Label for bouts that have none
+
+    Returns:
+        list: One list of bouts per segment
+    """
+    valid = []
+    for bout in bouts:
+        if not isinstance(bout, dict):
+            logger.warning(f"Invalid bout format: {bout}, expected dict")
+            continue
+        try:
+            start, end = float(bout.get('start')), float(bout.get('end'))
+        except (TypeError, ValueError):
+            logger.warning(f"Bout without numeric start/end skipped: {bout}")
+            continue
+        if not start <= end:
+            logger.warning(f"Bout with end before start skipped: {bout}")
+            continue
+        valid.append((bout, start, end))
+
+    segment_bouts = [[] for _ in segment_ranges]
+    if not valid or not segment_ranges:
+        return segment_bouts
+
+    range_starts, range_ends = zip(*segment_ranges)
+    bout_index, segment_index, clipped_starts, clipped_ends = clip_intervals(
+        [start for _, start, _ in valid], [end for _, _, end in valid], range_starts, range_ends
+    )
+    for i, segment, start, end in zip(bout_index.tolist(), segment_index.tolist(), clipped_starts.tolist(), clipped_ends.tolist()):
+        bout = valid[i][0]
+        segment_bouts[segment].append({**bout, 'start': start, 'end': end, 'label': bout.get('label', default_label)})
+    return segment_bouts
@@ -0,0 +1,138 @@
+import os
+import numpy as np
+import pandas as pd
+from app.logging_config import get_logger
+from app.services.signal_store import write_columns, read_header, open_columns, source_identity
+
+logger = get_logger(__name__)
+
+# A row index records the byte offset of every ROW_INDEX_STRIDE-th data row of a
+# signal CSV so a virtual split can seek close to its first row and parse only its
+# own rows. It is stored in the same columnar format as the signal sidecars.
+ROW_INDEX_EXTENSION = '.idx'
+ROW_INDEX_STRIDE = 1024
+SCAN_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def row_index_path(csv_path):
+    """Return the path of the row index that accompanies a signal CSV"""
+    return os.path.splitext(csv_path)[0] + ROW_INDEX_EXTENSION
+
+
+def _scan_row_offsets(csv_path, stride):
+    """
+    Find the byte offset of every stride-th data row and the total data row count.
+
+    Data row i starts right after the (i + 1)-th newline, the first newline ending
+    the header line. A newline at the very end of the file does not start a row.
+    """
+    file_size = os.path.getsize(csv_path)
+    offsets = []
+    newlines_seen = 0
+    position = 0
+    with open(csv_path, 'rb') as f:
+        while True:
+            chunk = f.read(SCAN_CHUNK_BYTES)
+            if not chunk:
+                break
+            newline_positions = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord('\n'))
+            # Row number started by each newline in this chunk (header newline starts row 0)
+            rows = newlines_seen + np.arange(len(newline_positions))
+            selected = (rows % stride) == 0
+            row_starts = position + newline_positions[selected] + 1
+            offsets.append(row_starts[row_starts < file_size])
+            newlines_seen += len(newline_positions)
+            position += len(chunk)
+
+    offsets = np.concatenate(offsets) if offsets else np.empty(0, dtype=np.int64)
+    with open(csv_path, 'rb') as f:
+        f.seek(max(file_size - 1, 0))
+        ends_with_newline = f.read(1) == b'\n'
+    num_rows = max(newlines_seen - (1 if ends_with_newline else 0), 0)
+    return offsets.astype(np.int64), num_rows
+
+
+def build_row_index(csv_path, stride=ROW_INDEX_STRIDE):
+    """
+    Scan a signal CSV and persist its row index next to it.
+
+    Args:
+        csv_path: Path of the signal CSV
+        stride: Number of rows between indexed offsets
+
+    Returns:
+        str: Path of the written index
+    """
+    source_size, source_mtime_ns = source_identity(csv_path)
+    offsets, num_data_rows = _scan_row_offsets(csv_path, stride)
+    path = row_index_path(csv_path)
+    write_columns(path, {'byte_offset': (offsets, '<i8')}, extra_header={
+        'stride': stride,
+        'num_data_rows': num_data_rows,
+        'source_size': source_size,
+        'source_mtime_ns': source_mtime_ns
+    })
+    logger.debug(f"Wrote row index {path} ({num_data_rows} rows, stride {stride})")
+    return path
+
+
+def load_row_index(csv_path):
+    """
+    Load a signal CSV's row index if it still matches the CSV on disk.
+
+    Returns:
+        tuple: (header dict, byte offsets array), or None when missing or stale
+    """
+    path = row_index_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        header = read_header(path)
+        if (header.get('source_size'), header.get('source_mtime_ns')) != source_identity(csv_path):
+            return None
+        return header, open_columns(path, header)['byte_offset']
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable row index {path}: {e}")
+        return None
+
+
+def get_row_index(csv_path):
+    """Return a valid row index for a signal CSV, building it on first access"""
+    index = load_row_index(csv_path)
+    if index is not None:
+        return index
+    try:
+        build_row_index(csv_path)
+    except Exception as e:
+        logger.warning(f"Could not build row index for {csv_path}: {e}")
+        return None
+    return load_row_index(csv_path)
+
+
+def read_csv_rows(csv_path, start_offset=None, end_offset=None, reader=pd.read_csv):
+    """
+    Parse data rows [start_offset, end_offset) of a signal CSV using its row index.
+
+    Seeks to the indexed row at or before start_offset and parses at most
+    stride - 1 rows more than requested, instead of scanning from the top of the file.
+    reader parses the rows, given the open file and pd.read_csv options.
+
+    Returns:
+        pandas.DataFrame, or None when no row index is available
+    """
+    index = get_row_index(csv_path)
+    if index is None:
+        return None
+    header, offsets = index
+    stride = header['stride']
+    num_data_rows = header['num_data_rows']
+
+    start = min(start_offset or 0, num_data_rows)
+    end = num_data_rows if end_offset is None else min(max(end_offset, start), num_data_rows)
+
+    with open(csv_path, 'rb') as f:
+        columns = pd.read_csv(f, nrows=0).columns
+        if start >= end:
+            return pd.DataFrame(columns=columns)
+        f.seek(int(offsets[start // stride]))
+        return reader(f, header=None, names=list(columns), skiprows=start % stride, nrows=end - start)
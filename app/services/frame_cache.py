@@ -0,0 +1,274 @@
+import os
+import time
+import inspect
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from app.logging_config import get_logger
+from app.services.signal_store import write_columns, read_header, open_columns, source_identity, SIGNAL_FILES, MERGED_STORE_NAME, SIDECAR_EXTENSION
+
+logger = get_logger(__name__)
+
+# Decoded session frames are kept in process so that opening, scoring and splitting
+# a session parse its files once. Entries are keyed by the loader, its arguments and
+# the size and mtime of the files it reads, so a rewritten file is never served from
+# the cache; least recently used frames are evicted to stay within the byte budget.
+FRAME_CACHE_MB = int(os.getenv('FRAME_CACHE_MB', '512'))
+
+# Behind the in-process cache, frames are shared between worker processes through a
+# directory of columnar files: any worker reuses a decode done by another. Files are
+# written to a temporary name and renamed into place, readers memory-map them, and
+# the least recently read files are removed beyond the size cap. Disabled (0) unless
+# configured, e.g. when several WSGI workers serve the same DATA_DIR.
+FRAME_DISK_CACHE_MB = int(os.getenv('FRAME_DISK_CACHE_MB', '0'))
+FRAME_DISK_CACHE_DIR = os.path.join(os.path.expanduser(os.getenv('DATA_DIR', '~/.delta/data')), '.frame_cache')
+# Temporary files older than this were left by a writer that died
+STALE_TEMP_SECONDS = 3600
+
+# With Copy-on-Write (always on from pandas 3) a modified frame gets its own data,
+# so cached frames can be handed out as shallow copies; otherwise they are copied
+COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
+
+class FrameCache:
+    """Thread-safe LRU cache of DataFrames bounded by their total memory use"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return a copy of the cached frame for key, or None"""
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+        # Callers may modify what they get back
+        return entry[0].copy(deep=not COPY_ON_WRITE)
+
+    def put(self, key, df):
+        """Cache a copy of df, evicting least recently used frames beyond the budget"""
+        size = int(df.memory_usage(index=True, deep=False).sum())
+        if size > self.max_bytes:
+            return
+        df = df.copy(deep=not COPY_ON_WRITE)
+        with self._lock:
+            if key in self._frames:
+                self.bytes -= self._frames.pop(key)[1]
+            self._frames[key] = (df, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._frames.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+            logger.debug(f"Frame cache holds {len(self._frames)} frames, {self.bytes / 1e6:.0f} MB")
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Counters and current usage of the cache"""
+        with self._lock:
+            return {
+                'entries': len(self._frames),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+class DiskFrameCache:
+    """LRU cache of DataFrames in a directory shared by processes, bounded by total file size"""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + SIDECAR_EXTENSION)
+
+    def get(self, key):
+        """Return the frame stored for key, or None"""
+        path = self._path(key)
+        try:
+            header = read_header(path)
+            if header.get('key') != repr(key):
+                raise KeyError(path)
+            columns = open_columns(path, header)
+            df = pd.DataFrame({name: np.array(values) for name, values in columns.items()})
+            # The modification time orders files for eviction
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            # Missing, evicted by another process meanwhile, or unreadable
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return df
+
+    def put(self, key, df):
+        """
+        Store a frame for key. Only frames of numeric columns over a default index
+        fit the columnar format; others are not stored.
+        """
+        if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+            return
+        if not all(dtype.kind in 'biuf' for dtype in df.dtypes):
+            return
+        if int(df.memory_usage(index=False, deep=False).sum()) > self.max_bytes:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            columns = {}
+            for name in df.columns:
+                values = df[name].to_numpy()
+                columns[str(name)] = (values, values.dtype.newbyteorder('<').str)
+            write_columns(self._path(key), columns, extra_header={'key': repr(key)})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not write frame to disk cache {self.directory}: {e}")
+            return
+        with self._lock:
+            self.writes += 1
+        self.cleanup()
+
+    def cleanup(self):
+        """Remove the least recently read files beyond the size cap, and stale temporary files"""
+        entries = []
+        now = time.time()
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+                if name.startswith('.tmp_'):
+                    if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                        os.remove(path)
+                elif name.endswith(SIDECAR_EXTENSION):
+                    entries.append((stat.st_mtime_ns, stat.st_size, path))
+            except OSError:
+                # Removed by another process meanwhile
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                with self._lock:
+                    self.evictions += 1
+            except OSError:
+                pass
+            total -= size
+
+    def stats(self):
+        """Counters and current usage of the cache directory"""
+        size = entries = 0
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(SIDECAR_EXTENSION) and not entry.name.startswith('.tmp_'):
+                    try:
+                        size += entry.stat().st_size
+                        entries += 1
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        with self._lock:
+            return {
+                'directory': self.directory,
+                'entries': entries,
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions
+            }
+
+
+frame_cache = FrameCache(FRAME_CACHE_MB * 1024 * 1024)
+disk_frame_cache = DiskFrameCache(FRAME_DISK_CACHE_DIR, FRAME_DISK_CACHE_MB * 1024 * 1024)
+
+
+def file_identity(path):
+    """Identity of a signal file: its path, size and mtime"""
+    return (os.path.abspath(path), *source_identity(path))
+
+
+def directory_identity(data_dir):
+    """Identity of the signal files and merged store in a session directory"""
+    paths = [os.path.join(data_dir, name) for name in [file_name for _, file_name in SIGNAL_FILES] + [MERGED_STORE_NAME]]
+    return tuple(file_identity(path) for path in paths if os.path.exists(path))
+
+
+def cached_frame(identify=file_identity, cache=None, disk_cache=None):
+    """
+    Serve a DataFrame loader from the frame cache, then the shared disk cache.
+
+    The loader's first argument is the file (or directory) it reads; identify maps it
+    to the key part that changes when the data does. Loads whose source cannot be
+    identified (e.g. a missing file) bypass the cache, and one-off reads whose frame
+    is not read again (upload preprocessing, pyramid builds) call wrapper.uncached.
+
+    Args:
+        identify: Function of the first argument returning a hashable identity
+        cache: FrameCache to use (defaults to the process-wide frame_cache)
+        disk_cache: DiskFrameCache to use (defaults to disk_frame_cache)
+    """
+    def decorator(loader):
+        signature = inspect.signature(loader)
+
+        @functools.wraps(loader)
+        def wrapper(*args, **kwargs):
+            memory = frame_cache if cache is None else cache
+            disk = disk_frame_cache if disk_cache is None else disk_cache
+            if memory.max_bytes <= 0 and disk.max_bytes <= 0:
+                return loader(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = list(bound.arguments.items())
+            try:
+                key = (loader.__qualname__, identify(arguments[0][1]), tuple(arguments[1:]))
+            except OSError:
+                return loader(*args, **kwargs)
+
+            df = memory.get(key) if memory.max_bytes > 0 else None
+            if df is not None:
+                return df
+            df = disk.get(key) if disk.max_bytes > 0 else None
+            if df is None:
+                df = loader(*args, **kwargs)
+                if disk.max_bytes > 0:
+                    disk.put(key, df)
+            if memory.max_bytes > 0:
+                memory.put(key, df)
+            return df
+        wrapper.uncached = loader
+        return wrapper
+    return decorator
@@ -1,16 +1,33 @@
 # app/services/model_processor.py
+import os
+import numpy as np
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Sessions longer than this many rows (2 h at 50 Hz) are fed to models that declare
+# a window_size or receptive_field in chunks of about this size, so memory for the
+# model's windowed input stays flat however long the session is (0 disables)
+STREAM_CHUNK_ROWS = int(os.getenv('MODEL_STREAM_CHUNK_ROWS', '360000'))
+
+def _stitch(stitched, values, rows, offset, start, end):
+    """Copy a chunk's values for session rows [start, end), found at offset in the chunk, into a session-length array"""
+    values = np.asarray(values).reshape(-1)
+    if stitched is None:
+        stitched = np.zeros(rows, dtype=values.dtype if values.dtype.kind in 'biuf' else np.float64)
+    kept = values[offset:offset + end - start]
+    stitched[start:start + len(kept)] = kept
+    return stitched
+
 class ModelProcessor:
     """
     Model processor that handles the delegation pattern for model processing.
     Provides a unified interface for preprocessing, running, and postprocessing data.
     """
     
-    def __init__(self, model_instance):
+    def __init__(self, model_instance, chunk_rows=None):
         self.model = model_instance
+        self.chunk_rows = STREAM_CHUNK_ROWS if chunk_rows is None else chunk_rows
         self._validate_model_interface()
     
     def _validate_model_interface(self):
@@ -31,18 +48,103 @@ class ModelProcessor:
                 f"See the model interface documentation for details."
             )
     
-    def process(self, data, device='cpu', threshold=None):
+    def streaming_layout(self):
+        """
+        Chunking a model allows, from the attributes it declares.
+
+        A model may declare window_size (rows per model input window) and
+        receptive_field (rows on either side of a sample that its prediction depends
+        on, defaulting to one window). Chunks and their context are whole windows,
+        so every chunk windows the data exactly as one pass over the session would.
+        Models that declare neither, or set streaming = False, are run in one pass.
+
+        Returns:
+            tuple: (chunk rows, context rows), or None to run in one pass
+        """
+        window_size = getattr(self.model, 'window_size', None)
+        receptive_field = getattr(self.model, 'receptive_field', None)
+        if self.chunk_rows <= 0 or getattr(self.model, 'streaming', True) is False:
+            return None
+        if not window_size and receptive_field is None:
+            return None
+        window_size = int(window_size or 1)
+        context = int(window_size if receptive_field is None else receptive_field)
+        # Round up to whole windows
+        chunk = -(-max(self.chunk_rows, window_size) // window_size) * window_size
+        context = -(-context // window_size) * window_size
+        return chunk, context
+
+    def has_confidence(self):
+        """Whether the model reports per-sample confidence through an optional confidence() method"""
+        return callable(getattr(self.model, 'confidence', None))
+
+    def process(self, data, device='cpu', threshold=None, with_confidence=False):
         """
         Process data through the complete model pipeline.
         
+        Long sessions are streamed through the model in overlapping chunks when
+        the model declares its window (see streaming_layout); shorter sessions and
+        other models get one pass.
+        
         Args:
             data: Raw session data (DataFrame or other format)
             device: Target device ('cpu' or 'cuda')
             threshold: Optional threshold for binary conversion. Passed to model's postprocess method.
+            with_confidence: Also return the model's per-sample confidence
             
         Returns:
-            Time-domain predictions ready for bout extraction
+            Time-domain predictions ready for bout extraction, or with
+            with_confidence a (predictions, confidence) tuple where confidence is
+            None for models without a confidence() method
         """
+        layout = self.streaming_layout() if hasattr(data, 'iloc') else None
+        if layout is not None and len(data) > layout[0]:
+            return self.process_streaming(data, device, threshold, *layout, with_confidence=with_confidence)
+        return self._process_once(data, device, threshold, with_confidence)
+
+    def process_streaming(self, data, device, threshold, chunk_rows, context_rows, with_confidence=False):
+        """
+        Feed a session through the model in chunks and stitch the predictions.
+
+        Each chunk of chunk_rows rows is passed with context_rows rows of the
+        session on either side; only the predictions for the chunk's own rows are
+        kept. Chunk bounds depend only on the session length, so results are
+        deterministic, and they match one pass whenever the model's predictions
+        depend on no more than context_rows rows on either side.
+
+        Args:
+            data: Session DataFrame
+            device: Target device ('cpu' or 'cuda')
+            threshold: Optional threshold passed to the model's postprocess method
+            chunk_rows: Rows predicted per chunk
+            context_rows: Rows of context on either side of a chunk
+            with_confidence: Also stitch and return the model's per-sample confidence
+
+        Returns:
+            numpy.ndarray: One prediction per row (0 where the model returned none),
+            or a (predictions, confidence) tuple as for process
+        """
+        rows = len(data)
+        chunks = -(-rows // chunk_rows)
+        logger.info(f"Streaming {rows} rows through the model in {chunks} chunks of {chunk_rows} (+{context_rows} context) rows")
+        stitched = None
+        stitched_confidence = None
+        for start in range(0, rows, chunk_rows):
+            end = min(start + chunk_rows, rows)
+            input_start = max(0, start - context_rows)
+            input_end = min(rows, end + context_rows)
+            chunk = data.iloc[input_start:input_end].reset_index(drop=True)
+            result = self._process_once(chunk, device, threshold, with_confidence)
+            predictions, confidence = result if with_confidence else (result, None)
+
+            stitched = _stitch(stitched, predictions, rows, start - input_start, start, end)
+            if confidence is not None:
+                stitched_confidence = _stitch(stitched_confidence, confidence, rows, start - input_start, start, end)
+        if with_confidence:
+            return stitched, stitched_confidence
+        return stitched
+
+    def _process_once(self, data, device='cpu', threshold=None, with_confidence=False):
         try:
             logger.info(f"Processing data through model on device: {device}, threshold: {threshold}")
             
@@ -64,7 +166,11 @@ class ModelProcessor:
                 time_domain_predictions = self.model.postprocess(raw_predictions, data)
             logger.debug("Prediction postprocessing completed")
             
-            return time_domain_predictions
+            if not with_confidence:
+                return time_domain_predictions
+            # Step 4: Per-sample confidence (e.g. probabilities) from models that provide it
+            confidence = self.model.confidence(raw_predictions, data) if self.has_confidence() else None
+            return time_domain_predictions, confidence
             
         except Exception as e:
             logger.error(f"Error in model processing pipeline: {e}")
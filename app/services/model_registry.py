@@ -0,0 +1,137 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from app.logging_config import get_logger
+from app.services.model_processor import ModelProcessor
+from app.services.frame_cache import file_identity
+
+logger = get_logger(__name__)
+
+# Loading a model imports its .py file, instantiates the class and reads its weights,
+# which costs more than scoring a short range with a small network. Ready processors
+# are kept per (model, device) and reused while the model's files are unchanged; the
+# least recently used are dropped beyond MODEL_CACHE_SIZE models or MODEL_CACHE_MB of
+# parameters and buffers.
+MODEL_CACHE_SIZE = int(os.getenv('MODEL_CACHE_SIZE', '4'))
+MODEL_CACHE_MB = int(os.getenv('MODEL_CACHE_MB', '2048'))
+
+
+def model_size_bytes(model, pt_file_path):
+    """Memory held by a model's parameters and buffers, or its weights file size for models that are not torch modules"""
+    if hasattr(model, 'parameters') and hasattr(model, 'buffers'):
+        try:
+            return sum(tensor.numel() * tensor.element_size() for tensors in (model.parameters(), model.buffers()) for tensor in tensors)
+        except (AttributeError, TypeError):
+            pass
+    return os.path.getsize(pt_file_path)
+
+
+class ModelRegistry:
+    """Thread-safe LRU cache of loaded models wrapped in ModelProcessors"""
+
+    def __init__(self, max_models, max_bytes):
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # One lock per key, so concurrent requests for a model load it once
+        self._load_locks = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+    def get(self, model_config, device, model_dir, loader):
+        """
+        Return a ready processor for a model on a device, loading it on first use
+        and again whenever its files change.
+
+        Args:
+            model_config: Model configuration dictionary (id, py_filename, pt_filename, class_name)
+            device: Target device ('cpu' or 'cuda')
+            model_dir: Directory holding the model files
+            loader: Function (model_config, device) returning the loaded model instance
+
+        Returns:
+            ModelProcessor: Processor wrapping the loaded model
+        """
+        key = (model_config['id'], device)
+        py_file_path = os.path.join(model_dir, model_config['py_filename'])
+        pt_file_path = os.path.join(model_dir, model_config['pt_filename'])
+        identity = (file_identity(py_file_path), file_identity(pt_file_path), model_config['class_name'])
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry['identity'] == identity:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    entry['uses'] += 1
+                    return entry['processor']
+                self.misses += 1
+                if entry is not None:
+                    # Files were replaced (or the class renamed) since the model was loaded
+                    self._remove(key)
+                    self.reloads += 1
+                    logger.info(f"model {model_config['id']} changed on disk, reloading on {device}")
+
+            start = time.perf_counter()
+            model = loader(model_config, device)
+            processor = ModelProcessor(model)
+            elapsed = time.perf_counter() - start
+            size = model_size_bytes(model, pt_file_path)
+            logger.info(f"loaded model {model_config['id']} on {device} in {elapsed * 1000:.0f} ms ({size / 1e6:.1f} MB)")
+
+            with self._lock:
+                self.load_seconds += elapsed
+                if self.max_models > 0 and size <= self.max_bytes:
+                    self._entries[key] = {'processor': processor, 'identity': identity, 'bytes': size, 'uses': 1,
+                                          'name': model_config.get('name'), 'loaded_at': time.time(), 'load_seconds': elapsed}
+                    self.bytes += size
+                    self._evict()
+            return processor
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry['bytes']
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_models or self.bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+            logger.debug(f"evicted model {key[0]} on {key[1]} from the registry")
+
+    def invalidate(self, model_id=None):
+        """Drop a model's loaded instances on every device, or all models"""
+        with self._lock:
+            for key in [key for key in self._entries if model_id is None or key[0] == model_id]:
+                self._remove(key)
+
+    def stats(self):
+        """Counters, current usage and the loaded models"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_models': self.max_models,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'reloads': self.reloads,
+                'evictions': self.evictions,
+                'load_seconds': round(self.load_seconds, 3),
+                'models': [
+                    {'model_id': model_id, 'device': device, 'name': entry['name'], 'bytes': entry['bytes'],
+                     'uses': entry['uses'], 'load_seconds': round(entry['load_seconds'], 3)}
+                    for (model_id, device), entry in self._entries.items()
+                ]
+            }
+
+
+model_registry = ModelRegistry(MODEL_CACHE_SIZE, MODEL_CACHE_MB * 1024 * 1024)
@@ -12,13 +12,39 @@ from app.repositories.session_repository import SessionRepository
 from app.exceptions import DatabaseError
 from app.logging_config import get_logger
 from app.services.model_processor import ModelProcessor
+from app.services.model_registry import model_registry as default_model_registry
+from app.services.scoring_scheduler import scoring_scheduler as default_scoring_scheduler, ScoringCancelled
+from app.services.bout_extraction import extract_bouts
+from app.services.batch_scoring import new_batch_state, load_batch_state, save_batch_state, run_batch
+from app.services.utils import load_session_signals, load_session_signals_time_range
 
 logger = get_logger(__name__)
 
+# Columns a model's preprocess() receives. Gyroscope axes are only added for
+# models whose settings opt in with use_gyro, so existing models keep their input.
+MODEL_INPUT_COLUMNS = ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']
+GYRO_INPUT_COLUMNS = ['gyro_x', 'gyro_y', 'gyro_z']
+
+def select_model_input(df, use_gyro=False):
+    """
+    Select the columns handed to a model, with int64 ns_since_reboot.
+
+    Args:
+        df: Session frame from load_session_signals
+        use_gyro: Also pass gyro_x/y/z when the session recorded a gyroscope
+
+    Returns:
+        pandas.DataFrame: ns_since_reboot and accel_x/y/z (plus gyro_x/y/z)
+    """
+    columns = MODEL_INPUT_COLUMNS + ([name for name in GYRO_INPUT_COLUMNS if name in df.columns] if use_gyro else [])
+    return df[columns].astype({'ns_since_reboot': 'int64'})
+
 class ModelService:
-    def __init__(self, session_repository=None, model_repository=None):
+    def __init__(self, session_repository=None, model_repository=None, model_registry=None, scoring_scheduler=None):
         self.session_repo: SessionRepository = session_repository
         self.model_repo = model_repository
+        self.model_registry = model_registry if model_registry is not None else default_model_registry
+        self.scoring_scheduler = scoring_scheduler if scoring_scheduler is not None else default_scoring_scheduler
         self.scoring_status = {}  # track scoring operations
         
         logger.info("model service initialized - no default models loaded")
@@ -166,6 +192,7 @@ class ModelService:
             
             if not updated_model:
                 return None
+            self.model_registry.invalidate(model_id)
             
             # format for json response with model_settings parsing
             import json
@@ -205,6 +232,7 @@ class ModelService:
                 return False
             
             self.model_repo.delete(model_id)
+            self.model_registry.invalidate(model_id)
             
             logger.info(f"deleted model {model_id}: {model['name']}")
             return True
@@ -248,7 +276,7 @@ class ModelService:
     # Data Processing Logic
     # =======================
 
-    def load_session_data(self, project_path, session_name, session_id=None):
+    def load_session_data(self, project_path, session_name, session_id=None, use_gyro=False):
         """
         Load session data supporting both regular and virtual split sessions
         
@@ -256,9 +284,10 @@ class ModelService:
             project_path: Path to the project directory
             session_name: Name of the session
             session_id: Session ID (required for virtual splits)
+            use_gyro: Include gyro_x/y/z when the session recorded a gyroscope
             
         Returns:
-            pandas.DataFrame: Session data with proper column naming
+            pandas.DataFrame: Model input as selected by select_model_input
         """
         try:
             # Check if this is a virtual split session
@@ -266,13 +295,9 @@ class ModelService:
                 split_info = self.session_repo.get_session_split_info(session_id)
                 if split_info and split_info['parent_data_path']:
                     # Virtual split session - load from parent with offsets
-                    csv_path = f"{split_info['parent_data_path']}/accelerometer_data.csv"
-                    logger.info(f"Loading virtual split session data from: {csv_path} (offsets: {split_info['data_start_offset']}-{split_info['data_end_offset']})")
-                    
-                    from app.services.utils import load_dataframe_from_csv
-                    df = load_dataframe_from_csv(
-                        csv_path, 
-                        column_prefix='accel',
+                    logger.info(f"Loading virtual split session data from: {split_info['parent_data_path']} (offsets: {split_info['data_start_offset']}-{split_info['data_end_offset']})")
+                    df = load_session_signals(
+                        split_info['parent_data_path'],
                         start_offset=split_info['data_start_offset'],
                         end_offset=split_info['data_end_offset']
                     )
@@ -282,30 +307,27 @@ class ModelService:
                     sample_rate = 1 / sample_interval
                     logger.info(f"loaded virtual split session data: {len(df)} rows at {sample_rate:.1f} Hz")
                     
-                    return df
-            
-            # Regular session - load from session directory
-            csv_path = f"{project_path}/{session_name}/accelerometer_data.csv"
-            logger.info(f"Loading session data from: {csv_path}")
+                    return select_model_input(df, use_gyro)
             
-            df = pd.read_csv(csv_path)
+            # Regular session - load from session directory; offset 0 selects every
+            # row (a load without offsets drops the last one, as for raw uploads)
+            data_dir = f"{project_path}/{session_name}"
+            logger.info(f"Loading session data from: {data_dir}")
             
-            # Ensure proper column naming
-            if 'x' in df.columns:
-                df = df.rename(columns={'x': 'accel_x', 'y': 'accel_y', 'z': 'accel_z'})
+            df = load_session_signals(data_dir, start_offset=0)
             
             # Calculate sample rate for logging
             sample_interval = df['ns_since_reboot'].diff().median() * 1e-9
             sample_rate = 1 / sample_interval
             logger.info(f"loaded session data: {len(df)} rows at {sample_rate:.1f} Hz")
             
-            return df
+            return select_model_input(df, use_gyro)
             
         except Exception as e:
             logger.error(f"error loading session data: {e}")
             raise DatabaseError(f'failed to load session data: {str(e)}')
         
-    def load_range_data(self, project_path, session_name, start_ns, end_ns, session_id=None):
+    def load_range_data(self, project_path, session_name, start_ns, end_ns, session_id=None, use_gyro=False):
         """
         Load session data with range filtering, supporting virtual splits
         
@@ -315,9 +337,10 @@ class ModelService:
             start_ns: Start timestamp for range filtering
             end_ns: End timestamp for range filtering
             session_id: Session ID (required for virtual splits)
+            use_gyro: Include gyro_x/y/z when the session recorded a gyroscope
             
         Returns:
-            pandas.DataFrame: Session data with proper column naming
+            pandas.DataFrame: Session data as returned by load_session_data
         """
         try:
             # Check if this is a virtual split session
@@ -325,13 +348,9 @@ class ModelService:
                 split_info = self.session_repo.get_session_split_info(session_id)
                 if split_info and split_info['parent_data_path']:
                     # Virtual split session - load from parent with offsets
-                    csv_path = f"{split_info['parent_data_path']}/accelerometer_data.csv"
-                    logger.info(f"Loading virtual split session range data from: {csv_path} (offsets: {split_info['data_start_offset']}-{split_info['data_end_offset']})")
-                    
-                    from app.services.utils import load_dataframe_from_csv
-                    df = load_dataframe_from_csv(
-                        csv_path, 
-                        column_prefix='accel',
+                    logger.info(f"Loading virtual split session range data from: {split_info['parent_data_path']} (offsets: {split_info['data_start_offset']}-{split_info['data_end_offset']})")
+                    df = load_session_signals(
+                        split_info['parent_data_path'],
                         start_offset=split_info['data_start_offset'],
                         end_offset=split_info['data_end_offset']
                     )
@@ -345,37 +364,27 @@ class ModelService:
                     filtered_df = df[(df['ns_since_reboot'] >= start_ns) & (df['ns_since_reboot'] <= end_ns)]
                     logger.info(f"filtered to range [{start_ns}, {end_ns}]: {len(filtered_df)} rows")
                     
-                    return filtered_df
-            
-            # Regular session - load from session directory
-            csv_path = f"{project_path}/{session_name}/accelerometer_data.csv"
-            logger.info(f"Loading session data from: {csv_path}")
+                    return select_model_input(filtered_df, use_gyro)
             
-            df = pd.read_csv(csv_path)
+            # Regular session - load only the requested range from the session directory
+            data_dir = f"{project_path}/{session_name}"
+            logger.info(f"Loading session range data from: {data_dir}")
             
-            # Ensure proper column naming
-            if 'x' in df.columns:
-                df = df.rename(columns={'x': 'accel_x', 'y': 'accel_y', 'z': 'accel_z'})
+            df = load_session_signals_time_range(data_dir, start_ns, end_ns)
             
-            # Calculate sample rate for logging
-            sample_interval = df['ns_since_reboot'].diff().median() * 1e-9
-            sample_rate = 1 / sample_interval
-            logger.info(f"loaded session data: {len(df)} rows at {sample_rate:.1f} Hz")
-            
-            # Filter by range
-            df = df[(df['ns_since_reboot'] >= start_ns) & (df['ns_since_reboot'] <= end_ns)]
+            logger.info(f"loaded session range data [{start_ns}, {end_ns}]: {len(df)} rows")
 
             if df.empty:
                 logger.warning(f"no data found in range {start_ns} to {end_ns} for session {session_name}")
                 return pd.DataFrame(columns=['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z', 'y_pred'])
             
-            return df
+            return select_model_input(df, use_gyro)
             
         except Exception as e:
             logger.error(f"error loading session data: {e}")
             raise DatabaseError(f'failed to load session data: {str(e)}')
 
-    def _extract_bouts_from_predictions(self, df, predictions, labeling_name, min_duration_sec=0.25):
+    def _extract_bouts_from_predictions(self, df, predictions, labeling_name, min_duration_sec=0.25, merge_gap_sec=0, confidence=None):
         """
         Extract bouts from prediction timeline
         
@@ -384,69 +393,25 @@ class ModelService:
             predictions: Model predictions (already thresholded binary values)
             labeling_name: Name for the labeling (None to use no label - append to current)
             min_duration_sec: Minimum bout duration in seconds
+            merge_gap_sec: Bouts separated by less than this many seconds are merged
+            confidence: Optional per-sample model confidence; bouts then carry its mean
             
         Returns:
             list: List of bout dictionaries
         """
         try:
-            # Add predictions to dataframe with configurable threshold
-            if len(predictions) < len(df):
-                # Extend predictions if needed
-                extended_predictions = np.concatenate([
-                    predictions, 
-                    np.zeros(len(df) - len(predictions))
-                ])
-                df = df.copy()
-                df['y_pred'] = extended_predictions
-            else:
-                df = df.copy()
-                df['y_pred'] = predictions[:len(df)]
-
-            # Extract bouts (predictions are already thresholded by processor)
-            smoking_bouts = []
-            current_bout = None
-            
-            for i in range(len(df)):
-                if df['y_pred'].iloc[i] > 0:  # Already binary from processor
-                    if current_bout is None:
-                        current_bout = [int(df['ns_since_reboot'].iloc[i]), None]
-                    current_bout[1] = int(df['ns_since_reboot'].iloc[i])
-                else:
-                    if current_bout is not None:
-                        smoking_bouts.append(current_bout)
-                        current_bout = None
-
-            # Close any open bout
-            if current_bout is not None:
-                smoking_bouts.append(current_bout)
-
-            # Filter by minimum duration and format as dictionaries
-            min_duration_ns = min_duration_sec * 1e9
             label = labeling_name or "smoking"
+            min_duration_ns = min_duration_sec * 1e9
+            logger.info(f"Filtering bouts: min_duration_sec={min_duration_sec}, merge_gap_sec={merge_gap_sec}")
             
-            logger.info(f"Filtering bouts: min_duration_sec={min_duration_sec}, min_duration_ns={min_duration_ns}")
-            logger.info(f"Found {len(smoking_bouts)} raw bouts before filtering")
-            
-            filtered_bouts = [
-                {
-                    'start': bout[0],
-                    'end': bout[1], 
-                    'label': label
-                }
-                for bout in smoking_bouts 
-                if ((bout[1] - bout[0]) >= min_duration_ns)
-            ]
-            
-            # Log some debug info about filtering
-            if len(smoking_bouts) > 0:
-                durations = [(bout[1] - bout[0]) / 1e9 for bout in smoking_bouts]
-                logger.info(f"Bout durations (seconds): {durations[:10]}...")  # Show first 10
-                logger.info(f"Min required duration: {min_duration_sec}s ({min_duration_ns}ns)")
-            
-            logger.info(f"extracted {len(filtered_bouts)} bouts with label: {label} "
-                       f"(filtered from {len(smoking_bouts)} raw bouts)")
+            bouts = extract_bouts(
+                df['ns_since_reboot'].to_numpy(), predictions, label,
+                min_duration_ns=min_duration_ns, merge_gap_ns=merge_gap_sec * 1e9,
+                confidence=confidence
+            )
             
-            return filtered_bouts
+            logger.info(f"extracted {len(bouts)} bouts with label: {label}")
+            return bouts
             
         except Exception as e:
             logger.error(f"error extracting bouts: {e}")
@@ -532,6 +497,24 @@ class ModelService:
                 del sys.modules[module_name]
             raise
 
+    def _get_model_processor(self, model_config, device):
+        """
+        Get a ready processor for a model from the registry, loading the model only
+        on first use or after its files changed
+        
+        Args:
+            model_config: Model configuration dictionary
+            device: Target device ('cpu' or 'cuda')
+            
+        Returns:
+            ModelProcessor wrapping the loaded model
+        """
+        return self.model_registry.get(model_config, device, self._get_model_dir(), self._load_model_instance)
+
+    def get_model_cache_stats(self):
+        """get counters and contents of the loaded model registry"""
+        return self.model_registry.stats()
+
     def _save_bouts_to_session(self, session_id, bouts):
         """
         Save bouts to session in database
@@ -561,7 +544,7 @@ class ModelService:
     #   Worker 
     # =======================
 
-    def _score_session_worker(self, scoring_id, project_path, session_name, session_id, model_config, device='cpu', append_to_current=True, current_labeling_name=None):
+    def _score_session_worker(self, scoring_id, project_path, session_name, session_id, model_config, device='cpu', append_to_current=True, current_labeling_name=None, cancelled=None):
         """
         Unified worker function that handles both CPU and GPU scoring through delegation
         
@@ -572,29 +555,33 @@ class ModelService:
             session_id: Database session ID
             model_config: Model configuration dictionary
             device: Target device ('cpu' or 'cuda')
+            cancelled: Optional Event set when the scoring is cancelled; checked between steps
         """
         try:
             device_label = device.upper()
             logger.info(f"{device_label} scoring session {scoring_id} with model {model_config['name']}")
 
-            # Step 1: Load session data (supports virtual splits)
-            data = self.load_session_data(project_path, session_name, session_id)
+            # Step 1: Load session data (supports virtual splits); the model sees the
+            # gyroscope only when its settings opt in
+            model_settings = model_config.get('model_settings') or {}
+            data = self.load_session_data(project_path, session_name, session_id, use_gyro=model_settings.get('use_gyro', False))
 
             # Step 2: Get model settings or use defaults
-            model_settings = model_config.get('model_settings', {})
             threshold = model_settings.get('threshold', 0.5)
             min_bout_duration_ns = model_settings.get('min_bout_duration_ns', 250000000)  # 0.25 seconds
             min_bout_duration_sec = min_bout_duration_ns / 1e9
+            merge_gap_sec = model_settings.get('merge_gap_ns', 0) / 1e9  # 0 keeps bouts apart
             
             logger.info(f"Model config model_settings: {model_config.get('model_settings')}")
             logger.info(f"Using model settings: threshold={threshold}, min_bout_duration_ns={min_bout_duration_ns}, min_bout_duration_sec={min_bout_duration_sec}")
             
-            # Step 3: Load and wrap model with processor
-            model_instance = self._load_model_instance(model_config, device)
-            processor = ModelProcessor(model_instance)
+            # Step 3: Get the loaded model, wrapped with its processor
+            self._check_cancelled(cancelled)
+            processor = self._get_model_processor(model_config, device)
             
             # Step 4: Process through model pipeline with custom threshold
-            time_domain_predictions = processor.process(data, device, threshold)
+            self._check_cancelled(cancelled)
+            time_domain_predictions, confidence = processor.process(data, device, threshold, with_confidence=True)
             
             # Step 5: Extract bouts from predictions using model settings
             if append_to_current:
@@ -603,10 +590,11 @@ class ModelService:
                 labeling_name = model_config['name']
             
             bouts = self._extract_bouts_from_predictions(
-                data, time_domain_predictions, labeling_name, min_bout_duration_sec
+                data, time_domain_predictions, labeling_name, min_bout_duration_sec, merge_gap_sec, confidence
             )
             
-            # Step 6: Save bouts to database
+            # Step 6: Save bouts to database (the last point a cancellation takes effect)
+            self._check_cancelled(cancelled)
             self._save_bouts_to_session(session_id, bouts)
             
             # Update status on completion
@@ -619,6 +607,12 @@ class ModelService:
             
             logger.info(f"{device_label} scoring completed successfully for {scoring_id}")
             
+        except ScoringCancelled:
+            logger.info(f"{device.upper()} scoring {scoring_id} cancelled")
+            self.scoring_status[scoring_id].update({
+                'status': 'cancelled',
+                'end_time': time.time()
+            })
         except Exception as e:
             logger.error(f"error during {device.upper()} scoring {scoring_id}: {e}")
             self.scoring_status[scoring_id].update({
@@ -631,7 +625,7 @@ class ModelService:
             if device == 'cuda':
                 torch.cuda.empty_cache()
 
-    def _score_range_worker(self, scoring_id, project_path, session_name, session_id, model_config, start_ns, end_ns, device='cpu', append_to_current=True, current_labeling_name=None):
+    def _score_range_worker(self, scoring_id, project_path, session_name, session_id, model_config, start_ns, end_ns, device='cpu', append_to_current=True, current_labeling_name=None, cancelled=None):
         """
         Unified worker function that handles both CPU and GPU scoring through delegation
         
@@ -642,29 +636,33 @@ class ModelService:
             session_id: Database session ID
             model_config: Model configuration dictionary
             device: Target device ('cpu' or 'cuda')
+            cancelled: Optional Event set when the scoring is cancelled; checked between steps
         """
         try:
             device_label = device.upper()
             logger.info(f"{device_label} scoring session {scoring_id} with model {model_config['name']}")
 
-            # Step 1: Load session data (supports virtual splits)
-            data = self.load_range_data(project_path, session_name, start_ns, end_ns, session_id)
+            # Step 1: Load session data (supports virtual splits); the model sees the
+            # gyroscope only when its settings opt in
+            model_settings = model_config.get('model_settings') or {}
+            data = self.load_range_data(project_path, session_name, start_ns, end_ns, session_id, use_gyro=model_settings.get('use_gyro', False))
             
             # Step 2: Get model settings or use defaults
-            model_settings = model_config.get('model_settings', {})
             threshold = model_settings.get('threshold', 0.5)
             min_bout_duration_ns = model_settings.get('min_bout_duration_ns', 250000000)  # 0.25 seconds
             min_bout_duration_sec = min_bout_duration_ns / 1e9
+            merge_gap_sec = model_settings.get('merge_gap_ns', 0) / 1e9  # 0 keeps bouts apart
             
             logger.info(f"Model config model_settings: {model_config.get('model_settings')}")
             logger.info(f"Using model settings: threshold={threshold}, min_bout_duration_ns={min_bout_duration_ns}, min_bout_duration_sec={min_bout_duration_sec}")
             
-            # Step 3: Load and wrap model with processor
-            model_instance = self._load_model_instance(model_config, device)
-            processor = ModelProcessor(model_instance)
+            # Step 3: Get the loaded model, wrapped with its processor
+            self._check_cancelled(cancelled)
+            processor = self._get_model_processor(model_config, device)
             
             # Step 4: Process through model pipeline with custom threshold
-            time_domain_predictions = processor.process(data, device, threshold)
+            self._check_cancelled(cancelled)
+            time_domain_predictions, confidence = processor.process(data, device, threshold, with_confidence=True)
             
             # Step 5: Extract bouts from predictions using model settings
             if append_to_current:
@@ -673,10 +671,11 @@ class ModelService:
                 labeling_name = model_config['name']
             
             bouts = self._extract_bouts_from_predictions(
-                data, time_domain_predictions, labeling_name, min_bout_duration_sec
+                data, time_domain_predictions, labeling_name, min_bout_duration_sec, merge_gap_sec, confidence
             )
             
-            # Step 6: Save bouts to database
+            # Step 6: Save bouts to database (the last point a cancellation takes effect)
+            self._check_cancelled(cancelled)
             self._save_bouts_to_session(session_id, bouts)
             
             # Update status on completion
@@ -689,6 +688,12 @@ class ModelService:
             
             logger.info(f"{device_label} scoring completed successfully for {scoring_id}")
             
+        except ScoringCancelled:
+            logger.info(f"{device.upper()} scoring {scoring_id} cancelled")
+            self.scoring_status[scoring_id].update({
+                'status': 'cancelled',
+                'end_time': time.time()
+            })
         except Exception as e:
             logger.error(f"error during {device.upper()} scoring {scoring_id}: {e}")
             self.scoring_status[scoring_id].update({
@@ -743,60 +748,208 @@ class ModelService:
             raise DatabaseError(f'failed to start scoring: {str(e)}')
 
     def score_session_async_with_model(self, project_path, session_name, session_id, model_config, device='cpu', append_to_current=True, current_labeling_name=None):
-        """start async scoring with specific model configuration and device"""
-        scoring_id = str(uuid.uuid4())
-        device_label = device.upper()
-
-        # Initialize status tracking
-        self.scoring_status[scoring_id] = {
-            'status': 'running',
-            'session_id': session_id,
-            'session_name': session_name,
-            'model_id': model_config['id'],
-            'model_name': model_config['name'],
-            'device': device,
-            'start_time': time.time(),
-            'error': None
-        }
-        
-        # Start async processing using unified worker
-        scoring_thread = threading.Thread(
-            target=self._score_session_worker,  
-            args=(scoring_id, project_path, session_name, session_id, model_config, device, append_to_current, current_labeling_name)
+        """queue async scoring of a full session with specific model configuration and device"""
+        return self._queue_scoring(
+            session_id, session_name, model_config, device,
+            lambda scoring_id, cancelled: self._score_session_worker(
+                scoring_id, project_path, session_name, session_id, model_config, device, append_to_current, current_labeling_name, cancelled
+            )
         )
-        scoring_thread.daemon = True
-        scoring_thread.start()
-        
-        logger.info(f"started {device_label} scoring thread for {scoring_id}")
-        return scoring_id
     
     def score_range_async_with_model(self, project_path, session_name, session_id, model_config, start_ns, end_ns, device='cpu', append_to_current=True, current_labeling_name=None):
-        """start async scoring with specific model configuration and device"""
+        """queue async scoring of a session range with specific model configuration and device"""
+        return self._queue_scoring(
+            session_id, session_name, model_config, device,
+            lambda scoring_id, cancelled: self._score_range_worker(
+                scoring_id, project_path, session_name, session_id, model_config, start_ns, end_ns, device, append_to_current, current_labeling_name, cancelled
+            )
+        )
+
+    def _queue_scoring(self, session_id, session_name, model_config, device, worker):
+        """
+        Queue a scoring job on the scoring scheduler and track its status
+        
+        Args:
+            session_id: Database session ID
+            session_name: Name of the session
+            model_config: Model configuration dictionary
+            device: Target device ('cpu' or 'cuda')
+            worker: Function (scoring_id, cancelled) doing the scoring
+            
+        Returns:
+            str: The scoring ID
+        """
         scoring_id = str(uuid.uuid4())
-        device_label = device.upper()
 
         # Initialize status tracking
         self.scoring_status[scoring_id] = {
-            'status': 'running',
+            'status': 'queued',
             'session_id': session_id,
             'session_name': session_name,
             'model_id': model_config['id'],
             'model_name': model_config['name'],
             'device': device,
-            'start_time': time.time(),
+            'queued_time': time.time(),
+            'start_time': None,
             'error': None
         }
+
+        def on_start():
+            self.scoring_status[scoring_id].update({'status': 'running', 'start_time': time.time()})
+
+        position = self.scoring_scheduler.submit(scoring_id, device, lambda cancelled: worker(scoring_id, cancelled), on_start=on_start)
+        logger.info(f"queued {device.upper()} scoring {scoring_id} at position {position}")
+        return scoring_id
+
+    def score_batch_with_model(self, model_id, project_id=None, session_ids=None, device='cpu', append_to_current=True, current_labeling_name=None):
+        """
+        Queue scoring of a project's sessions (or listed sessions) with one model,
+        loaded once for the whole batch
         
-        # Start async processing using unified worker
-        scoring_thread = threading.Thread(
-            target=self._score_range_worker,  
-            args=(scoring_id, project_path, session_name, session_id, model_config, start_ns, end_ns, device, append_to_current, current_labeling_name)
-        )
-        scoring_thread.daemon = True
-        scoring_thread.start()
+        Args:
+            model_id: ID of the model to use
+            project_id: Project whose visible sessions to score
+            session_ids: Optional explicit list of session IDs, instead of a project
+            device: Target device ('cpu' or 'cuda')
+            append_to_current: Label bouts with the current labeling instead of the model name
+            current_labeling_name: Name of the current labeling
+            
+        Returns:
+            dict: batch_id (also usable as a scoring ID) and the number of sessions
+        """
+        try:
+            if device not in ['cpu', 'cuda']:
+                raise ValueError('device must be either "cpu" or "cuda"')
+            if device == 'cuda' and not self.is_gpu_available():
+                raise RuntimeError('GPU is not available on this system')
+            if project_id is None and not session_ids:
+                raise ValueError('a project_id or session_ids is required')
+
+            model_config = self.get_model_by_id(model_id)
+            if not model_config:
+                raise DatabaseError(f'model {model_id} not found')
+            self._validate_model_files(model_config)
+
+            sessions = self.session_repo.get_scoring_targets(project_id=project_id, session_ids=session_ids)
+            if not sessions:
+                raise DatabaseError('no sessions to score')
+
+            labeling_name = (current_labeling_name or "smoking") if append_to_current else model_config['name']
+            state = new_batch_state(model_config, sessions, device, labeling_name)
+            self._queue_batch(state)
+            return {'batch_id': state['batch_id'], 'sessions_total': state['sessions_total']}
+
+        except Exception as e:
+            logger.error(f"error starting batch scoring with model {model_id}: {e}")
+            raise DatabaseError(f'failed to start batch scoring: {str(e)}')
+
+    def resume_batch_scoring(self, batch_id):
+        """
+        Queue an interrupted or cancelled batch again; sessions it already scored are skipped
         
-        logger.info(f"started {device_label} scoring thread for {scoring_id}")
-        return scoring_id
+        Args:
+            batch_id: ID of the batch
+            
+        Returns:
+            dict: batch_id and the number of sessions left, or None if the batch is unknown
+        """
+        state = load_batch_state(batch_id)
+        if state is None:
+            return None
+        current = self.scoring_status.get(batch_id)
+        if current is not None and current['status'] in ('queued', 'running'):
+            raise DatabaseError(f'batch {batch_id} is still {current["status"]}')
+        if state['status'] == 'completed' and state['sessions_failed'] == 0:
+            return {'batch_id': batch_id, 'sessions_remaining': 0}
+
+        state['status'] = 'queued'
+        self._queue_batch(state)
+        return {'batch_id': batch_id, 'sessions_remaining': state['sessions_total'] - state['sessions_done']}
+
+    def _queue_batch(self, state):
+        """Track a batch's state as its scoring status and queue it on the scoring scheduler"""
+        batch_id = state['batch_id']
+        self.scoring_status[batch_id] = state
+        # Saved before it runs, so a cancellation or restart while it waits is on disk too
+        self._save_batch_state(state)
+        self.scoring_scheduler.submit(batch_id, state['device'], lambda cancelled: self._score_batch_worker(state, cancelled))
+        logger.info(f"queued batch {batch_id}: {state['sessions_total']} sessions with model {state['model_name']}")
+
+    def _score_batch_worker(self, state, cancelled):
+        """
+        Score a batch's sessions with one loaded model, reading the next session
+        while the current one is scored
+        
+        Args:
+            state: Batch state; updated in place with per-session results
+            cancelled: Event set when the batch is cancelled; checked between sessions
+        """
+        device = state['device']
+        try:
+            model_config = self.get_model_by_id(state['model_id'])
+            if not model_config:
+                raise DatabaseError(f"model {state['model_id']} not found")
+            model_settings = model_config.get('model_settings') or {}
+            threshold = model_settings.get('threshold', 0.5)
+            min_bout_duration_sec = model_settings.get('min_bout_duration_ns', 250000000) / 1e9
+            merge_gap_sec = model_settings.get('merge_gap_ns', 0) / 1e9
+            processor = self._get_model_processor(model_config, device)
+
+            def load(session):
+                return self.load_session_data(session['project_path'], session['session_name'], session['session_id'], use_gyro=model_settings.get('use_gyro', False))
+
+            def score(session, data):
+                predictions, confidence = processor.process(data, device, threshold, with_confidence=True)
+                return self._extract_bouts_from_predictions(data, predictions, state['labeling_name'], min_bout_duration_sec, merge_gap_sec, confidence)
+
+            def save(session, bouts):
+                self._save_bouts_to_session(session['session_id'], bouts)
+
+            run_batch(state, load, score, save, cancelled)
+            
+        except Exception as e:
+            logger.error(f"error during batch scoring {state['batch_id']}: {e}")
+            state.update({'status': 'error', 'error': str(e), 'end_time': time.time()})
+            self._save_batch_state(state)
+        finally:
+            if device == 'cuda':
+                torch.cuda.empty_cache()
+
+    def _save_batch_state(self, state):
+        """Persist a batch's state; a failed write is logged, the in-memory status stays current"""
+        try:
+            save_batch_state(state)
+        except OSError as e:
+            logger.error(f"could not save state of batch {state['batch_id']}: {e}")
+
+    def _check_cancelled(self, cancelled):
+        if cancelled is not None and cancelled.is_set():
+            raise ScoringCancelled()
+
+    def cancel_scoring(self, scoring_id):
+        """
+        Cancel a queued or running scoring operation
+        
+        Args:
+            scoring_id: ID of the scoring operation
+            
+        Returns:
+            dict: Updated scoring status, or None if the scoring ID is unknown
+        """
+        if scoring_id not in self.scoring_status:
+            return None
+        outcome = self.scoring_scheduler.cancel(scoring_id)
+        if outcome == 'cancelled':
+            status = self.scoring_status[scoring_id]
+            status.update({'status': 'cancelled', 'end_time': time.time()})
+            if status.get('kind') == 'batch':
+                # Otherwise a restart would report the queued batch as interrupted
+                self._save_batch_state(status)
+        elif outcome == 'cancelling':
+            # The worker stops at its next checkpoint and records 'cancelled'
+            self.scoring_status[scoring_id]['cancel_requested'] = True
+        logger.info(f"cancel requested for scoring {scoring_id}: {outcome or 'already finished'}")
+        return self.get_scoring_status(scoring_id)
 
     def _validate_model_files(self, model_config):
         """Validate that model files exist before starting scoring"""
@@ -843,8 +996,27 @@ class ModelService:
             raise DatabaseError(f'scoring failed: {str(e)}')
     
     def get_scoring_status(self, scoring_id):
-        """get the status of a scoring operation"""
-        return self.scoring_status.get(scoring_id, {'status': 'not_found'})
+        """get the status of a scoring operation, with its queue position while it waits"""
+        status = self.scoring_status.get(scoring_id)
+        if status is None:
+            # A batch started before a restart is only on disk
+            status = load_batch_state(scoring_id)
+            if status is None:
+                return {'status': 'not_found'}
+            if status['status'] in ('queued', 'running'):
+                status['status'] = 'interrupted'
+        status = dict(status)
+        if status.get('kind') == 'batch':
+            # Per-session results stand in for the session list
+            status.pop('sessions')
+            status['results'] = dict(status['results'])
+        if status['status'] == 'queued':
+            status['queue_position'] = self.scoring_scheduler.queue_position(scoring_id)
+        return status
+
+    def get_scoring_queue_stats(self):
+        """get queue length and running jobs per device of the scoring scheduler"""
+        return self.scoring_scheduler.stats()
     
     def _get_model_dir(self):
         """get the model directory path"""
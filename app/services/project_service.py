@@ -5,6 +5,7 @@ from app.repositories.project_repository import ProjectRepository
 from app.repositories.participant_repository import ParticipantRepository
 from app.repositories.session_repository import SessionRepository
 from app.logging_config import get_logger
+from app.services.upload_preprocessing import upload_input_bytes
 import os
 import shutil
 from datetime import datetime
@@ -534,10 +535,14 @@ class ProjectService:
             'project_type': 'dataset_based'
         }
     
-    def discover_and_create_dataset_sessions(self, project_id: int) -> Dict[str, Any]:
+    def discover_and_create_dataset_sessions(self, project_id: int, job=None) -> Dict[str, Any]:
         """
         Discover sessions from linked datasets and create session records for a dataset-based project
         Uses the same time gap splitting logic as the original upload functionality
+
+        Args:
+            project_id: Dataset-based project to create sessions for
+            job: Optional UploadJob to report progress to
         """
         logger.info(f"Starting discover_and_create_dataset_sessions for project_id: {project_id}")
         logger.info(f"Session service available: {self.session_service is not None}")
@@ -588,8 +593,12 @@ class ProjectService:
             # Get sessions from the raw dataset
             raw_sessions = raw_dataset_service.discover_sessions_in_dataset(dataset_path)
             logger.info(f"Discovered {len(raw_sessions)} raw sessions in dataset {dataset['dataset_name']}: {[s['name'] for s in raw_sessions]}")
+            session_bytes = [upload_input_bytes(dataset_path, session['name']) for session in raw_sessions]
+            if job:
+                job.add_work(len(raw_sessions), sum(session_bytes))
             
-            for session in raw_sessions:
+            for session, input_bytes in zip(raw_sessions, session_bytes):
+                session_error = None
                 session_name = f"{dataset['dataset_name']}_{session['name']}"
                 
                 # Load original labels if available and convert to compatible format
@@ -661,7 +670,11 @@ class ProjectService:
                         
                 except Exception as e:
                     logger.warning(f"Could not process session {session['name']} with time gap splitting: {e}")
+                    session_error = str(e)
                     continue
+                finally:
+                    if job:
+                        job.session_finished(session['name'], input_bytes, session_error)
         
         # Add discovered labels to project
         if all_labels:
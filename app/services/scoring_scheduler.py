@@ -0,0 +1,168 @@
+import os
+import threading
+from collections import deque
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Scoring jobs wait in a FIFO queue for one of SCORING_WORKERS threads. A job also
+# needs a free slot on its device: one torch inference already uses every CPU core,
+# so running several at once only makes each slower. Jobs for a device whose slots
+# are taken stay queued without holding back jobs for the other device.
+SCORING_WORKERS = int(os.getenv('SCORING_WORKERS', '2'))
+SCORING_DEVICE_SLOTS = {
+    'cpu': int(os.getenv('SCORING_CPU_SLOTS', '1')),
+    'cuda': int(os.getenv('SCORING_CUDA_SLOTS', '1')),
+}
+
+
+class ScoringCancelled(Exception):
+    """Raised inside a scoring job once its cancellation was requested"""
+    pass
+
+
+class ScoringJob:
+    def __init__(self, job_id, device, run, on_start):
+        self.job_id = job_id
+        self.device = device
+        self.run = run
+        self.on_start = on_start
+        self.cancelled = threading.Event()
+
+
+class ScoringScheduler:
+    """Bounded worker pool running scoring jobs in submission order within per-device limits"""
+
+    def __init__(self, workers, device_slots):
+        self.workers = workers
+        self.device_slots = dict(device_slots)
+        self._queue = deque()
+        self._running = {}
+        self._condition = threading.Condition()
+        self._threads = []
+        self.completed = 0
+        self.cancelled = 0
+
+    def _start_workers(self):
+        # Threads are started on first use, so importing the module starts none
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f'scoring-worker-{len(self._threads)}', daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def submit(self, job_id, device, run, on_start=None):
+        """
+        Queue a scoring job.
+
+        Args:
+            job_id: Identifier used for status, position and cancellation
+            device: Device the job runs on ('cpu' or 'cuda')
+            run: Function of the job's cancellation Event doing the work
+            on_start: Optional function called when a worker picks the job up
+
+        Returns:
+            int: The job's 1-based position among queued jobs for its device
+        """
+        if self.device_slots.get(device, 0) <= 0:
+            raise ValueError(f'no scoring slots configured for device {device}')
+        with self._condition:
+            self._start_workers()
+            self._queue.append(ScoringJob(job_id, device, run, on_start))
+            position = self._position(job_id)
+            self._condition.notify_all()
+        logger.debug(f"queued scoring job {job_id} on {device} at position {position}")
+        return position
+
+    def _position(self, job_id):
+        device = None
+        for job in self._queue:
+            if job.job_id == job_id:
+                device = job.device
+                break
+        if device is None:
+            return None
+        position = 0
+        for job in self._queue:
+            if job.device == device:
+                position += 1
+            if job.job_id == job_id:
+                return position
+
+    def queue_position(self, job_id):
+        """1-based position of a queued job among queued jobs for its device, or None once it started"""
+        with self._condition:
+            return self._position(job_id)
+
+    def _next_runnable(self):
+        busy = {}
+        for job in self._running.values():
+            busy[job.device] = busy.get(job.device, 0) + 1
+        for job in self._queue:
+            if busy.get(job.device, 0) < self.device_slots.get(job.device, 0):
+                return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._condition:
+                job = self._next_runnable()
+                while job is None:
+                    self._condition.wait()
+                    job = self._next_runnable()
+                self._queue.remove(job)
+                self._running[job.job_id] = job
+
+            try:
+                if job.on_start:
+                    job.on_start()
+                job.run(job.cancelled)
+            except Exception as e:
+                # Jobs record their own errors; this only keeps the worker alive
+                logger.error(f"scoring job {job.job_id} raised: {e}")
+            finally:
+                with self._condition:
+                    del self._running[job.job_id]
+                    self.completed += 1
+                    self._condition.notify_all()
+
+    def cancel(self, job_id):
+        """
+        Cancel a job. Queued jobs are removed; running jobs are asked to stop at
+        their next checkpoint (inference already under way runs to completion).
+
+        Returns:
+            str: 'cancelled' for a removed queued job, 'cancelling' for a running
+            job, or None when the job is not queued or running
+        """
+        with self._condition:
+            for job in self._queue:
+                if job.job_id == job_id:
+                    self._queue.remove(job)
+                    self.cancelled += 1
+                    job.cancelled.set()
+                    return 'cancelled'
+            job = self._running.get(job_id)
+            if job is not None:
+                job.cancelled.set()
+                return 'cancelling'
+        return None
+
+    def stats(self):
+        """Queue length and running jobs per device, and the configured limits"""
+        with self._condition:
+            queued, running = {}, {}
+            for job in self._queue:
+                queued[job.device] = queued.get(job.device, 0) + 1
+            for job in self._running.values():
+                running[job.device] = running.get(job.device, 0) + 1
+            return {
+                'workers': self.workers,
+                'device_slots': dict(self.device_slots),
+                'queued': queued,
+                'running': running,
+                'completed': self.completed,
+                'cancelled': self.cancelled
+            }
+
+
+scoring_scheduler = ScoringScheduler(SCORING_WORKERS, SCORING_DEVICE_SLOTS)
@@ -3,7 +3,11 @@ import os
 import shutil
 import json
 import traceback
-from app.services.utils import timeit, resample
+from app.services.utils import timeit
+from app.services.bout_intervals import assign_bouts_to_segments
+from app.services.upload_preprocessing import prepare_upload, prepare_uploads, upload_input_bytes
+from app.services.session_validation import sniff_session_file, validate_session_files
+from app.services.session_summaries import compute_session_summary, SUMMARY_FIELDS
 import pandas as pd
 from app.exceptions import DatabaseError
 from app.repositories.session_repository import SessionRepository
@@ -51,20 +55,38 @@ class SessionService:
             return []
         
     @timeit
-    def validate_sessions(self, sessions, project_path):
-        skipped_sessions = []
-        for session in sessions:
-            csv_path = os.path.join(project_path, session['name'], 'accelerometer_data.csv')
-            if not self.validate_session_data(csv_path):
-                logger.warning(f"Invalid session data for {session['name']}")
-                skipped_sessions.append(session['name'])
-                session_dir = os.path.join(project_path, session['name'])
+    def validate_sessions(self, sessions, project_path, mode='sniff', workers=None):
+        """
+        Validate uploaded sessions and delete the directories of invalid ones.
+
+        Args:
+            sessions: Discovered sessions (dicts with 'name')
+            project_path: Path to the project directory
+            mode: 'sniff' checks the header and head/tail samples of each file;
+                'pandas' parses the first 1000 rows
+            workers: Threads to validate with (defaults to VALIDATION_WORKERS)
+
+        Returns:
+            list: Per-session reports (session_name, valid, reason, row_estimate,
+            sample_rate_hz, ...), in the order of sessions
+        """
+        check = sniff_session_file if mode == 'sniff' else self.validation_report
+        reports = validate_session_files([session['name'] for session in sessions], project_path, check=check, workers=workers)
+        for report in reports:
+            if not report['valid']:
+                logger.warning(f"Invalid session data for {report['session_name']}: {report['reason']}")
+                session_dir = os.path.join(project_path, report['session_name'])
                 if os.path.exists(session_dir):
                     shutil.rmtree(session_dir)
             else:
-                logger.info(f"Session {session['name']} data is valid")
-        return skipped_sessions
-    
+                logger.info(f"Session {report['session_name']} data is valid")
+        return reports
+
+    def validation_report(self, csv_path, min_rows=10):
+        """validate_session_data as a report dict, like sniff_session_file returns"""
+        reason = self._validation_failure(csv_path, min_rows)
+        return {'valid': reason is None, 'reason': reason}
+
     @timeit
     def validate_session_data(self, csv_path, min_rows=10):
         """
@@ -77,17 +99,21 @@ class SessionService:
         Returns:
             bool: True if data is valid, False otherwise
         """
+        return self._validation_failure(csv_path, min_rows) is None
+
+    def _validation_failure(self, csv_path, min_rows):
+        """Why validate_session_data rejects a file, or None when it is valid"""
         try:
             # Check if file exists and has content
             if not os.path.exists(csv_path):
                 logger.warning(f"Data file does not exist: {csv_path}")
-                return False
+                return 'Accelerometer data file is missing'
             
             # Check file size (empty files or very small files are invalid)
             file_size = os.path.getsize(csv_path)
             if file_size < 100:  # Less than 100 bytes is likely empty or just headers
                 logger.warning(f"Data file is too small ({file_size} bytes): {csv_path}")
-                return False
+                return f'Accelerometer data file is too small ({file_size} bytes)'
             
             # Try to read the CSV and validate content
             df = pd.read_csv(csv_path, nrows=1000) # tested to save ~1 second per file
@@ -96,32 +122,32 @@ class SessionService:
             # Check if required columns exist
             if not all(col in df.columns for col in expected_columns):
                 logger.warning(f"Invalid CSV format in {csv_path}. Expected columns: {expected_columns}, Found: {list(df.columns)}")
-                return False
+                return f"Missing columns {[col for col in expected_columns if col not in df.columns]}; found {list(df.columns)}"
             
             # Check if we have enough data rows
             if len(df) < min_rows:
                 logger.warning(f"Insufficient data rows ({len(df)}) in {csv_path}. Minimum required: {min_rows}")
-                return False
+                return f'Insufficient data rows ({len(df)}, minimum {min_rows})'
             # Check for valid timestamp data (not all NaN or zeros)
             if df['ns_since_reboot'].isna().all() or (df['ns_since_reboot'] == 0).all():
                 logger.warning(f"Invalid timestamp data in {csv_path}")
-                return False
+                return 'Timestamps are missing or zero'
             
             # Check for valid accelerometer data (not all NaN)
             accel_cols = ['x', 'y', 'z']
             if df[accel_cols].isna().all().all():
                 logger.warning(f"No valid accelerometer data in {csv_path}")
-                return False
+                return 'No valid accelerometer values'
             
             logger.debug(f"Data validation passed for {csv_path}: {len(df)} rows")
-            return True
+            return None
             
         except Exception as e:
             logger.error(f"Error validating data in {csv_path}: {e}", exc_info=True)
-            return False
+            return f'Validation failed: {e}'
     
     @timeit
-    def preprocess_and_split_session_on_upload(self, session_name, project_path, project_id, parent_bouts, gyro=False):
+    def preprocess_and_split_session_on_upload(self, session_name, project_path, project_id, parent_bouts, gyro=False, streaming=None):
         """
         Automatically split a session based on time gaps during upload.
         
@@ -130,237 +156,247 @@ class SessionService:
             project_path: Path to the project directory
             project_id: Database project ID
             bouts_json: JSON string of bouts data
+            streaming: Process the files in chunks instead of in memory; by default
+                only accelerometer files of at least STREAMING_INGEST_MIN_BYTES are streamed
         
         Returns:
             List of session names that were created (empty list if session was invalid/skipped)
         """
-        try:
-            from app.services.utils import load_dataframe_from_csv, get_sample_rate_from_dataframe, check_sample_rate_consistency
-            
-            accel_csv_path = os.path.join(project_path, session_name, 'accelerometer_data.csv')
-            gyro_csv_path = os.path.join(project_path, session_name, 'gyroscope_data.csv')
-
-            df = load_dataframe_from_csv(accel_csv_path, column_prefix='accel')
+        prepared = prepare_upload(session_name, project_path, streaming=streaming)
+        created_sessions, _ = self.register_prepared_upload(project_path, project_id, parent_bouts, prepared)
+        return created_sessions
 
-            if os.path.exists(gyro_csv_path):
-                gyro = True
-
-                accel_sample_rate = get_sample_rate_from_dataframe(df)
-
-                gyro_df = load_dataframe_from_csv(gyro_csv_path, column_prefix='gyro')
-                gyro_sample_rate = get_sample_rate_from_dataframe(gyro_df)
-
-                check_sample_rate_consistency(accel_sample_rate, gyro_sample_rate)
-                merge_tolerance = min(accel_sample_rate, gyro_sample_rate)
-
-                df = pd.merge_asof(
-                    df.sort_values('ns_since_reboot'),
-                    gyro_df.sort_values('ns_since_reboot'),
-                    on='ns_since_reboot',
-                    tolerance=int(1e9 / merge_tolerance),
-                    direction='nearest'
-                )
+    @timeit
+    def preprocess_sessions_on_upload(self, project_path, project_id, session_bouts, workers=None, job=None):
+        """
+        Preprocess and register the sessions of a project upload.
 
-                df = df.dropna()
+        File processing runs in a pool of worker processes (see prepare_uploads);
+        database inserts happen here, in upload order, so generated split names are
+        the same however the workers are scheduled.
 
-            gap_threshold_minutes = 30
-            gap_threshold_ns = gap_threshold_minutes * 60 * 1_000_000_000
-            df = df.sort_values('ns_since_reboot').reset_index(drop=True)
-            time_diffs = df['ns_since_reboot'].diff()
-            gap_indices = time_diffs[time_diffs > gap_threshold_ns].index
+        Args:
+            project_path: Path to the project directory
+            project_id: Database project ID
+            session_bouts: List of (session name, parent bouts) in upload order
+            workers: Worker processes to use (defaults to UPLOAD_WORKERS)
+            job: Optional UploadJob to report progress to
 
-            if len(gap_indices) == 0:
-                logger.debug(f"No time gaps found in session {session_name}, proceeding without splitting")
-                df = resample(df)
-                df[['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']].to_csv(accel_csv_path, index=False)
-                if gyro:
-                    df[['ns_since_reboot', 'gyro_x', 'gyro_y', 'gyro_z']].to_csv(gyro_csv_path, index=False)
-                logger.debug(f"Resampled data for session {session_name}")
-                logger.debug(f"Parsed {len(parent_bouts)} parent_bouts for single session {session_name}")
-                
-                # Calculate start_ns and stop_ns for the whole session
-                start_ns = int(df['ns_since_reboot'].min())
-                stop_ns = int(df['ns_since_reboot'].max())
-                
-                return self.session_repo.insert_single_session(session_name, project_id, json.dumps(parent_bouts), start_ns, stop_ns)
+        Returns:
+            list: Per session, in upload order: session_name, created_sessions and
+            error (None when the session was processed without problems)
+        """
+        bouts_by_position = [bouts for _, bouts in session_bouts]
+        session_names = [session_name for session_name, _ in session_bouts]
+        # Input sizes are taken up front: preprocessing rewrites the files
+        session_bytes = [upload_input_bytes(project_path, session_name) for session_name in session_names]
+        if job:
+            job.add_work(len(session_names), sum(session_bytes))
 
-            split_points = []
-            for idx in gap_indices:
-                if idx > 0 and idx < len(df) - 1:
-                    split_points.append(float(df.loc[idx, 'ns_since_reboot']))
-            split_points = sorted(set(float(p) for p in split_points))
-            split_indices = []
-            for point in split_points:
-                df['time_diff'] = abs(df['ns_since_reboot'] - point)
-                split_index = df['time_diff'].idxmin()
-                if split_index > 0 and split_index < len(df) - 1:
-                    split_indices.append(split_index)
-            split_indices = sorted(set(split_indices))
-            split_indices = [0] + split_indices + [len(df)]
-            
-            segments = []
-            for i in range(len(split_indices) - 1):
-                start_index = split_indices[i]
-                end_index = split_indices[i + 1]
-                if start_index < end_index:
-                    segment_df = df.iloc[start_index:end_index]
-                    if not segment_df.empty:
-                        logger.debug(f"Created segment {i + 1} with {len(segment_df)} rows for session {session_name}")
-                        segment_df = resample(segment_df)
-                        segments.append(segment_df)
-                    else:
-                        logger.warning(f"Segment {i + 1} is empty, skipping for session {session_name}")
-                else:
-                    logger.warning(f"Invalid segment indices for session {session_name}: start={start_index}, end={end_index}")
-            
-            # Define time ranges for each segment
-            segment_ranges = []
-            for segment in segments:
-                start_time = segment['ns_since_reboot'].min()
-                end_time = segment['ns_since_reboot'].max()
-                segment_ranges.append((start_time, end_time))
-            
-            # Assign bouts to segments based on time ranges
-            segment_bouts = [[] for _ in segments]
-            
-            for bout in parent_bouts:
-                if isinstance(bout, dict):
-                    bout_start = bout.get('start')
-                    bout_end = bout.get('end')
-                    bout_label = bout.get('label', 'smoking')
-                else:
-                    logger.warning(f"Invalid bout format in {parent_bouts}: {bout}, expected dict or list")
-                    continue
+        results = []
+        prepared_uploads = prepare_uploads(session_names, project_path, workers=workers)
+        for parent_bouts, input_bytes, prepared in zip(bouts_by_position, session_bytes, prepared_uploads):
+            created_sessions, error = self.register_prepared_upload(project_path, project_id, parent_bouts, prepared)
+            if job:
+                job.session_finished(prepared['session_name'], input_bytes, error)
+            results.append({
+                'session_name': prepared['session_name'],
+                'created_sessions': created_sessions,
+                'error': error
+            })
+        failed = [result['session_name'] for result in results if result['error']]
+        if failed:
+            logger.warning(f"{len(failed)} of {len(results)} uploaded sessions had errors: {failed}")
+        return results
 
-                for i, (segment_start, segment_end) in enumerate(segment_ranges):
-                    # If bout is entirely within segment
-                    if segment_start <= bout_start <= segment_end and segment_start <= bout_end <= segment_end:
-                        adjusted_bout = {'start': float(bout_start), 'end': float(bout_end), 'label': bout_label}
-                        segment_bouts[i].append(adjusted_bout)
-                        break
-                    # If bout overlaps with segment start
-                    elif bout_start < segment_start and segment_start <= bout_end <= segment_end:
-                        adjusted_bout = {'start': float(segment_start), 'end': float(bout_end), 'label': bout_label}
-                        segment_bouts[i].append(adjusted_bout)
-                        break
-                    # If bout overlaps with segment end
-                    elif segment_start <= bout_start <= segment_end and bout_end > segment_end:
-                        adjusted_bout = {'start': float(bout_start), 'end': float(segment_end), 'label': bout_label}
-                        segment_bouts[i].append(adjusted_bout)
-                        break
-                    # If bout spans entire segment
-                    elif bout_start < segment_start and bout_end > segment_end:
-                        adjusted_bout = {'start': float(segment_start), 'end': float(segment_end), 'label': bout_label}
-                        segment_bouts[i].append(adjusted_bout)
-                        break
+    def register_prepared_upload(self, project_path, project_id, parent_bouts, prepared):
+        """
+        Insert the sessions for a prepared upload, falling back to inserting the
+        original session unsplit when preprocessing or registration failed.
 
+        Args:
+            project_path: Path to the project directory
+            project_id: Database project ID
+            parent_bouts: Bouts uploaded with the session
+            prepared: Result of prepare_upload
 
-            # Save the complete resampled data to original directory (preserve original)
-            original_dir = os.path.join(project_path, session_name)
-            df[['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']].to_csv(os.path.join(original_dir, 'accelerometer_data.csv'), index=False)
-            if gyro:
-                df[['ns_since_reboot', 'gyro_x', 'gyro_y', 'gyro_z']].to_csv(os.path.join(original_dir, 'gyroscope_data.csv'), index=False)
-            
-            # Create virtual split sessions (no physical directories)
-            new_sessions = []
-            
-            for i, segment in enumerate(segments):
-                # Generate unique name
-                new_name = self.generate_unique_session_name_upload(session_name, project_path, project_id)
-                
-                # Use the original split indices as offsets (they correspond to the un-resampled dataframe)
-                segment_start_offset = split_indices[i]
-                segment_end_offset = split_indices[i + 1]
-                
-                
-                # Calculate start_ns and stop_ns for this segment
-                segment_start_ns = int(segment['ns_since_reboot'].min())
-                segment_stop_ns = int(segment['ns_since_reboot'].max())
-                
-                # Insert virtual split session into database
-                result = self.session_repo.insert_single_session(
-                    new_name, 
-                    project_id, 
-                    json.dumps(segment_bouts[i]), 
-                    segment_start_ns, 
-                    segment_stop_ns,
-                    parent_data_path=original_dir,
-                    data_start_offset=segment_start_offset,
-                    data_end_offset=segment_end_offset
+        Returns:
+            tuple: (list of created session names, error message or None)
+        """
+        session_name = prepared['session_name']
+        error = prepared['error']
+        plan = prepared['plan']
+        if error is None:
+            try:
+                return self._register_upload(session_name, project_path, project_id, parent_bouts, plan), None
+            except Exception as e:
+                error = str(e)
+                logger.error(
+                    f"Failed to auto-split session '{session_name}' in project {project_id}: {str(e)}", 
+                    exc_info=True,
+                    extra={
+                        'session_name': session_name,
+                        'project_id': project_id,
+                        'project_path': project_path,
+                        'error_type': type(e).__name__,
+                        'traceback': traceback.format_exc()
+                    }
                 )
-                if result:  # Only add to new_sessions if insertion was successful
-                    new_sessions.append(new_name)
-            
-            # Mark original session as split but keep the data
-            conn = self.get_db_connection()
-            if conn:
-                try:
-                    with conn.cursor(dictionary=True) as cursor:
-                        cursor.execute("""
-                            INSERT INTO sessions (project_id, session_name, status, keep, bouts, start_ns, stop_ns)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s)
-                        """, (project_id, session_name, 'Split', 0, '[]', int(df['ns_since_reboot'].min()), int(df['ns_since_reboot'].max())))
-                        
-                        parent_session_id = cursor.lastrowid
-                        
-                        # Update is_visible to hide the parent session
-                        cursor.execute("""
-                            UPDATE sessions SET is_visible = 0 WHERE session_id = %s
-                        """, (parent_session_id,))
-                        
-                        # Add lineage for virtual splits
-                        for new_session_name in new_sessions:
-                            cursor.execute("""
-                                SELECT session_id FROM sessions WHERE session_name = %s AND project_id = %s
-                            """, (new_session_name, project_id))
-                            child_result = cursor.fetchone()
-                            if child_result:
-                                cursor.execute("""
-                                    INSERT INTO session_lineage (child_session_id, parent_session_id)
-                                    VALUES (%s, %s)
-                                """, (child_result['session_id'], parent_session_id))
-                    
-                    conn.commit()
-                except Exception as e:
-                    conn.rollback()
-                    logger.error(f"Error creating parent session for virtual splits: {e}")
-                finally:
-                    conn.close()
-            
-            logger.info(f"Created {len(new_sessions)} virtual split sessions from upload for {session_name}")
-            return new_sessions
-            
-        except Exception as e:
+
+        # Fallback: insert original session
+        try:
+            logger.info(f"Attempting fallback: inserting original session '{session_name}' without splitting")
+            # Calculate start_ns and stop_ns for the original session
+            if plan is not None:
+                fallback_start_ns, fallback_stop_ns = plan['start_ns'], plan['stop_ns']
+            elif prepared['fallback_bounds'] is not None:
+                fallback_start_ns, fallback_stop_ns = prepared['fallback_bounds']
+            else:
+                raise ValueError('Session bounds are unknown because the upload could not be read')
+            return self.session_repo.insert_single_session(session_name, project_id, json.dumps(parent_bouts, indent=2), fallback_start_ns, fallback_stop_ns), error
+        except Exception as fallback_error:
             logger.error(
-                f"Failed to auto-split session '{session_name}' in project {project_id}: {str(e)}", 
+                f"Fallback insertion also failed for session '{session_name}': {str(fallback_error)}", 
                 exc_info=True,
                 extra={
                     'session_name': session_name,
                     'project_id': project_id,
-                    'project_path': project_path,
-                    'error_type': type(e).__name__,
-                    'traceback': traceback.format_exc()
+                    'original_error': error,
+                    'fallback_error': str(fallback_error)
                 }
             )
-            # Fallback: insert original session
+            return [], error
+
+    def _register_upload(self, session_name, project_path, project_id, parent_bouts, plan):
+        """
+        Insert the sessions for a preprocessed upload.
+
+        Args:
+            session_name: Name of the uploaded session
+            project_path: Path to the project directory
+            project_id: Database project ID
+            parent_bouts: Bouts uploaded with the session
+            plan: Result of preprocessing: split flag, start_ns/stop_ns of the written
+                data and, for split uploads, the segments with their row offsets
+
+        Returns:
+            List of session names that were created
+        """
+        if not plan['split']:
+            logger.debug(f"Parsed {len(parent_bouts)} parent_bouts for single session {session_name}")
+            created = self.session_repo.insert_single_session(session_name, project_id, json.dumps(parent_bouts), plan['start_ns'], plan['stop_ns'])
+            if created:
+                self._save_summary(project_id, session_name, plan.get('summary'))
+            return created
+
+        # Define time ranges for each segment
+        segment_ranges = [(segment['start_ns'], segment['stop_ns']) for segment in plan['segments']]
+        
+        # Clip bouts to every segment they overlap
+        segment_bouts = assign_bouts_to_segments(segment_ranges, parent_bouts)
+
+        original_dir = os.path.join(project_path, session_name)
+        
+        # Create virtual split sessions (no physical directories)
+        new_sessions = []
+        
+        for i, segment in enumerate(plan['segments']):
+            # Generate unique name
+            new_name = self.generate_unique_session_name_upload(session_name, project_path, project_id)
+            
+            # Insert virtual split session into database
+            result = self.session_repo.insert_single_session(
+                new_name, 
+                project_id, 
+                json.dumps(segment_bouts[i]), 
+                segment['start_ns'], 
+                segment['stop_ns'],
+                parent_data_path=original_dir,
+                data_start_offset=segment['start_offset'],
+                data_end_offset=segment['end_offset']
+            )
+            if result:  # Only add to new_sessions if insertion was successful
+                new_sessions.append(new_name)
+                self._save_summary(project_id, new_name, segment.get('summary'))
+        
+        # Mark original session as split but keep the data
+        conn = self.get_db_connection()
+        if conn:
             try:
-                logger.info(f"Attempting fallback: inserting original session '{session_name}' without splitting")
-                # Calculate start_ns and stop_ns for the original session
-                fallback_start_ns = int(df['ns_since_reboot'].min())
-                fallback_stop_ns = int(df['ns_since_reboot'].max())
-                return self.session_repo.insert_single_session(session_name, project_id, json.dumps(parent_bouts, indent=2), fallback_start_ns, fallback_stop_ns)
-            except Exception as fallback_error:
-                logger.error(
-                    f"Fallback insertion also failed for session '{session_name}': {str(fallback_error)}", 
-                    exc_info=True,
-                    extra={
-                        'session_name': session_name,
-                        'project_id': project_id,
-                        'original_error': str(e),
-                        'fallback_error': str(fallback_error)
-                    }
-                )
-                return []
+                with conn.cursor(dictionary=True) as cursor:
+                    cursor.execute("""
+                        INSERT INTO sessions (project_id, session_name, status, keep, bouts, start_ns, stop_ns)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """, (project_id, session_name, 'Split', 0, '[]', plan['start_ns'], plan['stop_ns']))
+                    
+                    parent_session_id = cursor.lastrowid
+                    
+                    # Update is_visible to hide the parent session
+                    cursor.execute("""
+                        UPDATE sessions SET is_visible = 0 WHERE session_id = %s
+                    """, (parent_session_id,))
+                    
+                    # Add lineage for virtual splits
+                    for new_session_name in new_sessions:
+                        cursor.execute("""
+                            SELECT session_id FROM sessions WHERE session_name = %s AND project_id = %s
+                        """, (new_session_name, project_id))
+                        child_result = cursor.fetchone()
+                        if child_result:
+                            cursor.execute("""
+                                INSERT INTO session_lineage (child_session_id, parent_session_id)
+                                VALUES (%s, %s)
+                            """, (child_result['session_id'], parent_session_id))
+                
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error creating parent session for virtual splits: {e}")
+            finally:
+                conn.close()
+        
+        logger.info(f"Created {len(new_sessions)} virtual split sessions from upload for {session_name}")
+        return new_sessions
+
+    def _save_summary(self, project_id, session_name, summary):
+        """Store a session's signal summary; failures are logged and left for the backfill"""
+        if summary is None:
+            return
+        try:
+            self.session_repo.save_summary(project_id, session_name, summary)
+        except DatabaseError as e:
+            logger.warning(f"Could not store signal summary for session '{session_name}' in project {project_id}: {e}")
+
+    def backfill_session_summaries(self, project_id=None, dry_run=False):
+        """
+        Compute and store signal summaries for sessions that have none.
+
+        Args:
+            project_id: Optional project to restrict the backfill to
+            dry_run: Only count the sessions that would be summarized
+
+        Returns:
+            dict: sessions_found, summaries_written and errors (session_id, error)
+        """
+        sessions = self.session_repo.get_sessions_without_summary(project_id)
+        report = {'sessions_found': len(sessions), 'summaries_written': 0, 'errors': []}
+        if dry_run:
+            return report
+
+        for session in sessions:
+            session_id = session['session_id']
+            try:
+                session_info = self.get_session_details(session_id)
+                source = self.get_signal_source(session_id, session_info) if session_info else None
+                if not source:
+                    raise ValueError('Signal files for the session could not be located')
+                summary = compute_session_summary(source['data_dir'], source['start_row'], source['end_row'], source['start_ns'], source['end_ns'])
+                self.session_repo.save_summary(session['project_id'], session['session_name'], summary)
+                report['summaries_written'] += 1
+            except Exception as e:
+                logger.error(f"Failed to summarize session {session_id}: {e}")
+                report['errors'].append({'session_id': session_id, 'error': str(e)})
+        return report
 
     def generate_unique_session_name_upload(self, original_name, project_path, project_id):
         """Generate a unique session name by adding numeric suffixes (for upload process)"""
@@ -410,7 +446,7 @@ class SessionService:
                 conn.close()
 
     def get_sessions(self, project_id=None, show_split=False):
-        """Get sessions, optionally filtered by project and split status"""
+        """Get sessions, optionally filtered by project and split status, with their signal summaries"""
         conn = self.get_db_connection()
         
         if conn is None:
@@ -426,10 +462,12 @@ class SessionService:
                 cursor.execute(f"""
                     SELECT s.session_id, s.session_name, s.status, s.keep, s.verified,
                         s.puffs_verified, s.smoking_verified,
-                        p.project_name, p.project_id, part.participant_code
+                        p.project_name, p.project_id, part.participant_code,
+                        ss.row_count, ss.duration_seconds, ss.sample_rate_hz, ss.gap_count, ss.axis_stats
                     FROM sessions s
                     JOIN projects p ON s.project_id = p.project_id
                     JOIN participants part ON p.participant_id = part.participant_id
+                    LEFT JOIN session_summaries ss ON ss.session_id = s.session_id
                     WHERE s.project_id = %s {visibility_condition}
                     ORDER BY s.session_name
                 """, (project_id,))
@@ -438,19 +476,33 @@ class SessionService:
                 cursor.execute(f"""
                     SELECT s.session_id, s.session_name, s.status, s.keep, s.verified,
                         s.puffs_verified, s.smoking_verified,
-                        p.project_name, p.project_id, part.participant_code
+                        p.project_name, p.project_id, part.participant_code,
+                        ss.row_count, ss.duration_seconds, ss.sample_rate_hz, ss.gap_count, ss.axis_stats
                     FROM sessions s
                     JOIN projects p ON s.project_id = p.project_id
                     JOIN participants part ON p.participant_id = part.participant_id
+                    LEFT JOIN session_summaries ss ON ss.session_id = s.session_id
                     WHERE 1=1 {visibility_condition}
                     ORDER BY s.session_name
                 """)
             
             sessions = cursor.fetchall()
+            for session in sessions:
+                self._attach_summary(session)
             return sessions
         finally:
             cursor.close()
             conn.close()
+
+    def _attach_summary(self, session):
+        """Move a session row's summary columns into session['summary'] (None when not computed yet)"""
+        values = {field: session.pop(field, None) for field in SUMMARY_FIELDS}
+        if values['row_count'] is None:
+            session['summary'] = None
+            return
+        if isinstance(values['axis_stats'], str):
+            values['axis_stats'] = json.loads(values['axis_stats'])
+        session['summary'] = values
     
     def get_session_details(self, session_id):
         """Get detailed information for a specific session"""
@@ -475,7 +527,76 @@ class SessionService:
         finally:
             cursor.close()
             conn.close()
-    
+
+    def get_signal_source(self, session_id, session_info):
+        """
+        Locate the signal files backing a session and the part of them it covers.
+
+        Virtual splits (including dataset-based sessions) read a window of their
+        parent's files, identified by row offsets or, for older splits, by the
+        session's time range. Regular sessions read their own directory in full.
+
+        Args:
+            session_id: ID of the session
+            session_info: Row returned by get_session_details
+
+        Returns:
+            dict: data_dir, start_row, end_row, start_ns, end_ns (bounds may be None),
+            or None for a dataset-based session without virtual split information
+        """
+        split_info = self.session_repo.get_session_split_info(session_id)
+        logger.debug(f"Split info for session {session_id}: {split_info}")
+
+        # Handle dataset-based sessions that need path correction
+        dataset_id = session_info.get('dataset_id')
+        raw_session_name = session_info.get('raw_session_name')
+        parent_data_path = str(split_info.get('parent_data_path', '')) if split_info else ''
+        if dataset_id and (not split_info or not split_info.get('parent_data_path') or 'raw_datasets/raw_datasets' in parent_data_path or not os.path.exists(parent_data_path)):
+            # Get correct dataset path using current server's DATA_DIR
+            try:
+                from app.services.raw_dataset_service import RawDatasetService
+                raw_dataset_service = RawDatasetService()
+                dataset = raw_dataset_service.raw_dataset_repo.find_by_id(dataset_id)
+                if dataset:
+                    # Use current DATA_DIR instead of stored path
+                    current_data_dir = os.path.expanduser(os.getenv('DATA_DIR', '~/.delta/data'))
+                    dataset_dir_name = os.path.basename(dataset['file_path'])
+                    corrected_dataset_path = os.path.join(current_data_dir, 'raw_datasets', dataset_dir_name)
+
+                    # If we don't have raw_session_name, infer it by removing the split suffix (.1, .2, etc)
+                    if not raw_session_name:
+                        session_name = session_info['session_name']
+                        raw_session_name = session_name.split('.')[0] if '.' in session_name else session_name
+                    corrected_path = os.path.join(corrected_dataset_path, raw_session_name)
+                    logger.debug(f"Corrected data path for session {session_id}: {corrected_path} (stored: {dataset['file_path']})")
+
+                    # Ensure split_info exists and set the path
+                    if not split_info:
+                        split_info = {'data_start_offset': None, 'data_end_offset': None}
+                    split_info['parent_data_path'] = corrected_path
+            except Exception as e:
+                logger.warning(f"Could not correct data path for session {session_id}: {e}")
+
+        if split_info and split_info.get('parent_data_path'):
+            source = {'data_dir': split_info['parent_data_path'], 'start_row': None, 'end_row': None, 'start_ns': None, 'end_ns': None}
+            if split_info['data_start_offset'] is not None and split_info['data_end_offset'] is not None:
+                source['start_row'] = split_info['data_start_offset']
+                source['end_row'] = split_info['data_end_offset']
+            else:
+                # Older virtual splits without offsets are bounded by their time range
+                source['start_ns'] = session_info['start_ns']
+                source['end_ns'] = session_info['stop_ns']
+            return source
+
+        if session_info.get('project_path'):
+            return {
+                'data_dir': os.path.join(session_info['project_path'], session_info['session_name']),
+                'start_row': None, 'end_row': None, 'start_ns': None, 'end_ns': None
+            }
+
+        # Dataset-based session without virtual split info - this shouldn't happen
+        return None
+
     def get_all_sessions_with_details(self, include_discarded=False):
         """Get all sessions with project and participant information"""
         conn = self.get_db_connection()
@@ -861,13 +982,40 @@ class SessionService:
                 """, (session_id,))
                 
             conn.commit()
-            return created_sessions
         except Exception as e:
             conn.rollback()
             raise DatabaseError(f'Failed to split session: {str(e)}')
         finally:
             conn.close()
 
+        self._summarize_splits(session_info['project_id'], parent_data_path, new_sessions)
+        return created_sessions
+
+    def _summarize_splits(self, project_id, data_dir, new_sessions):
+        """
+        Compute and store the signal summaries of sessions created by a manual split.
+
+        Failures are logged and left for the backfill, as on upload.
+
+        Args:
+            project_id: ID of the project the sessions belong to
+            data_dir: Directory holding the signal files the splits index into
+            new_sessions: The split_session entries (name, start_ns, stop_ns and row offsets)
+        """
+        for session_data in new_sessions:
+            start_row = session_data.get('data_start_offset')
+            end_row = session_data.get('data_end_offset')
+            try:
+                if start_row is not None and end_row is not None:
+                    summary = compute_session_summary(data_dir, start_row, end_row)
+                else:
+                    # Splits of older virtual splits without offsets are bounded by their time range
+                    summary = compute_session_summary(data_dir, start_ns=session_data['start_ns'], end_ns=session_data['stop_ns'])
+            except Exception as e:
+                logger.warning(f"Could not summarize split session '{session_data['name']}' in {data_dir}: {e}")
+                continue
+            self._save_summary(project_id, session_data['name'], summary)
+
     def duplicate_session_bouts_for_labeling(self, project_id, original_name, new_name):
         """Duplicate all session bouts from one labeling to create bouts for a new labeling
         
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+# Split points index a session's rows by timestamp. Timestamps written by the
+# upload pipeline are sorted, so every lookup here is a binary search; unsorted
+# legacy files fall back to a linear nearest-timestamp scan per point.
+
+
+def _is_sorted(ns):
+    return len(ns) < 2 or bool(np.all(ns[1:] >= ns[:-1]))
+
+
+def nearest_row_indices(ns, points):
+    """
+    Find the row whose timestamp is nearest each point.
+
+    Ties go to the earliest row, as Series.idxmin would pick.
+
+    Args:
+        ns: Row timestamps
+        points: Timestamps to locate
+
+    Returns:
+        numpy.ndarray: Row index per point
+    """
+    ns = np.asarray(ns, dtype=np.float64)
+    points = np.asarray(points, dtype=np.float64)
+    if len(ns) == 0:
+        return np.empty(0, dtype=np.int64)
+    if not _is_sorted(ns):
+        return np.array([np.nanargmin(np.abs(ns - point)) for point in points], dtype=np.int64)
+
+    right = np.clip(np.searchsorted(ns, points, side='left'), 0, len(ns) - 1)
+    left = np.maximum(right - 1, 0)
+    use_left = np.abs(ns[left] - points) <= np.abs(ns[right] - points)
+    nearest = np.where(use_left, left, right)
+    # Among duplicate timestamps the first row wins
+    return np.searchsorted(ns, ns[nearest], side='left').astype(np.int64)
+
+
+def gap_row_indices(ns, gap_threshold_ns):
+    """
+    Find the rows that start after a recording gap.
+
+    Args:
+        ns: Sorted row timestamps
+        gap_threshold_ns: Smallest interval between consecutive rows that counts as a gap
+
+    Returns:
+        numpy.ndarray: Index of the first row after each gap
+    """
+    ns = np.asarray(ns, dtype=np.float64)
+    return np.flatnonzero(np.diff(ns) > gap_threshold_ns) + 1
+
+
+def split_segments(ns, split_indices):
+    """
+    Cut a session into segments at the given rows.
+
+    Split rows at the first or last row, or repeated, are ignored, so every segment
+    has at least one row.
+
+    Args:
+        ns: Row timestamps
+        split_indices: Rows that start a new segment
+
+    Returns:
+        list: One dict per segment with start_offset/end_offset (half-open row range)
+        and start_ns/stop_ns (timestamp range of the segment's rows)
+    """
+    ns = np.asarray(ns)
+    indices = np.unique(np.asarray(split_indices, dtype=np.int64))
+    indices = indices[(indices > 0) & (indices < len(ns) - 1)]
+    bounds = np.concatenate(([0], indices, [len(ns)])).astype(np.int64)
+    starts, ends = bounds[:-1], bounds[1:]
+
+    if _is_sorted(ns):
+        first_ns = ns[starts]
+        last_ns = ns[ends - 1]
+    else:
+        first_ns = np.fmin.reduceat(ns, starts)
+        last_ns = np.fmax.reduceat(ns, starts)
+
+    return [{
+        'start_offset': int(start),
+        'end_offset': int(end),
+        'start_ns': first,
+        'stop_ns': last
+    } for start, end, first, last in zip(starts, ends, first_ns, last_ns)]
+
+
+def split_at_points(ns, points):
+    """Segments of a session cut at the rows nearest each split point"""
+    return split_segments(ns, nearest_row_indices(ns, points))
+
+
+def split_at_gaps(ns, gap_threshold_ns):
+    """Segments of a session cut at every recording gap"""
+    return split_segments(ns, gap_row_indices(ns, gap_threshold_ns))
+
+
+def resample_bin_starts(ns, target_hz=50):
+    """
+    Timestamps of the resample bins containing ns, as utils.resample labels them.
+
+    A segment resampled on its own spans the bins of its first and last rows, so
+    this gives its resampled start/stop without resampling it.
+    """
+    timestamps = pd.to_datetime(pd.Series(np.atleast_1d(ns)), unit='ns').dt.floor(f'{1000 // target_hz}ms')
+    return timestamps.astype('int64').to_numpy()
@@ -0,0 +1,64 @@
+import numpy as np
+from app.services.utils import load_session_signals
+
+# Signal-level metadata for session lists, computed once when a session's files are
+# written (or by the backfill) and stored in the session_summaries table, so listing
+# sessions never re-reads signal files. Within a session, any pause between samples
+# longer than SUMMARY_GAP_NS counts as a gap; pauses long enough to split an upload
+# never occur inside one session.
+SUMMARY_GAP_NS = 1_000_000_000
+SUMMARY_FIELDS = ('row_count', 'duration_seconds', 'sample_rate_hz', 'gap_count', 'axis_stats')
+
+
+def summarize_signals(df):
+    """
+    Summarize a session's signal rows.
+
+    Args:
+        df: DataFrame with ns_since_reboot and axis columns (accel_x, ..., gyro_z)
+
+    Returns:
+        dict: row_count, duration_seconds, sample_rate_hz (from the median sample
+        interval), gap_count and axis_stats ({axis: {min, max, mean}}); fields that
+        need more rows than the session has are None
+    """
+    ns = df['ns_since_reboot'].to_numpy(dtype=np.float64)
+    summary = {'row_count': int(len(ns)), 'duration_seconds': None, 'sample_rate_hz': None, 'gap_count': 0, 'axis_stats': {}}
+    if len(ns) >= 2:
+        intervals = np.diff(ns)
+        summary['duration_seconds'] = round(float(ns[-1] - ns[0]) / 1e9, 3)
+        median = float(np.median(intervals))
+        if median > 0:
+            summary['sample_rate_hz'] = round(1e9 / median, 3)
+        summary['gap_count'] = int(np.count_nonzero(intervals > SUMMARY_GAP_NS))
+
+    for name in df.columns:
+        if name == 'ns_since_reboot':
+            continue
+        values = df[name].to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            summary['axis_stats'][name] = {'min': float(values.min()), 'max': float(values.max()), 'mean': float(values.mean())}
+        else:
+            summary['axis_stats'][name] = {'min': None, 'max': None, 'mean': None}
+    return summary
+
+
+def compute_session_summary(data_dir, start_row=None, end_row=None, start_ns=None, end_ns=None):
+    """
+    Summarize the signal rows a session covers.
+
+    Args:
+        data_dir: Directory holding the signal files (the parent's for virtual splits)
+        start_row, end_row: Optional half-open row bounds (virtual split offsets)
+        start_ns, end_ns: Optional inclusive time bounds (older splits without offsets)
+
+    Returns:
+        dict: See summarize_signals
+    """
+    df = load_session_signals.uncached(data_dir, start_offset=start_row, end_offset=end_row)
+    if start_ns is not None:
+        df = df[df['ns_since_reboot'] >= start_ns]
+    if end_ns is not None:
+        df = df[df['ns_since_reboot'] <= end_ns]
+    return summarize_signals(df)
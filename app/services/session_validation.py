@@ -0,0 +1,158 @@
+import os
+import csv
+import math
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Uploaded sessions are checked before preprocessing by sniffing their accelerometer
+# file: the header and a few kilobytes from each end are enough to reject broken
+# files and to estimate size and sample rate. The checks only read files, so many
+# sessions are sniffed at once in threads.
+VALIDATION_WORKERS = int(os.getenv('VALIDATION_WORKERS', '16'))
+SNIFF_BYTES = 64 * 1024
+SAMPLE_RATE_ROWS = 200
+MIN_FILE_BYTES = 100
+EXPECTED_COLUMNS = ['ns_since_reboot', 'x', 'y', 'z']
+
+
+def _fields(line, indices):
+    """Float values of the given fields of a CSV line; empty or malformed fields are NaN"""
+    fields = next(csv.reader([line]), [])
+    values = []
+    for i in indices:
+        try:
+            values.append(float(fields[i]))
+        except (IndexError, ValueError):
+            values.append(math.nan)
+    return values
+
+
+def sniff_session_file(csv_path, min_rows=10, sample_bytes=SNIFF_BYTES):
+    """
+    Check an accelerometer file from its header and head/tail byte samples.
+
+    Applies the same checks as SessionService.validate_session_data (columns, row
+    count, timestamps and accelerometer values present) without parsing the file
+    with pandas: rows are counted from line breaks and only as many lines are
+    parsed as the checks and estimates need.
+
+    Args:
+        csv_path: Path to the accelerometer_data.csv file
+        min_rows: Minimum number of data rows required
+        sample_bytes: Bytes read from each end of the file
+
+    Returns:
+        dict: valid, reason (None when valid), file_size, row_estimate (exact for
+        files that fit in the sample), sample_rate_hz and duration_seconds
+    """
+    report = {'valid': False, 'reason': None, 'file_size': None, 'row_estimate': None, 'sample_rate_hz': None, 'duration_seconds': None}
+    if not os.path.exists(csv_path):
+        report['reason'] = 'Accelerometer data file is missing'
+        return report
+
+    size = os.path.getsize(csv_path)
+    report['file_size'] = size
+    if size < MIN_FILE_BYTES:
+        report['reason'] = f'Accelerometer data file is too small ({size} bytes)'
+        return report
+
+    with open(csv_path, 'rb') as f:
+        head = f.read(sample_bytes)
+        whole = len(head) >= size
+        tail = b''
+        if not whole:
+            f.seek(max(size - sample_bytes, len(head)))
+            tail = f.read()
+
+    header_end = head.find(b'\n') + 1 or len(head)
+    columns = [name.strip() for name in next(csv.reader([head[:header_end].decode('utf-8', errors='replace')]), [])]
+    missing = [name for name in EXPECTED_COLUMNS if name not in columns]
+    if missing:
+        report['reason'] = f"Missing columns {missing}; found {columns}"
+        return report
+
+    body = head[header_end:]
+    if not whole:
+        # The sample ends mid-line
+        body = body[:body.rfind(b'\n') + 1]
+    data_lines = [line for line in body.decode('utf-8', errors='replace').splitlines() if line.strip()]
+    if whole:
+        report['row_estimate'] = len(data_lines)
+    elif data_lines:
+        report['row_estimate'] = int(round((size - header_end) * len(data_lines) / len(body)))
+    else:
+        report['row_estimate'] = 0
+    if report['row_estimate'] < min_rows:
+        report['reason'] = f"Insufficient data rows ({report['row_estimate']}, minimum {min_rows})"
+        return report
+
+    indices = [columns.index(name) for name in EXPECTED_COLUMNS]
+    # Timestamps of the first rows, enough for a stable median interval
+    first_ns = []
+    has_timestamps = has_values = False
+    for line in data_lines:
+        ns, *axes = _fields(line, indices)
+        if len(first_ns) < SAMPLE_RATE_ROWS:
+            first_ns.append(ns)
+        has_timestamps = has_timestamps or (not math.isnan(ns) and ns != 0)
+        has_values = has_values or not all(math.isnan(value) for value in axes)
+        if has_timestamps and has_values and len(first_ns) >= SAMPLE_RATE_ROWS:
+            break
+    if not has_timestamps:
+        report['reason'] = 'Timestamps are missing or zero'
+        return report
+    if not has_values:
+        report['reason'] = 'No valid accelerometer values'
+        return report
+
+    first_ns = np.array(first_ns)
+    first_ns = first_ns[~np.isnan(first_ns)]
+    intervals = np.diff(first_ns)
+    intervals = intervals[intervals > 0]
+    if len(intervals):
+        report['sample_rate_hz'] = round(1e9 / float(np.median(intervals)), 2)
+
+    # The last parseable timestamp, searching back from the end of the file
+    tail_lines = data_lines if whole else tail.decode('utf-8', errors='replace').splitlines()[1:]
+    last_ns = first_ns[-1]
+    for line in reversed(tail_lines):
+        ns = _fields(line, indices[:1])[0]
+        if not math.isnan(ns):
+            last_ns = ns
+            break
+    report['duration_seconds'] = round(float(last_ns - first_ns[0]) / 1e9, 3)
+
+    report['valid'] = True
+    return report
+
+
+def validate_session_files(session_names, project_path, check=sniff_session_file, workers=None):
+    """
+    Check the accelerometer file of each session in a thread pool.
+
+    Args:
+        session_names: Session directories to check
+        project_path: Path to the project directory
+        check: Function of the accelerometer CSV path returning a report dict
+        workers: Threads to use (defaults to VALIDATION_WORKERS)
+
+    Returns:
+        list: One report per session, in the order of session_names, with its session_name
+    """
+    def run(session_name):
+        csv_path = os.path.join(project_path, session_name, 'accelerometer_data.csv')
+        try:
+            report = check(csv_path)
+        except Exception as e:
+            logger.error(f"Error validating data in {csv_path}: {e}", exc_info=True)
+            report = {'valid': False, 'reason': f'Validation failed: {e}'}
+        return {'session_name': session_name, **report}
+
+    workers = max(1, min(VALIDATION_WORKERS if workers is None else workers, len(session_names)))
+    if workers == 1:
+        return [run(session_name) for session_name in session_names]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, session_names))
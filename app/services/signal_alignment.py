@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# Gyroscope samples are aligned to accelerometer samples by nearest timestamp, as
+# pd.merge_asof(direction='nearest') would: each left row takes the closest right
+# row within the tolerance, ties go to the earlier right row, and left rows without
+# a match are dropped together with rows holding missing values (merge + dropna).
+
+
+def nearest_indices(left_ns, right_ns, tolerance=None):
+    """
+    Find the right row nearest each left timestamp.
+
+    Among duplicate right timestamps the backward candidate is the last and the
+    forward candidate the first, as in merge_asof. Timestamps are compared as float64.
+
+    Args:
+        left_ns: Sorted timestamps to align
+        right_ns: Sorted timestamps to align to
+        tolerance: Largest distance that still matches (inclusive), or None
+
+    Returns:
+        numpy.ndarray: Right row index per left row, -1 where nothing is within tolerance
+    """
+    left_ns = np.asarray(left_ns, dtype=np.float64)
+    right_ns = np.asarray(right_ns, dtype=np.float64)
+    if len(right_ns) == 0:
+        return np.full(len(left_ns), -1, dtype=np.int64)
+
+    forward = np.searchsorted(right_ns, left_ns, side='left')
+    if len(right_ns) < 2 or bool(np.all(right_ns[1:] > right_ns[:-1])):
+        # Distinct timestamps: the backward candidate is just before the forward one,
+        # or is the forward one itself on an exact match, which wins anyway
+        backward = forward - 1
+    else:
+        backward = np.searchsorted(right_ns, left_ns, side='right') - 1
+
+    forward_distance = np.take(right_ns, forward, mode='clip') - left_ns
+    backward_distance = left_ns - np.take(right_ns, backward, mode='clip')
+    # Left is sorted, so only a prefix lacks a backward candidate and a suffix a forward one
+    forward_distance[np.searchsorted(forward, len(right_ns)):] = np.inf
+    backward_distance[:np.searchsorted(backward, 0)] = np.inf
+
+    nearest = np.where(backward_distance <= forward_distance, backward, forward)
+    distance = np.minimum(backward_distance, forward_distance)
+    np.putmask(nearest, distance > (np.inf if tolerance is None else tolerance), -1)
+    np.putmask(nearest, np.isinf(distance), -1)
+    return nearest
+
+
+def align_nearest(left, right, tolerance=None, on='ns_since_reboot'):
+    """
+    Join right's columns onto left's rows by nearest timestamp, keeping complete rows.
+
+    Equivalent to pd.merge_asof(left, right, on=on, tolerance=tolerance,
+    direction='nearest').dropna().reset_index(drop=True) for sorted frames.
+
+    Args:
+        left: DataFrame sorted by on (e.g. accelerometer samples)
+        right: DataFrame sorted by on (e.g. gyroscope samples)
+        tolerance: Largest timestamp distance that still matches, or None
+        on: Timestamp column
+
+    Returns:
+        pandas.DataFrame: left's columns followed by right's other columns
+    """
+    indices = nearest_indices(left[on].to_numpy(), right[on].to_numpy(), tolerance)
+    keep = indices >= 0
+    columns = {name: left[name].to_numpy() for name in left.columns}
+    for name in right.columns:
+        if name != on:
+            values = right[name].to_numpy()
+            columns[name] = values[np.maximum(indices, 0)] if len(values) else np.full(len(indices), np.nan)
+    for values in columns.values():
+        if values.dtype.kind == 'f':
+            keep &= ~np.isnan(values)
+    if keep.all():
+        return pd.DataFrame(columns)
+    return pd.DataFrame({name: values[keep] for name, values in columns.items()})
@@ -0,0 +1,376 @@
+import os
+import numpy as np
+import pandas as pd
+from app.logging_config import get_logger
+from app.services.signal_store import write_columns, read_header, open_columns, open_sidecar, source_identity, TIMESTAMP_COLUMN, AXIS_DTYPE, TIMESTAMP_DTYPE
+from app.services.utils import read_signal_csv, load_dataframe_from_csv
+
+logger = get_logger(__name__)
+
+# A level-of-detail pyramid summarises a signal file as min/max envelopes over
+# row buckets. Level 0 buckets hold BASE_BUCKET_ROWS rows and each further level
+# merges LEVEL_FACTOR buckets of the level below, until a level has at most
+# MIN_TOP_BUCKETS buckets. All levels are concatenated into one columnar file:
+#   ns_first, ns_last            first/last timestamp of each bucket
+#   <axis>_min, <axis>_max       envelope of each signal column over the bucket
+# and the header records each level's bucket size and position.
+PYRAMID_EXTENSION = '.lod'
+BASE_BUCKET_ROWS = 8
+LEVEL_FACTOR = 4
+MIN_TOP_BUCKETS = 256
+DEFAULT_MAX_POINTS = 10000
+
+
+def pyramid_path(csv_path):
+    """Return the path of the level-of-detail pyramid for a signal CSV"""
+    return os.path.splitext(csv_path)[0] + PYRAMID_EXTENSION
+
+
+def _build_levels(ns, axes):
+    """
+    Reduce a signal to min/max envelopes at every pyramid level.
+
+    Args:
+        ns: int64 timestamps, sorted ascending
+        axes: Ordered mapping of column name -> float values
+
+    Returns:
+        tuple: (level descriptors, column name -> concatenated level arrays)
+    """
+    levels = []
+    parts = {'ns_first': [], 'ns_last': []}
+    for name in axes:
+        parts[f'{name}_min'] = []
+        parts[f'{name}_max'] = []
+    if len(ns) == 0:
+        return levels, {name: np.empty(0) for name in parts}
+
+    bucket_rows = BASE_BUCKET_ROWS
+    starts = np.arange(0, len(ns), bucket_rows)
+    ns_first = ns[starts]
+    ns_last = ns[np.minimum(starts + bucket_rows, len(ns)) - 1]
+    # fmin/fmax skip NaN gaps instead of letting them swallow the whole bucket
+    mins = {name: np.fmin.reduceat(values, starts) for name, values in axes.items()}
+    maxs = {name: np.fmax.reduceat(values, starts) for name, values in axes.items()}
+
+    offset = 0
+    while True:
+        levels.append({'bucket_rows': bucket_rows, 'start': offset, 'count': len(ns_first)})
+        parts['ns_first'].append(ns_first)
+        parts['ns_last'].append(ns_last)
+        for name in axes:
+            parts[f'{name}_min'].append(mins[name])
+            parts[f'{name}_max'].append(maxs[name])
+        offset += len(ns_first)
+        if len(ns_first) <= MIN_TOP_BUCKETS:
+            break
+
+        starts = np.arange(0, len(ns_first), LEVEL_FACTOR)
+        ns_last = ns_last[np.minimum(starts + LEVEL_FACTOR, len(ns_first)) - 1]
+        ns_first = ns_first[starts]
+        mins = {name: np.fmin.reduceat(values, starts) for name, values in mins.items()}
+        maxs = {name: np.fmax.reduceat(values, starts) for name, values in maxs.items()}
+        bucket_rows *= LEVEL_FACTOR
+
+    return levels, {name: np.concatenate(arrays) for name, arrays in parts.items()}
+
+
+def write_pyramid(csv_path, df):
+    """
+    Build and persist the pyramid for a signal CSV from the frame it was written from.
+
+    Must be called after the CSV itself has been written; like the sidecar, the
+    pyramid is ignored once the CSV's size or mtime change.
+
+    Args:
+        csv_path: Path of the CSV the frame was written to
+        df: DataFrame with an ns_since_reboot column and numeric axis columns
+
+    Returns:
+        str: Path of the written pyramid
+    """
+    ns = df[TIMESTAMP_COLUMN].to_numpy().astype(np.int64)
+    axes = {name: df[name].to_numpy(dtype=np.float64) for name in df.columns if name != TIMESTAMP_COLUMN}
+    return _write_pyramid_arrays(csv_path, ns, axes)
+
+
+def write_pyramid_from_sidecar(csv_path):
+    """
+    Build the pyramid for a signal CSV straight from its memory-mapped sidecar.
+
+    Level 0 is reduced from the mapped float32 columns, so only the pyramid itself
+    is held in memory. Min/max commute with rounding to float32, so the result
+    matches a pyramid built from the float64 frame.
+    """
+    columns = open_sidecar(csv_path)
+    if columns is None:
+        raise ValueError(f"No valid sidecar to build a pyramid from for {csv_path}")
+    axes = {name: values for name, values in columns.items() if name != TIMESTAMP_COLUMN}
+    return _write_pyramid_arrays(csv_path, columns[TIMESTAMP_COLUMN], axes)
+
+
+def _write_pyramid_arrays(csv_path, ns, axes):
+    levels, arrays = _build_levels(ns, axes)
+
+    columns = {}
+    for name, values in arrays.items():
+        columns[name] = (values, TIMESTAMP_DTYPE if name.startswith('ns_') else AXIS_DTYPE)
+
+    source_size, source_mtime_ns = source_identity(csv_path)
+    path = pyramid_path(csv_path)
+    write_columns(path, columns, extra_header={
+        'signal_rows': len(ns),
+        'axes': list(axes),
+        'levels': levels,
+        'source_size': source_size,
+        'source_mtime_ns': source_mtime_ns
+    })
+    logger.debug(f"Wrote signal pyramid {path} ({len(levels)} levels over {len(ns)} rows)")
+    return path
+
+
+def build_pyramid_from_csv(csv_path):
+    """Read a signal file and write its pyramid (used to backfill existing data)"""
+    df = read_signal_csv.uncached(csv_path)
+    if df[TIMESTAMP_COLUMN].isna().any():
+        raise ValueError(f"Timestamps in {csv_path} contain missing values")
+    numeric = [TIMESTAMP_COLUMN] + [c for c in df.columns if c != TIMESTAMP_COLUMN and pd.api.types.is_numeric_dtype(df[c])]
+    return write_pyramid(csv_path, df[numeric])
+
+
+class SignalPyramid:
+    """Read-only view over a memory-mapped pyramid file"""
+
+    def __init__(self, header, columns):
+        self.header = header
+        self.columns = columns
+        self.axes = header['axes']
+        self.levels = header['levels']
+        self.signal_rows = header['signal_rows']
+
+    def level(self, index):
+        """Return column name -> array for one level"""
+        descriptor = self.levels[index]
+        start = descriptor['start']
+        stop = start + descriptor['count']
+        return {name: values[start:stop] for name, values in self.columns.items()}
+
+    def rows_for_time_range(self, start_ns=None, end_ns=None):
+        """
+        Find the signal rows covering [start_ns, end_ns] to level-0 bucket precision.
+
+        Returns:
+            tuple: (start_row, end_row) half-open row range
+        """
+        if not self.levels:
+            return 0, 0
+        finest = self.level(0)
+        bucket_rows = self.levels[0]['bucket_rows']
+        first = 0 if start_ns is None else int(np.searchsorted(finest['ns_last'], start_ns, side='left'))
+        last = len(finest['ns_first']) if end_ns is None else int(np.searchsorted(finest['ns_first'], end_ns, side='right'))
+        return min(first * bucket_rows, self.signal_rows), min(last * bucket_rows, self.signal_rows)
+
+    def choose_level(self, start_row, end_row, max_points):
+        """
+        Pick the finest level whose buckets over [start_row, end_row) fit in max_points.
+
+        Each bucket is drawn as two points (its min and its max). When not even the
+        coarsest level fits, it is still returned and envelope() merges its buckets
+        further to honour max_points.
+
+        Returns:
+            int: Level index, or None when the raw rows themselves fit
+        """
+        if end_row - start_row <= max_points:
+            return None
+        for index, descriptor in enumerate(self.levels):
+            bucket_rows = descriptor['bucket_rows']
+            buckets = -(-end_row // bucket_rows) - start_row // bucket_rows
+            if 2 * buckets <= max_points:
+                return index
+        return len(self.levels) - 1
+
+    def _reduce_rows(self, read_rows, start_row, end_row):
+        """Summarise raw rows [start_row, end_row) as a single bucket"""
+        rows = read_rows(start_row, end_row)
+        ns = np.asarray(rows[TIMESTAMP_COLUMN], dtype=np.int64)
+        bucket = {'ns_first': ns[:1], 'ns_last': ns[-1:]}
+        for name in self.axes:
+            values = np.asarray(rows[name], dtype=np.float64)
+            bucket[f'{name}_min'] = np.array([np.fmin.reduce(values)])
+            bucket[f'{name}_max'] = np.array([np.fmax.reduce(values)])
+        return bucket
+
+    def envelope(self, index, start_row, end_row, read_rows, max_points=None):
+        """
+        Return the min/max envelope of one level over [start_row, end_row).
+
+        Buckets wholly inside the range come from the level. A range that does not
+        start or end on a bucket boundary (virtual splits rarely do) has partial
+        buckets at its edges, and those are reduced from the raw rows in range so no
+        sample outside [start_row, end_row) leaks into the view. When max_points is
+        given and the buckets still do not fit, consecutive buckets are merged.
+
+        Each bucket becomes two rows: (ns_first, axis minima) then (ns_last, axis maxima).
+
+        Args:
+            index: Level index from choose_level
+            start_row, end_row: Half-open row range
+            read_rows: Callable (start, end) -> column name -> raw values for those rows
+            max_points: Optional bound on the number of returned rows
+
+        Returns:
+            tuple: (DataFrame, bucket_rows) where bucket_rows is the nominal rows per bucket
+        """
+        bucket_rows = self.levels[index]['bucket_rows']
+        level = self.level(index)
+        lo = -(-start_row // bucket_rows)
+        hi = max(lo, end_row // bucket_rows)
+        head_end = min(lo * bucket_rows, end_row)
+        tail_start = max(hi * bucket_rows, head_end)
+
+        pieces = []
+        if start_row < head_end:
+            pieces.append(self._reduce_rows(read_rows, start_row, head_end))
+        pieces.append({name: values[lo:hi] for name, values in level.items()})
+        if tail_start < end_row:
+            pieces.append(self._reduce_rows(read_rows, tail_start, end_row))
+        buckets = {name: np.concatenate([piece[name] for piece in pieces]) for name in level}
+
+        count = len(buckets['ns_first'])
+        if max_points is not None and 2 * count > max_points:
+            if max_points < 2:
+                raise ValueError("max_points must be at least 2 to draw a min/max envelope")
+            group = -(-count // (max_points // 2))
+            starts = np.arange(0, count, group)
+            merged = {
+                'ns_first': buckets['ns_first'][starts],
+                'ns_last': buckets['ns_last'][np.minimum(starts + group, count) - 1]
+            }
+            for name in self.axes:
+                merged[f'{name}_min'] = np.fmin.reduceat(buckets[f'{name}_min'], starts)
+                merged[f'{name}_max'] = np.fmax.reduceat(buckets[f'{name}_max'], starts)
+            buckets = merged
+            bucket_rows *= group
+
+        data = {TIMESTAMP_COLUMN: np.column_stack((buckets['ns_first'], buckets['ns_last'])).ravel()}
+        for name in self.axes:
+            pairs = np.column_stack((buckets[f'{name}_min'], buckets[f'{name}_max']))
+            data[name] = pairs.ravel().astype(np.float64)
+        return pd.DataFrame(data), bucket_rows
+
+
+def _raw_row_reader(csv_path):
+    """Return a (start, end) -> raw columns reader for a signal file, preferring its sidecar"""
+    def read_rows(start, end):
+        columns = open_sidecar(csv_path)
+        if columns is not None:
+            return {name: np.asarray(values[start:end]) for name, values in columns.items()}
+        df = read_signal_csv(csv_path)
+        return {name: df[name].to_numpy()[start:end] for name in df.columns}
+    return read_rows
+
+
+def load_pyramid(csv_path):
+    """
+    Map a signal CSV's pyramid if it still matches the CSV on disk.
+
+    Returns:
+        SignalPyramid, or None when missing, stale or unreadable
+    """
+    path = pyramid_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        header = read_header(path)
+        if not os.path.exists(csv_path) or (header.get('source_size'), header.get('source_mtime_ns')) != source_identity(csv_path):
+            return None
+        return SignalPyramid(header, open_columns(path, header))
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable signal pyramid {path}: {e}")
+        return None
+
+
+def _decimated_view(csv_path, column_prefix, start_ns, end_ns, start_row, end_row, max_points):
+    """
+    Stride through a signal that has no pyramid, keeping at most max_points rows.
+
+    Serves files the upload path and the backfill migration have not covered yet
+    without building their pyramid during a request. Reads the memory-mapped
+    sidecar when there is one, and the CSV otherwise.
+
+    Returns:
+        tuple: (DataFrame, bucket_rows) where bucket_rows is the stride
+    """
+    columns = open_sidecar(csv_path)
+    if columns is None:
+        df = read_signal_csv(csv_path)
+        columns = {name: df[name].to_numpy() for name in df.columns}
+    timestamps = columns[TIMESTAMP_COLUMN]
+    first = 0 if start_row is None else start_row
+    last = len(timestamps) if end_row is None else min(end_row, len(timestamps))
+    rows = np.arange(first, max(first, last))
+    if start_ns is not None or end_ns is not None:
+        window = np.asarray(timestamps[first:first + len(rows)])
+        lower = -np.inf if start_ns is None else start_ns
+        upper = np.inf if end_ns is None else end_ns
+        rows = rows[(window >= lower) & (window <= upper)]
+    bucket_rows = 1 if max_points is None else max(1, -(-len(rows) // max_points))
+    rows = rows[::bucket_rows]
+
+    renames = {'x': f'{column_prefix}_x', 'y': f'{column_prefix}_y', 'z': f'{column_prefix}_z'}
+    wanted = [TIMESTAMP_COLUMN, *renames, *renames.values()]
+    df = pd.DataFrame({name: np.asarray(values[rows]) for name, values in columns.items() if name in wanted})
+    df = df.rename(columns=renames)
+    return df.astype({name: float for name in df.columns}), bucket_rows
+
+
+def query_signal_view(csv_path, column_prefix='accel', start_ns=None, end_ns=None, start_row=None, end_row=None, max_points=DEFAULT_MAX_POINTS):
+    """
+    Return at most max_points samples describing a signal over a time/row window.
+
+    Windows that fit the budget are returned at full resolution; larger windows
+    are answered from the finest pyramid level that fits, as min/max pairs, so
+    short spikes survive any zoom level and the cost does not grow with the window.
+    Files without a pyramid yet are decimated by striding instead, until the
+    backfill migration builds one.
+
+    Args:
+        csv_path: Path of the signal CSV (the parent file for virtual splits)
+        column_prefix: Prefix for legacy x/y/z column names ('accel' or 'gyro')
+        start_ns, end_ns: Optional inclusive time bounds
+        start_row, end_row: Optional half-open row bounds (virtual split offsets)
+        max_points: Maximum number of samples to return (at least 2 when the
+            window has to be downsampled)
+
+    Returns:
+        tuple: (DataFrame, bucket_rows) where bucket_rows is 1 for raw samples
+    """
+    pyramid = load_pyramid(csv_path)
+    if pyramid is None:
+        logger.debug(f"No signal pyramid for {csv_path}, serving a strided read")
+        return _decimated_view(csv_path, column_prefix, start_ns, end_ns, start_row, end_row, max_points)
+    first, last = pyramid.rows_for_time_range(start_ns, end_ns)
+    if start_row is not None:
+        first = max(first, start_row)
+    if end_row is not None:
+        last = min(last, end_row)
+    last = max(first, last)
+
+    index = pyramid.choose_level(first, last, max_points)
+    if index is None:
+        df = load_dataframe_from_csv(csv_path, column_prefix=column_prefix, start_offset=first, end_offset=last)
+        bucket_rows = 1
+    else:
+        df, bucket_rows = pyramid.envelope(index, first, last, _raw_row_reader(csv_path), max_points)
+        df = df.rename(columns={'x': f'{column_prefix}_x', 'y': f'{column_prefix}_y', 'z': f'{column_prefix}_z'})
+
+    if start_ns is not None or end_ns is not None:
+        lower = -np.inf if start_ns is None else start_ns
+        upper = np.inf if end_ns is None else end_ns
+        if bucket_rows == 1:
+            df = df[(df[TIMESTAMP_COLUMN] >= lower) & (df[TIMESTAMP_COLUMN] <= upper)]
+        else:
+            # Edge buckets may straddle the window; pin their timestamps to its bounds
+            df[TIMESTAMP_COLUMN] = df[TIMESTAMP_COLUMN].clip(lower=lower, upper=upper)
+    return df.reset_index(drop=True), bucket_rows
@@ -0,0 +1,484 @@
+import os
+import json
+import struct
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Sidecar layout:
+#   MAGIC (8 bytes) | header length (uint32 LE) | JSON header | padding | column blocks
+# Each column block is a contiguous little-endian array whose byte offset and dtype
+# are recorded in the JSON header. Blocks are aligned to DATA_ALIGNMENT bytes.
+MAGIC = b'LBLCOLS1'
+FORMAT_VERSION = 1
+DATA_ALIGNMENT = 64
+SIDECAR_EXTENSION = '.cols'
+COLUMNS_MIMETYPE = 'application/vnd.label.columns'
+
+TIMESTAMP_COLUMN = 'ns_since_reboot'
+TIMESTAMP_DTYPE = '<i8'
+AXIS_DTYPE = '<f4'
+# Signal CSVs are authoritative and keep full precision; only sidecars narrow the axes
+CSV_AXIS_DTYPE = '<f8'
+
+# A session's aligned accelerometer and gyroscope rows, side by side in one file
+MERGED_STORE_NAME = 'signals.cols'
+SIGNAL_FILES = (('accel', 'accelerometer_data.csv'), ('gyro', 'gyroscope_data.csv'))
+
+
+def sidecar_path(csv_path):
+    """Return the path of the binary sidecar that shadows a signal CSV"""
+    return os.path.splitext(csv_path)[0] + SIDECAR_EXTENSION
+
+
+def source_identity(csv_path):
+    """Return the (size, mtime_ns) pair that derived files record to detect a changed CSV"""
+    stat = os.stat(csv_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _aligned(offset):
+    return (offset + DATA_ALIGNMENT - 1) // DATA_ALIGNMENT * DATA_ALIGNMENT
+
+
+def _plan_layout(specs, num_rows, extra_header=None, default=None):
+    """
+    Place columns of known dtype and length in the columnar binary format.
+
+    Args:
+        specs: Ordered list of (column name, numpy dtype)
+        num_rows: Length of every column
+
+    Returns:
+        tuple: (header dict, encoded header bytes, total size)
+    """
+    header = {'version': FORMAT_VERSION, 'num_rows': num_rows, 'columns': []}
+    if extra_header:
+        header.update(extra_header)
+
+    # Offsets depend on the header size, which depends on the offsets, so size the
+    # header with placeholder offsets first and then fill them in.
+    for name, dtype in specs:
+        header['columns'].append({'name': name, 'dtype': np.dtype(dtype).str, 'offset': 0})
+    header_bytes = json.dumps(header, default=default).encode('utf-8')
+    # Reserve room for offsets growing by a few digits each
+    data_start = _aligned(len(MAGIC) + 4 + len(header_bytes) + 32 * len(specs))
+
+    offset = data_start
+    for column, (_, dtype) in zip(header['columns'], specs):
+        column['offset'] = offset
+        offset = _aligned(offset + num_rows * np.dtype(dtype).itemsize)
+    header_bytes = json.dumps(header, default=default).encode('utf-8')
+    if len(MAGIC) + 4 + len(header_bytes) > data_start:
+        raise ValueError("Columnar header does not fit in reserved space")
+    return header, header_bytes, max(offset, data_start)
+
+
+def _layout(columns, extra_header=None, default=None):
+    """
+    Lay out named, typed columns in the columnar binary format.
+
+    Returns:
+        tuple: (header dict, encoded header bytes, [(column entry, array)], total size)
+    """
+    arrays = [(name, np.ascontiguousarray(values, dtype=dtype)) for name, (values, dtype) in columns.items()]
+    num_rows = len(arrays[0][1]) if arrays else 0
+    if any(len(values) != num_rows for _, values in arrays):
+        raise ValueError("All columns must have the same length")
+
+    header, header_bytes, total_size = _plan_layout([(name, values.dtype) for name, values in arrays], num_rows, extra_header, default)
+    blocks = [(column, values) for column, (_, values) in zip(header['columns'], arrays)]
+    return header, header_bytes, blocks, total_size
+
+
+def write_columns(path, columns, extra_header=None):
+    """
+    Write named, typed columns to a columnar binary file.
+
+    The file is written to a temporary path in the same directory and renamed
+    into place so readers never observe a partially written sidecar.
+
+    Args:
+        path: Destination path
+        columns: Ordered mapping of column name -> (numpy array, dtype string)
+        extra_header: Optional dict merged into the JSON header
+
+    Returns:
+        dict: The header that was written
+    """
+    header, header_bytes, blocks, total_size = _layout(columns, extra_header)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix=SIDECAR_EXTENSION)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header_bytes)))
+            f.write(header_bytes)
+            for column, values in blocks:
+                f.seek(column['offset'])
+                f.write(values.tobytes())
+            f.truncate(total_size)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return header
+
+
+def encode_columns(columns, extra_header=None, default=None):
+    """
+    Encode named, typed columns in the columnar binary format as an in-memory buffer.
+
+    Used as the wire format for session data responses (COLUMNS_MIMETYPE). Blocks
+    are aligned so clients can view them directly as typed arrays.
+
+    Args:
+        columns: Ordered mapping of column name -> (numpy array, dtype string)
+        extra_header: Optional dict merged into the JSON header
+        default: Optional json.dumps fallback for values in extra_header
+
+    Returns:
+        bytes: The encoded buffer
+    """
+    _, header_bytes, blocks, total_size = _layout(columns, extra_header, default)
+    buffer = bytearray(total_size)
+    buffer[:len(MAGIC)] = MAGIC
+    buffer[len(MAGIC):len(MAGIC) + 4] = struct.pack('<I', len(header_bytes))
+    buffer[len(MAGIC) + 4:len(MAGIC) + 4 + len(header_bytes)] = header_bytes
+    for column, values in blocks:
+        buffer[column['offset']:column['offset'] + values.nbytes] = values.tobytes()
+    return bytes(buffer)
+
+
+class ColumnWriter:
+    """
+    Build a columnar binary file from chunks without holding whole columns in memory.
+
+    Each column is spooled to its own temporary file next to the destination; close()
+    lays the spooled columns out in the usual format and renames the result into place.
+    """
+
+    def __init__(self, path, dtypes):
+        """
+        Args:
+            path: Destination path
+            dtypes: Ordered mapping of column name -> dtype string
+        """
+        self.path = path
+        self.specs = [(name, np.dtype(dtype)) for name, dtype in dtypes.items()]
+        self.num_rows = 0
+        self.timestamps_sorted = True
+        self.last_timestamp = None
+        directory = os.path.dirname(os.path.abspath(path))
+        self.spools = {}
+        for name, _ in self.specs:
+            fd, spool_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.col')
+            self.spools[name] = (os.fdopen(fd, 'wb'), spool_path)
+
+    def append(self, columns):
+        """Append one chunk given as column name -> array (all the same length)"""
+        lengths = {len(columns[name]) for name, _ in self.specs}
+        if len(lengths) != 1:
+            raise ValueError(f"All columns must have the same length when writing {self.path}")
+        if TIMESTAMP_COLUMN in columns and len(columns[TIMESTAMP_COLUMN]):
+            timestamps = np.asarray(columns[TIMESTAMP_COLUMN])
+            if self.last_timestamp is not None and timestamps[0] < self.last_timestamp:
+                self.timestamps_sorted = False
+            elif np.any(np.diff(timestamps) < 0):
+                self.timestamps_sorted = False
+            self.last_timestamp = timestamps[-1]
+        for name, dtype in self.specs:
+            self.spools[name][0].write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+        self.num_rows += lengths.pop()
+
+    def close(self, extra_header=None):
+        """
+        Assemble the spooled columns into the destination file.
+
+        Returns:
+            dict: The header that was written
+        """
+        if any(name == TIMESTAMP_COLUMN for name, _ in self.specs):
+            extra_header = {**(extra_header or {}), 'timestamps_sorted': self.timestamps_sorted}
+        header, header_bytes, total_size = _plan_layout(self.specs, self.num_rows, extra_header)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix=SIDECAR_EXTENSION)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(MAGIC)
+                f.write(struct.pack('<I', len(header_bytes)))
+                f.write(header_bytes)
+                for column in header['columns']:
+                    spool, spool_path = self.spools[column['name']]
+                    spool.close()
+                    f.seek(column['offset'])
+                    with open(spool_path, 'rb') as source:
+                        shutil.copyfileobj(source, f)
+                f.truncate(total_size)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            self.discard()
+        return header
+
+    def discard(self):
+        """Drop the spooled columns without writing the destination"""
+        for spool, spool_path in self.spools.values():
+            spool.close()
+            if os.path.exists(spool_path):
+                os.remove(spool_path)
+        self.spools = {}
+
+
+def read_header(path):
+    """Read and validate the JSON header of a columnar binary file"""
+    with open(path, 'rb') as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"Not a columnar sidecar file: {path}")
+        (header_len,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_len).decode('utf-8'))
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported sidecar version {header.get('version')} in {path}")
+    return header
+
+
+def open_columns(path, header=None):
+    """
+    Memory-map every column of a columnar binary file.
+
+    Slicing a returned column is zero-copy and only touches the pages covering the
+    slice, so reading rows [start:end] costs O(end - start) regardless of where in
+    the file they sit.
+
+    Returns:
+        dict: Column name -> read-only numpy array, in stored order
+    """
+    header = header or read_header(path)
+    num_rows = header['num_rows']
+    columns = {}
+    for column in header['columns']:
+        dtype = np.dtype(column['dtype'])
+        if num_rows == 0:
+            columns[column['name']] = np.empty(0, dtype=dtype)
+        else:
+            columns[column['name']] = np.memmap(path, dtype=dtype, mode='r', offset=column['offset'], shape=(num_rows,))
+    return columns
+
+
+def write_sidecar(csv_path, df):
+    """
+    Write the binary sidecar for a signal CSV from the frame it was written from.
+
+    Must be called after the CSV itself has been written: the sidecar records the
+    CSV's size and mtime and is ignored by readers once the CSV changes.
+
+    Args:
+        csv_path: Path of the CSV the frame was written to
+        df: DataFrame with an ns_since_reboot column and numeric axis columns
+    """
+    columns = {TIMESTAMP_COLUMN: (df[TIMESTAMP_COLUMN].to_numpy(), TIMESTAMP_DTYPE)}
+    # Time-range reads binary search sorted timestamps and mask anything else
+    timestamps_sorted = bool(df[TIMESTAMP_COLUMN].is_monotonic_increasing)
+    for name in df.columns:
+        if name == TIMESTAMP_COLUMN:
+            continue
+        columns[name] = (df[name].to_numpy(), AXIS_DTYPE)
+
+    source_size, source_mtime_ns = source_identity(csv_path)
+    path = sidecar_path(csv_path)
+    write_columns(path, columns, extra_header={
+        'source_size': source_size,
+        'source_mtime_ns': source_mtime_ns,
+        'timestamps_sorted': timestamps_sorted
+    })
+    logger.debug(f"Wrote signal sidecar {path} ({len(df)} rows)")
+    return path
+
+
+def has_valid_sidecar(csv_path):
+    """
+    Check whether a signal CSV has a sidecar that still matches the CSV on disk.
+
+    The CSV is authoritative: a sidecar whose CSV is missing (left behind by a
+    deleted or moved session) has nothing to be checked against and is not valid.
+    """
+    path = sidecar_path(csv_path)
+    if not os.path.exists(path) or not os.path.exists(csv_path):
+        return False
+    try:
+        header = read_header(path)
+        return (header.get('source_size'), header.get('source_mtime_ns')) == source_identity(csv_path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable sidecar {path}: {e}")
+        return False
+
+
+def open_sidecar(csv_path):
+    """
+    Memory-map the columns of a signal CSV's sidecar.
+
+    Returns:
+        dict: Column name -> read-only array, or None when there is no valid sidecar
+    """
+    if not has_valid_sidecar(csv_path):
+        return None
+    path = sidecar_path(csv_path)
+    try:
+        return open_columns(path)
+    except Exception as e:
+        logger.warning(f"Failed to map sidecar {path}, falling back to CSV: {e}")
+        return None
+
+
+def read_sidecar(csv_path, start_offset=None, end_offset=None):
+    """
+    Load a signal CSV's data from its binary sidecar.
+
+    Args:
+        csv_path: Path of the signal CSV
+        start_offset: Optional first row to load (virtual split start)
+        end_offset: Optional row to stop before (virtual split end)
+
+    Returns:
+        pandas.DataFrame with the CSV's columns (int64 timestamps, float32 axes),
+        or None when there is no valid sidecar and the caller should parse the CSV.
+    """
+    columns = open_sidecar(csv_path)
+    if columns is None:
+        return None
+    # Only the requested rows are copied out of the mapping
+    return pd.DataFrame({name: np.array(values[start_offset:end_offset]) for name, values in columns.items()})
+
+
+def read_sidecar_time_range(csv_path, start_ns, stop_ns):
+    """
+    Load the rows of a signal CSV whose timestamps fall in [start_ns, stop_ns].
+
+    When the sidecar header records sorted timestamps, the row range is found with
+    a binary search on the mapped timestamp column instead of scanning the file.
+    Otherwise (unsorted data, or sidecars written before the flag existed) the
+    timestamps are masked, which keeps the matching rows in file order.
+
+    Returns:
+        pandas.DataFrame, or None when there is no valid sidecar
+    """
+    columns = open_sidecar(csv_path)
+    if columns is None:
+        return None
+    timestamps = columns[TIMESTAMP_COLUMN]
+    if read_header(sidecar_path(csv_path)).get('timestamps_sorted'):
+        start = int(np.searchsorted(timestamps, start_ns, side='left'))
+        end = int(np.searchsorted(timestamps, stop_ns, side='right'))
+        return pd.DataFrame({name: np.array(values[start:end]) for name, values in columns.items()})
+    rows = np.flatnonzero((timestamps >= start_ns) & (timestamps <= stop_ns))
+    return pd.DataFrame({name: values[rows] for name, values in columns.items()})
+
+
+def build_sidecar_from_csv(csv_path):
+    """
+    Parse a signal CSV and write its sidecar (used to backfill existing data).
+
+    Returns:
+        str: Path of the written sidecar, or None if the CSV cannot be represented
+    """
+    from app.services.utils import read_signal_table
+
+    df = read_signal_table(csv_path)
+    if TIMESTAMP_COLUMN not in df.columns:
+        logger.warning(f"Skipping sidecar for {csv_path}: missing {TIMESTAMP_COLUMN} column")
+        return None
+    if df[TIMESTAMP_COLUMN].isna().any():
+        logger.warning(f"Skipping sidecar for {csv_path}: timestamps contain missing values")
+        return None
+    numeric = [TIMESTAMP_COLUMN] + [c for c in df.columns if c != TIMESTAMP_COLUMN and pd.api.types.is_numeric_dtype(df[c])]
+    return write_sidecar(csv_path, df[numeric])
+
+
+def merged_store_path(data_dir):
+    """Return the path of a session directory's merged 6-axis store"""
+    return os.path.join(data_dir, MERGED_STORE_NAME)
+
+
+def write_merged_store(data_dir):
+    """
+    Combine a session's accelerometer and gyroscope sidecars into one 6-axis store.
+
+    Uploads write both signal files from the same aligned rows, so the store holds
+    their columns side by side. It records both CSVs' size and mtime and is ignored
+    by readers once either changes.
+
+    Returns:
+        str: Path of the written store, or None when either file lacks a valid
+        sidecar or their timestamps differ
+    """
+    columns = {}
+    sources = {}
+    for prefix, file_name in SIGNAL_FILES:
+        csv_path = os.path.join(data_dir, file_name)
+        if not os.path.exists(csv_path):
+            return None
+        mapped = open_sidecar(csv_path)
+        if mapped is None:
+            return None
+        if TIMESTAMP_COLUMN not in columns:
+            columns[TIMESTAMP_COLUMN] = (mapped[TIMESTAMP_COLUMN], TIMESTAMP_DTYPE)
+        elif not np.array_equal(mapped[TIMESTAMP_COLUMN], columns[TIMESTAMP_COLUMN][0]):
+            logger.warning(f"Not merging signals in {data_dir}: accelerometer and gyroscope rows differ")
+            return None
+        for axis in 'xyz':
+            name = f'{prefix}_{axis}'
+            columns[name] = (mapped[name] if name in mapped else mapped[axis], AXIS_DTYPE)
+        sources[file_name] = list(source_identity(csv_path))
+
+    path = merged_store_path(data_dir)
+    write_columns(path, columns, extra_header={'sources': sources})
+    logger.debug(f"Wrote merged signal store {path}")
+    return path
+
+
+def open_merged_store(data_dir):
+    """
+    Memory-map the columns of a session's merged 6-axis store.
+
+    Returns:
+        dict: Column name -> read-only array, or None when there is no store or
+        either signal CSV changed since it was written
+    """
+    path = merged_store_path(data_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        header = read_header(path)
+        for file_name, identity in header.get('sources', {}).items():
+            csv_path = os.path.join(data_dir, file_name)
+            if not os.path.exists(csv_path) or list(source_identity(csv_path)) != identity:
+                return None
+        return open_columns(path, header)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable merged signal store {path}: {e}")
+        return None
+
+
+def read_merged_store(data_dir, start_offset=None, end_offset=None):
+    """
+    Load rows of a session's merged store: int64 timestamps and float32 accel/gyro axes.
+
+    Rows are the signal CSVs' rows, so virtual split offsets apply unchanged.
+
+    Returns:
+        pandas.DataFrame, or None when there is no valid store
+    """
+    columns = open_merged_store(data_dir)
+    if columns is None:
+        return None
+    return pd.DataFrame({name: np.array(values[start_offset:end_offset]) for name, values in columns.items()})
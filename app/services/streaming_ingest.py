@@ -0,0 +1,341 @@
+import os
+import numpy as np
+import pandas as pd
+from app.exceptions import ValidationError
+from app.logging_config import get_logger
+from app.services.utils import resample, read_signal_table
+from app.services.signal_store import ColumnWriter, sidecar_path, source_identity, write_merged_store, TIMESTAMP_COLUMN, TIMESTAMP_DTYPE, AXIS_DTYPE, CSV_AXIS_DTYPE
+from app.services.signal_pyramid import write_pyramid_from_sidecar
+from app.services.session_splits import resample_bin_starts
+from app.services.signal_alignment import align_nearest
+
+logger = get_logger(__name__)
+
+# Uploads whose accelerometer CSV is at least this large are ingested in chunks
+STREAMING_INGEST_MIN_BYTES = int(os.getenv('STREAMING_INGEST_MIN_MB', '512')) * 1024 * 1024
+DEFAULT_CHUNK_ROWS = 500_000
+GAP_THRESHOLD_NS = 30 * 60 * 1_000_000_000
+DAY_NS = 24 * 60 * 60 * 1_000_000_000
+
+ACCEL_COLUMNS = [TIMESTAMP_COLUMN, 'accel_x', 'accel_y', 'accel_z']
+GYRO_COLUMNS = [TIMESTAMP_COLUMN, 'gyro_x', 'gyro_y', 'gyro_z']
+
+
+class _IntervalMedian:
+    """Exact median of consecutive timestamp differences, kept as value counts"""
+
+    def __init__(self):
+        self.counts = {}
+        self.previous = None
+
+    def add(self, ns):
+        values = ns if self.previous is None else np.concatenate(([self.previous], ns))
+        diffs = np.diff(values)
+        self.previous = ns[-1]
+        for value, count in zip(*np.unique(diffs, return_counts=True)):
+            self.counts[value] = self.counts.get(value, 0) + count
+
+    def median(self):
+        total = sum(self.counts.values())
+        if total == 0:
+            return float('nan')
+        middle = [(total - 1) // 2, total // 2]
+        found = []
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            while middle and middle[0] < seen:
+                middle.pop(0)
+                found.append(value)
+        return float(np.mean(found))
+
+
+class _StreamingResampler:
+    """
+    Resample a time-ordered stream exactly like utils.resample on the whole frame.
+
+    Rows of the last, possibly incomplete bin are held back and prepended to the
+    next chunk, and the last emitted row seeds forward-filling of the next chunk.
+    """
+
+    def __init__(self, target_hz):
+        self.target_hz = target_hz
+        self.freq = f'{1000 // target_hz}ms'
+        self.bin_ns = (1000 // target_hz) * 1_000_000
+        if DAY_NS % self.bin_ns != 0:
+            # utils.resample bins from midnight of the first sample's day, which only
+            # lines up across chunks when the bin width divides a day
+            raise ValidationError(f"Streaming resample does not support {target_hz} Hz")
+        self.remainder = None
+        self.last_row = None
+
+    def _emit(self, df):
+        out = resample(df, target_hz=self.target_hz)
+        if self.last_row is not None:
+            previous_bin = int(self.last_row[TIMESTAMP_COLUMN].iloc[0])
+            first_bin = int(out[TIMESTAMP_COLUMN].iloc[0])
+            if first_bin > previous_bin + self.bin_ns:
+                # Empty bins between the chunks, as the whole-frame resample emits them
+                missing = pd.DataFrame({TIMESTAMP_COLUMN: np.arange(previous_bin + self.bin_ns, first_bin, self.bin_ns, dtype=np.int64)})
+                out = pd.concat([missing, out], ignore_index=True)[out.columns]
+            out = pd.concat([self.last_row, out], ignore_index=True).ffill().iloc[1:].reset_index(drop=True)
+        self.last_row = out.iloc[-1:]
+        return out
+
+    def push(self, df):
+        """Add a chunk and return the fully resampled bins it completes"""
+        if self.remainder is not None:
+            df = pd.concat([self.remainder, df], ignore_index=True)
+        bins = pd.to_datetime(df[TIMESTAMP_COLUMN], unit='ns').dt.floor(self.freq)
+        complete = (bins != bins.iloc[-1]).to_numpy()
+        self.remainder = df[~complete]
+        if not complete.any():
+            return None
+        return self._emit(df[complete])
+
+    def flush(self):
+        """Return the bins still held back at the end of the stream"""
+        if self.remainder is None or self.remainder.empty:
+            return None
+        out = self._emit(self.remainder)
+        self.remainder = None
+        return out
+
+
+class _SignalOutput:
+    """A signal CSV being written chunk by chunk, with its sidecar spooled alongside"""
+
+    def __init__(self, csv_path, columns, tag):
+        self.csv_path = csv_path
+        self.columns = columns
+        self.tmp_path = os.path.join(os.path.dirname(csv_path), f'.tmp_{tag}_{os.path.basename(csv_path)}')
+        self.file = open(self.tmp_path, 'w', newline='')
+        self.header_written = False
+        # The CSV keeps float64 axes; the sidecar writer narrows them to float32
+        self.dtypes = {name: TIMESTAMP_DTYPE if name == TIMESTAMP_COLUMN else CSV_AXIS_DTYPE for name in columns}
+        self.sidecar = ColumnWriter(sidecar_path(csv_path), {name: TIMESTAMP_DTYPE if name == TIMESTAMP_COLUMN else AXIS_DTYPE for name in columns})
+
+    def write(self, df):
+        frame = df[self.columns].astype(self.dtypes)
+        frame.to_csv(self.file, index=False, header=not self.header_written)
+        self.header_written = True
+        self.sidecar.append({name: frame[name].to_numpy() for name in self.columns})
+
+    def commit(self):
+        """Move the CSV into place, then its sidecar and pyramid"""
+        if not self.header_written:
+            pd.DataFrame(columns=self.columns).to_csv(self.file, index=False)
+        self.file.close()
+        source_size, source_mtime_ns = source_identity(self.tmp_path)
+        # Renaming keeps size and mtime, so the sidecar matches the CSV once both are in place
+        self.sidecar.close(extra_header={'source_size': source_size, 'source_mtime_ns': source_mtime_ns})
+        os.replace(self.tmp_path, self.csv_path)
+        try:
+            write_pyramid_from_sidecar(self.csv_path)
+        except Exception as e:
+            logger.warning(f"Could not write signal pyramid for {self.csv_path}: {e}")
+
+    def discard(self):
+        self.file.close()
+        self.sidecar.discard()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class StreamingSessionIngest:
+    """
+    Chunked equivalent of the in-memory upload preprocessing.
+
+    Reads the accelerometer (and optional gyroscope) CSVs in time-ordered chunks,
+    aligns them by nearest timestamp, detects recording gaps and resamples, keeping memory bounded
+    by the chunk size instead of the session length. State carried across chunk
+    boundaries:
+      - the held-back last row of each file (the in-memory loader drops it)
+      - the gyroscope rows around the previous chunk's end, for the nearest merge
+      - the previous timestamp and row count, for gap detection
+      - the resample bin remainder and last resampled row, for mean/ffill
+
+    The written files and the returned plan match the in-memory path exactly. Inputs
+    the streaming path cannot reproduce (unsorted or duplicate timestamps) raise
+    ValidationError so the caller can fall back to the in-memory path.
+    """
+
+    def __init__(self, accel_csv_path, gyro_csv_path=None, chunk_rows=DEFAULT_CHUNK_ROWS, gap_threshold_ns=GAP_THRESHOLD_NS, target_hz=50):
+        self.accel_csv_path = accel_csv_path
+        self.gyro_csv_path = gyro_csv_path if gyro_csv_path and os.path.exists(gyro_csv_path) else None
+        self.chunk_rows = chunk_rows
+        self.gap_threshold_ns = gap_threshold_ns
+        self.target_hz = target_hz
+
+    def _read_chunks(self, csv_path, column_prefix):
+        """Yield float chunks of a signal CSV, dropping its last row like load_dataframe_from_csv"""
+        columns = [TIMESTAMP_COLUMN] + [f'{column_prefix}_{axis}' for axis in 'xyz']
+        chunks = read_signal_table(csv_path, columns=columns + ['x', 'y', 'z'], axis_dtype=CSV_AXIS_DTYPE, chunksize=self.chunk_rows)
+        pending = None
+        try:
+            for chunk in chunks:
+                chunk = chunk.rename(columns={'x': f'{column_prefix}_x', 'y': f'{column_prefix}_y', 'z': f'{column_prefix}_z'})
+                chunk = chunk[columns].astype(float)
+                if pending is not None:
+                    chunk = pd.concat([pending, chunk], ignore_index=True)
+                pending = chunk.iloc[-1:]
+                chunk = chunk.iloc[:-1]
+                if not chunk.empty:
+                    yield chunk.reset_index(drop=True)
+        except ValueError as e:
+            # Chunks are parsed in the signal schema; missing timestamps or
+            # non-numeric values only show up once their chunk is reached
+            raise ValidationError(f"Cannot parse {csv_path} as signal data: {e}")
+
+    def _scan(self, csv_path, column_prefix):
+        """
+        First pass over a file: check timestamps are strictly increasing and compute
+        the sample rate exactly as get_sample_rate_from_dataframe would.
+        """
+        intervals = _IntervalMedian()
+        rows = 0
+        for chunk in self._read_chunks(csv_path, column_prefix):
+            ns = chunk[TIMESTAMP_COLUMN].to_numpy()
+            if np.isnan(ns).any():
+                raise ValidationError(f"Missing timestamps in {csv_path}")
+            if not (np.diff(ns) > 0).all() or (intervals.previous is not None and ns[0] <= intervals.previous):
+                raise ValidationError(f"Timestamps in {csv_path} are not strictly increasing")
+            intervals.add(ns)
+            rows += len(ns)
+        if rows == 0:
+            raise ValidationError(f"No samples in {csv_path}")
+        sample_interval = intervals.median() * 1e-9
+        return 1 / sample_interval
+
+    def _merged_chunks(self, merge_tolerance):
+        """Yield accelerometer chunks nearest-merged with the gyroscope stream"""
+        accel_chunks = self._read_chunks(self.accel_csv_path, 'accel')
+        if not self.gyro_csv_path:
+            yield from accel_chunks
+            return
+
+        gyro_chunks = self._read_chunks(self.gyro_csv_path, 'gyro')
+        gyro_buffer = pd.DataFrame(columns=GYRO_COLUMNS, dtype=float)
+        gyro_done = False
+        for accel in accel_chunks:
+            accel_max = accel[TIMESTAMP_COLUMN].iloc[-1]
+            # The buffer must reach the first gyro sample at or after this chunk's end
+            while not gyro_done and (gyro_buffer.empty or gyro_buffer[TIMESTAMP_COLUMN].iloc[-1] < accel_max):
+                gyro = next(gyro_chunks, None)
+                if gyro is None:
+                    gyro_done = True
+                else:
+                    gyro_buffer = gyro if gyro_buffer.empty else pd.concat([gyro_buffer, gyro], ignore_index=True)
+
+            yield align_nearest(accel, gyro_buffer, tolerance=merge_tolerance)
+
+            # Keep the last gyro sample at or before this chunk's end: it is the
+            # backward candidate for the start of the next chunk
+            gyro_ns = gyro_buffer[TIMESTAMP_COLUMN].to_numpy()
+            keep_from = max(int(np.searchsorted(gyro_ns, accel_max, side='right')) - 1, 0)
+            gyro_buffer = gyro_buffer.iloc[keep_from:].reset_index(drop=True)
+
+    def run(self):
+        """
+        Process the upload and write its signal files in place.
+
+        Returns:
+            dict: Upload plan with keys gyro, split, start_ns, stop_ns and, for split
+            uploads, segments (start_offset, end_offset, start_ns, stop_ns)
+        """
+        merge_tolerance = None
+        if self.gyro_csv_path:
+            from app.services.utils import check_sample_rate_consistency
+            accel_sample_rate = self._scan(self.accel_csv_path, 'accel')
+            gyro_sample_rate = self._scan(self.gyro_csv_path, 'gyro')
+            check_sample_rate_consistency(accel_sample_rate, gyro_sample_rate)
+            merge_tolerance = int(1e9 / min(accel_sample_rate, gyro_sample_rate))
+        else:
+            self._scan(self.accel_csv_path, 'accel')
+
+        # Whether the upload splits is only known at the end, so both candidate outputs
+        # are written: the merged rows (split uploads keep these so offsets index into
+        # them) and the resampled rows (written for uploads without gaps)
+        outputs = {'raw': [], 'resampled': []}
+        for tag in outputs:
+            outputs[tag].append(_SignalOutput(self.accel_csv_path, ACCEL_COLUMNS, tag))
+            if self.gyro_csv_path:
+                outputs[tag].append(_SignalOutput(self.gyro_csv_path, GYRO_COLUMNS, tag))
+
+        try:
+            resampler = _StreamingResampler(self.target_hz)
+            rows = 0
+            first_ns = None
+            previous_ns = None
+            resampled_bounds = [None, None]
+            gaps = []
+
+            def write_resampled(out):
+                if out is None or out.empty:
+                    return
+                if resampled_bounds[0] is None:
+                    resampled_bounds[0] = int(out[TIMESTAMP_COLUMN].iloc[0])
+                resampled_bounds[1] = int(out[TIMESTAMP_COLUMN].iloc[-1])
+                for output in outputs['resampled']:
+                    output.write(out)
+
+            for chunk in self._merged_chunks(merge_tolerance):
+                if chunk.empty:
+                    continue
+                ns = chunk[TIMESTAMP_COLUMN].to_numpy()
+                if first_ns is None:
+                    first_ns = ns[0]
+                diffs = np.diff(ns, prepend=ns[0] if previous_ns is None else previous_ns)
+                for position in np.flatnonzero(diffs > self.gap_threshold_ns):
+                    before = ns[position - 1] if position > 0 else previous_ns
+                    gaps.append((rows + int(position), before, ns[position]))
+                previous_ns = ns[-1]
+                rows += len(chunk)
+
+                for output in outputs['raw']:
+                    output.write(chunk)
+                write_resampled(resampler.push(chunk))
+            write_resampled(resampler.flush())
+
+            if rows == 0:
+                raise ValueError(f"No merged samples for {self.accel_csv_path}")
+
+            # Matches the in-memory rule that split indices must leave a row on each side
+            gaps = [gap for gap in gaps if 0 < gap[0] < rows - 1]
+            plan = {
+                'gyro': bool(self.gyro_csv_path),
+                'split': bool(gaps)
+            }
+            if gaps:
+                starts = [(0, first_ns)] + [(index, ns) for index, _, ns in gaps]
+                ends = [(index, before) for index, before, _ in gaps] + [(rows, previous_ns)]
+                plan['start_ns'] = int(first_ns)
+                plan['stop_ns'] = int(previous_ns)
+                first_bins = resample_bin_starts([ns for _, ns in starts], self.target_hz)
+                last_bins = resample_bin_starts([ns for _, ns in ends], self.target_hz)
+                plan['segments'] = [{
+                    'start_offset': start_offset,
+                    'end_offset': end_offset,
+                    'start_ns': int(first_bin),
+                    'stop_ns': int(last_bin)
+                } for (start_offset, _), (end_offset, _), first_bin, last_bin in zip(starts, ends, first_bins, last_bins)]
+                keep, drop = outputs['raw'], outputs['resampled']
+            else:
+                plan['start_ns'], plan['stop_ns'] = resampled_bounds
+                keep, drop = outputs['resampled'], outputs['raw']
+        except Exception:
+            for output in outputs['raw'] + outputs['resampled']:
+                output.discard()
+            raise
+
+        for output in drop:
+            output.discard()
+        for output in keep:
+            output.commit()
+        if self.gyro_csv_path:
+            try:
+                write_merged_store(os.path.dirname(self.accel_csv_path))
+            except Exception as e:
+                logger.warning(f"Could not write merged signal store for {self.accel_csv_path}: {e}")
+        logger.info(f"Streamed upload {self.accel_csv_path}: {rows} merged rows, {len(plan.get('segments', []))} segments")
+        return plan
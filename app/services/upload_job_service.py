@@ -0,0 +1,127 @@
+import time
+import uuid
+import threading
+import traceback
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class UploadJob:
+    """Progress of one background ingest job; updated by the worker thread, read by status requests"""
+
+    def __init__(self, job_id, kind, description):
+        self.job_id = job_id
+        self.kind = kind
+        self.description = description
+        self.status = 'queued'
+        self.sessions_total = 0
+        self.sessions_done = 0
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.session_errors = {}
+        self.start_time = time.time()
+        self.end_time = None
+        self.result = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def add_work(self, sessions, bytes_total):
+        """Announce sessions (and their input bytes) still to be processed"""
+        with self._lock:
+            self.sessions_total += sessions
+            self.bytes_total += bytes_total
+
+    def session_finished(self, session_name, bytes_processed, error=None):
+        with self._lock:
+            self.sessions_done += 1
+            self.bytes_done += bytes_processed
+            if error:
+                self.session_errors[session_name] = error
+
+    def eta_seconds(self):
+        """Remaining time extrapolated from the bytes processed so far, or None before any progress"""
+        if self.status != 'running' or self.bytes_done == 0 or self.bytes_total == 0:
+            return None
+        elapsed = time.time() - self.start_time
+        return max(0.0, elapsed * (self.bytes_total - self.bytes_done) / self.bytes_done)
+
+    def to_dict(self):
+        with self._lock:
+            end_time = self.end_time or time.time()
+            eta = self.eta_seconds()
+            return {
+                'job_id': self.job_id,
+                'kind': self.kind,
+                'description': self.description,
+                'status': self.status,
+                'sessions_total': self.sessions_total,
+                'sessions_done': self.sessions_done,
+                'bytes_total': self.bytes_total,
+                'bytes_done': self.bytes_done,
+                'elapsed_seconds': round(end_time - self.start_time, 1),
+                'eta_seconds': None if eta is None else round(eta, 1),
+                'session_errors': dict(self.session_errors),
+                'result': self.result,
+                'error': self.error
+            }
+
+
+class UploadJobService:
+    """
+    Run project uploads and session discovery in background threads.
+
+    Jobs are kept in memory, like scoring status, so they are lost on restart; the
+    work itself is persisted as it goes (project rows, session rows, signal files).
+    """
+
+    def __init__(self, max_finished_jobs=200):
+        self.jobs = {}
+        self.max_finished_jobs = max_finished_jobs
+        self._lock = threading.Lock()
+
+    def start(self, kind, description, work, *args, **kwargs):
+        """
+        Start work(*args, job=job, **kwargs) in a daemon thread.
+
+        The return value of work becomes the job's result; an exception fails the job.
+
+        Returns:
+            str: Job ID to poll with get_status
+        """
+        job = UploadJob(str(uuid.uuid4()), kind, description)
+        with self._lock:
+            self._forget_finished_jobs()
+            self.jobs[job.job_id] = job
+
+        thread = threading.Thread(target=self._run, args=(job, work, args, kwargs), daemon=True)
+        thread.start()
+        logger.info(f"Started {kind} job {job.job_id}: {description}")
+        return job.job_id
+
+    def _run(self, job, work, args, kwargs):
+        job.status = 'running'
+        try:
+            job.result = work(*args, job=job, **kwargs)
+            job.status = 'completed'
+            logger.info(f"{job.kind} job {job.job_id} completed: {job.sessions_done}/{job.sessions_total} sessions")
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            logger.error(f"{job.kind} job {job.job_id} failed: {e}\n{traceback.format_exc()}")
+        finally:
+            job.end_time = time.time()
+
+    def _forget_finished_jobs(self):
+        finished = [job for job in self.jobs.values() if job.end_time is not None]
+        finished.sort(key=lambda job: job.end_time)
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job.job_id]
+
+    def get_status(self, job_id):
+        """
+        Returns:
+            dict: Job progress, or None for an unknown job ID
+        """
+        job = self.jobs.get(job_id)
+        return job.to_dict() if job else None
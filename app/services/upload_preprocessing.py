@@ -0,0 +1,271 @@
+import os
+import time
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.exceptions import ValidationError
+from app.logging_config import get_logger, setup_logging
+from app.services.utils import resample, signal_csv_dtypes
+from app.services.signal_store import write_sidecar, write_merged_store, CSV_AXIS_DTYPE
+from app.services.csv_index import build_row_index
+from app.services.signal_pyramid import write_pyramid
+from app.services.session_splits import split_at_gaps, resample_bin_starts
+from app.services.signal_alignment import align_nearest
+from app.services.session_summaries import compute_session_summary
+from app.services.streaming_ingest import StreamingSessionIngest, STREAMING_INGEST_MIN_BYTES
+
+logger = get_logger(__name__)
+
+# Upload preprocessing (merge, gap detection, resampling and writing the signal
+# files) touches only the session's own files, so sessions of a project upload are
+# prepared in worker processes while the parent registers finished ones in the
+# database. UPLOAD_WORKERS=1 prepares them one by one in the calling process.
+UPLOAD_WORKERS = int(os.getenv('UPLOAD_WORKERS', str(min(4, os.cpu_count() or 1))))
+GAP_THRESHOLD_MINUTES = 30
+
+
+def write_signal_files(df, accel_csv_path, gyro_csv_path=None):
+    """
+    Write the accelerometer (and optional gyroscope) CSVs plus their sidecars (or row
+    indexes) and pyramids, and with a gyroscope the session's merged 6-axis store
+    """
+    outputs = [(accel_csv_path, ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z'])]
+    if gyro_csv_path:
+        outputs.append((gyro_csv_path, ['ns_since_reboot', 'gyro_x', 'gyro_y', 'gyro_z']))
+    for csv_path, columns in outputs:
+        # The CSV is authoritative, so its axes keep full float64 precision; only
+        # the sidecar (and pyramid) narrow them to float32
+        dtypes = signal_csv_dtypes(columns, axis_dtype=CSV_AXIS_DTYPE)
+        if df['ns_since_reboot'].isna().any():
+            dtypes.pop('ns_since_reboot')
+        signal_df = df[columns].astype(dtypes)
+        signal_df.to_csv(csv_path, index=False)
+        try:
+            write_sidecar(csv_path, signal_df)
+        except Exception as e:
+            # The CSV is authoritative; index it so virtual splits can still seek into it
+            logger.warning(f"Could not write signal sidecar for {csv_path}: {e}")
+            try:
+                build_row_index(csv_path)
+            except Exception as e:
+                logger.warning(f"Could not build row index for {csv_path}: {e}")
+        try:
+            write_pyramid(csv_path, signal_df)
+        except Exception as e:
+            # Views stride through the signal until the backfill migration builds it
+            logger.warning(f"Could not write signal pyramid for {csv_path}: {e}")
+    if gyro_csv_path:
+        try:
+            write_merged_store(os.path.dirname(accel_csv_path))
+        except Exception as e:
+            # Readers load and align the two signal files instead
+            logger.warning(f"Could not write merged signal store for {accel_csv_path}: {e}")
+
+
+def upload_input_bytes(project_path, session_name):
+    """Size of an uploaded session's signal files, used to report ingest progress"""
+    total = 0
+    for filename in ('accelerometer_data.csv', 'gyroscope_data.csv'):
+        path = os.path.join(project_path, session_name, filename)
+        if os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+
+@contextmanager
+def _stage(timings, name):
+    """Add the wall time of the enclosed block to timings[name], in seconds"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def _log_timings(session_name, timings):
+    stages = ', '.join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items())
+    logger.info(f"Preprocessed session {session_name}: {stages}")
+
+
+def add_signal_summaries(plan, data_dir):
+    """
+    Attach signal summaries to an upload plan: plan['summary'] for an unsplit
+    session, segment['summary'] for each segment of a split one.
+
+    A summary that cannot be computed is left as None for the backfill to fill in.
+    """
+    targets = plan['segments'] if plan['split'] else [plan]
+    for target in targets:
+        try:
+            target['summary'] = compute_session_summary(data_dir, target.get('start_offset'), target.get('end_offset'))
+        except Exception as e:
+            logger.warning(f"Could not summarize signals in {data_dir}: {e}")
+            target['summary'] = None
+
+
+def prepare_upload(session_name, project_path, streaming=None):
+    """
+    Preprocess an uploaded session's files without touching the database.
+
+    Merges accelerometer and gyroscope data, detects recording gaps and rewrites
+    the session's signal files: resampled when there are no gaps, merged rows that
+    the virtual split offsets index into otherwise.
+
+    Args:
+        session_name: Name of the uploaded session directory
+        project_path: Path to the project directory
+        streaming: Process the files in chunks instead of in memory; by default
+            only accelerometer files of at least STREAMING_INGEST_MIN_BYTES are streamed
+
+    Returns:
+        dict: session_name, plan (gyro, split, start_ns, stop_ns and, for split uploads,
+        segments with row offsets, plus signal summaries; see add_signal_summaries),
+        error (None on success), fallback_bounds (the session's start/stop when it
+        was read before failing) and timings (seconds spent per stage: read, merge,
+        split, resample, write, summarize)
+    """
+    df = None
+    gyro = False
+    timings = {}
+    try:
+        from app.services.utils import load_dataframe_from_csv, get_sample_rate_from_dataframe, check_sample_rate_consistency
+
+        accel_csv_path = os.path.join(project_path, session_name, 'accelerometer_data.csv')
+        gyro_csv_path = os.path.join(project_path, session_name, 'gyroscope_data.csv')
+
+        if streaming is None:
+            streaming = os.path.getsize(accel_csv_path) >= STREAMING_INGEST_MIN_BYTES
+        if streaming:
+            try:
+                with _stage(timings, 'stream'):
+                    plan = StreamingSessionIngest(accel_csv_path, gyro_csv_path).run()
+                with _stage(timings, 'summarize'):
+                    add_signal_summaries(plan, os.path.dirname(accel_csv_path))
+                _log_timings(session_name, timings)
+                return {'session_name': session_name, 'plan': plan, 'error': None, 'fallback_bounds': None, 'timings': timings}
+            except ValidationError as e:
+                logger.warning(f"Cannot stream session {session_name}, processing it in memory: {e}")
+
+        # The loader returns rows sorted by timestamp, and alignment keeps the
+        # accelerometer rows' order, so nothing below needs to sort again
+        with _stage(timings, 'read'):
+            df = load_dataframe_from_csv.uncached(accel_csv_path, column_prefix='accel', axis_dtype=CSV_AXIS_DTYPE)
+            gyro_df = load_dataframe_from_csv.uncached(gyro_csv_path, column_prefix='gyro', axis_dtype=CSV_AXIS_DTYPE) if os.path.exists(gyro_csv_path) else None
+
+        if gyro_df is not None:
+            gyro = True
+            with _stage(timings, 'merge'):
+                accel_sample_rate = get_sample_rate_from_dataframe(df)
+                gyro_sample_rate = get_sample_rate_from_dataframe(gyro_df)
+
+                check_sample_rate_consistency(accel_sample_rate, gyro_sample_rate)
+                merge_tolerance = min(accel_sample_rate, gyro_sample_rate)
+
+                df = align_nearest(df, gyro_df, tolerance=int(1e9 / merge_tolerance))
+                del gyro_df
+
+        with _stage(timings, 'split'):
+            gap_threshold_ns = GAP_THRESHOLD_MINUTES * 60 * 1_000_000_000
+            segments = split_at_gaps(df['ns_since_reboot'].to_numpy(), gap_threshold_ns)
+
+        if len(segments) == 1:
+            logger.debug(f"No time gaps found in session {session_name}, proceeding without splitting")
+            with _stage(timings, 'resample'):
+                df = resample(df)
+            with _stage(timings, 'write'):
+                write_signal_files(df, accel_csv_path, gyro_csv_path if gyro else None)
+            logger.debug(f"Resampled data for session {session_name}")
+
+            # Calculate start_ns and stop_ns for the whole session
+            plan = {
+                'gyro': gyro,
+                'split': False,
+                'start_ns': int(df['ns_since_reboot'].min()),
+                'stop_ns': int(df['ns_since_reboot'].max())
+            }
+            # Summaries read the written files; release the merged rows first
+            df = None
+            with _stage(timings, 'summarize'):
+                add_signal_summaries(plan, os.path.dirname(accel_csv_path))
+            _log_timings(session_name, timings)
+            return {'session_name': session_name, 'plan': plan, 'error': None, 'fallback_bounds': None, 'timings': timings}
+
+        # Save the complete merged data to original directory (preserve original);
+        # the segment offsets index into these rows
+        with _stage(timings, 'write'):
+            write_signal_files(df, accel_csv_path, gyro_csv_path if gyro else None)
+
+        # Segments report the span they have once resampled: the bins of their first and last rows
+        bin_starts = resample_bin_starts([bound for segment in segments for bound in (segment['start_ns'], segment['stop_ns'])])
+        for i, segment in enumerate(segments):
+            segment['start_ns'] = int(bin_starts[2 * i])
+            segment['stop_ns'] = int(bin_starts[2 * i + 1])
+            logger.debug(f"Created segment {i + 1} with {segment['end_offset'] - segment['start_offset']} rows for session {session_name}")
+
+        plan = {
+            'gyro': gyro,
+            'split': True,
+            'start_ns': int(df['ns_since_reboot'].min()),
+            'stop_ns': int(df['ns_since_reboot'].max()),
+            'segments': segments
+        }
+        df = None
+        with _stage(timings, 'summarize'):
+            add_signal_summaries(plan, os.path.dirname(accel_csv_path))
+        _log_timings(session_name, timings)
+        return {'session_name': session_name, 'plan': plan, 'error': None, 'fallback_bounds': None, 'timings': timings}
+
+    except Exception as e:
+        logger.error(f"Failed to preprocess session '{session_name}' in {project_path}: {str(e)}", exc_info=True)
+        fallback_bounds = None
+        if df is not None and not df.empty:
+            fallback_bounds = (int(df['ns_since_reboot'].min()), int(df['ns_since_reboot'].max()))
+        return {'session_name': session_name, 'plan': None, 'error': str(e), 'fallback_bounds': fallback_bounds, 'timings': timings}
+
+
+def _init_worker(log_level):
+    setup_logging(level=log_level, use_colors=False)
+
+
+def prepare_uploads(session_names, project_path, workers=None):
+    """
+    Preprocess several uploaded sessions, in parallel when workers allow.
+
+    Results are yielded in the order of session_names as soon as each one and all
+    before it are ready, so callers can register sessions while later ones are
+    still being prepared, and naming stays deterministic.
+
+    Args:
+        session_names: Session directories to preprocess
+        project_path: Path to the project directory
+        workers: Worker processes to use (defaults to UPLOAD_WORKERS)
+
+    Yields:
+        dict: prepare_upload result per session
+    """
+    workers = min(UPLOAD_WORKERS if workers is None else workers, len(session_names))
+    if workers <= 1:
+        for session_name in session_names:
+            yield prepare_upload(session_name, project_path)
+        return
+
+    # Spawned workers do not inherit the server's threads or open connections
+    context = multiprocessing.get_context('spawn')
+    log_level = os.getenv('LOG_LEVEL', 'INFO')
+    pending = list(session_names)
+    while pending:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)), mp_context=context, initializer=_init_worker, initargs=(log_level,)) as pool:
+            futures = [pool.submit(prepare_upload, session_name, project_path) for session_name in pending]
+            for position, (session_name, future) in enumerate(zip(pending, futures)):
+                try:
+                    yield future.result()
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. out of memory), which fails every job still in
+                    # the pool; report this session and retry the rest in a fresh pool
+                    logger.error(f"Worker died while preprocessing session '{session_name}': {e}")
+                    yield {'session_name': session_name, 'plan': None, 'error': f'Worker process died: {e}', 'fallback_bounds': None, 'timings': {}}
+                    pending = pending[position + 1:]
+                    break
+            else:
+                pending = []
@@ -1,12 +1,26 @@
+import numpy as np
 import pandas as pd
 import time
 import functools
 import os
 from app.logging_config import get_logger
+from app.services.signal_store import read_sidecar, read_sidecar_time_range, read_merged_store, TIMESTAMP_COLUMN, TIMESTAMP_DTYPE, AXIS_DTYPE
+from app.services.signal_alignment import align_nearest
+from app.services.frame_cache import cached_frame, directory_identity
+from app.services.csv_index import read_csv_rows
+
+try:
+    import pyarrow  # noqa: F401  (optional: multithreaded CSV parsing)
+    SIGNAL_CSV_ENGINE = 'pyarrow'
+except ImportError:
+    SIGNAL_CSV_ENGINE = 'c'
 
 # Get logger for this module
 logger = get_logger(__name__)
 
+# read_csv options the pyarrow engine does not support; reads using them go through the C engine
+_PYARROW_UNSUPPORTED_OPTIONS = ('nrows', 'chunksize', 'iterator')
+
 def timeit(func):
     """Decorator to time function execution"""
     @functools.wraps(func)
@@ -22,43 +36,167 @@ def timeit(func):
         return result
     return wrapper
     
+DAY_NS = 24 * 60 * 60 * 1_000_000_000
+
 def resample(df,target_hz=50):
-    df = df.copy()
-    df['timestamp'] = pd.to_datetime(df['ns_since_reboot'], unit='ns')
-    df = df.set_index('timestamp')
+    """
+    Mean-resample a signal onto 1000 // target_hz ms bins and forward-fill empty bins.
+
+    Bins are aligned to midnight of the first sample's day, as pandas resample
+    aligns them. Sorted integral timestamps take a single numpy pass; anything else
+    goes through pandas.
+    """
+    bin_ns = (1000 // target_hz) * 1_000_000
+    ns = df['ns_since_reboot'].to_numpy()
+    numeric = all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes)
+    if numeric and len(ns) > 0 and DAY_NS % bin_ns == 0 and df['ns_since_reboot'].is_monotonic_increasing:
+        ns_int = ns.astype(np.int64)
+        if ns[0] >= 0 and np.array_equal(ns_int, ns):
+            return _resample_sorted(df, ns_int, bin_ns)
+
     freq = f'{1000//target_hz}ms'  # 20ms for 50Hz
-    df_resampled = df.resample(freq).mean().ffill()
-    df_resampled = df_resampled.reset_index()
-    df_resampled['ns_since_reboot'] = df_resampled['timestamp'].astype('int64')
-    df = df_resampled.drop('timestamp', axis=1)
-    return df
-
-def load_dataframe_from_csv(csv_path, column_prefix='accel', target_hz=50, start_offset=None, end_offset=None):
-    # Efficient loading using pandas skiprows and nrows for virtual splits
-    if start_offset is not None or end_offset is not None:
-        # For virtual splits, use skiprows and nrows for efficient loading
-        skiprows = list(range(1, start_offset + 1)) if start_offset and start_offset > 0 else None
-        
-        if end_offset is not None:
-            if start_offset is not None:
-                nrows = end_offset - start_offset
-            else:
-                nrows = end_offset
-        else:
-            nrows = None
+    df_resampled = df.set_index(pd.to_datetime(df['ns_since_reboot'], unit='ns').rename('timestamp')).resample(freq).mean().ffill()
+    df_resampled['ns_since_reboot'] = df_resampled.index.astype('int64')
+    return df_resampled.reset_index(drop=True)
+
+def _resample_sorted(df, ns, bin_ns):
+    """resample() for sorted, non-negative integral timestamps: one reduceat per column"""
+    # With the bin width dividing a day, bins counted from the epoch line up with
+    # bins counted from midnight of the first sample's day
+    bins = ns // bin_ns
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bins)) + 1))
+    slots = bins[starts] - bins[0]
+    num_bins = int(bins[-1] - bins[0]) + 1
+
+    out = {'ns_since_reboot': (bins[0] + np.arange(num_bins, dtype=np.int64)) * bin_ns}
+    for name in df.columns:
+        if name == 'ns_since_reboot':
+            continue
+        values = df[name].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        counts = np.add.reduceat(valid.astype(np.int64), starts)
+        column = np.full(num_bins, np.nan)
+        column[slots] = np.divide(sums, counts, out=np.full(len(sums), np.nan), where=counts > 0)
+        # Forward-fill: every slot takes the value of the last non-NaN slot at or before it
+        last_valid = np.maximum.accumulate(np.where(np.isnan(column), 0, np.arange(num_bins)))
+        out[name] = column[last_valid]
+    return pd.DataFrame(out)[list(df.columns)]
+
+def signal_csv_dtypes(columns, axis_dtype=AXIS_DTYPE):
+    """Parse dtypes of signal CSV columns: int64 timestamps and, by default, the sidecar's float32 axes"""
+    return {name: TIMESTAMP_DTYPE if name == TIMESTAMP_COLUMN else axis_dtype for name in columns}
+
+def read_csv_header(csv_path):
+    """Column names from the first line of a CSV"""
+    return list(pd.read_csv(csv_path, nrows=0, engine='c').columns)
+
+def read_signal_table(source, columns=None, engine=None, axis_dtype=AXIS_DTYPE, **kwargs):
+    """
+    Parse a signal CSV with its dtypes declared up front.
+
+    Columns are parsed straight into the signal schema (see signal_csv_dtypes), so
+    no cast pass follows. A file the schema cannot hold (missing timestamps,
+    non-numeric columns) is parsed again with inferred dtypes, as pd.read_csv would.
+
+    Args:
+        source: CSV path, or an open file together with names=
+        columns: Columns to parse, ignoring names absent from the file (default: all)
+        engine: 'pyarrow' or 'c' (default: SIGNAL_CSV_ENGINE); options pyarrow
+            cannot handle, such as nrows or skiprows lists, use the C engine
+        axis_dtype: dtype of the axis columns; '<f8' keeps every uploaded decimal
+            for code that rewrites the CSVs
+        **kwargs: Further pd.read_csv options
+
+    Returns:
+        pandas.DataFrame, or a chunk iterator when chunksize is given
+    """
+    names = kwargs.get('names') or read_csv_header(source)
+    if columns is not None:
+        kwargs['usecols'] = [name for name in names if name in columns]
+        names = kwargs['usecols']
+
+    engine = engine or SIGNAL_CSV_ENGINE
+    if engine == 'pyarrow' and (any(kwargs.get(option) is not None for option in _PYARROW_UNSUPPORTED_OPTIONS) or isinstance(kwargs.get('skiprows'), list)):
+        engine = 'c'
+
+    position = source.tell() if hasattr(source, 'seek') else None
+    try:
+        return pd.read_csv(source, engine=engine, dtype=signal_csv_dtypes(names, axis_dtype), **kwargs)
+    except ValueError as e:
+        logger.debug(f"Signal schema does not fit {getattr(source, 'name', source)}, inferring dtypes: {e}")
+        if position is not None:
+            source.seek(position)
+        return pd.read_csv(source, engine='c', **kwargs)
+
+@cached_frame()
+def read_signal_csv(csv_path):
+    """
+    Read a session signal file, preferring its binary sidecar over parsing the CSV.
+
+    Returns the same columns and dtypes as pd.read_csv(csv_path) would.
+    """
+    df = read_sidecar(csv_path)
+    if df is None:
+        df = read_signal_table(csv_path)
+    float_columns = [c for c in df.columns if c != 'ns_since_reboot']
+    return df.astype({c: 'float64' for c in float_columns})
+
+@cached_frame()
+def load_signal_time_range(csv_path, start_ns, stop_ns):
+    """
+    Read the rows of a session signal file with start_ns <= ns_since_reboot <= stop_ns.
+
+    Uses a binary search over the memory-mapped sidecar when available, otherwise
+    parses the whole CSV and filters it.
+    """
+    df = read_sidecar_time_range(csv_path, start_ns, stop_ns)
+    if df is None:
+        df = read_signal_table(csv_path)
+        df = df[(df['ns_since_reboot'] >= start_ns) & (df['ns_since_reboot'] <= stop_ns)].reset_index(drop=True)
+    float_columns = [c for c in df.columns if c != 'ns_since_reboot']
+    return df.astype({c: 'float64' for c in float_columns})
+
+@cached_frame()
+def load_dataframe_from_csv(csv_path, column_prefix='accel', target_hz=50, start_offset=None, end_offset=None, axis_dtype=AXIS_DTYPE):
+    is_virtual_split = start_offset is not None or end_offset is not None
+    # Raw uploads name the axes x/y/z, preprocessed files prefix them
+    wanted = ['ns_since_reboot', 'x', 'y', 'z', f'{column_prefix}_x', f'{column_prefix}_y', f'{column_prefix}_z']
+    read_table = functools.partial(read_signal_table, columns=wanted, axis_dtype=axis_dtype)
+    # Virtual splits are a zero-copy slice of the memory-mapped sidecar; the sidecar
+    # holds every CSV row, so a full load drops the last row like the CSV path below.
+    # The sidecar only holds float32 axes, so wider loads parse the CSV.
+    df = read_sidecar(csv_path, start_offset, end_offset) if np.dtype(axis_dtype) == np.dtype(AXIS_DTYPE) else None
+    if df is not None:
+        if not is_virtual_split:
+            df = df.iloc[:-1]
+    elif is_virtual_split:
+        # Seek straight to the split's first row using the CSV's byte-offset row index
+        df = read_csv_rows(csv_path, start_offset, end_offset, reader=read_table)
+        if df is None:
+            # Without a row index, use skiprows and nrows for efficient loading
+            skiprows = list(range(1, start_offset + 1)) if start_offset and start_offset > 0 else None
             
-        df = pd.read_csv(csv_path, skiprows=skiprows, nrows=nrows)
+            if end_offset is not None:
+                if start_offset is not None:
+                    nrows = end_offset - start_offset
+                else:
+                    nrows = end_offset
+            else:
+                nrows = None
+                
+            df = read_table(csv_path, skiprows=skiprows, nrows=nrows)
     else:
         # Regular loading for non-virtual splits
-        df = pd.read_csv(csv_path).iloc[:-1]
+        df = read_table(csv_path).iloc[:-1]
     
     df = df.rename(columns={'x': f'{column_prefix}_x', 'y': f'{column_prefix}_y', 'z': f'{column_prefix}_z'})
-    df['ns_since_reboot'] = df['ns_since_reboot'].astype(float)
-    df[f'{column_prefix}_x'] = df[f'{column_prefix}_x'].astype(float)
-    df[f'{column_prefix}_y'] = df[f'{column_prefix}_y'].astype(float)
-    df[f'{column_prefix}_z'] = df[f'{column_prefix}_z'].astype(float)
-    df = df.sort_values('ns_since_reboot').reset_index(drop=True)
-    return df
+    columns = ['ns_since_reboot', f'{column_prefix}_x', f'{column_prefix}_y', f'{column_prefix}_z']
+    df = df.astype({name: float for name in columns})
+    # Signal files are normally written in time order; only sort when they are not
+    if not df['ns_since_reboot'].is_monotonic_increasing:
+        df = df.sort_values('ns_since_reboot')
+    return df.reset_index(drop=True)
 
 def get_sample_rate_from_dataframe(df):
     sample_interval = df['ns_since_reboot'].diff().median() * 1e-9
@@ -71,6 +209,69 @@ def check_sample_rate_consistency(sample_rate1, sample_rate2):
     
     return True
 
+@cached_frame(directory_identity)
+def load_session_signals(data_dir, start_offset=None, end_offset=None):
+    """
+    Load a session's accelerometer and, when recorded, gyroscope axes as one frame.
+
+    Reads the merged 6-axis store written at upload when it is valid. Otherwise
+    loads both signal files and aligns the gyroscope rows to the accelerometer rows
+    by nearest timestamp, as the upload does.
+
+    Args:
+        data_dir: Directory holding the signal files (the parent's for virtual splits)
+        start_offset: Optional first row to load (virtual split start)
+        end_offset: Optional row to stop before (virtual split end)
+
+    Returns:
+        pandas.DataFrame: ns_since_reboot, accel_x/y/z and gyro_x/y/z as floats, with
+        the rows load_dataframe_from_csv would select
+    """
+    df = read_merged_store(data_dir, start_offset, end_offset)
+    if df is not None:
+        if start_offset is None and end_offset is None:
+            df = df.iloc[:-1]
+        return df.astype(float)
+
+    accel = load_dataframe_from_csv(os.path.join(data_dir, 'accelerometer_data.csv'), column_prefix='accel', start_offset=start_offset, end_offset=end_offset)
+    gyro_csv_path = os.path.join(data_dir, 'gyroscope_data.csv')
+    if not os.path.exists(gyro_csv_path):
+        return accel
+    gyro = load_dataframe_from_csv(gyro_csv_path, column_prefix='gyro', start_offset=start_offset, end_offset=end_offset)
+    return _combine_signals(accel, gyro)
+
+def load_session_signals_time_range(data_dir, start_ns, stop_ns):
+    """
+    Load a session's accelerometer and, when recorded, gyroscope axes with
+    start_ns <= ns_since_reboot <= stop_ns as one frame.
+
+    Each signal file is read with load_signal_time_range, so only the requested
+    rows are copied out of the sidecars.
+
+    Returns:
+        pandas.DataFrame: ns_since_reboot, accel_x/y/z and gyro_x/y/z as floats
+    """
+    frames = {}
+    for prefix, file_name in (('accel', 'accelerometer_data.csv'), ('gyro', 'gyroscope_data.csv')):
+        csv_path = os.path.join(data_dir, file_name)
+        if prefix == 'gyro' and not os.path.exists(csv_path):
+            break
+        df = load_signal_time_range(csv_path, start_ns, stop_ns)
+        df = df.rename(columns={'x': f'{prefix}_x', 'y': f'{prefix}_y', 'z': f'{prefix}_z'})
+        frames[prefix] = df[['ns_since_reboot', f'{prefix}_x', f'{prefix}_y', f'{prefix}_z']].astype(float)
+    if 'gyro' not in frames or frames['accel'].empty:
+        return frames['accel']
+    return _combine_signals(frames['accel'], frames['gyro'])
+
+def _combine_signals(accel, gyro):
+    """Put gyroscope axes beside the accelerometer rows, aligning by nearest timestamp unless the rows already match"""
+    accel_ns = accel['ns_since_reboot'].to_numpy()
+    if np.array_equal(accel_ns, gyro['ns_since_reboot'].to_numpy()):
+        # Files written by the upload already hold the same aligned rows
+        return pd.concat([accel, gyro.drop(columns='ns_since_reboot')], axis=1)
+    tolerance = int(1e9 / min(get_sample_rate_from_dataframe(accel), get_sample_rate_from_dataframe(gyro)))
+    return align_nearest(accel, gyro, tolerance=tolerance)
+
 def load_session_data_with_virtual_splits(project_path, session_name, parent_data_path=None, start_offset=None, end_offset=None):
     """
     Load session data supporting virtual splits via pandas offset slicing.
@@ -85,35 +286,11 @@ def load_session_data_with_virtual_splits(project_path, session_name, parent_dat
     Returns:
         dict: Contains 'accel' dataframe and optionally 'gyro' dataframe
     """
-    import os
-    
-    # Determine which data path to use
-    if parent_data_path:
-        # Virtual split - use parent data path with offsets
-        accel_csv_path = os.path.join(parent_data_path, 'accelerometer_data.csv')
-        gyro_csv_path = os.path.join(parent_data_path, 'gyroscope_data.csv')
-    else:
-        # Regular session - use session path
-        accel_csv_path = os.path.join(project_path, session_name, 'accelerometer_data.csv')
-        gyro_csv_path = os.path.join(project_path, session_name, 'gyroscope_data.csv')
-    
-    result = {}
-    
-    # Load accelerometer data
-    result['accel'] = load_dataframe_from_csv(
-        accel_csv_path, 
-        column_prefix='accel', 
-        start_offset=start_offset, 
-        end_offset=end_offset
-    )
-    
-    # Load gyroscope data if it exists
-    if os.path.exists(gyro_csv_path):
-        result['gyro'] = load_dataframe_from_csv(
-            gyro_csv_path, 
-            column_prefix='gyro', 
-            start_offset=start_offset, 
-            end_offset=end_offset
-        )
-    
-    return result
\ No newline at end of file
+    # Virtual splits read the parent's data with offsets
+    data_dir = parent_data_path or os.path.join(project_path, session_name)
+    df = load_session_signals(data_dir, start_offset=start_offset, end_offset=end_offset)
+
+    result = {'accel': df[['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']]}
+    if 'gyro_x' in df.columns:
+        result['gyro'] = df[['ns_since_reboot', 'gyro_x', 'gyro_y', 'gyro_z']]
+    return result
@@ -162,6 +162,66 @@ export class ModelAPI {
         }
     }
 
+    /**
+     * Score all sessions of a project with one model, loaded once for the batch
+     * @param {string|number} projectId - ID of the project whose sessions to score
+     * @param {string|number} modelId - ID of the model to use
+     * @param {string} device - 'cpu' or 'cuda'
+     * @param {boolean} appendToCurrent - Whether to append to current labeling or create new one
+     * @returns {Promise<Object>} Batch result with batch_id (pollable as a scoring_id) and sessions_total
+     */
+    static async scoreProject(projectId, modelId, device = 'cpu', appendToCurrent = true, currentLabelingName = null) {
+        try {
+            console.log('batch scoring project with model:', { projectId, modelId, device, appendToCurrent, currentLabelingName });
+            
+            const response = await fetch('/api/models/score_batch', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    project_id: projectId,
+                    model_id: modelId,
+                    device: device,
+                    append_to_current: appendToCurrent,
+                    current_labeling_name: currentLabelingName
+                })
+            });
+            
+            if (!response.ok) {
+                const errorData = await response.json();
+                throw new Error(errorData.error || 'failed to start batch scoring');
+            }
+            
+            const result = await response.json();
+            console.log('batch scoring started:', result);
+            return result;
+        } catch (error) {
+            console.error('error batch scoring project:', error);
+            throw error;
+        }
+    }
+
+    /**
+     * Resume an interrupted or cancelled batch; sessions already scored are skipped
+     * @param {string} batchId - ID of the batch
+     * @returns {Promise<Object>} Batch ID and the number of sessions remaining
+     */
+    static async resumeBatchScoring(batchId) {
+        try {
+            const response = await fetch(`/api/models/score_batch/${batchId}/resume`, { method: 'POST' });
+            if (!response.ok) {
+                const errorData = await response.json();
+                throw new Error(errorData.error || 'failed to resume batch scoring');
+            }
+            
+            return await response.json();
+        } catch (error) {
+            console.error('error resuming batch scoring:', error);
+            throw error;
+        }
+    }
+
     static async scoreSessionInVisibleRange(sessionId, modelId, projectName, sessionName, startNs, endNs, appendToCurrent = true, currentLabelingName = null) {
         try {
             console.log('scoring session with model:', { sessionId, modelId, projectName, sessionName, startNs, endNs, appendToCurrent, currentLabelingName });
@@ -252,6 +312,25 @@ export class ModelAPI {
         }
     }
 
+    /**
+     * Cancel a queued or running scoring operation
+     * @param {string} scoringId - ID of the scoring operation
+     * @returns {Promise<Object>} Scoring status after the cancellation request
+     */
+    static async cancelScoring(scoringId) {
+        try {
+            const response = await fetch(`/api/scoring_status/${scoringId}/cancel`, { method: 'POST' });
+            if (!response.ok) {
+                throw new Error(`failed to cancel scoring: ${response.status}`);
+            }
+            
+            return await response.json();
+        } catch (error) {
+            console.error('error cancelling scoring:', error);
+            throw error;
+        }
+    }
+
 
 
         /**
@@ -321,6 +400,8 @@ export class ModelAPI {
      * @param {Object} settings - Model settings object
      * @param {number} settings.threshold - Prediction threshold (0-1)
      * @param {number} settings.min_bout_duration_ns - Minimum bout duration in nanoseconds
+     * @param {number} [settings.merge_gap_ns] - Bouts closer than this many nanoseconds are merged
+     * @param {boolean} [settings.use_gyro] - Pass gyroscope axes to the model as well
      * @returns {Promise<Object>} Updated model data
      */
     static async updateModelSettings(modelId, settings) {
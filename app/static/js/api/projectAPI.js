@@ -389,6 +389,39 @@ export class ProjectAPI {
         }
     }
 
+    /**
+     * Fetch the progress of a background upload or session discovery job
+     * @param {string} uploadId - Job ID returned when the upload was started
+     * @returns {Promise<Object>} Job status with sessions/bytes done and total, eta_seconds and result
+     */
+    static async fetchUploadStatus(uploadId) {
+        const response = await fetch(`/api/upload_status/${uploadId}`);
+        if (!response.ok) {
+            throw new Error(`Failed to fetch upload status: ${response.status} ${response.statusText}`);
+        }
+        return response.json();
+    }
+
+    /**
+     * Poll a background upload job until it completes or fails
+     * @param {string} uploadId - Job ID returned when the upload was started
+     * @param {Function} [onProgress] - Called with each status while the job runs
+     * @param {number} [intervalMs=2000] - Polling interval
+     * @returns {Promise<Object>} Final job status
+     */
+    static async waitForUpload(uploadId, onProgress = null, intervalMs = 2000) {
+        while (true) {
+            const status = await ProjectAPI.fetchUploadStatus(uploadId);
+            if (onProgress) {
+                onProgress(status);
+            }
+            if (status.status === 'completed' || status.status === 'failed') {
+                return status;
+            }
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+        }
+    }
+
 }
 
 export default ProjectAPI;
\ No newline at end of file
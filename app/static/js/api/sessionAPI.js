@@ -3,45 +3,169 @@
  * Handles all session-related API calls
  */
 
+// Binary columnar wire format (see app/services/signal_store.py):
+//   MAGIC (8 bytes) | header length (uint32 LE) | JSON header | aligned column blocks
+export const COLUMNS_MIMETYPE = 'application/vnd.label.columns';
+const COLUMNS_MAGIC = 'LBLCOLS1';
+const TYPED_ARRAYS = {
+    '<f8': Float64Array,
+    '<f4': Float32Array,
+    '<i4': Int32Array
+};
+
+/**
+ * Decode a columnar binary buffer into typed arrays (views, no copies)
+ * @param {ArrayBuffer} buffer - Response body
+ * @returns {{header: Object, columns: Object<string, TypedArray>}} Decoded header and columns
+ */
+export function decodeColumns(buffer) {
+    const magic = new TextDecoder().decode(new Uint8Array(buffer, 0, COLUMNS_MAGIC.length));
+    if (magic !== COLUMNS_MAGIC) {
+        throw new Error('Response is not in the columnar format');
+    }
+    const headerLength = new DataView(buffer).getUint32(COLUMNS_MAGIC.length, true);
+    const headerStart = COLUMNS_MAGIC.length + 4;
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, headerStart, headerLength)));
+
+    const columns = {};
+    for (const column of header.columns) {
+        const ArrayType = TYPED_ARRAYS[column.dtype];
+        if (!ArrayType) {
+            throw new Error(`Unsupported column dtype ${column.dtype}`);
+        }
+        // Typed arrays use platform byte order, which is little-endian on every supported browser
+        columns[column.name] = new ArrayType(buffer, column.offset, header.num_rows);
+    }
+    return { header, columns };
+}
+
+/**
+ * Convert JSON sample records to the columnar shape returned by decodeColumns
+ * @param {Array<Object>} records - Samples as {ns_since_reboot, accel_x, ...} objects
+ * @returns {Object} Column name -> array, plus length
+ */
+export function recordsToColumns(records) {
+    const columns = { length: records.length };
+    for (const name of ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']) {
+        columns[name] = Float64Array.from(records, d => d[name]);
+    }
+    return columns;
+}
+
+/**
+ * Read a columnar or JSON sample response
+ * @param {Response} response - Successful fetch response
+ * @returns {Promise<{meta: Object, columns: Object}>} Response metadata and sample columns
+ */
+async function readSampleColumns(response) {
+    if ((response.headers.get('Content-Type') || '').startsWith(COLUMNS_MIMETYPE)) {
+        const decoded = decodeColumns(await response.arrayBuffer());
+        return { meta: decoded.header.meta || {}, columns: { length: decoded.header.num_rows, ...decoded.columns } };
+    }
+    const { data, ...meta } = await response.json();
+    return { meta, columns: recordsToColumns(data || []) };
+}
+
 export class SessionAPI {
     /**
      * Load session data for a specific session
+     *
+     * Signal and bouts are separate resources, each tagged by the server, so the
+     * browser cache revalidates them independently and an unchanged signal costs
+     * only a 304.
      * @param {string} sessionId - The ID of the session to load
-     * @returns {Promise<{bouts: Array, data: Array}>} Session data
+     * @returns {Promise<{bouts: Array, data: Object}>} Session bouts and sample columns
      */
     static async loadSessionData(sessionId) {
         try {
             console.log(`Loading session data for session ID: ${sessionId}`);
-            
-            const response = await fetch(`/api/session/${sessionId}`);
-            if (!response.ok) {
-                throw new Error(`Failed to fetch session data: ${response.status} ${response.statusText}`);
-            }
-            
-            const data = await response.json();
-            console.log('Received session data:', data);
-                    
-            // Ensure bouts is an array
-            let bouts = data.bouts;
-            if (typeof bouts === 'string') {
-                try {
-                    bouts = JSON.parse(bouts);
-                } catch (e) {
-                    console.error('Error parsing bouts in loadSessionData:', e);
-                    bouts = [];
-                }
-            } else if (!Array.isArray(bouts)) {
-                bouts = [];
-            }
-            
-            console.log(`Successfully loaded session data: ${bouts.length} bouts, ${data.data?.length || 0} data points`);
-            
-            return { bouts: bouts, data: data.data };
+
+            const [data, bouts] = await Promise.all([
+                SessionAPI.loadSessionSignal(sessionId),
+                SessionAPI.loadSessionBouts(sessionId)
+            ]);
+
+            console.log(`Successfully loaded session data: ${bouts.length} bouts, ${data.length} data points`);
+
+            return { bouts: bouts, data: data };
         } catch (error) {
             console.error('Error loading session data:', error);
             throw error;
         }
     }
+
+    /**
+     * Load a session's samples
+     *
+     * Prefers the binary columnar response and falls back to JSON; either way the
+     * samples are returned as typed-array columns ready for Plotly.
+     * @param {string} sessionId - The ID of the session to load
+     * @returns {Promise<Object>} Sample columns
+     */
+    static async loadSessionSignal(sessionId) {
+        const response = await fetch(`/api/session/${sessionId}/signal`, {
+            headers: { 'Accept': `${COLUMNS_MIMETYPE}, application/json;q=0.9` }
+        });
+        if (!response.ok) {
+            throw new Error(`Failed to fetch session signal: ${response.status} ${response.statusText}`);
+        }
+        const { columns } = await readSampleColumns(response);
+        return columns;
+    }
+
+    /**
+     * Load a session's bouts without its samples, e.g. after scoring or a label edit
+     * @param {string} sessionId - The ID of the session to load
+     * @returns {Promise<Array>} Session bouts
+     */
+    static async loadSessionBouts(sessionId) {
+        const response = await fetch(`/api/session/${sessionId}/bouts`);
+        if (!response.ok) {
+            throw new Error(`Failed to fetch session bouts: ${response.status} ${response.statusText}`);
+        }
+
+        let { bouts } = await response.json();
+        // Ensure bouts is an array
+        if (typeof bouts === 'string') {
+            try {
+                bouts = JSON.parse(bouts);
+            } catch (e) {
+                console.error('Error parsing bouts in loadSessionBouts:', e);
+                bouts = [];
+            }
+        } else if (!Array.isArray(bouts)) {
+            bouts = [];
+        }
+        return bouts;
+    }
+
+    /**
+     * Load the visible slice of a session's accelerometer signal, downsampled on the server
+     *
+     * Like loadSessionSignal, prefers the columnar response and is revalidated by
+     * the browser cache, so returning to a window already seen costs only a 304.
+     * @param {string} sessionId - The ID of the session to load
+     * @param {number} startNs - Start of the visible window (ns_since_reboot)
+     * @param {number} endNs - End of the visible window (ns_since_reboot)
+     * @param {number} maxPoints - Maximum samples to return
+     * @returns {Promise<{bucketRows: number, columns: Object}>} Rows per returned sample and sample columns
+     */
+    static async loadSessionWindow(sessionId, startNs, endNs, maxPoints) {
+        const params = new URLSearchParams({
+            start_ns: Math.floor(startNs),
+            end_ns: Math.ceil(endNs),
+            max_points: Math.max(2, Math.round(maxPoints))
+        });
+        const response = await fetch(`/api/session/${sessionId}/window?${params}`, {
+            headers: { 'Accept': `${COLUMNS_MIMETYPE}, application/json;q=0.9` }
+        });
+        if (!response.ok) {
+            throw new Error(`Failed to fetch session window: ${response.status} ${response.statusText}`);
+        }
+        const { meta, columns } = await readSampleColumns(response);
+        return { bucketRows: meta.bucket_rows, columns };
+    }
+
     /**
      * Fetch all sessions or sessions for a specific project
      * @param {number|null} projectId - The project ID (optional)
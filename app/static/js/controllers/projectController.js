@@ -234,10 +234,21 @@ export class ProjectController {
             window.hideModal('createProjectModal');
         }
 
-        // Start project creation in background
+        // Start project creation in background and refresh once the upload job finishes
         ProjectService.createProject(formData)
-            .then(result => {
-                console.log("Project created:", result);
+            .then(result => ProjectAPI.waitForUpload(result.upload_id, status => {
+                console.log(`Upload ${status.status}: ${status.sessions_done}/${status.sessions_total} sessions, ETA ${status.eta_seconds ?? '?'} s`);
+            }))
+            .then(job => {
+                console.log("Project upload finished:", job);
+                if (job.status === 'failed') {
+                    alert('Project upload failed: ' + job.error);
+                }
+                const rejected = (job.result?.session_validation || []).filter(report => !report.valid);
+                if (rejected.length > 0) {
+                    alert('Skipped invalid sessions:\n' + rejected.map(report => `${report.session_name}: ${report.reason}`).join('\n'));
+                }
+                location.reload(); // Refresh the page to show updated projects
             })
             .catch(error => {
                 console.error('Error creating project:', error);
@@ -245,15 +256,6 @@ export class ProjectController {
             
         console.log('Project creation started in background:', formData);
         
-        // Refresh projects list if we're on the projects page
-        setTimeout(() => {
-            console.log('Refreshing projects list after creation');
-            if (ProjectController.initializeProjects) {
-                ProjectController.initializeProjects();
-            }
-            location.reload(); // Refresh the page to show updated projects
-        }, 1000);
-        
         if (window.resetForm) {
             window.resetForm('create-project-form');
         }
@@ -271,6 +273,9 @@ export class ProjectController {
         progressElement.style.display = 'block';
         
         
+        const progressBar = document.getElementById('bulk-progress-bar');
+        const statusText = document.getElementById('bulk-status-text');
+        
         // Use fetch API to send data to your backend
         const formData = new FormData();
         formData.append('bulkUploadFolderPath', bulkUploadFolderPath);
@@ -278,22 +283,30 @@ export class ProjectController {
         fetch('/api/projects/bulk-upload', {
             method: 'POST',
             body: formData
-        });
-        // Close the modal after starting the upload
-        const bulkUploadModal = document.getElementById('bulkUploadModal');
-        if (bulkUploadModal) {
-            const modal = bootstrap.Modal.getInstance(bulkUploadModal);
-            if (modal) {
-                modal.hide();
-            }
-        }
-        // Reload the projects list to reflect the new uploads and refresh page
-        ProjectController.initializeProjects().then(() => {
-            location.reload(); // Refresh the page to show updated projects
-        }).catch(error => {
-            console.error('Error during bulk upload:', error);
-            alert('Failed to start bulk upload: ' + error.message);
-        });
+        })
+            .then(async response => {
+                const result = await response.json();
+                if (!response.ok) {
+                    throw new Error(result.error || 'Failed to start bulk upload');
+                }
+                // Follow the background job until every project is processed
+                return ProjectAPI.waitForUpload(result.upload_id, status => {
+                    const fraction = status.bytes_total ? status.bytes_done / status.bytes_total : 0;
+                    progressBar.style.width = `${Math.round(fraction * 100)}%`;
+                    const eta = status.eta_seconds != null ? `, about ${Math.ceil(status.eta_seconds / 60)} min left` : '';
+                    statusText.textContent = `${status.sessions_done}/${status.sessions_total} sessions processed${eta}`;
+                });
+            })
+            .then(job => {
+                if (job.status === 'failed') {
+                    throw new Error(job.error);
+                }
+                location.reload(); // Refresh the page to show updated projects
+            })
+            .catch(error => {
+                console.error('Error during bulk upload:', error);
+                alert('Bulk upload failed: ' + error.message);
+            });
     }
 
     /**
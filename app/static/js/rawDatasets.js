@@ -3,6 +3,8 @@
  * Handles upload, preview, and management of raw sensor datasets
  */
 
+import ProjectAPI from './api/projectAPI.js';
+
 class RawDatasetManager {
     constructor() {
         this.currentDataset = null;
@@ -539,9 +541,16 @@ class RawDatasetManager {
             const result = await response.json();
             
             if (response.ok) {
-                this.showSuccess(
-                    `Project "${result.project_name}" created successfully with ${result.dataset_count} dataset(s)!`
-                );
+                // Sessions are created from the datasets by a background job; wait for it
+                createBtn.innerHTML = '<i class="fa-solid fa-spinner fa-spin me-2"></i>Creating sessions...';
+                const job = await ProjectAPI.waitForUpload(result.upload_id);
+                if (job.status === 'failed') {
+                    this.showError(`Project "${result.project_name}" was created, but creating its sessions failed: ${job.error}`);
+                } else {
+                    this.showSuccess(
+                        `Project "${result.project_name}" created successfully with ${result.dataset_count} dataset(s) and ${job.result.sessions_created} session(s)!`
+                    );
+                }
                 
                 // Close modal
                 bootstrap.Modal.getInstance(document.getElementById('createProjectModal')).hide();
@@ -27,7 +27,13 @@ export class ProjectService {
                     });
                     
                     if (response.ok) {
-                        const discoveryResult = await response.json();
+                        const started = await response.json();
+                        // Discovery runs as a background job; wait for it to finish
+                        const job = await ProjectAPI.waitForUpload(started.upload_id);
+                        if (job.status === 'failed') {
+                            throw new Error(job.error);
+                        }
+                        const discoveryResult = { success: true, ...job.result };
                         if (discoveryResult.success && discoveryResult.sessions_created > 0) {
                             console.log(`Discovered ${discoveryResult.sessions_created} sessions for dataset-based project`);
                             
@@ -324,7 +330,6 @@ export class ProjectService {
             // Log business-relevant information
             console.log('Upload started:', result);
             console.log('Upload ID:', result.upload_id);
-            console.log('Sessions found:', result.sessions_found);
             
             return result;
         } catch (error) {
@@ -94,15 +94,13 @@ export class SessionService {
      * @returns {boolean} True if data format is valid
      */
     static validateSessionData(session) {
-        if (!session || !session.data || !Array.isArray(session.data)) {
+        const data = session?.data;
+        if (!data || !data.ns_since_reboot) {
             return false;
         }
 
-        return session.data.every(d => 
-            d.ns_since_reboot && 
-            typeof d.accel_x === 'number' && 
-            typeof d.accel_y === 'number' && 
-            typeof d.accel_z === 'number'
+        return ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z'].every(name =>
+            data[name] && data[name].length === data.length
         );
     }
 
@@ -1295,6 +1295,8 @@ window.showModelSettings = async function(modelId, modelName) {
         const thresholdSlider = document.getElementById('threshold-slider');
         const thresholdValue = document.getElementById('threshold-value');
         const minDurationInput = document.getElementById('min-duration-input');
+        const mergeGapInput = document.getElementById('merge-gap-input');
+        const useGyroInput = document.getElementById('use-gyro-input');
         
         if (thresholdSlider && thresholdValue) {
             thresholdSlider.value = settings.threshold;
@@ -1306,6 +1308,14 @@ window.showModelSettings = async function(modelId, modelName) {
             minDurationInput.value = minDurationSec;
         }
         
+        if (mergeGapInput) {
+            mergeGapInput.value = (settings.merge_gap_ns || 0) / 1e9;
+        }
+        
+        if (useGyroInput) {
+            useGyroInput.checked = Boolean(settings.use_gyro);
+        }
+        
         // Show the settings panel
         document.getElementById('model-settings-panel').style.display = 'block';
         
@@ -1339,6 +1349,8 @@ window.saveModelSettings = async function() {
     try {
         const thresholdSlider = document.getElementById('threshold-slider');
         const minDurationInput = document.getElementById('min-duration-input');
+        const mergeGapInput = document.getElementById('merge-gap-input');
+        const useGyroInput = document.getElementById('use-gyro-input');
         
         if (!thresholdSlider || !minDurationInput) {
             throw new Error('Settings form elements not found');
@@ -1347,6 +1359,7 @@ window.saveModelSettings = async function() {
         const threshold = parseFloat(thresholdSlider.value);
         const minDurationSec = parseFloat(minDurationInput.value);
         const minDurationNs = Math.round(minDurationSec * 1e9);
+        const mergeGapSec = mergeGapInput ? parseFloat(mergeGapInput.value) || 0 : 0;
         
         // Validate inputs
         if (threshold < 0 || threshold > 1) {
@@ -1357,9 +1370,15 @@ window.saveModelSettings = async function() {
             throw new Error('Minimum duration must be between 0.1 and 60 seconds');
         }
         
+        if (mergeGapSec < 0) {
+            throw new Error('Merge gap cannot be negative');
+        }
+        
         const settings = {
             threshold: threshold,
-            min_bout_duration_ns: minDurationNs
+            min_bout_duration_ns: minDurationNs,
+            merge_gap_ns: Math.round(mergeGapSec * 1e9),
+            use_gyro: useGyroInput ? useGyroInput.checked : false
         };
         
         // Import ModelAPI and update model settings
@@ -1367,7 +1386,7 @@ window.saveModelSettings = async function() {
         await ModelAPI.updateModelSettings(window.currentEditingModelId, settings);
         
         console.log('model settings saved successfully:', settings);
-        window.alert(`Settings saved for ${window.currentEditingModelName}!\n\nThreshold: ${threshold}\nMin Duration: ${minDurationSec}s`);
+        window.alert(`Settings saved for ${window.currentEditingModelName}!\n\nThreshold: ${threshold}\nMin Duration: ${minDurationSec}s\nMerge Gap: ${mergeGapSec}s`);
         
         // Hide the panel
         window.hideModelSettingsPanel();
@@ -1387,7 +1406,7 @@ window.resetModelSettings = function() {
         return;
     }
     
-    const confirmed = (typeof confirm !== 'undefined' ? confirm : window.confirm)(`Reset ${window.currentEditingModelName} to default settings?\n\nThreshold: 0.5\nMin Duration: 0.25s`);
+    const confirmed = (typeof confirm !== 'undefined' ? confirm : window.confirm)(`Reset ${window.currentEditingModelName} to default settings?\n\nThreshold: 0.5\nMin Duration: 0.25s\nMerge Gap: 0s`);
     if (!confirmed) return;
     
     // Update UI to defaults
@@ -1403,6 +1422,16 @@ window.resetModelSettings = function() {
     if (minDurationInput) {
         minDurationInput.value = 0.25;
     }
+    
+    const mergeGapInput = document.getElementById('merge-gap-input');
+    if (mergeGapInput) {
+        mergeGapInput.value = 0;
+    }
+    
+    const useGyroInput = document.getElementById('use-gyro-input');
+    if (useGyroInput) {
+        useGyroInput.checked = false;
+    }
 };
 
 
@@ -56,6 +56,18 @@ CREATE TABLE session_lineage (
     FOREIGN KEY (parent_session_id) REFERENCES sessions(session_id)
 );
 
+-- Signal metadata computed when session data is written
+CREATE TABLE session_summaries (
+    session_id INT PRIMARY KEY,
+    row_count BIGINT NOT NULL,
+    duration_seconds DOUBLE NULL,
+    sample_rate_hz DOUBLE NULL,
+    gap_count INT NOT NULL DEFAULT 0 COMMENT 'Pauses of more than a second between samples',
+    axis_stats JSON COMMENT 'Per-axis min, max and mean',
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
+);
+
 CREATE TABLE models (
     model_id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(255) NOT NULL,
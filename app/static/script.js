@@ -221,6 +221,7 @@ function updateSessionsList() {
 async function pollScoringStatus(scoringId, sessionId, sessionName, deviceType = 'cpu') {
     const maxPolls = 120; // 2 minutes max
     let pollCount = 0;
+    let lastQueuePosition = null;
     const deviceLabel = deviceType.toUpperCase();
     
     console.log(`Starting ${deviceLabel} scoring status polling for ${scoringId}`);
@@ -232,6 +233,14 @@ async function pollScoringStatus(scoringId, sessionId, sessionName, deviceType =
             console.log(`${deviceLabel} polling response status:`, response.status); 
             const status = await response.json();
             
+            // Time spent waiting in the scoring queue does not count towards the limit
+            if (status.status === 'queued') {
+                if (status.queue_position !== lastQueuePosition) {
+                    lastQueuePosition = status.queue_position;
+                    showNotification(`${deviceLabel} scoring for ${sessionName} is queued (position ${status.queue_position})`, 'info');
+                }
+                return;
+            }
             pollCount++;
             
             if (status.status === 'completed') {
@@ -247,26 +256,14 @@ async function pollScoringStatus(scoringId, sessionId, sessionName, deviceType =
                 );
                 resetScoreButton(sessionId);
                 
-                // Force refresh the session data from the server
-                const sessionResponse = await fetch(`/api/session/${sessionId}`);
-                if (sessionResponse.ok) {
-                    const sessionData = await sessionResponse.json();
+                // Refresh the session's bouts from the server; scoring leaves the signal unchanged
+                try {
+                    const bouts = await SessionAPI.loadSessionBouts(sessionId);
                     
                     // Update the session in our local sessions array
                     const sessionIndex = sessions.findIndex(s => s.session_id == sessionId);
                     if (sessionIndex !== -1) {
-                        // Parse bouts if they're a string
-                        let bouts = sessionData.bouts;
-                        if (typeof bouts === 'string') {
-                            try {
-                                bouts = JSON.parse(bouts);
-                            } catch (e) {
-                                console.error('Error parsing bouts:', e);
-                                bouts = [];
-                            }
-                        }
-                        sessions[sessionIndex].bouts = bouts || [];
-                        sessions[sessionIndex].data = sessionData.data;
+                        sessions[sessionIndex].bouts = bouts;
                         
                         // Extract the labeling name from the new bouts and create/update labeling
                         if (bouts && bouts.length > 0) {
@@ -283,6 +280,8 @@ async function pollScoringStatus(scoringId, sessionId, sessionName, deviceType =
                             }
                         }
                     }
+                } catch (error) {
+                    console.error('Error refreshing scored session data:', error);
                 }
                 
                 // If this session is currently being visualized, refresh it
@@ -312,6 +311,11 @@ async function pollScoringStatus(scoringId, sessionId, sessionName, deviceType =
                 showNotification(`${deviceLabel} scoring failed: ${errorMsg}`, 'error');
                 resetScoreButton(sessionId);
                 
+            } else if (status.status === 'cancelled') {
+                clearInterval(poll);
+                showNotification(`${deviceLabel} scoring for ${sessionName} was cancelled`, 'warning');
+                resetScoreButton(sessionId);
+                
             } else if (pollCount >= maxPolls) {
                 clearInterval(poll);
                 showNotification(`${deviceLabel} scoring is taking longer than expected`, 'warning');
@@ -334,6 +338,38 @@ async function pollScoringStatus(scoringId, sessionId, sessionName, deviceType =
 
 
 
+// Re-fetch the visible window at higher resolution after zoom/pan settles
+const WINDOW_FETCH_DELAY_MS = 150;
+let windowFetchTimer = null;
+let windowFetchSeq = 0;
+
+function scheduleVisibleWindowFetch(plotDiv, sessionId) {
+    clearTimeout(windowFetchTimer);
+    windowFetchTimer = setTimeout(() => fetchVisibleWindow(plotDiv, sessionId), WINDOW_FETCH_DELAY_MS);
+}
+
+async function fetchVisibleWindow(plotDiv, sessionId) {
+    const xrange = plotDiv?._fullLayout?.xaxis?.range;
+    if (!xrange || currentSessionId != sessionId) return;
+
+    const seq = ++windowFetchSeq;
+    // Two samples (min and max) per horizontal pixel
+    const maxPoints = Math.max(500, 2 * plotDiv.clientWidth);
+    try {
+        const windowData = await SessionAPI.loadSessionWindow(sessionId, Number(xrange[0]), Number(xrange[1]), maxPoints);
+        // Drop responses that were overtaken by a newer zoom or a session switch
+        if (seq !== windowFetchSeq || currentSessionId != sessionId) return;
+
+        const { columns } = windowData;
+        Plotly.restyle(plotDiv, {
+            x: [0, 1, 2].map(() => columns.ns_since_reboot),
+            y: [columns.accel_x, columns.accel_y, columns.accel_z]
+        }, [0, 1, 2]);
+    } catch (error) {
+        console.error('Error loading visible window:', error);
+    }
+}
+
 // Show visualization view
 async function visualizeSession(sessionId) {
     // If we're already viewing a session and switching to another, save changes first
@@ -504,21 +540,20 @@ async function visualizeSession(sessionId) {
         return;
     }
 
-    const timestamps = dataToPlot.map(d => d.ns_since_reboot).filter(t => t);
-    const xValues = dataToPlot.map(d => d.accel_x).filter(accel_x => typeof accel_x === 'number');
-    const yValues = dataToPlot.map(d => d.accel_y).filter(accel_y => typeof accel_y === 'number');
-    const zValues = dataToPlot.map(d => d.accel_z).filter(accel_z => typeof accel_z === 'number');
-    const labels = dataToPlot.map(d => d.label).filter(label => typeof label === 'number');
+    // Session data arrives as typed-array columns, which Plotly plots without copying
+    const timestamps = dataToPlot.ns_since_reboot;
+    const xValues = dataToPlot.accel_x;
+    const yValues = dataToPlot.accel_y;
+    const zValues = dataToPlot.accel_z;
+    const labels = [];
     if (timestamps.length === 0) {
         console.error('No valid timestamps for plotting');
         return;
     }
 
-    // With this more efficient approach:
-    minTimestamp = timestamps.reduce((min, val) => Math.min(min, val), Infinity);
-
-    // And similarly for maxTimestamp:
-    maxTimestamp = timestamps.reduce((max, val) => Math.max(max, val), -Infinity);
+    // Timestamps are sorted, so the extremes are the ends of the column
+    minTimestamp = timestamps[0];
+    maxTimestamp = timestamps[timestamps.length - 1];
 
     const traces = [
         { x: timestamps, y: xValues, name: 'X Axis', type: 'scatter', mode: 'lines', line: { color: '#17BECF' } },
@@ -595,9 +630,13 @@ async function visualizeSession(sessionId) {
             }
         });
         // Update overlays on plot relayout (pan, zoom, etc.)
-        plotDiv.on('plotly_relayout', () => {
+        plotDiv.on('plotly_relayout', (eventData) => {
             console.log('Plotly relayout event');
             window.OverlayManager.updateOverlaysForLabelingChange(session, currentLabelingName);
+            // Fetch detail for the new x-range only when the visible window changed
+            if (eventData && Object.keys(eventData).some(key => key.startsWith('xaxis.range') || key === 'xaxis.autorange')) {
+                scheduleVisibleWindowFetch(plotDiv, sessionId);
+            }
         });
         // Update overlays during pan/zoom interaction
         plotDiv.on('plotly_relayouting', () => {
@@ -2149,15 +2188,13 @@ Cancel = Choose a new name`);
             if (currentSession) {
                 console.log('Refreshing current session data after labeling import to prevent overwrite');
                 try {
-                    // Reload the session data from the server to get the most up-to-date bouts
-                    const { bouts, data } = await SessionAPI.loadSessionData(currentSessionId);
+                    // Reload the bouts from the server to get the most up-to-date labels
+                    const bouts = await SessionAPI.loadSessionBouts(currentSessionId);
                     currentSession.bouts = bouts;
-                    currentSession.data = data;
                     
                     // Update the drag context as well
                     if (dragContext.currentSession && dragContext.currentSession.session_id == currentSessionId) {
                         dragContext.currentSession.bouts = bouts;
-                        dragContext.currentSession.data = data;
                     }
                     
                     // Refresh the visualization to show any imported bouts
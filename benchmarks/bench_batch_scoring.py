@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Measure read-ahead in batch scoring.
+
+Runs a batch of synthetic sessions through run_batch, loading each session's CSV
+and scoring it with a stand-in model (numpy matrix products over windows, which
+release the GIL like torch inference), with and without loading the next session
+while the current one is scored.
+
+Usage:
+    python3 benchmarks/bench_batch_scoring.py [--sessions 10] [--hours 0.5] [--steps 4]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.utils import load_dataframe_from_csv
+from app.services.batch_scoring import new_batch_state, run_batch
+
+
+def make_session_csv(path, hours, seed, hz=50):
+    rows = int(hours * 3600 * hz)
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * (1_000_000_000 // hz),
+        'accel_x': rng.normal(0, 1, rows).round(5),
+        'accel_y': rng.normal(0, 1, rows).round(5),
+        'accel_z': rng.normal(9.8, 1, rows).round(5),
+    }).to_csv(path, index=False)
+
+
+def make_model(steps, window=3000):
+    rng = np.random.default_rng(0)
+    weights = rng.normal(size=(window * 3, 512)) / window
+
+    def score(session, df):
+        values = df[['accel_x', 'accel_y', 'accel_z']].to_numpy()
+        windows = values[:len(values) // window * window].reshape(-1, window * 3)
+        hidden = windows @ weights
+        for _ in range(steps):
+            hidden = np.tanh(hidden @ np.eye(512))
+        return [{'start': i, 'end': i + 1} for i in np.flatnonzero(hidden[:, 0] > 0.5)]
+    return score
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark read-ahead in batch scoring')
+    parser.add_argument('--sessions', type=int, default=10, help='Sessions in the batch')
+    parser.add_argument('--hours', type=float, default=0.5, help='Length of each session in hours')
+    parser.add_argument('--steps', type=int, default=4, help='Work per window of the stand-in model')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sessions = []
+        for i in range(args.sessions):
+            os.makedirs(os.path.join(tmp, f'session.{i}'))
+            make_session_csv(os.path.join(tmp, f'session.{i}', 'accelerometer_data.csv'), args.hours, i)
+            sessions.append({'session_id': i, 'session_name': f'session.{i}', 'project_path': tmp})
+
+        def load(session):
+            csv_path = os.path.join(session['project_path'], session['session_name'], 'accelerometer_data.csv')
+            return load_dataframe_from_csv.uncached(csv_path, column_prefix='accel')
+
+        score = make_model(args.steps)
+        load_time = time.perf_counter()
+        frame = load(sessions[0])
+        load_time = time.perf_counter() - load_time
+        score_time = time.perf_counter()
+        score(sessions[0], frame)
+        score_time = time.perf_counter() - score_time
+        print(f"{args.sessions} sessions of {args.hours:g} h: load {load_time * 1000:.0f} ms, score {score_time * 1000:.0f} ms each; {os.cpu_count()} CPUs")
+
+        for prefetch in (0, 1):
+            state = new_batch_state({'id': 1, 'name': 'bench'}, sessions, 'cpu', 'smoking')
+            start = time.perf_counter()
+            run_batch(state, load, score, lambda session, bouts: None, directory=os.path.join(tmp, 'batches'), prefetch=prefetch)
+            elapsed = time.perf_counter() - start
+            print(f"  read-ahead {prefetch}: {elapsed:6.2f} s  ({elapsed / args.sessions * 1000:.0f} ms per session)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compare bout extraction: the former per-sample pandas loop versus the run-length encoder.
+
+Generates per-sample predictions with runs of random length and times
+extract_bouts on the full input. The per-sample loop takes minutes on 10M samples,
+so it is timed on --legacy-rows samples and its per-sample cost extrapolated.
+
+Usage:
+    python3 benchmarks/bench_bout_extraction.py [--rows 10000000] [--legacy-rows 200000] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.bout_extraction import extract_bouts
+
+
+def make_predictions(rows, hz=50):
+    rng = np.random.default_rng(0)
+    ns = (1_000_000_000_000 + np.arange(rows, dtype=np.int64) * (1_000_000_000 // hz)).astype(np.float64)
+    lengths = rng.geometric(0.002, rows // 100)
+    values = np.repeat(rng.random(len(lengths)) < 0.2, lengths)
+    predictions = np.zeros(rows)
+    predictions[:min(rows, len(values))] = values[:rows]
+    return ns, predictions
+
+
+def legacy_extract(df, predictions, min_duration_sec=0.25):
+    df = df.copy()
+    df['y_pred'] = predictions[:len(df)]
+    bouts = []
+    current_bout = None
+    for i in range(len(df)):
+        if df['y_pred'].iloc[i] > 0:
+            if current_bout is None:
+                current_bout = [int(df['ns_since_reboot'].iloc[i]), None]
+            current_bout[1] = int(df['ns_since_reboot'].iloc[i])
+        elif current_bout is not None:
+            bouts.append(current_bout)
+            current_bout = None
+    if current_bout is not None:
+        bouts.append(current_bout)
+    return [{'start': b[0], 'end': b[1], 'label': 'smoking'} for b in bouts if (b[1] - b[0]) >= min_duration_sec * 1e9]
+
+
+def best_of(repeat, fn):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bout extraction from prediction arrays')
+    parser.add_argument('--rows', type=int, default=10_000_000, help='Samples for the run-length encoder')
+    parser.add_argument('--legacy-rows', type=int, default=200_000, help='Samples for the per-sample loop')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions (best is reported)')
+    args = parser.parse_args()
+
+    ns, predictions = make_predictions(args.rows)
+    vector_time, bouts = best_of(args.repeat, lambda: extract_bouts(ns, predictions, min_duration_ns=0.25e9))
+    with_confidence_time, _ = best_of(args.repeat, lambda: extract_bouts(ns, predictions, min_duration_ns=0.25e9, merge_gap_ns=1e9, confidence=predictions))
+    print(f"Run-length encoder, {args.rows:,} samples: {vector_time * 1000:8.1f} ms ({len(bouts):,} bouts)"
+          f"; with gap merging and confidence: {with_confidence_time * 1000:8.1f} ms")
+
+    legacy_ns, legacy_predictions = ns[:args.legacy_rows], predictions[:args.legacy_rows]
+    df = pd.DataFrame({'ns_since_reboot': legacy_ns})
+    legacy_time, legacy_bouts = best_of(1, lambda: legacy_extract(df, legacy_predictions))
+    assert legacy_bouts == extract_bouts(legacy_ns, legacy_predictions, min_duration_ns=0.25e9)
+    extrapolated = legacy_time * args.rows / args.legacy_rows
+    print(f"Per-sample loop, {args.legacy_rows:,} samples: {legacy_time * 1000:8.1f} ms"
+          f" -> ~{extrapolated:.0f} s for {args.rows:,} ({extrapolated / vector_time:.0f}x slower)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Measure response compression on the session data and export endpoints.
+
+Serves a synthetic 50 Hz session through the sessions blueprint (with a stand-in
+session service) and a labels export-sized JSON body, with and without negotiated
+compression. Reports body sizes, server time per request and the estimated time
+to deliver the body over a link of the given bandwidth.
+
+Usage:
+    python3 benchmarks/bench_compression.py [--hours 1] [--bouts 500] [--mbps 50] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes import sessions
+from app.compression import init_compression, available_encodings
+from app.services.signal_store import COLUMNS_MIMETYPE
+
+
+class BenchSessionService:
+    def __init__(self, data_dir, bouts):
+        self.data_dir = data_dir
+        self.bouts = bouts
+
+    def get_session_details(self, session_id):
+        return {'session_id': session_id, 'session_name': 'session', 'project_path': self.data_dir, 'bouts': self.bouts}
+
+    def get_signal_source(self, session_id, session_info):
+        return {'data_dir': self.data_dir, 'start_row': None, 'end_row': None, 'start_ns': None, 'end_ns': None}
+
+
+def make_session_csv(path, hours, hz=50):
+    rows = int(hours * 3600 * hz)
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * (1_000_000_000 // hz),
+        'accel_x': rng.normal(0, 1, rows).round(5),
+        'accel_y': rng.normal(0, 1, rows).round(5),
+        'accel_z': rng.normal(9.8, 1, rows).round(5),
+    }).to_csv(path, index=False)
+    return rows
+
+
+def make_bouts(count):
+    return [{'start': 1_000_000_000_000 + i * 7_000_000_000, 'end': 1_000_000_000_000 + i * 7_000_000_000 + 3_000_000_000,
+             'label': 'smoking' if i % 3 else 'puff', 'confidence': 0.9} for i in range(count)]
+
+
+def make_app(data_dir, bouts, compress):
+    app = Flask(__name__)
+    if compress:
+        init_compression(app)
+    sessions.init_controller(None, BenchSessionService(data_dir, bouts), None)
+    app.register_blueprint(sessions.sessions_bp)
+
+    @app.route('/api/export/labels')
+    def export_labels():
+        # Shaped like main.export_labels: one entry per session with its bouts
+        return jsonify({'sessions': [{'session_id': i, 'session_name': f'session.{i}', 'bouts': bouts} for i in range(40)]})
+    return app
+
+
+def best_of(repeat, fn):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark negotiated response compression')
+    parser.add_argument('--hours', type=float, default=1, help='Synthetic session length in hours')
+    parser.add_argument('--bouts', type=int, default=500, help='Bouts per session')
+    parser.add_argument('--mbps', type=float, default=50, help='Link bandwidth for the transfer estimate')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions (best is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = make_session_csv(os.path.join(tmp, 'accelerometer_data.csv'), args.hours)
+        bouts = make_bouts(args.bouts)
+        print(f"Session: {rows:,} rows ({args.hours:g} h), {args.bouts} bouts; encodings: {', '.join(available_encodings())}; link: {args.mbps:g} Mbit/s")
+
+        plain = make_app(tmp, bouts, compress=False).test_client()
+        compressed = make_app(tmp, bouts, compress=True).test_client()
+        # Build the signal pyramid before timing
+        plain.get('/api/session/1/signal')
+
+        requests = [
+            ('session JSON', '/api/session/1', 'application/json'),
+            ('session columnar', '/api/session/1', COLUMNS_MIMETYPE),
+            ('bouts', '/api/session/1/bouts', 'application/json'),
+            ('labels export', '/api/export/labels', 'application/json'),
+        ]
+        for label, path, accept in requests:
+            plain_time, plain_response = best_of(args.repeat, lambda: plain.get(path, headers={'Accept': accept}))
+            for encoding in available_encodings():
+                headers = {'Accept': accept, 'Accept-Encoding': encoding}
+                encoded_time, encoded_response = best_of(args.repeat, lambda: compressed.get(path, headers=headers))
+                plain_total = plain_time + len(plain_response.data) * 8 / (args.mbps * 1e6)
+                encoded_total = encoded_time + len(encoded_response.data) * 8 / (args.mbps * 1e6)
+                print(f"  {label:17s} {encoding:7s} {len(plain_response.data) / 1e3:8.1f} KB -> {len(encoded_response.data) / 1e3:7.1f} KB"
+                      f"   server {plain_time * 1000:6.1f} -> {encoded_time * 1000:6.1f} ms"
+                      f"   with transfer {plain_total * 1000:6.1f} -> {encoded_total * 1000:6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
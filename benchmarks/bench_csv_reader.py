@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compare signal CSV parsing backends.
+
+Generates synthetic 50 Hz accelerometer files of typical session lengths and times
+the previous parse (default pd.read_csv followed by astype(float)) against
+read_signal_table with the declared schema on the C engine and, when installed,
+the pyarrow engine.
+
+Usage:
+    python3 benchmarks/bench_csv_reader.py [--hours 1 8 24] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.utils import read_signal_table, SIGNAL_CSV_ENGINE
+
+
+def make_session_csv(path, hours, hz=50):
+    rows = int(hours * 3600 * hz)
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * (1_000_000_000 // hz),
+        'x': rng.normal(0, 1, rows).round(5),
+        'y': rng.normal(0, 1, rows).round(5),
+        'z': rng.normal(9.8, 1, rows).round(5),
+    }).to_csv(path, index=False)
+    return rows
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def default_parse(csv_path):
+    """The previous loader parse: inferred dtypes, then a cast pass"""
+    df = pd.read_csv(csv_path)
+    for name in df.columns:
+        df[name] = df[name].astype(float)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark signal CSV parsing backends')
+    parser.add_argument('--hours', type=float, nargs='+', default=[1, 8, 24], help='Synthetic session lengths in hours')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions (best is reported)')
+    args = parser.parse_args()
+
+    engines = ['c'] + (['pyarrow'] if SIGNAL_CSV_ENGINE == 'pyarrow' else [])
+    print(f"Default engine: {SIGNAL_CSV_ENGINE}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for hours in args.hours:
+            csv_path = os.path.join(tmp, f'accelerometer_{hours:g}h.csv')
+            rows = make_session_csv(csv_path, hours)
+            print(f"\n{hours:g} h: {rows:,} rows, {os.path.getsize(csv_path) / 1e6:.0f} MB")
+
+            baseline = best_of(args.repeat, lambda: default_parse(csv_path))
+            print(f"  read_csv + astype(float):  {baseline * 1000:8.1f} ms")
+            for engine in engines:
+                elapsed = best_of(args.repeat, lambda: read_signal_table(csv_path, engine=engine))
+                print(f"  schema, {engine:8s} engine:   {elapsed * 1000:8.1f} ms  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
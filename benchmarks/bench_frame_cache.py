@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Measure the frame cache on the open -> score -> split sequence.
+
+Scoring and splitting a session each load its accelerometer frame again after the
+session is opened. Times those three loads of a virtual split through the uncached
+loader and through the frame cache, for a file with a binary sidecar and for a
+CSV-only file. Then times the first load in a worker whose memory cache is empty
+while another worker already populated the shared disk cache.
+
+Usage:
+    python3 benchmarks/bench_frame_cache.py [--hours 24] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.utils import load_dataframe_from_csv
+from app.services.signal_store import build_sidecar_from_csv, sidecar_path
+from app.services.frame_cache import frame_cache, cached_frame, FrameCache, DiskFrameCache
+
+
+def make_session_csv(path, hours, hz=50):
+    rows = int(hours * 3600 * hz)
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * (1_000_000_000 // hz),
+        'accel_x': rng.normal(0, 1, rows).round(5),
+        'accel_y': rng.normal(0, 1, rows).round(5),
+        'accel_z': rng.normal(9.8, 1, rows).round(5),
+    }).to_csv(path, index=False)
+    return rows
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the decoded session frame cache')
+    parser.add_argument('--hours', type=float, default=24, help='Synthetic session length in hours')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions (best is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'accelerometer_data.csv')
+        rows = make_session_csv(csv_path, args.hours)
+        # A virtual split covering the middle half of the parent's rows
+        start, end = rows // 4, 3 * rows // 4
+        print(f"Session: {rows:,} rows ({args.hours:g} h), split of {end - start:,} rows")
+
+        def sequence(loader):
+            for _ in ('open', 'score', 'split'):
+                loader(csv_path, column_prefix='accel', start_offset=start, end_offset=end)
+
+        def cached():
+            frame_cache.clear()
+            sequence(load_dataframe_from_csv)
+
+        for label, prepare in (('CSV only', lambda: None), ('sidecar', lambda: build_sidecar_from_csv(csv_path))):
+            prepare()
+            uncached_time = best_of(args.repeat, lambda: sequence(load_dataframe_from_csv.uncached))
+            cached_time = best_of(args.repeat, cached)
+            print(f"  {label:9s} uncached: {uncached_time * 1000:8.1f} ms   cached: {cached_time * 1000:8.1f} ms  ({uncached_time / cached_time:.1f}x)")
+        assert os.path.exists(sidecar_path(csv_path))
+        print(f"Cache after run: {frame_cache.stats()}")
+
+        disk = DiskFrameCache(os.path.join(tmp, 'frame_cache'), 4 * 1024 ** 3)
+        def worker_load():
+            # A worker that has not loaded this split yet
+            load = cached_frame(cache=FrameCache(0), disk_cache=disk)(load_dataframe_from_csv.uncached)
+            return load(csv_path, column_prefix='accel', start_offset=start, end_offset=end)
+        for label, prepare in (('CSV only', lambda: os.remove(sidecar_path(csv_path))), ('sidecar', lambda: build_sidecar_from_csv(csv_path))):
+            prepare()
+            shutil.rmtree(disk.directory, ignore_errors=True)
+            decode_time = best_of(1, worker_load)
+            shared_time = best_of(args.repeat, worker_load)
+            print(f"  {label:9s} first worker: {decode_time * 1000:8.1f} ms   other workers: {shared_time * 1000:8.1f} ms  ({decode_time / shared_time:.1f}x)")
+        print(f"Disk cache after run: {disk.stats()}")
+
+
+if __name__ == '__main__':
+    main()
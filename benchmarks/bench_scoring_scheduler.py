@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Compare thread-per-request scoring with the bounded scoring scheduler under load.
+
+Submits a burst of simulated CPU scoring jobs at once (multithreaded matrix products
+standing in for torch inference) and reports the wall time of the burst and the
+time each job takes from submission to completion, first with one thread per job
+as before and then through a ScoringScheduler.
+
+Usage:
+    python3 benchmarks/bench_scoring_scheduler.py [--jobs 10] [--size 1024] [--steps 20] [--slots 1]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scoring_scheduler import ScoringScheduler
+
+
+def make_job(size, steps):
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=(size, size))
+
+    def run(cancelled=None):
+        x = a
+        for _ in range(steps):
+            x = np.tanh(x @ a / size)
+        return x
+    return run
+
+
+def burst(jobs, submit):
+    """Submit all jobs at once; returns wall time and per-job latencies"""
+    latencies = [None] * len(jobs)
+    done = threading.Semaphore(0)
+    start = time.perf_counter()
+
+    def wrap(i, job):
+        def run(cancelled=None):
+            job()
+            latencies[i] = time.perf_counter() - start
+            done.release()
+        return run
+
+    for i, job in enumerate(jobs):
+        submit(i, wrap(i, job))
+    for _ in jobs:
+        done.acquire()
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the bounded scoring scheduler under a burst of requests')
+    parser.add_argument('--jobs', type=int, default=10, help='Concurrent scoring requests')
+    parser.add_argument('--size', type=int, default=1024, help='Matrix size of the simulated model')
+    parser.add_argument('--steps', type=int, default=20, help='Matrix products per job')
+    parser.add_argument('--slots', type=int, default=1, help='CPU slots of the scheduler')
+    args = parser.parse_args()
+
+    jobs = [make_job(args.size, args.steps) for _ in range(args.jobs)]
+    single = time.perf_counter()
+    jobs[0]()
+    single = time.perf_counter() - single
+    print(f"{args.jobs} jobs of {single * 1000:.0f} ms each when run alone")
+
+    def thread_per_request(i, run):
+        threading.Thread(target=run, daemon=True).start()
+
+    scheduler = ScoringScheduler(args.slots, {'cpu': args.slots})
+
+    def scheduled(i, run):
+        scheduler.submit(i, 'cpu', run)
+
+    for label, submit in (('thread per request', thread_per_request), (f'scheduler ({args.slots} slot)', scheduled)):
+        wall, latencies = burst(jobs, submit)
+        print(f"  {label:20s} burst {wall:6.2f} s   first result {latencies[0]:6.2f} s"
+              f"   median {latencies[len(latencies) // 2]:6.2f} s   last {latencies[-1]:6.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Compare split-index computation: a full-column nearest scan per split point versus
+the sorted-timestamp split engine, and per-bout segment loops versus interval clipping.
+
+Builds a synthetic 50 Hz session with many recording gaps and times finding the
+segments at every gap (upload auto-split) and at user split points (manual split),
+then assigning bouts to the segments.
+
+Usage:
+    python3 benchmarks/bench_session_splits.py [--hours 8] [--gaps 500] [--bouts 5000] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.session_splits import split_at_gaps, split_at_points
+from app.services.bout_intervals import assign_bouts_to_segments
+
+GAP_THRESHOLD_NS = 30 * 60 * 1_000_000_000
+
+
+def make_session(hours, gaps, hz=50):
+    rows = int(hours * 3600 * hz)
+    ns = 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * (1_000_000_000 // hz)
+    gap_rows = np.sort(np.random.default_rng(0).choice(np.arange(1, rows - 1), gaps, replace=False))
+    for row in gap_rows:
+        ns[row:] += 2 * GAP_THRESHOLD_NS
+    return pd.DataFrame({'ns_since_reboot': ns.astype(float)})
+
+
+def best_of(repeat, fn):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def scan_segments(df, points):
+    """The previous approach: a time_diff column and idxmin per split point"""
+    split_indices = []
+    for point in sorted(set(float(p) for p in points)):
+        df['time_diff'] = abs(df['ns_since_reboot'] - point)
+        split_index = df['time_diff'].idxmin()
+        if 0 < split_index < len(df) - 1:
+            split_indices.append(split_index)
+    split_indices = [0] + sorted(set(split_indices)) + [len(df)]
+    segments = []
+    for start, end in zip(split_indices[:-1], split_indices[1:]):
+        segment = df.iloc[start:end]
+        segments.append((start, end, segment['ns_since_reboot'].min(), segment['ns_since_reboot'].max()))
+    return segments
+
+
+def loop_assign_bouts(segment_ranges, bouts):
+    """The previous approach: scan segments per bout, keeping the first overlap"""
+    segment_bouts = [[] for _ in segment_ranges]
+    for bout in bouts:
+        for i, (segment_start, segment_end) in enumerate(segment_ranges):
+            if bout['start'] <= segment_end and bout['end'] >= segment_start:
+                segment_bouts[i].append({'start': max(bout['start'], segment_start), 'end': min(bout['end'], segment_end), 'label': bout['label']})
+                break
+    return segment_bouts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark session split-index computation')
+    parser.add_argument('--hours', type=float, default=8, help='Synthetic session length in hours')
+    parser.add_argument('--gaps', type=int, default=500, help='Number of recording gaps')
+    parser.add_argument('--bouts', type=int, default=5000, help='Number of labelled bouts')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions (best is reported)')
+    args = parser.parse_args()
+
+    df = make_session(args.hours, args.gaps)
+    ns = df['ns_since_reboot'].to_numpy()
+    print(f"Session: {len(df):,} samples, {args.gaps} gaps")
+
+    diffs = df['ns_since_reboot'].diff()
+    gap_points = df.loc[diffs[diffs > GAP_THRESHOLD_NS].index, 'ns_since_reboot'].tolist()
+
+    scan_time, expected = best_of(args.repeat, lambda: scan_segments(df.copy(), gap_points))
+    gaps_time, segments = best_of(args.repeat, lambda: split_at_gaps(ns, GAP_THRESHOLD_NS))
+    points_time, point_segments = best_of(args.repeat, lambda: split_at_points(ns, gap_points))
+
+    for result in (segments, point_segments):
+        assert [(s['start_offset'], s['end_offset'], s['start_ns'], s['stop_ns']) for s in result] == expected
+
+    print(f"Per-point idxmin scan: {scan_time * 1000:9.1f} ms")
+    print(f"Engine, gaps:          {gaps_time * 1000:9.1f} ms  ({scan_time / gaps_time:.0f}x faster)")
+    print(f"Engine, split points:  {points_time * 1000:9.1f} ms  ({scan_time / points_time:.0f}x faster)")
+
+    rng = np.random.default_rng(1)
+    bout_starts = rng.uniform(ns[0], ns[-1], args.bouts)
+    bouts = [{'start': float(start), 'end': float(start + 60e9), 'label': 'smoking'} for start in bout_starts]
+    segment_ranges = [(s['start_ns'], s['stop_ns']) for s in segments]
+    loop_time, _ = best_of(args.repeat, lambda: loop_assign_bouts(segment_ranges, bouts))
+    clip_time, _ = best_of(args.repeat, lambda: assign_bouts_to_segments(segment_ranges, bouts))
+    print(f"Bouts ({args.bouts}), segment loop:    {loop_time * 1000:9.1f} ms")
+    print(f"Bouts ({args.bouts}), interval clip:   {clip_time * 1000:9.1f} ms  ({loop_time / clip_time:.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare loading a session signal file from CSV text versus its binary sidecar.
+
+Generates a synthetic 50 Hz accelerometer session in a temporary directory and
+times load_dataframe_from_csv with and without the sidecar present, plus a
+virtual-split load through the CSV row index.
+
+Usage:
+    python3 benchmarks/bench_signal_store.py [--hours 4] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.signal_store import write_sidecar, sidecar_path
+from app.services.utils import load_dataframe_from_csv
+
+
+def make_session_csv(path, hours, hz=50):
+    rows = int(hours * 3600 * hz)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * (1_000_000_000 // hz),
+        'accel_x': rng.normal(0, 1, rows).round(6),
+        'accel_y': rng.normal(0, 1, rows).round(6),
+        'accel_z': rng.normal(9.8, 1, rows).round(6),
+    })
+    df.to_csv(path, index=False)
+    return df
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CSV vs sidecar session loading')
+    parser.add_argument('--hours', type=float, default=4, help='Synthetic session length in hours')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions (best is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'accelerometer_data.csv')
+        df = make_session_csv(csv_path, args.hours)
+        print(f"Session: {len(df):,} rows, CSV {os.path.getsize(csv_path) / 1e6:.1f} MB")
+
+        csv_time = best_of(args.repeat, lambda: load_dataframe_from_csv.uncached(csv_path))
+
+        # A 10 minute virtual split near the end of the recording
+        start, end = len(df) - 40_000, len(df) - 10_000
+        skiprows_split_time = best_of(args.repeat, lambda: pd.read_csv(csv_path, skiprows=range(1, start + 1), nrows=end - start))
+        load_split = lambda: load_dataframe_from_csv.uncached(csv_path, start_offset=start, end_offset=end)
+        # First access builds the CSV row index; time it separately from indexed loads
+        index_build_time = best_of(1, load_split)
+        indexed_split_time = best_of(args.repeat, load_split)
+
+        write_sidecar(csv_path, df)
+        print(f"Sidecar: {os.path.getsize(sidecar_path(csv_path)) / 1e6:.1f} MB")
+        sidecar_time = best_of(args.repeat, lambda: load_dataframe_from_csv.uncached(csv_path))
+
+        split_time = best_of(args.repeat, load_split)
+
+        print(f"CSV load:            {csv_time * 1000:9.1f} ms")
+        print(f"Sidecar load:        {sidecar_time * 1000:9.1f} ms  ({csv_time / sidecar_time:.1f}x faster)")
+        print(f"CSV split (skiprows):{skiprows_split_time * 1000:9.1f} ms")
+        print(f"CSV split (row idx): {indexed_split_time * 1000:9.1f} ms  (first access incl. index build {index_build_time * 1000:.1f} ms)")
+        print(f"Sidecar split:       {split_time * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
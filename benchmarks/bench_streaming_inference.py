@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Measure peak memory of model inference with and without chunked streaming.
+
+Runs a stand-in windowed model (overlapping 60 s windows at half-window stride,
+copied into one input array the way unfold + contiguous tensors are) over
+synthetic 50 Hz sessions of increasing length, and reports the peak memory
+allocated during processing (tracemalloc) and the time taken.
+
+Usage:
+    python3 benchmarks/bench_streaming_inference.py [--hours 6 24 72] [--chunk-rows 360000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.model_processor import ModelProcessor
+
+
+class OverlappingWindowModel:
+    window_size = 3000
+    receptive_field = 3000
+
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        self.weights = rng.normal(size=(self.window_size, 3)).astype(np.float32) / self.window_size
+
+    def preprocess(self, data):
+        values = data[['accel_x', 'accel_y', 'accel_z']].to_numpy(dtype=np.float32)
+        stride = self.window_size // 2
+        starts = np.arange(0, len(values) - self.window_size + 1, stride)
+        return np.stack([values[s:s + self.window_size] for s in starts])
+
+    def run(self, preprocessed_data, device='cpu'):
+        return np.einsum('nwc,wc->n', preprocessed_data, self.weights)
+
+    def postprocess(self, raw_predictions, raw_data, threshold=None):
+        stride = self.window_size // 2
+        per_window = (raw_predictions > (threshold or 0)).astype(np.float32)
+        predictions = np.zeros(len(raw_data), dtype=np.float32)
+        for offset in (0, stride):
+            # Each sample takes the latest window covering it
+            covered = per_window[offset // stride::2].repeat(self.window_size)
+            predictions[offset:offset + len(covered)] = np.maximum(predictions[offset:offset + len(covered)], covered)
+        return predictions
+
+
+def make_session(hours, hz=50):
+    rows = int(hours * 3600 * hz)
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'ns_since_reboot': np.arange(rows, dtype=np.float64) * (1e9 / hz),
+        'accel_x': rng.normal(0, 1, rows).astype(np.float32),
+        'accel_y': rng.normal(0, 1, rows).astype(np.float32),
+        'accel_z': rng.normal(9.8, 1, rows).astype(np.float32),
+    })
+
+
+def measure(processor, data):
+    tracemalloc.start()
+    start = time.perf_counter()
+    predictions = processor.process(data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed, predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming (chunked) model inference')
+    parser.add_argument('--hours', type=float, nargs='+', default=[6, 24, 72], help='Session lengths in hours')
+    parser.add_argument('--chunk-rows', type=int, default=360_000, help='Rows per streamed chunk')
+    args = parser.parse_args()
+
+    for hours in args.hours:
+        data = make_session(hours)
+        single_peak, single_time, single = measure(ModelProcessor(OverlappingWindowModel(), chunk_rows=0), data)
+        stream_peak, stream_time, streamed = measure(ModelProcessor(OverlappingWindowModel(), chunk_rows=args.chunk_rows), data)
+        assert np.array_equal(streamed[:len(single)], single)
+        print(f"{hours:5g} h ({len(data):>10,} rows)  single pass: {single_peak / 1e6:8.1f} MB {single_time:6.2f} s"
+              f"   streamed: {stream_peak / 1e6:8.1f} MB {stream_time:6.2f} s")
+        del data, single, streamed
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Compare the in-memory upload pipeline before and after removing redundant passes.
+
+The previous pipeline cast columns one at a time, sorted every frame before and
+after the merge and resampled a copy of the merged frame through pandas. The
+current one sorts only unsorted input and resamples sorted timestamps in a single
+numpy pass. Both write the same signal files.
+
+Builds a synthetic accelerometer + gyroscope session, then times each pipeline and
+measures its peak traced memory in a separate run (tracing slows it down).
+
+Usage:
+    python3 benchmarks/bench_upload_pipeline.py [--hours 24] [--repeat 1]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.upload_preprocessing import prepare_upload, write_signal_files, GAP_THRESHOLD_MINUTES
+from app.services.session_splits import split_at_gaps
+from app.services.utils import get_sample_rate_from_dataframe, check_sample_rate_consistency
+from tests.conftest import make_signal
+
+
+def make_upload(directory, hours, hz=50):
+    session_dir = os.path.join(directory, 'upload', 'session')
+    os.makedirs(session_dir)
+    rows = int(hours * 3600 * hz)
+    make_signal(1_000_000_000_000, rows, hz, 0).to_csv(os.path.join(session_dir, 'accelerometer_data.csv'), index=False)
+    make_signal(1_000_003_000_000, rows, hz, 1).to_csv(os.path.join(session_dir, 'gyroscope_data.csv'), index=False)
+    return os.path.join(directory, 'upload'), rows
+
+
+def previous_load(csv_path, column_prefix):
+    """The previous loader: per-column casts and an unconditional sort"""
+    df = pd.read_csv(csv_path).iloc[:-1]
+    df = df.rename(columns={'x': f'{column_prefix}_x', 'y': f'{column_prefix}_y', 'z': f'{column_prefix}_z'})
+    for name in ['ns_since_reboot', f'{column_prefix}_x', f'{column_prefix}_y', f'{column_prefix}_z']:
+        df[name] = df[name].astype(float)
+    return df.sort_values('ns_since_reboot').reset_index(drop=True)
+
+
+def previous_resample(df, target_hz=50):
+    """The previous resample: a copy with a datetime column, then pandas mean/ffill"""
+    df = df.copy()
+    df['timestamp'] = pd.to_datetime(df['ns_since_reboot'], unit='ns')
+    df = df.set_index('timestamp')
+    df_resampled = df.resample(f'{1000 // target_hz}ms').mean().ffill().reset_index()
+    df_resampled['ns_since_reboot'] = df_resampled['timestamp'].astype('int64')
+    return df_resampled.drop('timestamp', axis=1)
+
+
+def previous_pipeline(session_name, project_path):
+    accel_csv_path = os.path.join(project_path, session_name, 'accelerometer_data.csv')
+    gyro_csv_path = os.path.join(project_path, session_name, 'gyroscope_data.csv')
+    df = previous_load(accel_csv_path, 'accel')
+    gyro_df = previous_load(gyro_csv_path, 'gyro')
+    accel_sample_rate = get_sample_rate_from_dataframe(df)
+    gyro_sample_rate = get_sample_rate_from_dataframe(gyro_df)
+    check_sample_rate_consistency(accel_sample_rate, gyro_sample_rate)
+    df = pd.merge_asof(
+        df.sort_values('ns_since_reboot'),
+        gyro_df.sort_values('ns_since_reboot'),
+        on='ns_since_reboot',
+        tolerance=int(1e9 / min(accel_sample_rate, gyro_sample_rate)),
+        direction='nearest'
+    ).dropna()
+    df = df.sort_values('ns_since_reboot').reset_index(drop=True)
+    segments = split_at_gaps(df['ns_since_reboot'].to_numpy(), GAP_THRESHOLD_MINUTES * 60 * 1_000_000_000)
+    assert len(segments) == 1
+    df = previous_resample(df)
+    write_signal_files(df, accel_csv_path, gyro_csv_path)
+    return int(df['ns_since_reboot'].min()), int(df['ns_since_reboot'].max())
+
+
+def current_pipeline(session_name, project_path):
+    prepared = prepare_upload(session_name, project_path, streaming=False)
+    assert prepared['error'] is None, prepared['error']
+    return prepared
+
+
+def run_on_copy(source, workdir, fn, trace=False):
+    """Run fn on a fresh copy of the upload; returns (seconds, peak traced bytes, result)"""
+    target = os.path.join(workdir, 'run')
+    shutil.rmtree(target, ignore_errors=True)
+    shutil.copytree(source, target)
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = fn('session', target)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def best_of(repeat, fn):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        elapsed, _, result = fn()
+        timings.append(elapsed)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the in-memory upload pipeline')
+    parser.add_argument('--hours', type=float, default=24, help='Synthetic session length in hours')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed repetitions (best is reported)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_upload_pipeline_')
+    try:
+        source, rows = make_upload(workdir, args.hours)
+        size_mb = sum(os.path.getsize(os.path.join(source, 'session', name)) for name in os.listdir(os.path.join(source, 'session'))) / 1e6
+        print(f"Session: {rows:,} accelerometer + gyroscope samples ({args.hours:g} h, {size_mb:.0f} MB of CSV)")
+
+        previous_time, bounds = best_of(args.repeat, lambda: run_on_copy(source, workdir, previous_pipeline))
+        current_time, prepared = best_of(args.repeat, lambda: run_on_copy(source, workdir, current_pipeline))
+        assert (prepared['plan']['start_ns'], prepared['plan']['stop_ns']) == bounds
+
+        _, previous_peak, _ = run_on_copy(source, workdir, previous_pipeline, trace=True)
+        _, current_peak, _ = run_on_copy(source, workdir, current_pipeline, trace=True)
+
+        print(f"Previous pipeline: {previous_time:7.2f} s  peak {previous_peak / 1e6:7.0f} MB")
+        print(f"Current pipeline:  {current_time:7.2f} s  peak {current_peak / 1e6:7.0f} MB  ({previous_time / current_time:.2f}x faster)")
+        print('Current stages:    ' + ', '.join(f"{name} {seconds:.2f} s" for name, seconds in prepared['timings'].items()))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
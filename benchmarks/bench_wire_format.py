@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Compare session data response encodings: JSON records versus the binary columnar format.
+
+Builds a synthetic 50 Hz accelerometer session and times the serialization step
+of get_session_data for both encodings, reporting body sizes.
+
+Usage:
+    python3 benchmarks/bench_wire_format.py [--hours 1] [--repeat 3]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.signal_store import encode_columns
+
+COLUMNS = ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']
+
+
+def make_session(hours, hz=50):
+    rows = int(hours * 3600 * hz)
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'ns_since_reboot': (1_000_000_000_000 + np.arange(rows, dtype=np.int64) * (1_000_000_000 // hz)).astype(float),
+        'accel_x': rng.normal(0, 1, rows),
+        'accel_y': rng.normal(0, 1, rows),
+        'accel_z': rng.normal(9.8, 1, rows),
+    })
+
+
+def best_of(repeat, fn):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def encode_json(df):
+    return json.dumps({'bouts': '[]', 'data': df[COLUMNS].to_dict(orient='records')}).encode('utf-8')
+
+
+def encode_binary(df):
+    columns = {name: (df[name].to_numpy(), '<f8' if name == 'ns_since_reboot' else '<f4') for name in COLUMNS}
+    return encode_columns(columns, extra_header={'meta': {'bouts': '[]'}})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark session data response encodings')
+    parser.add_argument('--hours', type=float, default=1, help='Synthetic session length in hours')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions (best is reported)')
+    args = parser.parse_args()
+
+    df = make_session(args.hours)
+    print(f"Session: {len(df):,} samples")
+
+    json_time, json_body = best_of(args.repeat, lambda: encode_json(df))
+    binary_time, binary_body = best_of(args.repeat, lambda: encode_binary(df))
+
+    print(f"JSON records:  {json_time * 1000:9.1f} ms  {len(json_body) / 1e6:7.1f} MB")
+    print(f"Columnar:      {binary_time * 1000:9.1f} ms  {len(binary_body) / 1e6:7.1f} MB  ({json_time / binary_time:.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
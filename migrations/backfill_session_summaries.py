@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Backfill signal summaries for sessions uploaded before summaries existed
+
+New uploads store each session's row count, duration, sample rate, gap count and
+per-axis min/max/mean in the session_summaries table. This script computes them
+for every visible session that has none, reading the session's signal files once.
+
+Usage:
+    python3 backfill_session_summaries.py [--dry-run] [--project-id PROJECT_ID]
+"""
+
+import os
+import sys
+import argparse
+
+# Add the parent directory to the path so we can import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from app.services.database_service import get_db_connection
+from app.services.session_service import SessionService
+from app.repositories.session_repository import SessionRepository
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description='Backfill signal summaries for existing sessions')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Count sessions without a summary without writing anything')
+    parser.add_argument('--project-id', type=int,
+                       help='Backfill only the specified project ID')
+
+    args = parser.parse_args()
+
+    session_service = SessionService(
+        get_db_connection=get_db_connection,
+        session_repository=SessionRepository(get_db_connection=get_db_connection)
+    )
+
+    try:
+        report = session_service.backfill_session_summaries(project_id=args.project_id, dry_run=args.dry_run)
+        logger.info(f"Sessions without a summary: {report['sessions_found']}")
+
+        if report['errors']:
+            print(f"\nBackfill completed with {len(report['errors'])} errors:")
+            for error in report['errors']:
+                print(f"  - Session {error['session_id']}: {error['error']}")
+            sys.exit(1)
+        else:
+            print(f"\nBackfill {'simulation ' if args.dry_run else ''}completed successfully!")
+            print(f"Sessions without a summary: {report['sessions_found']}")
+            print(f"Summaries written: {report['summaries_written']}")
+            sys.exit(0)
+
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}")
+        print(f"Backfill failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Backfill binary signal sidecars for existing projects and raw datasets
+
+New uploads write a columnar sidecar (accelerometer_data.cols / gyroscope_data.cols)
+and a min/max level-of-detail pyramid (*.lod) next to each signal CSV. This script
+walks DATA_DIR, which holds both legacy project directories and raw_datasets/, and
+writes both for any signal CSV that is missing them or whose copies are stale.
+Sidecars written before the header recorded whether timestamps are sorted are
+rewritten too, so time-range reads can use a binary search on them again.
+
+Usage:
+    python3 backfill_signal_sidecars.py [--dry-run] [--data-dir DATA_DIR] [--force]
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime
+
+# Add the parent directory to the path so we can import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from app.services.signal_store import has_valid_sidecar, build_sidecar_from_csv, read_header, sidecar_path
+from app.services.signal_pyramid import load_pyramid, build_pyramid_from_csv
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SIGNAL_FILES = ('accelerometer_data.csv', 'gyroscope_data.csv')
+
+class SidecarBackfiller:
+    def __init__(self, data_dir: str, dry_run: bool = False, force: bool = False):
+        self.data_dir = os.path.expanduser(data_dir)
+        self.dry_run = dry_run
+        self.force = force
+        self.report = {
+            'start_time': datetime.now().isoformat(),
+            'dry_run': dry_run,
+            'files_found': 0,
+            'sidecars_written': 0,
+            'pyramids_written': 0,
+            'files_skipped': 0,
+            'errors': []
+        }
+
+    def find_signal_files(self):
+        """Yield every session signal CSV below the data directory"""
+        for root, dirs, files in os.walk(self.data_dir):
+            for name in SIGNAL_FILES:
+                if name in files:
+                    yield os.path.join(root, name)
+
+    def run(self):
+        if not os.path.isdir(self.data_dir):
+            raise Exception(f'Data directory does not exist: {self.data_dir}')
+
+        logger.info(f"Scanning {self.data_dir} for signal files")
+        for csv_path in self.find_signal_files():
+            self.report['files_found'] += 1
+            needs_sidecar = self.force or not has_valid_sidecar(csv_path) or 'timestamps_sorted' not in read_header(sidecar_path(csv_path))
+            needs_pyramid = self.force or load_pyramid(csv_path) is None
+            if not needs_sidecar and not needs_pyramid:
+                self.report['files_skipped'] += 1
+                continue
+
+            if self.dry_run:
+                logger.info(f"Would write {'sidecar ' if needs_sidecar else ''}{'pyramid ' if needs_pyramid else ''}for {csv_path}")
+                self.report['sidecars_written'] += int(needs_sidecar)
+                self.report['pyramids_written'] += int(needs_pyramid)
+                continue
+
+            try:
+                if needs_sidecar:
+                    if build_sidecar_from_csv(csv_path):
+                        self.report['sidecars_written'] += 1
+                        logger.info(f"Wrote sidecar for {csv_path}")
+                    else:
+                        self.report['files_skipped'] += 1
+                        continue
+                if needs_pyramid:
+                    build_pyramid_from_csv(csv_path)
+                    self.report['pyramids_written'] += 1
+                    logger.info(f"Wrote pyramid for {csv_path}")
+            except Exception as e:
+                logger.error(f"Failed to backfill {csv_path}: {e}")
+                self.report['errors'].append({'path': csv_path, 'error': str(e)})
+
+        self.report['end_time'] = datetime.now().isoformat()
+        logger.info(f"Backfill {'simulation ' if self.dry_run else ''}completed")
+        logger.info(f"Signal files found: {self.report['files_found']}")
+        logger.info(f"Sidecars written: {self.report['sidecars_written']}")
+        logger.info(f"Pyramids written: {self.report['pyramids_written']}")
+        logger.info(f"Skipped: {self.report['files_skipped']}")
+        logger.info(f"Errors: {len(self.report['errors'])}")
+        return self.report
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description='Backfill binary signal sidecars and pyramids for existing session data')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='List files that need a sidecar without writing anything')
+    parser.add_argument('--data-dir', default=os.getenv('DATA_DIR', '~/.delta/data'),
+                       help='Root data directory to scan (defaults to DATA_DIR)')
+    parser.add_argument('--force', action='store_true',
+                       help='Rewrite sidecars and pyramids even when they are up to date')
+
+    args = parser.parse_args()
+
+    backfiller = SidecarBackfiller(args.data_dir, dry_run=args.dry_run, force=args.force)
+
+    try:
+        report = backfiller.run()
+
+        if report['errors']:
+            print(f"\nBackfill completed with {len(report['errors'])} errors:")
+            for error in report['errors']:
+                print(f"  - {error['path']}: {error['error']}")
+            sys.exit(1)
+        else:
+            print(f"\nBackfill completed successfully!")
+            print(f"Sidecars written: {report['sidecars_written']}")
+            print(f"Pyramids written: {report['pyramids_written']}")
+            sys.exit(0)
+
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}")
+        print(f"Backfill failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+-- Migration: Create the session summaries table
+-- Stores signal-level metadata computed once per session so session lists never re-read signal files.
+-- Fill it for existing sessions with migrations/backfill_session_summaries.py
+
+CREATE TABLE session_summaries (
+    session_id INT PRIMARY KEY,
+    row_count BIGINT NOT NULL,
+    duration_seconds DOUBLE NULL,
+    sample_rate_hz DOUBLE NULL,
+    gap_count INT NOT NULL DEFAULT 0 COMMENT 'Pauses of more than a second between samples',
+    axis_stats JSON COMMENT 'Per-axis min, max and mean',
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
+);
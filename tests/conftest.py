@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+
+def make_signal(start_ns, rows, hz, seed, prefix=None, jitter=True):
+    """
+    Synthetic accelerometer/gyroscope samples shared by the upload, alignment and
+    summary tests (and benchmarks/bench_upload_pipeline.py).
+
+    Args:
+        start_ns: Timestamp of the first sample
+        rows: Number of samples
+        hz: Sample rate
+        seed: Random seed; the same arguments always give the same frame
+        prefix: Axis column prefix ('accel' or 'gyro'); None names them x/y/z as uploaded
+        jitter: Shift about 5% of the samples by up to a quarter period, like clock jitter
+
+    Returns:
+        pandas.DataFrame: int64 ns_since_reboot and three float axis columns
+    """
+    rng = np.random.default_rng(seed)
+    step = 1_000_000_000 // hz
+    ns = start_ns + np.arange(rows, dtype=np.int64) * step
+    if jitter:
+        ns = ns + rng.integers(-step // 4, step // 4, rows) * (rng.random(rows) < 0.05)
+    axis = (lambda name: f'{prefix}_{name}') if prefix else (lambda name: name)
+    return pd.DataFrame({
+        'ns_since_reboot': ns,
+        axis('x'): rng.normal(0, 1, rows).round(5),
+        axis('y'): rng.normal(0, 1, rows).round(5),
+        axis('z'): rng.normal(9.8, 1, rows).round(5),
+    })
@@ -0,0 +1,128 @@
+import pytest
+import sys
+import os
+import threading
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.batch_scoring import new_batch_state, load_batch_state, run_batch
+
+MODEL = {'id': 7, 'name': 'cnn'}
+
+
+@pytest.fixture
+def state_dir(tmp_path):
+    """Fixture to provide a directory for batch state files"""
+    return str(tmp_path / 'batches')
+
+
+@pytest.fixture
+def batch():
+    """Fixture to provide the state of a new five-session batch"""
+    sessions = [{'session_id': i, 'session_name': f'session.{i}', 'project_path': '/data/project'} for i in range(1, 6)]
+    return new_batch_state(MODEL, sessions, 'cpu', 'smoking')
+
+
+class Recorder:
+    """Fake load/score/save steps that record what happened in which order"""
+
+    def __init__(self, fail=()):
+        self.events = []
+        self.saved = {}
+        self.fail = set(fail)
+        self._lock = threading.Lock()
+
+    def log(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    def load(self, session):
+        self.log(('load', session['session_id']))
+        if session['session_id'] in self.fail:
+            raise OSError('file missing')
+        return [session['session_id']] * session['session_id']
+
+    def score(self, session, data):
+        self.log(('score', session['session_id']))
+        return [{'start': 0, 'end': 1}] * len(data)
+
+    def save(self, session, bouts):
+        self.saved[session['session_id']] = bouts
+
+
+class TestBatchScoring:
+
+    def test_scores_every_session_and_reports_totals(self, batch, state_dir):
+        recorder = Recorder()
+        state = run_batch(batch, recorder.load, recorder.score, recorder.save, directory=state_dir)
+        assert state['status'] == 'completed'
+        assert state['sessions_done'] == 5 and state['sessions_failed'] == 0
+        assert state['bouts_count'] == 15
+        assert {k: v['bouts_count'] for k, v in state['results'].items()} == {'1': 1, '2': 2, '3': 3, '4': 4, '5': 5}
+        assert load_batch_state(batch['batch_id'], state_dir)['status'] == 'completed'
+
+    def test_next_session_loads_while_current_is_scored(self, batch, state_dir):
+        scoring = threading.Event()
+        next_loaded = threading.Event()
+
+        def load(session):
+            if session['session_id'] == 2:
+                # Loading session 2 waits until session 1 is being scored
+                assert scoring.wait(5)
+                next_loaded.set()
+            return [session['session_id']]
+
+        def score(session, data):
+            if session['session_id'] == 1:
+                scoring.set()
+                assert next_loaded.wait(5)
+            return []
+
+        state = run_batch(batch, load, score, lambda session, bouts: None, directory=state_dir, prefetch=1)
+        assert state['sessions_done'] == 5
+
+    def test_failed_session_does_not_stop_batch(self, batch, state_dir):
+        recorder = Recorder(fail={3})
+        state = run_batch(batch, recorder.load, recorder.score, recorder.save, directory=state_dir)
+        assert state['status'] == 'completed'
+        assert state['sessions_done'] == 4 and state['sessions_failed'] == 1
+        assert state['results']['3'] == {'status': 'error', 'error': 'file missing', 'session_name': 'session.3',
+                                         'seconds': state['results']['3']['seconds']}
+        assert sorted(recorder.saved) == [1, 2, 4, 5]
+
+    def test_cancelled_batch_resumes_where_it_stopped(self, batch, state_dir):
+        cancelled = threading.Event()
+        recorder = Recorder()
+
+        def save(session, bouts):
+            recorder.save(session, bouts)
+            if session['session_id'] == 2:
+                cancelled.set()
+
+        state = run_batch(batch, recorder.load, recorder.score, save, cancelled=cancelled, directory=state_dir)
+        assert state['status'] == 'cancelled'
+        assert sorted(recorder.saved) == [1, 2]
+
+        # A restarted server picks the batch up from its saved state
+        resumed = Recorder()
+        state = run_batch(load_batch_state(batch['batch_id'], state_dir), resumed.load, resumed.score, resumed.save, directory=state_dir)
+        assert state['status'] == 'completed'
+        assert sorted(resumed.saved) == [3, 4, 5]
+        assert state['sessions_done'] == 5
+
+    def test_resume_retries_failed_sessions(self, batch, state_dir):
+        run_batch(batch, *self._steps(Recorder(fail={2})), directory=state_dir)
+        retry = Recorder()
+        state = run_batch(load_batch_state(batch['batch_id'], state_dir), *self._steps(retry), directory=state_dir)
+        assert sorted(retry.saved) == [2]
+        assert state['sessions_failed'] == 0
+
+    def test_state_lookup_only_accepts_batch_ids(self, batch, state_dir):
+        run_batch(batch, *self._steps(Recorder()), directory=state_dir)
+        assert load_batch_state(batch['batch_id'], state_dir) is not None
+        assert load_batch_state('../../etc/passwd', state_dir) is None
+
+    @staticmethod
+    def _steps(recorder):
+        return recorder.load, recorder.score, recorder.save
@@ -0,0 +1,106 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.bout_extraction import extract_bouts, prediction_runs, merge_close_runs
+
+
+def legacy_extract_bouts(df, predictions, labeling_name, min_duration_sec=0.25):
+    """The per-sample loop ModelService used before, kept as the parity reference"""
+    if len(predictions) < len(df):
+        df = df.copy()
+        df['y_pred'] = np.concatenate([predictions, np.zeros(len(df) - len(predictions))])
+    else:
+        df = df.copy()
+        df['y_pred'] = predictions[:len(df)]
+
+    bouts = []
+    current_bout = None
+    for i in range(len(df)):
+        if df['y_pred'].iloc[i] > 0:
+            if current_bout is None:
+                current_bout = [int(df['ns_since_reboot'].iloc[i]), None]
+            current_bout[1] = int(df['ns_since_reboot'].iloc[i])
+        else:
+            if current_bout is not None:
+                bouts.append(current_bout)
+                current_bout = None
+    if current_bout is not None:
+        bouts.append(current_bout)
+
+    min_duration_ns = min_duration_sec * 1e9
+    label = labeling_name or "smoking"
+    return [{'start': b[0], 'end': b[1], 'label': label} for b in bouts if (b[1] - b[0]) >= min_duration_ns]
+
+
+def make_session(rows, seed, hz=50):
+    """Timestamps at hz with jitter, and runs of positive predictions of random length"""
+    rng = np.random.default_rng(seed)
+    ns = (1_000_000_000_000 + np.arange(rows) * (1_000_000_000 // hz) + rng.integers(0, 1000, rows)).astype(np.float64)
+    lengths = rng.geometric(0.02, rows)
+    values = np.repeat(rng.integers(0, 2, len(lengths)), lengths)[:rows].astype(np.float64)
+    return pd.DataFrame({'ns_since_reboot': ns}), values
+
+
+class TestBoutExtraction:
+
+    @pytest.mark.parametrize('seed', [0, 1, 2])
+    @pytest.mark.parametrize('min_duration_sec', [0, 0.25, 2.0])
+    def test_parity_with_sample_loop(self, seed, min_duration_sec):
+        df, predictions = make_session(20_000, seed)
+        expected = legacy_extract_bouts(df, predictions, 'model', min_duration_sec)
+        assert expected
+        assert extract_bouts(df['ns_since_reboot'].to_numpy(), predictions, 'model', min_duration_ns=min_duration_sec * 1e9) == expected
+
+    @pytest.mark.parametrize('length', [0, 5, 10, 15])
+    def test_parity_when_lengths_differ(self, length):
+        df = pd.DataFrame({'ns_since_reboot': np.arange(10, dtype=np.float64) * 1e8})
+        predictions = np.tile([1.0, 1.0, 0.0], 5)[:length]
+        expected = legacy_extract_bouts(df, predictions, None, 0)
+        assert extract_bouts(df['ns_since_reboot'].to_numpy(), predictions, 'smoking') == expected
+
+    def test_integer_timestamps_above_2_53_stay_exact(self):
+        ns = 2**60 + np.arange(20, dtype=np.int64) * 20_000_001 + 1
+        df = pd.DataFrame({'ns_since_reboot': ns})
+        predictions = np.array([0, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 0, 1, 1, 0, 0, 0, 1, 1, 1], dtype=np.float64)
+        expected = legacy_extract_bouts(df, predictions, 'model', 0.03)
+        assert [b['start'] for b in expected][0] == int(ns[1])
+        assert extract_bouts(ns, predictions, 'model', min_duration_ns=0.03e9) == expected
+        merged = extract_bouts(ns, predictions, min_duration_ns=0.03e9, merge_gap_ns=0.05e9)
+        assert [(b['start'], b['end']) for b in merged] == [(int(ns[1]), int(ns[3])), (int(ns[6]), int(ns[13])), (int(ns[17]), int(ns[19]))]
+
+    def test_runs_at_array_edges(self):
+        first, last = prediction_runs(np.array([True, True, False, True, False, False, True]))
+        assert first.tolist() == [0, 3, 6]
+        assert last.tolist() == [1, 3, 6]
+        first, last = prediction_runs(np.zeros(4, dtype=bool))
+        assert len(first) == len(last) == 0
+
+    def test_short_gaps_are_merged(self):
+        ns = np.arange(12, dtype=np.float64) * 1e9
+        first, last = merge_close_runs(np.array([0, 4, 10]), np.array([2, 6, 11]), ns, 2.5e9)
+        # 2 -> 4 is a 2 s gap (merged); 6 -> 10 is 4 s (kept apart)
+        assert first.tolist() == [0, 10]
+        assert last.tolist() == [6, 11]
+
+    def test_merge_happens_before_duration_filter(self):
+        ns = np.arange(10, dtype=np.float64) * 1e9
+        predictions = np.array([1, 1, 0, 1, 1, 0, 0, 0, 1, 0])
+        bouts = extract_bouts(ns, predictions, min_duration_ns=3e9, merge_gap_ns=2.5e9)
+        assert bouts == [{'start': 0, 'end': 4_000_000_000, 'label': 'smoking'}]
+
+    def test_mean_confidence_per_bout(self):
+        ns = np.arange(8, dtype=np.float64) * 1e9
+        predictions = np.array([1, 1, 0, 0, 1, 1, 1, 0])
+        confidence = np.array([0.9, 0.7, 0.1, 0.2, 0.6, 0.8, 1.0, 0.0])
+        bouts = extract_bouts(ns, predictions, confidence=confidence)
+        assert [b['confidence'] for b in bouts] == pytest.approx([0.8, 0.8])
+        assert [(b['start'], b['end']) for b in bouts] == [(0, 1_000_000_000), (4_000_000_000, 6_000_000_000)]
+
+    def test_empty_input(self):
+        assert extract_bouts(np.array([]), np.array([])) == []
@@ -0,0 +1,68 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.bout_intervals import assign_bouts_to_segments, clip_intervals
+
+
+def brute_force_clip(bouts, segment_ranges):
+    """Every (bout, segment) overlap, clipped, by direct comparison"""
+    segment_bouts = [[] for _ in segment_ranges]
+    for i, (segment_start, segment_end) in enumerate(segment_ranges):
+        for bout in bouts:
+            if bout['start'] <= segment_end and bout['end'] >= segment_start:
+                segment_bouts[i].append((max(bout['start'], segment_start), min(bout['end'], segment_end), bout['label']))
+    return segment_bouts
+
+
+@pytest.fixture
+def segment_ranges():
+    """Fixture to provide three disjoint segments"""
+    return [(0.0, 100.0), (200.0, 300.0), (400.0, 500.0)]
+
+
+class TestBoutIntervals:
+
+    def test_bout_spanning_segments_is_clipped_to_each(self, segment_ranges):
+        bouts = [{'start': 50.0, 'end': 450.0, 'label': 'smoking'}]
+        result = assign_bouts_to_segments(segment_ranges, bouts)
+        assert result == [
+            [{'start': 50.0, 'end': 100.0, 'label': 'smoking'}],
+            [{'start': 200.0, 'end': 300.0, 'label': 'smoking'}],
+            [{'start': 400.0, 'end': 450.0, 'label': 'smoking'}],
+        ]
+
+    def test_edges_gaps_and_extra_keys(self, segment_ranges):
+        bouts = [
+            {'start': 100.0, 'end': 150.0, 'label': 'puff', 'confidence': 0.9},  # touches segment end
+            {'start': 120.0, 'end': 180.0, 'label': 'puff'},  # entirely in a gap
+            {'start': 210.0, 'end': 220.0},  # no label
+            ['not', 'a', 'bout'],
+            {'start': None, 'end': 5.0, 'label': 'puff'},
+        ]
+        result = assign_bouts_to_segments(segment_ranges, bouts)
+        assert result[0] == [{'start': 100.0, 'end': 100.0, 'label': 'puff', 'confidence': 0.9}]
+        assert result[1] == [{'start': 210.0, 'end': 220.0, 'label': 'smoking'}]
+        assert result[2] == []
+
+    @pytest.mark.parametrize('shuffle_segments', [False, True])
+    def test_matches_brute_force(self, shuffle_segments):
+        rng = np.random.default_rng(0)
+        edges = np.sort(rng.uniform(0, 1e6, 200))
+        segment_ranges = [(float(a), float(b)) for a, b in zip(edges[::2], edges[1::2])]
+        if shuffle_segments:
+            segment_ranges = [segment_ranges[i] for i in rng.permutation(len(segment_ranges))]
+        starts = rng.uniform(-1e4, 1e6, 3000)
+        bouts = [{'start': float(s), 'end': float(s + rng.exponential(2e4)), 'label': f'bout{i}'} for i, s in enumerate(starts)]
+
+        result = assign_bouts_to_segments(segment_ranges, bouts)
+        expected = brute_force_clip(bouts, segment_ranges)
+        assert [[(b['start'], b['end'], b['label']) for b in segment] for segment in result] == expected
+
+    def test_clip_intervals_empty(self):
+        interval_index, range_index, starts, ends = clip_intervals([], [], [0.0], [1.0])
+        assert len(interval_index) == len(range_index) == len(starts) == len(ends) == 0
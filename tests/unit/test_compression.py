@@ -0,0 +1,88 @@
+import pytest
+import sys
+import os
+import gzip
+import zlib
+from flask import Flask, Response, jsonify
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.compression import init_compression, compress_stream, available_encodings, COMPRESS_MIN_BYTES
+
+RECORDS = [{'ns_since_reboot': 1_000_000_000 + i * 20_000_000, 'accel_x': 0.25, 'accel_y': -0.5, 'accel_z': 9.8} for i in range(2000)]
+
+
+@pytest.fixture
+def client():
+    """Fixture to provide a test client for an app with compression and sample endpoints"""
+    app = Flask(__name__)
+    init_compression(app)
+
+    @app.route('/large')
+    def large():
+        response = jsonify({'data': RECORDS})
+        response.set_etag('abc')
+        return response
+
+    @app.route('/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.route('/stream')
+    def stream():
+        def generate():
+            for i in range(0, len(RECORDS), 100):
+                yield ''.join(f"{r['ns_since_reboot']},{r['accel_x']}\n" for r in RECORDS[i:i + 100])
+        return Response(generate(), mimetype='text/csv')
+
+    @app.route('/image')
+    def image():
+        return Response(b'\x89PNG' + bytes(COMPRESS_MIN_BYTES * 4), mimetype='image/png')
+
+    return app.test_client()
+
+
+class TestResponseCompression:
+
+    @pytest.mark.parametrize('encoding, decompress', [('gzip', gzip.decompress), ('deflate', zlib.decompress)])
+    def test_large_json_is_compressed(self, client, encoding, decompress):
+        plain = client.get('/large')
+        response = client.get('/large', headers={'Accept-Encoding': encoding})
+        assert response.headers['Content-Encoding'] == encoding
+        assert int(response.headers['Content-Length']) == len(response.data) < len(plain.data) / 4
+        assert decompress(response.data) == plain.data
+        assert 'Accept-Encoding' in response.headers['Vary']
+
+    def test_preferred_encoding_is_negotiated(self, client):
+        response = client.get('/large', headers={'Accept-Encoding': 'deflate;q=0.5, gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert available_encodings()[-2:] == ['gzip', 'deflate']
+
+    def test_uncompressed_without_accept_encoding(self, client):
+        response = client.get('/large', headers={'Accept-Encoding': 'identity'})
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['data'] == RECORDS
+
+    def test_small_and_binary_responses_are_not_compressed(self, client):
+        assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+        assert 'Content-Encoding' not in client.get('/image', headers={'Accept-Encoding': 'gzip'}).headers
+
+    def test_streamed_response_is_compressed(self, client):
+        plain = client.get('/stream')
+        response = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        assert gzip.decompress(response.data) == plain.data
+
+    def test_stream_pieces_decode_as_they_arrive(self):
+        chunks = [b'a' * 1000, b'b' * 1000]
+        decompressor = zlib.decompressobj(31)
+        pieces = compress_stream(iter(chunks), 'gzip')
+        # The first chunk is readable before the generator is exhausted
+        assert decompressor.decompress(next(pieces)) == chunks[0]
+
+    def test_strong_etag_becomes_weak(self, client):
+        response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['ETag'] == 'W/"abc"'
+        assert client.get('/large').headers['ETag'] == '"abc"'
@@ -0,0 +1,72 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.csv_index import build_row_index, load_row_index, read_csv_rows, row_index_path
+from app.services.utils import load_dataframe_from_csv
+
+
+@pytest.fixture
+def signal_csv(tmp_path):
+    """Fixture to provide a raw accelerometer CSV without a sidecar"""
+    rows = 1000
+    df = pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * 20_000_000,
+        'x': np.sin(np.arange(rows) * 0.1).round(4),
+        'y': np.cos(np.arange(rows) * 0.1).round(4),
+        'z': (9.8 + np.sin(np.arange(rows) * 0.05)).round(4),
+    })
+    csv_path = str(tmp_path / 'accelerometer_data.csv')
+    df.to_csv(csv_path, index=False)
+    return csv_path, df
+
+
+class TestCsvRowIndex:
+
+    @pytest.mark.parametrize("start_offset,end_offset", [(0, 1000), (37, 512), (300, 301), (None, 64), (900, None), (990, 5000)])
+    def test_rows_match_dataframe(self, signal_csv, start_offset, end_offset):
+        csv_path, df = signal_csv
+        build_row_index(csv_path, stride=64)
+        loaded = read_csv_rows(csv_path, start_offset, end_offset)
+        expected = df.iloc[start_offset:end_offset].reset_index(drop=True)
+        pd.testing.assert_frame_equal(loaded, expected)
+
+    def test_built_on_first_access(self, signal_csv):
+        csv_path, df = signal_csv
+        assert not os.path.exists(row_index_path(csv_path))
+        loaded = read_csv_rows(csv_path, 10, 20)
+        assert os.path.exists(row_index_path(csv_path))
+        assert len(loaded) == 10
+
+    def test_file_without_trailing_newline(self, signal_csv):
+        csv_path, df = signal_csv
+        with open(csv_path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            f.truncate()
+        build_row_index(csv_path, stride=64)
+        header, _ = load_row_index(csv_path)
+        assert header['num_data_rows'] == len(df)
+        assert read_csv_rows(csv_path, 995, None)['ns_since_reboot'].tolist() == df['ns_since_reboot'].iloc[995:].tolist()
+
+    def test_stale_index_is_rebuilt(self, signal_csv):
+        csv_path, df = signal_csv
+        build_row_index(csv_path, stride=64)
+        df.iloc[:100].to_csv(csv_path, index=False)
+        assert load_row_index(csv_path) is None
+        assert len(read_csv_rows(csv_path, 50, None)) == 50
+
+    @pytest.mark.parametrize("start_offset,end_offset", [(100, 250), (None, 50), (400, None)])
+    def test_loader_matches_skiprows(self, signal_csv, start_offset, end_offset):
+        csv_path, _ = signal_csv
+        skiprows = list(range(1, start_offset + 1)) if start_offset else None
+        nrows = None if end_offset is None else end_offset - (start_offset or 0)
+        expected = pd.read_csv(csv_path, skiprows=skiprows, nrows=nrows)
+        expected = expected.rename(columns={'x': 'accel_x', 'y': 'accel_y', 'z': 'accel_z'}).astype(float)
+
+        loaded = load_dataframe_from_csv(csv_path, start_offset=start_offset, end_offset=end_offset)
+        pd.testing.assert_frame_equal(loaded, expected)
@@ -0,0 +1,80 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.utils import read_signal_table, load_dataframe_from_csv, SIGNAL_CSV_ENGINE
+from app.services.upload_preprocessing import write_signal_files
+from app.services.signal_store import CSV_AXIS_DTYPE
+
+ENGINES = ['c'] + (['pyarrow'] if SIGNAL_CSV_ENGINE == 'pyarrow' else [])
+
+
+@pytest.fixture
+def signal_csv(tmp_path):
+    """Fixture to provide a raw accelerometer CSV with an extra non-signal column"""
+    rows = 500
+    df = pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * 20_000_000,
+        'x': np.sin(np.arange(rows) * 0.1).round(5),
+        'y': np.cos(np.arange(rows) * 0.1).round(5),
+        'z': (9.8 + np.sin(np.arange(rows) * 0.05)).round(5),
+        'note': 'walking',
+    })
+    csv_path = str(tmp_path / 'accelerometer_data.csv')
+    df.to_csv(csv_path, index=False)
+    return csv_path, df
+
+
+class TestSignalCsvReader:
+
+    @pytest.mark.parametrize('engine', ENGINES)
+    def test_parses_into_signal_schema(self, signal_csv, engine):
+        csv_path, df = signal_csv
+        loaded = read_signal_table(csv_path, columns=['ns_since_reboot', 'x', 'y', 'z', 'accel_x'], engine=engine)
+        assert list(loaded.columns) == ['ns_since_reboot', 'x', 'y', 'z']
+        assert loaded['ns_since_reboot'].dtype == np.int64
+        assert all(loaded[axis].dtype == np.float32 for axis in 'xyz')
+        np.testing.assert_array_equal(loaded['ns_since_reboot'].to_numpy(), df['ns_since_reboot'].to_numpy())
+        np.testing.assert_array_equal(loaded['x'].to_numpy(), df['x'].to_numpy(dtype=np.float32))
+
+    def test_engines_agree(self, signal_csv):
+        csv_path, _ = signal_csv
+        columns = ['ns_since_reboot', 'x', 'y', 'z']
+        frames = [read_signal_table(csv_path, columns=columns, engine=engine) for engine in ENGINES]
+        for frame in frames[1:]:
+            pd.testing.assert_frame_equal(frame, frames[0])
+
+    @pytest.mark.parametrize('engine', ENGINES)
+    def test_missing_timestamps_fall_back_to_inferred_dtypes(self, signal_csv, engine):
+        csv_path, df = signal_csv
+        df.loc[3, 'ns_since_reboot'] = None
+        df.to_csv(csv_path, index=False)
+        loaded = read_signal_table(csv_path, columns=['ns_since_reboot', 'x'], engine=engine)
+        assert loaded['ns_since_reboot'].isna().sum() == 1
+        assert len(loaded) == len(df)
+
+    def test_loader_reads_only_signal_columns(self, signal_csv):
+        csv_path, df = signal_csv
+        loaded = load_dataframe_from_csv(csv_path)
+        assert list(loaded.columns) == ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']
+        assert (loaded.dtypes == np.float64).all()
+        assert len(loaded) == len(df) - 1
+
+    def test_written_files_keep_full_precision(self, signal_csv):
+        csv_path, df = signal_csv
+        df.loc[0, 'x'] = 0.123456789
+        df.loc[0, 'z'] = 9.806650161743164
+        df.to_csv(csv_path, index=False)
+        loaded = load_dataframe_from_csv(csv_path, axis_dtype=CSV_AXIS_DTYPE)
+        write_signal_files(loaded, csv_path)
+        lines = open(csv_path).read().splitlines()
+        # The CSV is authoritative: integer timestamps and every uploaded decimal
+        assert lines[1] == f"{df['ns_since_reboot'][0]},0.123456789,{df['y'][0]},9.806650161743164"
+        pd.testing.assert_frame_equal(load_dataframe_from_csv(csv_path, axis_dtype=CSV_AXIS_DTYPE), loaded.iloc[:-1])
+        # Default loads read the float32 sidecar written alongside
+        np.testing.assert_array_equal(load_dataframe_from_csv(csv_path)['accel_x'], loaded['accel_x'].iloc[:-1].to_numpy(dtype=np.float32))
@@ -0,0 +1,173 @@
+import pytest
+import sys
+import os
+import subprocess
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.frame_cache import FrameCache, DiskFrameCache, cached_frame, frame_cache
+from app.services.utils import load_dataframe_from_csv
+
+
+def make_frame(rows, value=0.0):
+    return pd.DataFrame({'ns_since_reboot': np.arange(rows, dtype=np.float64), 'accel_x': np.full(rows, value)})
+
+
+@pytest.fixture
+def signal_csv(tmp_path):
+    """Fixture to provide a small accelerometer CSV"""
+    csv_path = tmp_path / 'accelerometer_data.csv'
+    pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(200, dtype=np.int64) * 20_000_000,
+        'x': np.linspace(0, 1, 200).round(5),
+        'y': 0.5,
+        'z': 9.8,
+    }).to_csv(csv_path, index=False)
+    return str(csv_path)
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    """Fixture to provide an empty disk cache directory with a 1 MB cap"""
+    return DiskFrameCache(str(tmp_path / 'frame_cache'), 1024 * 1024)
+
+
+@pytest.fixture
+def counting_loader(signal_csv):
+    """Fixture to provide a cached loader over a private cache, with a call counter"""
+    cache = FrameCache(10 * 1024 * 1024)
+    calls = []
+
+    @cached_frame(cache=cache, disk_cache=DiskFrameCache(None, 0))
+    def load(csv_path, start_offset=None, end_offset=None):
+        calls.append((start_offset, end_offset))
+        return load_dataframe_from_csv.uncached(csv_path, start_offset=start_offset, end_offset=end_offset)
+
+    return load, cache, calls
+
+
+class TestFrameCache:
+
+    def test_repeated_loads_hit(self, signal_csv, counting_loader):
+        load, cache, calls = counting_loader
+        first = load(signal_csv)
+        second = load(signal_csv, None, None)
+        pd.testing.assert_frame_equal(first, second)
+        assert len(calls) == 1
+        assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+    def test_offsets_are_part_of_the_key(self, signal_csv, counting_loader):
+        load, _, calls = counting_loader
+        assert len(load(signal_csv, 10, 50)) == 40
+        assert len(load(signal_csv, 10, 60)) == 50
+        assert len(calls) == 2
+
+    def test_changed_file_is_reloaded(self, signal_csv, counting_loader):
+        load, _, calls = counting_loader
+        before = load(signal_csv)
+        with open(signal_csv, 'a') as f:
+            f.write('1000004000000000,2.0,0.5,9.8\n')
+        after = load(signal_csv)
+        assert len(calls) == 2
+        assert len(after) == len(before) + 1
+
+    def test_returned_frames_do_not_alias_the_cache(self, signal_csv, counting_loader):
+        load, _, _ = counting_loader
+        df = load(signal_csv)
+        df.loc[:, 'accel_x'] = -1.0
+        assert (load(signal_csv)['accel_x'] >= 0).all()
+
+    def test_least_recently_used_frames_are_evicted(self):
+        frame_bytes = int(make_frame(100).memory_usage(index=True).sum())
+        cache = FrameCache(3 * frame_bytes)
+        for key in 'abc':
+            cache.put(key, make_frame(100))
+        cache.get('a')
+        cache.put('d', make_frame(100))
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.stats()['evictions'] == 1
+        assert cache.stats()['bytes'] == 3 * frame_bytes
+
+    def test_frames_over_budget_are_not_cached(self):
+        cache = FrameCache(1024)
+        cache.put('big', make_frame(10_000))
+        assert cache.stats()['entries'] == 0
+
+    def test_missing_file_bypasses_cache(self, tmp_path, counting_loader):
+        load, cache, _ = counting_loader
+        with pytest.raises(FileNotFoundError):
+            load(str(tmp_path / 'missing.csv'))
+        assert cache.stats()['misses'] == 0
+
+    def test_utils_loaders_use_the_shared_cache(self, signal_csv):
+        hits = frame_cache.stats()['hits']
+        load_dataframe_from_csv(signal_csv, start_offset=5, end_offset=25)
+        load_dataframe_from_csv(signal_csv, start_offset=5, end_offset=25)
+        assert frame_cache.stats()['hits'] == hits + 1
+
+
+class TestDiskFrameCache:
+
+    def test_round_trip_between_instances(self, disk_cache):
+        df = make_frame(500, 1.5)
+        disk_cache.put(('load', 1), df)
+        # Another worker process sees the same directory
+        other = DiskFrameCache(disk_cache.directory, disk_cache.max_bytes)
+        pd.testing.assert_frame_equal(other.get(('load', 1)), df)
+        assert other.get(('load', 2)) is None
+        assert other.stats()['hits'] == 1 and other.stats()['misses'] == 1
+
+    def test_readable_from_another_process(self, disk_cache):
+        disk_cache.put(('load', 1), make_frame(500, 2.0))
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        script = (
+            "from app.services.frame_cache import DiskFrameCache; "
+            f"print(DiskFrameCache({disk_cache.directory!r}, 1 << 20).get(('load', 1))['accel_x'].sum())"
+        )
+        output = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True, check=True).stdout
+        assert float(output.strip().splitlines()[-1]) == 1000.0
+
+    def test_population_leaves_no_temporary_files(self, disk_cache):
+        disk_cache.put(('load', 1), make_frame(100))
+        names = os.listdir(disk_cache.directory)
+        assert len(names) == 1 and not names[0].startswith('.tmp_')
+
+    def test_least_recently_read_files_are_removed(self, disk_cache):
+        frame = make_frame(20_000)
+        for i in range(3):
+            disk_cache.put(('load', i), frame)
+            path = disk_cache._path(('load', i))
+            os.utime(path, ns=(i * 1_000_000_000, i * 1_000_000_000))
+        # Reading marks a file as recently used
+        disk_cache.get(('load', 0))
+        disk_cache.put(('load', 3), frame)
+        assert disk_cache.stats()['entries'] == 3
+        assert disk_cache.get(('load', 1)) is None
+        assert disk_cache.get(('load', 0)) is not None
+        assert disk_cache.stats()['bytes'] <= disk_cache.max_bytes
+        assert disk_cache.stats()['evictions'] >= 1
+
+    def test_non_numeric_frames_are_not_stored(self, disk_cache):
+        disk_cache.put(('load', 1), pd.DataFrame({'label': ['a', 'b']}))
+        disk_cache.put(('load', 2), make_frame(10).iloc[5:])
+        assert disk_cache.stats()['entries'] == 0
+
+    def test_loader_reuses_another_workers_decode(self, signal_csv, disk_cache):
+        calls = []
+
+        def make_loader():
+            # Each worker has its own memory cache over the shared directory
+            @cached_frame(cache=FrameCache(10 * 1024 * 1024), disk_cache=disk_cache)
+            def load(csv_path, start_offset=None, end_offset=None):
+                calls.append(csv_path)
+                return load_dataframe_from_csv.uncached(csv_path, start_offset=start_offset, end_offset=end_offset)
+            return load
+
+        first = make_loader()(signal_csv, 20, 120)
+        second = make_loader()(signal_csv, 20, 120)
+        pd.testing.assert_frame_equal(first, second)
+        assert len(calls) == 1
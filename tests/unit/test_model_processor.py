@@ -0,0 +1,140 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.model_processor import ModelProcessor
+
+
+class WindowModel:
+    """Predicts whether each non-overlapping window's mean accel_x is positive; drops a trailing partial window"""
+    window_size = 100
+
+    def __init__(self):
+        self.input_rows = []
+
+    def preprocess(self, data):
+        self.input_rows.append(len(data))
+        values = data['accel_x'].to_numpy()
+        windows = len(values) // self.window_size
+        return values[:windows * self.window_size].reshape(windows, self.window_size)
+
+    def run(self, preprocessed_data, device='cpu'):
+        return preprocessed_data.mean(axis=1)
+
+    def postprocess(self, raw_predictions, raw_data, threshold=None):
+        return (raw_predictions > (threshold or 0)).astype(np.float64).repeat(self.window_size)
+
+
+class ConfidenceModel(WindowModel):
+    """WindowModel that also reports each window's sigmoid score as per-sample confidence"""
+
+    def confidence(self, raw_predictions, raw_data):
+        return (1 / (1 + np.exp(-raw_predictions))).repeat(self.window_size)
+
+
+class SmoothingModel(WindowModel):
+    """Per-sample centered moving average over 41 rows, which needs 20 rows of context"""
+    window_size = None
+    receptive_field = 20
+
+    def preprocess(self, data):
+        self.input_rows.append(len(data))
+        return data['accel_x'].to_numpy()
+
+    def run(self, preprocessed_data, device='cpu'):
+        return pd.Series(preprocessed_data).rolling(41, center=True, min_periods=1).mean().to_numpy()
+
+    def postprocess(self, raw_predictions, raw_data, threshold=None):
+        return raw_predictions
+
+
+class UndeclaredModel(WindowModel):
+    """Windows its input like WindowModel without declaring it"""
+    window_size = None
+
+    def preprocess(self, data):
+        self.input_rows.append(len(data))
+        values = data['accel_x'].to_numpy()
+        return values[:len(values) // 100 * 100].reshape(-1, 100)
+
+    def postprocess(self, raw_predictions, raw_data, threshold=None):
+        return (raw_predictions > (threshold or 0)).astype(np.float64).repeat(100)
+
+
+def make_session(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'ns_since_reboot': np.arange(rows, dtype=np.float64) * 2e7,
+        'accel_x': rng.normal(0, 1, rows),
+    }, index=np.arange(rows) + 1000)
+
+
+class TestStreamingInference:
+
+    @pytest.mark.parametrize('rows', [2_000, 2_050, 1_999])
+    def test_windowed_model_matches_single_pass(self, rows):
+        data = make_session(rows)
+        expected = ModelProcessor(WindowModel(), chunk_rows=0).process(data)
+        model = WindowModel()
+        streamed = ModelProcessor(model, chunk_rows=300).process(data)
+        assert len(model.input_rows) > 1
+        assert len(streamed) == rows
+        np.testing.assert_array_equal(streamed[:len(expected)], expected)
+        assert not streamed[len(expected):].any()
+
+    def test_context_makes_smoothing_exact(self):
+        data = make_session(1_000)
+        expected = ModelProcessor(SmoothingModel(), chunk_rows=0).process(data)
+        streamed = ModelProcessor(SmoothingModel(), chunk_rows=128).process(data)
+        np.testing.assert_allclose(streamed, expected)
+
+    def test_chunk_size_bounds_model_input(self):
+        for rows in (3_000, 30_000):
+            model = WindowModel()
+            ModelProcessor(model, chunk_rows=250).process(make_session(rows))
+            # Chunks round up to 300 rows, plus one window of context on each side
+            assert max(model.input_rows) == 500
+
+    def test_threshold_reaches_each_chunk(self):
+        data = make_session(1_000)
+        low = ModelProcessor(WindowModel(), chunk_rows=200).process(data, threshold=-10)
+        high = ModelProcessor(WindowModel(), chunk_rows=200).process(data, threshold=10)
+        assert low.all() and not high.any()
+
+    def test_single_pass_without_declarations_or_when_opted_out(self):
+        data = make_session(1_000)
+        undeclared = UndeclaredModel()
+        ModelProcessor(undeclared, chunk_rows=100).process(data)
+        assert undeclared.input_rows == [1_000]
+
+        opted_out = WindowModel()
+        opted_out.streaming = False
+        ModelProcessor(opted_out, chunk_rows=100).process(data)
+        assert opted_out.input_rows == [1_000]
+
+    def test_short_session_uses_single_pass(self):
+        model = WindowModel()
+        ModelProcessor(model, chunk_rows=5_000).process(make_session(1_000))
+        assert model.input_rows == [1_000]
+
+    def test_confidence_is_stitched_like_predictions(self):
+        data = make_session(2_050)
+        expected, expected_confidence = ModelProcessor(ConfidenceModel(), chunk_rows=0).process(data, with_confidence=True)
+        streamed, confidence = ModelProcessor(ConfidenceModel(), chunk_rows=300).process(data, with_confidence=True)
+
+        assert len(confidence) == len(streamed) == 2_050
+        np.testing.assert_array_equal(streamed[:len(expected)], expected)
+        np.testing.assert_allclose(confidence[:len(expected_confidence)], expected_confidence)
+        assert ((confidence[:len(expected)] > 0.5) == (expected > 0)).all()
+
+    def test_models_without_confidence_report_none(self):
+        data = make_session(2_000)
+        for chunk_rows in (0, 300):
+            predictions, confidence = ModelProcessor(WindowModel(), chunk_rows=chunk_rows).process(data, with_confidence=True)
+            assert len(predictions) == 2_000
+            assert confidence is None
@@ -0,0 +1,125 @@
+import pytest
+import sys
+import os
+import time
+import threading
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.model_registry import ModelRegistry
+from app.services.model_processor import ModelProcessor
+
+
+class FakeModel:
+    """Implements the model interface; its weights size stands in for memory use"""
+
+    def preprocess(self, data):
+        return data
+
+    def run(self, data, device):
+        return data
+
+    def postprocess(self, predictions, data, threshold=None):
+        return predictions
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    """Fixture to provide a model directory with two models' files"""
+    for name in ('a', 'b'):
+        (tmp_path / f'{name}.py').write_text('class Model: pass\n')
+        (tmp_path / f'{name}.pt').write_bytes(bytes(1000))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def loader():
+    """Fixture to provide a model loader that records its calls"""
+    calls = []
+
+    def load(model_config, device):
+        calls.append((model_config['id'], device))
+        return FakeModel()
+    load.calls = calls
+    return load
+
+
+def config(model_id, name='a'):
+    return {'id': model_id, 'name': f'model {model_id}', 'py_filename': f'{name}.py', 'pt_filename': f'{name}.pt', 'class_name': 'Model'}
+
+
+class TestModelRegistry:
+
+    def test_loaded_model_is_reused(self, model_dir, loader):
+        registry = ModelRegistry(4, 1 << 20)
+        first = registry.get(config(1), 'cpu', model_dir, loader)
+        second = registry.get(config(1), 'cpu', model_dir, loader)
+        assert isinstance(first, ModelProcessor)
+        assert first is second
+        assert loader.calls == [(1, 'cpu')]
+        assert registry.stats()['hits'] == 1 and registry.stats()['misses'] == 1
+
+    def test_devices_are_cached_separately(self, model_dir, loader):
+        registry = ModelRegistry(4, 1 << 20)
+        registry.get(config(1), 'cpu', model_dir, loader)
+        registry.get(config(1), 'cuda', model_dir, loader)
+        assert loader.calls == [(1, 'cpu'), (1, 'cuda')]
+
+    def test_changed_weights_are_reloaded(self, model_dir, loader):
+        registry = ModelRegistry(4, 1 << 20)
+        first = registry.get(config(1), 'cpu', model_dir, loader)
+        with open(os.path.join(model_dir, 'a.pt'), 'ab') as f:
+            f.write(b'\0')
+        second = registry.get(config(1), 'cpu', model_dir, loader)
+        assert first is not second
+        assert registry.stats()['reloads'] == 1
+        assert registry.stats()['entries'] == 1
+
+    def test_least_recently_used_model_is_evicted(self, model_dir, loader):
+        registry = ModelRegistry(2, 1 << 20)
+        registry.get(config(1), 'cpu', model_dir, loader)
+        registry.get(config(2, 'b'), 'cpu', model_dir, loader)
+        registry.get(config(1), 'cpu', model_dir, loader)
+        registry.get(config(3), 'cpu', model_dir, loader)
+        assert [entry['model_id'] for entry in registry.stats()['models']] == [1, 3]
+        assert registry.stats()['evictions'] == 1
+
+    def test_memory_limit_evicts(self, model_dir, loader):
+        registry = ModelRegistry(4, 1500)
+        registry.get(config(1), 'cpu', model_dir, loader)
+        registry.get(config(2, 'b'), 'cpu', model_dir, loader)
+        stats = registry.stats()
+        assert stats['entries'] == 1 and stats['bytes'] == 1000
+
+    def test_invalidate_drops_model_on_all_devices(self, model_dir, loader):
+        registry = ModelRegistry(4, 1 << 20)
+        registry.get(config(1), 'cpu', model_dir, loader)
+        registry.get(config(1), 'cuda', model_dir, loader)
+        registry.get(config(2, 'b'), 'cpu', model_dir, loader)
+        registry.invalidate(1)
+        assert [entry['model_id'] for entry in registry.stats()['models']] == [2]
+
+    def test_concurrent_requests_load_once(self, model_dir):
+        registry = ModelRegistry(4, 1 << 20)
+        calls = []
+
+        def slow_load(model_config, device):
+            calls.append(model_config['id'])
+            time.sleep(0.05)
+            return FakeModel()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get(config(1), 'cpu', model_dir, slow_load))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert calls == [1]
+        assert all(result is results[0] for result in results)
+
+    def test_invalid_model_is_not_cached(self, model_dir):
+        registry = ModelRegistry(4, 1 << 20)
+        with pytest.raises(ValueError):
+            registry.get(config(1), 'cpu', model_dir, lambda model_config, device: object())
+        assert registry.stats()['entries'] == 0
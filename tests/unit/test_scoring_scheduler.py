@@ -0,0 +1,139 @@
+import pytest
+import sys
+import os
+import threading
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scoring_scheduler import ScoringScheduler
+
+TIMEOUT = 5
+
+
+class Jobs:
+    """Jobs that block until released and record the order they ran in"""
+
+    def __init__(self):
+        self.started = []
+        self.finished = []
+        self.release = {}
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def make(self, name):
+        self.release[name] = threading.Event()
+        started = threading.Event()
+
+        def run(cancelled):
+            with self._lock:
+                self.started.append(name)
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            started.set()
+            self.release[name].wait(TIMEOUT)
+            with self._lock:
+                self.running -= 1
+                self.finished.append((name, cancelled.is_set()))
+        run.started = started
+        return run
+
+
+def wait_for(condition):
+    event = threading.Event()
+    for _ in range(TIMEOUT * 100):
+        if condition():
+            return True
+        event.wait(0.01)
+    return False
+
+
+@pytest.fixture
+def jobs():
+    """Fixture to provide a recorder of blocking jobs, releasing any left at teardown"""
+    recorder = Jobs()
+    yield recorder
+    for event in recorder.release.values():
+        event.set()
+
+
+class TestScoringScheduler:
+
+    def test_device_slots_bound_concurrency(self, jobs):
+        scheduler = ScoringScheduler(4, {'cpu': 1, 'cuda': 1})
+        runs = [jobs.make(f'cpu{i}') for i in range(3)]
+        for i, run in enumerate(runs):
+            scheduler.submit(f'cpu{i}', 'cpu', run)
+        assert runs[0].started.wait(TIMEOUT)
+        assert scheduler.queue_position('cpu1') == 1
+        assert scheduler.queue_position('cpu2') == 2
+        assert scheduler.stats()['running'] == {'cpu': 1}
+
+        for i in range(3):
+            jobs.release[f'cpu{i}'].set()
+        assert wait_for(lambda: len(jobs.finished) == 3)
+        assert jobs.started == ['cpu0', 'cpu1', 'cpu2']
+        assert jobs.max_running == 1
+
+    def test_busy_device_does_not_block_other_device(self, jobs):
+        scheduler = ScoringScheduler(2, {'cpu': 1, 'cuda': 1})
+        cpu0, cpu1, gpu = jobs.make('cpu0'), jobs.make('cpu1'), jobs.make('gpu')
+        scheduler.submit('cpu0', 'cpu', cpu0)
+        scheduler.submit('cpu1', 'cpu', cpu1)
+        scheduler.submit('gpu', 'cuda', gpu)
+        assert gpu.started.wait(TIMEOUT)
+        assert scheduler.queue_position('cpu1') == 1
+        assert scheduler.queue_position('gpu') is None
+
+    def test_workers_bound_concurrency(self, jobs):
+        scheduler = ScoringScheduler(1, {'cpu': 1, 'cuda': 1})
+        cpu, gpu = jobs.make('cpu'), jobs.make('gpu')
+        scheduler.submit('cpu', 'cpu', cpu)
+        scheduler.submit('gpu', 'cuda', gpu)
+        assert cpu.started.wait(TIMEOUT)
+        assert not gpu.started.wait(0.1)
+        jobs.release['cpu'].set()
+        assert gpu.started.wait(TIMEOUT)
+
+    def test_cancel_queued_job(self, jobs):
+        scheduler = ScoringScheduler(1, {'cpu': 1})
+        first, second = jobs.make('first'), jobs.make('second')
+        scheduler.submit('first', 'cpu', first)
+        scheduler.submit('second', 'cpu', second)
+        assert first.started.wait(TIMEOUT)
+
+        assert scheduler.cancel('second') == 'cancelled'
+        assert scheduler.queue_position('second') is None
+        jobs.release['first'].set()
+        assert wait_for(lambda: scheduler.stats()['running'] == {})
+        assert jobs.started == ['first']
+        assert scheduler.stats()['cancelled'] == 1
+
+    def test_cancel_running_job_sets_its_event(self, jobs):
+        scheduler = ScoringScheduler(1, {'cpu': 1})
+        run = jobs.make('job')
+        scheduler.submit('job', 'cpu', run)
+        assert run.started.wait(TIMEOUT)
+        assert scheduler.cancel('job') == 'cancelling'
+        jobs.release['job'].set()
+        assert wait_for(lambda: jobs.finished == [('job', True)])
+        assert scheduler.cancel('job') is None
+
+    def test_failing_job_keeps_worker_alive(self, jobs):
+        scheduler = ScoringScheduler(1, {'cpu': 1})
+        started = []
+
+        def fail(cancelled):
+            raise RuntimeError('model failed')
+
+        scheduler.submit('failing', 'cpu', fail, on_start=lambda: started.append('failing'))
+        run = jobs.make('next')
+        scheduler.submit('next', 'cpu', run)
+        assert run.started.wait(TIMEOUT)
+        assert started == ['failing']
+
+    def test_device_without_slots_is_rejected(self):
+        scheduler = ScoringScheduler(1, {'cpu': 1, 'cuda': 0})
+        with pytest.raises(ValueError):
+            scheduler.submit('job', 'cuda', lambda cancelled: None)
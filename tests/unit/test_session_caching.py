@@ -0,0 +1,121 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+from flask import Flask
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes import sessions
+from app.services.signal_store import COLUMNS_MIMETYPE
+
+
+class FakeSessionService:
+    """Serves one session whose bouts can be edited"""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.bouts = [{'start': 1, 'end': 2, 'label': 'smoking'}]
+
+    def get_session_details(self, session_id):
+        if session_id != 1:
+            return None
+        return {'session_id': 1, 'session_name': 'session', 'project_path': self.data_dir, 'bouts': list(self.bouts)}
+
+    def get_signal_source(self, session_id, session_info):
+        return {'data_dir': self.data_dir, 'start_row': None, 'end_row': None, 'start_ns': None, 'end_ns': None}
+
+
+@pytest.fixture
+def session_dir(tmp_path):
+    """Fixture to provide a session directory with a small accelerometer file"""
+    pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(500, dtype=np.int64) * 20_000_000,
+        'x': np.linspace(0, 1, 500).round(5),
+        'y': 0.5,
+        'z': 9.8,
+    }).to_csv(tmp_path / 'accelerometer_data.csv', index=False)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def client(session_dir):
+    """Fixture to provide a test client for the sessions blueprint and its fake service"""
+    service = FakeSessionService(session_dir)
+    sessions.init_controller(None, service, None)
+    app = Flask(__name__)
+    app.register_blueprint(sessions.sessions_bp)
+    return app.test_client(), service
+
+
+class TestSessionCaching:
+
+    @pytest.mark.parametrize('path', ['/api/session/1', '/api/session/1/signal', '/api/session/1/bouts', '/api/session/1/window?max_points=100'])
+    def test_unchanged_resources_revalidate_to_304(self, client, path):
+        client, _ = client
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+        assert 'no-cache' in response.headers['Cache-Control']
+
+        revalidated = client.get(path, headers={'If-None-Match': etag})
+        assert revalidated.status_code == 304
+        assert revalidated.data == b''
+        assert revalidated.headers['ETag'] == etag
+
+    def test_bouts_edit_keeps_signal_tag(self, client):
+        client, service = client
+        signal = client.get('/api/session/1/signal').headers['ETag']
+        bouts = client.get('/api/session/1/bouts').headers['ETag']
+        combined = client.get('/api/session/1').headers['ETag']
+
+        service.bouts.append({'start': 3, 'end': 4, 'label': 'smoking'})
+        assert client.get('/api/session/1/signal', headers={'If-None-Match': signal}).status_code == 304
+        changed = client.get('/api/session/1/bouts', headers={'If-None-Match': bouts})
+        assert changed.status_code == 200
+        assert len(changed.get_json()['bouts']) == 2
+        assert client.get('/api/session/1', headers={'If-None-Match': combined}).status_code == 200
+
+    def test_rewritten_file_changes_signal_tag(self, client, session_dir):
+        client, _ = client
+        etag = client.get('/api/session/1/signal').headers['ETag']
+        csv_path = os.path.join(session_dir, 'accelerometer_data.csv')
+        with open(csv_path, 'a') as f:
+            f.write('1000010000000000,2.0,0.5,9.8\n')
+        response = client.get('/api/session/1/signal', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+    def test_representations_have_distinct_tags(self, client):
+        client, _ = client
+        as_json = client.get('/api/session/1/signal')
+        as_columns = client.get('/api/session/1/signal', headers={'Accept': COLUMNS_MIMETYPE})
+        assert as_columns.mimetype == COLUMNS_MIMETYPE
+        assert as_json.headers['ETag'] != as_columns.headers['ETag']
+        assert 'Accept' in as_columns.headers['Vary']
+
+    def test_window_tag_follows_query_and_representation(self, client):
+        client, _ = client
+        wide = client.get('/api/session/1/window?max_points=100')
+        narrow = client.get('/api/session/1/window?max_points=100&end_ns=1000002000000000')
+        as_columns = client.get('/api/session/1/window?max_points=100', headers={'Accept': COLUMNS_MIMETYPE})
+        assert len({wide.headers['ETag'], narrow.headers['ETag'], as_columns.headers['ETag']}) == 3
+
+        body = wide.get_json()
+        assert body['channel'] == 'accel'
+        assert body['bucket_rows'] > 1
+        assert len(body['data']) <= 100
+        assert as_columns.mimetype == COLUMNS_MIMETYPE
+
+    def test_window_without_gyro_file_is_not_found(self, client):
+        client, _ = client
+        assert client.get('/api/session/1/window?channel=gyro').status_code == 404
+        assert client.get('/api/session/1/window?channel=mag').status_code == 400
+
+    def test_missing_session_is_not_cached(self, client):
+        client, _ = client
+        response = client.get('/api/session/2/bouts')
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers
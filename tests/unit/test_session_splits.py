@@ -0,0 +1,81 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.session_splits import nearest_row_indices, split_at_gaps, split_at_points, resample_bin_starts
+from app.services.utils import resample
+
+
+def idxmin_split_indices(df, points):
+    """The per-point full-column scan the split engine replaces"""
+    indices = []
+    for point in sorted(set(float(p) for p in points)):
+        df['time_diff'] = abs(df['ns_since_reboot'] - point)
+        split_index = df['time_diff'].idxmin()
+        if split_index == 0 or split_index == len(df) - 1:
+            continue
+        indices.append(split_index)
+    return sorted(set(indices))
+
+
+@pytest.fixture
+def session_ns():
+    """Fixture to provide sorted 50 Hz timestamps with duplicates and two long gaps"""
+    ns = 1_000_000_000_000 + np.arange(5000, dtype=np.int64) * 20_000_000
+    ns[2000:] += 40 * 60 * 1_000_000_000
+    ns[4000:] += 90 * 60 * 1_000_000_000
+    ns[101] = ns[100]
+    ns[102] = ns[100]
+    return ns
+
+
+class TestSessionSplits:
+
+    def test_nearest_matches_idxmin(self, session_ns):
+        rng = np.random.default_rng(0)
+        points = np.concatenate((
+            rng.uniform(session_ns[0] - 1e9, session_ns[-1] + 1e9, 200),
+            session_ns[[0, 100, 101, 2500, 4999]],
+            (session_ns[[500, 1500]] + session_ns[[501, 1501]]) / 2  # exact ties
+        ))
+        df = pd.DataFrame({'ns_since_reboot': session_ns})
+        expected = idxmin_split_indices(df, points)
+        indices = nearest_row_indices(session_ns, points)
+        indices = sorted(set(int(i) for i in indices if 0 < i < len(session_ns) - 1))
+        assert indices == expected
+
+    def test_unsorted_timestamps_match_idxmin(self, session_ns):
+        shuffled = np.random.default_rng(1).permutation(session_ns)
+        points = shuffled[[10, 20, 30]] + 5_000_000
+        df = pd.DataFrame({'ns_since_reboot': shuffled})
+        indices = nearest_row_indices(shuffled, points)
+        assert sorted(set(int(i) for i in indices if 0 < i < len(shuffled) - 1)) == idxmin_split_indices(df, points)
+
+    def test_split_at_points_segments(self, session_ns):
+        segments = split_at_points(session_ns, [session_ns[1000], session_ns[3000], session_ns[0]])
+
+        assert [(s['start_offset'], s['end_offset']) for s in segments] == [(0, 1000), (1000, 3000), (3000, 5000)]
+        for segment in segments:
+            rows = session_ns[segment['start_offset']:segment['end_offset']]
+            assert segment['start_ns'] == rows.min()
+            assert segment['stop_ns'] == rows.max()
+
+    def test_split_at_gaps(self, session_ns):
+        segments = split_at_gaps(session_ns, 30 * 60 * 1_000_000_000)
+        assert [(s['start_offset'], s['end_offset']) for s in segments] == [(0, 2000), (2000, 4000), (4000, 5000)]
+
+        # A gap before the last row leaves nothing to split off
+        assert len(split_at_gaps(session_ns[:2001], 30 * 60 * 1_000_000_000)) == 1
+
+    def test_bin_starts_match_resampled_bounds(self, session_ns):
+        ns = session_ns[:2000] + 7_654_321
+        df = pd.DataFrame({'ns_since_reboot': ns.astype(float), 'accel_x': np.arange(len(ns), dtype=float)})
+        resampled = resample(df)
+        first, last = resample_bin_starts([ns[0], ns[-1]])
+        assert first == resampled['ns_since_reboot'].min()
+        assert last == resampled['ns_since_reboot'].max()
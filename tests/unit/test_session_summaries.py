@@ -0,0 +1,174 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.session_summaries import summarize_signals, compute_session_summary
+from app.services.upload_preprocessing import prepare_upload
+from app.services.session_service import SessionService
+from app.services.utils import load_session_signals
+from tests.conftest import make_signal
+
+GAP_NS = 45 * 60 * 1_000_000_000
+
+
+class FakeSessionRepository:
+    """Records inserted sessions and saved summaries"""
+
+    def __init__(self):
+        self.sessions = []
+        self.summaries = {}
+
+    def insert_single_session(self, session_name, project_id, bouts_json, start_ns, stop_ns, **kwargs):
+        self.sessions.append(session_name)
+        return [session_name]
+
+    def count_sessions_by_name_and_project(self, session_name, project_id):
+        return self.sessions.count(session_name)
+
+    def save_summary(self, project_id, session_name, summary):
+        self.summaries[session_name] = summary
+        return 1
+
+    def get_session_split_info(self, session_id):
+        return None
+
+
+class FakeConnection:
+    """Accepts the statements split_session runs and hands out increasing row IDs"""
+
+    def __init__(self):
+        self.lastrowid = 100
+        self.committed = False
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if query.strip().startswith('INSERT INTO sessions'):
+            self.lastrowid += 1
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def split_upload(tmp_path):
+    """Fixture to provide an accelerometer + gyroscope upload with one recording gap"""
+    session_dir = tmp_path / 'project' / 'session'
+    session_dir.mkdir(parents=True)
+    start_ns = 1_000_000_000_000
+    for i, name in enumerate(['accelerometer_data.csv', 'gyroscope_data.csv']):
+        pieces = [make_signal(start_ns, 3000, 50, i, jitter=False), make_signal(start_ns + 3000 * 20_000_000 + GAP_NS, 2000, 50, 10 + i, jitter=False)]
+        pd.concat(pieces).to_csv(session_dir / name, index=False)
+    return str(tmp_path / 'project')
+
+
+class TestSignalSummaries:
+
+    def test_summarize_signals(self):
+        df = pd.DataFrame({
+            'ns_since_reboot': np.array([0, 20, 40, 2_000_000_060, 2_000_000_080], dtype=np.float64),
+            'accel_x': [1.0, -2.0, 3.0, np.nan, 0.0],
+        })
+        summary = summarize_signals(df)
+        assert summary['row_count'] == 5
+        assert summary['duration_seconds'] == 2.0
+        assert summary['sample_rate_hz'] == 5e7
+        assert summary['gap_count'] == 1
+        assert summary['axis_stats'] == {'accel_x': {'min': -2.0, 'max': 3.0, 'mean': 0.5}}
+
+    def test_empty_session(self):
+        summary = summarize_signals(pd.DataFrame({'ns_since_reboot': [], 'accel_x': []}))
+        assert summary['row_count'] == 0
+        assert summary['duration_seconds'] is None
+        assert summary['axis_stats']['accel_x']['mean'] is None
+
+    def test_upload_plan_carries_segment_summaries(self, split_upload):
+        prepared = prepare_upload('session', split_upload, streaming=False)
+        plan = prepared['plan']
+        assert plan['split']
+        assert 'summarize' in prepared['timings']
+
+        data_dir = os.path.join(split_upload, 'session')
+        for segment in plan['segments']:
+            summary = segment['summary']
+            expected = load_session_signals(data_dir, segment['start_offset'], segment['end_offset'])
+            assert summary['row_count'] == segment['end_offset'] - segment['start_offset'] == len(expected)
+            assert summary['sample_rate_hz'] == pytest.approx(50, rel=1e-3)
+            assert summary['gap_count'] == 0
+            assert set(summary['axis_stats']) == {'accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z'}
+            assert summary['axis_stats']['gyro_z']['max'] == pytest.approx(expected['gyro_z'].max())
+
+    def test_time_bounds_limit_rows(self, split_upload):
+        prepare_upload('session', split_upload, streaming=False)
+        data_dir = os.path.join(split_upload, 'session')
+        whole = compute_session_summary(data_dir)
+        assert whole['gap_count'] == 1
+        first = compute_session_summary(data_dir, end_ns=1_000_000_000_000 + 2999 * 20_000_000)
+        assert first['row_count'] == 3000
+        assert first['gap_count'] == 0
+
+    def test_registration_stores_summaries(self, split_upload):
+        repository = FakeSessionRepository()
+        service = SessionService(session_repository=repository)
+        service.get_db_connection = lambda: None
+        prepared = prepare_upload('session', split_upload, streaming=False)
+
+        created = service._register_upload('session', split_upload, 1, [], prepared['plan'])
+        assert created == ['session.1', 'session.2']
+        assert [repository.summaries[name] for name in created] == [segment['summary'] for segment in prepared['plan']['segments']]
+
+    def test_manual_split_stores_summaries(self, split_upload):
+        prepare_upload('session', split_upload, streaming=False)
+        repository = FakeSessionRepository()
+        service = SessionService(session_repository=repository)
+        connection = FakeConnection()
+        service.get_db_connection = lambda: connection
+
+        data_dir = os.path.join(split_upload, 'session')
+        session_info = {'session_name': 'session', 'project_path': split_upload, 'project_id': 1, 'keep': 1}
+        start_ns = 1_000_000_000_000
+        new_sessions = [
+            {'name': 'session.a', 'bouts': [], 'start_ns': start_ns, 'stop_ns': start_ns + 999 * 20_000_000, 'data_start_offset': 0, 'data_end_offset': 1000},
+            {'name': 'session.b', 'bouts': [], 'start_ns': start_ns + 1000 * 20_000_000, 'stop_ns': start_ns + 3999 * 20_000_000 + GAP_NS, 'data_start_offset': 1000, 'data_end_offset': 4000},
+            # Older splits without offsets are summarized over their time range
+            {'name': 'session.c', 'bouts': [], 'start_ns': start_ns, 'stop_ns': start_ns + 2999 * 20_000_000, 'data_start_offset': None, 'data_end_offset': None},
+        ]
+        created = service.split_session(7, session_info, new_sessions)
+
+        assert connection.committed
+        assert created == [101, 102, 103]
+        assert repository.summaries['session.a'] == compute_session_summary(data_dir, 0, 1000)
+        assert repository.summaries['session.b']['row_count'] == 3000
+        assert repository.summaries['session.b']['gap_count'] == 1
+        assert repository.summaries['session.c']['row_count'] == 3000
+
+    def test_session_rows_nest_summary(self):
+        service = SessionService()
+        session = {'session_id': 1, 'row_count': 10, 'duration_seconds': 0.18, 'sample_rate_hz': 50.0,
+                   'gap_count': 0, 'axis_stats': '{"accel_x": {"min": 0.0, "max": 1.0, "mean": 0.5}}'}
+        service._attach_summary(session)
+        assert session == {'session_id': 1, 'summary': {
+            'row_count': 10, 'duration_seconds': 0.18, 'sample_rate_hz': 50.0, 'gap_count': 0,
+            'axis_stats': {'accel_x': {'min': 0.0, 'max': 1.0, 'mean': 0.5}}}}
+
+        unsummarized = {'session_id': 2, 'row_count': None, 'duration_seconds': None, 'sample_rate_hz': None, 'gap_count': None, 'axis_stats': None}
+        service._attach_summary(unsummarized)
+        assert unsummarized == {'session_id': 2, 'summary': None}
@@ -0,0 +1,79 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.session_service import SessionService
+from app.services.session_validation import sniff_session_file, validate_session_files
+
+
+def make_accel(rows, hz=50):
+    rng = np.random.default_rng(rows)
+    return pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * (1_000_000_000 // hz),
+        'x': rng.normal(0, 1, rows).round(5),
+        'y': rng.normal(0, 1, rows).round(5),
+        'z': rng.normal(9.8, 1, rows).round(5),
+    })
+
+
+def write_session(project_path, name, df=None, text=None):
+    session_dir = project_path / name
+    session_dir.mkdir(parents=True)
+    if df is not None:
+        df.to_csv(session_dir / 'accelerometer_data.csv', index=False)
+    elif text is not None:
+        (session_dir / 'accelerometer_data.csv').write_text(text)
+    return str(session_dir / 'accelerometer_data.csv')
+
+
+@pytest.fixture
+def project_path(tmp_path):
+    """Fixture to provide a project with valid sessions and one of each kind of invalid session"""
+    path = tmp_path / 'project'
+    write_session(path, 'long', make_accel(60_000))
+    write_session(path, 'short', make_accel(200))
+    write_session(path, 'wrong_columns', make_accel(200).rename(columns={'x': 'a'}))
+    write_session(path, 'few_rows', make_accel(5))
+    no_timestamps = make_accel(200)
+    no_timestamps['ns_since_reboot'] = 0
+    write_session(path, 'zero_timestamps', no_timestamps)
+    no_values = make_accel(200)
+    no_values[['x', 'y', 'z']] = np.nan
+    write_session(path, 'no_values', no_values)
+    write_session(path, 'tiny', text='ns_since_reboot,x,y,z\n')
+    write_session(path, 'missing')
+    return path
+
+
+SESSIONS = ['long', 'short', 'wrong_columns', 'few_rows', 'zero_timestamps', 'no_values', 'tiny', 'missing']
+
+
+class TestSessionValidation:
+
+    def test_sniffing_agrees_with_pandas_validation(self, project_path):
+        service = SessionService()
+        sniffed = validate_session_files(SESSIONS, str(project_path), workers=4)
+        parsed = validate_session_files(SESSIONS, str(project_path), check=service.validation_report, workers=1)
+        assert [report['session_name'] for report in sniffed] == SESSIONS
+        assert [report['valid'] for report in sniffed] == [report['valid'] for report in parsed]
+        assert [report['reason'] for report in sniffed] == [report['reason'] for report in parsed]
+        assert [report['valid'] for report in sniffed] == [True, True] + [False] * 6
+
+    def test_estimates(self, project_path):
+        report = sniff_session_file(str(project_path / 'long' / 'accelerometer_data.csv'), sample_bytes=4096)
+        assert report['row_estimate'] == pytest.approx(60_000, rel=0.05)
+        assert report['sample_rate_hz'] == pytest.approx(50)
+        assert report['duration_seconds'] == pytest.approx((60_000 - 1) / 50)
+
+        report = sniff_session_file(str(project_path / 'short' / 'accelerometer_data.csv'))
+        assert report['row_estimate'] == 200
+
+    def test_validate_sessions_removes_invalid_sessions(self, project_path):
+        reports = SessionService().validate_sessions([{'name': name} for name in SESSIONS], str(project_path))
+        assert [report['session_name'] for report in reports if report['valid']] == ['long', 'short']
+        assert sorted(os.listdir(project_path)) == ['long', 'short']
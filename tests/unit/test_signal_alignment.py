@@ -0,0 +1,131 @@
+import pytest
+import sys
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.signal_alignment import nearest_indices, align_nearest
+from app.services.signal_store import merged_store_path, open_merged_store, read_merged_store
+from app.services.session_service import SessionService
+from app.services.utils import load_session_signals, load_session_signals_time_range, load_session_data_with_virtual_splits, load_dataframe_from_csv
+from tests.conftest import make_signal
+
+
+def merge_asof_nearest(left, right, tolerance):
+    """The alignment the upload used before: merge_asof nearest, then dropna"""
+    return pd.merge_asof(left, right, on='ns_since_reboot', tolerance=tolerance, direction='nearest').dropna().reset_index(drop=True)
+
+
+@pytest.fixture
+def uploaded_session(tmp_path):
+    """Fixture to provide a preprocessed accelerometer + gyroscope session directory"""
+    session_dir = tmp_path / 'project' / 'session'
+    session_dir.mkdir(parents=True)
+    for i, name in enumerate(['accelerometer_data.csv', 'gyroscope_data.csv']):
+        df = make_signal(1_000_000_000_000 + i * 3_000_000, 3000, 50, i)
+        df.to_csv(session_dir / name, index=False)
+
+    service = SessionService()
+    service._register_upload = lambda session_name, project_path, project_id, parent_bouts, plan: [session_name]
+    service.preprocess_and_split_session_on_upload('session', str(tmp_path / 'project'), 1, [], streaming=False)
+    return str(session_dir)
+
+
+class TestNearestAlignment:
+
+    @pytest.mark.parametrize('seed', range(20))
+    def test_matches_merge_asof(self, seed):
+        rng = np.random.default_rng(seed)
+        left = pd.DataFrame({'ns_since_reboot': np.sort(rng.integers(0, 2000, 300)).astype(float), 'a': rng.normal(size=300)})
+        right = pd.DataFrame({'ns_since_reboot': np.sort(rng.integers(0, 2000, 200)).astype(float), 'b': rng.normal(size=200)})
+        # Gaps in the right-hand rows leave some left rows unmatched
+        right.loc[rng.random(200) < 0.05, 'b'] = np.nan
+        for tolerance in [None, 0, 7]:
+            pd.testing.assert_frame_equal(align_nearest(left, right, tolerance), merge_asof_nearest(left, right, tolerance))
+
+    def test_ties_take_the_earlier_row(self):
+        assert list(nearest_indices([5, 15], [0, 10, 20])) == [0, 1]
+
+    def test_rows_beyond_tolerance_are_unmatched(self):
+        assert list(nearest_indices([0, 100, 1000], [98, 102], tolerance=5)) == [-1, 0, -1]
+
+    def test_empty_right_drops_every_row(self):
+        left = make_signal(0, 10, 50, 0, prefix='accel')
+        right = make_signal(0, 0, 50, 1, prefix='gyro')
+        aligned = align_nearest(left, right)
+        assert len(aligned) == 0
+        assert list(aligned.columns) == list(left.columns) + ['gyro_x', 'gyro_y', 'gyro_z']
+
+    def test_upload_sized_session(self):
+        accel = make_signal(1_000_000_000_000, 20000, 50, 0, prefix='accel').astype(float)
+        gyro = make_signal(1_000_003_000_000, 20000, 50, 1, prefix='gyro').astype(float)
+        pd.testing.assert_frame_equal(align_nearest(accel, gyro, 20_000_000), merge_asof_nearest(accel, gyro, 20_000_000))
+
+
+class TestMergedStore:
+
+    def test_written_on_upload(self, uploaded_session):
+        assert os.path.exists(merged_store_path(uploaded_session))
+        merged = read_merged_store(uploaded_session)
+        accel = load_dataframe_from_csv(os.path.join(uploaded_session, 'accelerometer_data.csv'), column_prefix='accel')
+        gyro = load_dataframe_from_csv(os.path.join(uploaded_session, 'gyroscope_data.csv'), column_prefix='gyro')
+        assert list(merged.columns) == ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z']
+        # The store keeps the files' last row, which the CSV loader drops
+        assert len(merged) == len(accel) + 1
+        np.testing.assert_array_equal(merged['ns_since_reboot'].to_numpy()[:-1], accel['ns_since_reboot'].to_numpy())
+        np.testing.assert_array_equal(merged['gyro_y'].to_numpy()[:-1], gyro['gyro_y'].to_numpy(dtype=np.float32))
+
+    def test_offsets_select_rows(self, uploaded_session):
+        merged = read_merged_store(uploaded_session)
+        window = read_merged_store(uploaded_session, 100, 250)
+        pd.testing.assert_frame_equal(window, merged.iloc[100:250].reset_index(drop=True))
+
+    def test_ignored_after_csv_changes(self, uploaded_session):
+        gyro_path = os.path.join(uploaded_session, 'gyroscope_data.csv')
+        with open(gyro_path, 'a') as f:
+            f.write('\n')
+        assert open_merged_store(uploaded_session) is None
+
+    def test_loader_matches_csv_fallback(self, uploaded_session, tmp_path):
+        fallback_dir = tmp_path / 'fallback'
+        shutil.copytree(uploaded_session, fallback_dir)
+        os.remove(merged_store_path(str(fallback_dir)))
+
+        for offsets in [(None, None), (200, 900)]:
+            from_store = load_session_signals(uploaded_session, *offsets)
+            from_csv = load_session_signals(str(fallback_dir), *offsets)
+            pd.testing.assert_frame_equal(from_store, from_csv, check_exact=False, rtol=1e-6)
+
+    def test_offset_zero_loads_every_row(self, uploaded_session):
+        # Scoring loads whole sessions this way, keeping the last row
+        loaded = load_session_signals(uploaded_session, start_offset=0)
+        merged = read_merged_store(uploaded_session)
+        pd.testing.assert_frame_equal(loaded, merged.astype(float))
+
+    def test_time_range_matches_offset_load(self, uploaded_session):
+        full = load_session_signals(uploaded_session, start_offset=0)
+        start_ns = full['ns_since_reboot'].iloc[300]
+        stop_ns = full['ns_since_reboot'].iloc[1200]
+        loaded = load_session_signals_time_range(uploaded_session, start_ns, stop_ns)
+        assert list(loaded.columns) == ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z']
+        pd.testing.assert_frame_equal(loaded, full.iloc[300:1201].reset_index(drop=True))
+
+    def test_virtual_split_loader_keeps_channels(self, uploaded_session):
+        data = load_session_data_with_virtual_splits(None, 'session', parent_data_path=uploaded_session, start_offset=10, end_offset=60)
+        assert list(data['accel'].columns) == ['ns_since_reboot', 'accel_x', 'accel_y', 'accel_z']
+        assert list(data['gyro'].columns) == ['ns_since_reboot', 'gyro_x', 'gyro_y', 'gyro_z']
+        assert len(data['accel']) == len(data['gyro']) == 50
+
+    def test_loader_aligns_unmerged_files(self, tmp_path):
+        accel = make_signal(1_000_000_000_000, 500, 50, 0, prefix='accel')
+        gyro = make_signal(1_000_003_000_000, 500, 50, 1, prefix='gyro')
+        accel.set_axis(['ns_since_reboot', 'x', 'y', 'z'], axis=1).to_csv(tmp_path / 'accelerometer_data.csv', index=False)
+        gyro.set_axis(['ns_since_reboot', 'x', 'y', 'z'], axis=1).to_csv(tmp_path / 'gyroscope_data.csv', index=False)
+
+        loaded = load_session_signals(str(tmp_path))
+        expected = merge_asof_nearest(accel.iloc[:-1].astype(float), gyro.iloc[:-1].astype(float), 20_000_000)
+        pd.testing.assert_frame_equal(loaded, expected)
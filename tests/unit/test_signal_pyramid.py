@@ -0,0 +1,132 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.signal_pyramid import write_pyramid, load_pyramid, query_signal_view, pyramid_path, BASE_BUCKET_ROWS
+
+
+@pytest.fixture
+def signal_csv(tmp_path):
+    """Fixture to provide a 50 Hz accelerometer CSV with a one-sample spike"""
+    rows = 20_000
+    df = pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * 20_000_000,
+        'accel_x': np.sin(np.arange(rows) * 0.01).round(4),
+        'accel_y': np.cos(np.arange(rows) * 0.01).round(4),
+        'accel_z': np.full(rows, 9.8),
+    })
+    df.loc[12_345, 'accel_z'] = 30.0
+    csv_path = str(tmp_path / 'accelerometer_data.csv')
+    df.to_csv(csv_path, index=False)
+    return csv_path, df
+
+
+class TestSignalPyramid:
+
+    def test_levels_cover_signal(self, signal_csv):
+        csv_path, df = signal_csv
+        write_pyramid(csv_path, df)
+        pyramid = load_pyramid(csv_path)
+
+        assert pyramid.levels[0]['bucket_rows'] == BASE_BUCKET_ROWS
+        for index, descriptor in enumerate(pyramid.levels):
+            level = pyramid.level(index)
+            assert descriptor['count'] == -(-len(df) // descriptor['bucket_rows'])
+            assert level['ns_first'][0] == df['ns_since_reboot'].iloc[0]
+            assert level['ns_last'][-1] == df['ns_since_reboot'].iloc[-1]
+            assert level['accel_x_min'].min() == pytest.approx(df['accel_x'].min(), abs=1e-6)
+            assert level['accel_x_max'].max() == pytest.approx(df['accel_x'].max(), abs=1e-6)
+
+    def test_spike_survives_full_view(self, signal_csv):
+        csv_path, df = signal_csv
+        write_pyramid(csv_path, df)
+        view, bucket_rows = query_signal_view(csv_path, max_points=500)
+
+        assert len(view) <= 500
+        assert bucket_rows > 1
+        assert view['accel_z'].max() == pytest.approx(30.0)
+        # Strided decimation of the same budget loses the spike
+        assert df['accel_z'].iloc[::len(df) // 250].max() == pytest.approx(9.8)
+
+    def test_zoomed_window_is_full_resolution(self, signal_csv):
+        csv_path, df = signal_csv
+        start_ns = int(df['ns_since_reboot'].iloc[1000])
+        end_ns = int(df['ns_since_reboot'].iloc[1299])
+        view, bucket_rows = query_signal_view(csv_path, start_ns=start_ns, end_ns=end_ns, max_points=2000)
+
+        assert bucket_rows == 1
+        np.testing.assert_array_equal(view['ns_since_reboot'].to_numpy(), df['ns_since_reboot'].iloc[1000:1300].to_numpy())
+
+    def test_row_bounds_limit_view(self, signal_csv):
+        csv_path, df = signal_csv
+        write_pyramid(csv_path, df)
+        view, _ = query_signal_view(csv_path, start_row=5000, end_row=15000, max_points=400)
+
+        assert len(view) <= 400
+        assert view['ns_since_reboot'].min() >= df['ns_since_reboot'].iloc[5000 - 5000 % 4096]
+        assert view['ns_since_reboot'].max() <= df['ns_since_reboot'].iloc[min(15000 + 4096, len(df) - 1)]
+
+    def test_missing_pyramid_falls_back_to_strided_read(self, signal_csv):
+        csv_path, df = signal_csv
+        view, bucket_rows = query_signal_view(csv_path, start_row=1000, end_row=19_000, max_points=100)
+
+        assert not os.path.exists(pyramid_path(csv_path))
+        assert len(view) <= 100
+        np.testing.assert_array_equal(view['ns_since_reboot'].to_numpy(), df['ns_since_reboot'].iloc[1000:19_000:bucket_rows].to_numpy())
+        np.testing.assert_allclose(view['accel_x'].to_numpy(), df['accel_x'].iloc[1000:19_000:bucket_rows].to_numpy(), atol=1e-6)
+
+    def test_stale_pyramid_is_ignored(self, signal_csv):
+        csv_path, df = signal_csv
+        write_pyramid(csv_path, df)
+        assert load_pyramid(csv_path) is not None
+
+        df.iloc[:100].to_csv(csv_path, index=False)
+        assert load_pyramid(csv_path) is None
+        view, bucket_rows = query_signal_view(csv_path, max_points=1000)
+        assert bucket_rows == 1
+        assert len(view) == 100
+
+    def test_unaligned_split_excludes_neighbouring_rows(self, tmp_path):
+        rows = 100_000
+        split_row = 50_003
+        ns = 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * 20_000_000
+        ns[split_row:] += 45 * 60 * 1_000_000_000
+        df = pd.DataFrame({
+            'ns_since_reboot': ns,
+            'accel_x': np.sin(np.arange(rows) * 0.01).round(4),
+            'accel_y': np.zeros(rows),
+            'accel_z': np.full(rows, 9.8),
+        })
+        # Spikes in the previous split and just past the end of the queried rows
+        df.loc[split_row - 1, 'accel_z'] = 100.0
+        df.loc[80_001, 'accel_z'] = -100.0
+        csv_path = str(tmp_path / 'accelerometer_data.csv')
+        df.to_csv(csv_path, index=False)
+        write_pyramid(csv_path, df)
+
+        view, bucket_rows = query_signal_view(csv_path, start_row=split_row, end_row=80_001, max_points=1000)
+        split = df.iloc[split_row:80_001]
+
+        assert bucket_rows > 1
+        assert len(view) <= 1000
+        assert view['ns_since_reboot'].iloc[0] == split['ns_since_reboot'].iloc[0]
+        assert view['ns_since_reboot'].iloc[-1] == split['ns_since_reboot'].iloc[-1]
+        assert view['accel_z'].max() == pytest.approx(9.8)
+        assert view['accel_z'].min() == pytest.approx(9.8)
+        assert view['accel_x'].min() == pytest.approx(split['accel_x'].min(), abs=1e-6)
+        assert view['accel_x'].max() == pytest.approx(split['accel_x'].max(), abs=1e-6)
+
+    @pytest.mark.parametrize("max_points", [2, 10, 100])
+    def test_small_budget_is_respected(self, signal_csv, max_points):
+        csv_path, df = signal_csv
+        write_pyramid(csv_path, df)
+        view, bucket_rows = query_signal_view(csv_path, max_points=max_points)
+
+        assert len(view) <= max_points
+        assert bucket_rows * max_points // 2 >= len(df)
+        assert view['accel_z'].max() == pytest.approx(30.0)
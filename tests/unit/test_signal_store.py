@@ -0,0 +1,140 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.signal_store import write_sidecar, read_sidecar, has_valid_sidecar, sidecar_path, open_sidecar, encode_columns, open_columns, read_header, read_sidecar_time_range, ColumnWriter
+from app.services.utils import load_dataframe_from_csv, read_signal_csv, load_signal_time_range
+
+
+@pytest.fixture
+def signal_csv(tmp_path):
+    """Fixture to provide a small resampled accelerometer CSV"""
+    rows = 500
+    df = pd.DataFrame({
+        'ns_since_reboot': 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * 20_000_000,
+        'accel_x': np.sin(np.arange(rows) * 0.1).round(4),
+        'accel_y': np.cos(np.arange(rows) * 0.1).round(4),
+        'accel_z': (9.8 + np.sin(np.arange(rows) * 0.05)).round(4),
+    })
+    csv_path = str(tmp_path / 'accelerometer_data.csv')
+    df.to_csv(csv_path, index=False)
+    return csv_path, df
+
+
+class TestSignalStore:
+
+    def test_roundtrip(self, signal_csv):
+        csv_path, df = signal_csv
+        write_sidecar(csv_path, df)
+
+        loaded = read_sidecar(csv_path)
+        assert loaded is not None
+        assert list(loaded.columns) == list(df.columns)
+        assert loaded['ns_since_reboot'].dtype == np.int64
+        assert loaded['accel_x'].dtype == np.float32
+        np.testing.assert_array_equal(loaded['ns_since_reboot'].to_numpy(), df['ns_since_reboot'].to_numpy())
+        np.testing.assert_allclose(loaded['accel_z'].to_numpy(), df['accel_z'].to_numpy(), rtol=1e-6)
+
+    def test_missing_sidecar_returns_none(self, signal_csv):
+        csv_path, _ = signal_csv
+        assert read_sidecar(csv_path) is None
+
+    def test_stale_sidecar_is_ignored(self, signal_csv):
+        csv_path, df = signal_csv
+        write_sidecar(csv_path, df)
+        df.iloc[:10].to_csv(csv_path, index=False)
+        assert not has_valid_sidecar(csv_path)
+        assert read_sidecar(csv_path) is None
+
+    def test_orphaned_sidecar_is_ignored(self, signal_csv):
+        csv_path, df = signal_csv
+        write_sidecar(csv_path, df)
+        os.remove(csv_path)
+        assert os.path.exists(sidecar_path(csv_path))
+        assert not has_valid_sidecar(csv_path)
+        assert read_sidecar(csv_path) is None
+
+    def test_corrupt_sidecar_is_ignored(self, signal_csv):
+        csv_path, _ = signal_csv
+        with open(sidecar_path(csv_path), 'wb') as f:
+            f.write(b'not a sidecar')
+        assert read_sidecar(csv_path) is None
+
+    @pytest.mark.parametrize("start_offset,end_offset", [(None, None), (100, 250), (None, 50), (400, None)])
+    def test_loader_matches_csv(self, signal_csv, start_offset, end_offset):
+        csv_path, df = signal_csv
+        from_csv = load_dataframe_from_csv(csv_path, start_offset=start_offset, end_offset=end_offset)
+        write_sidecar(csv_path, df)
+        from_sidecar = load_dataframe_from_csv(csv_path, start_offset=start_offset, end_offset=end_offset)
+
+        assert len(from_sidecar) == len(from_csv)
+        pd.testing.assert_frame_equal(from_sidecar, from_csv, check_exact=False, rtol=1e-6)
+
+    def test_read_signal_csv_matches_dtypes(self, signal_csv):
+        csv_path, df = signal_csv
+        expected = pd.read_csv(csv_path)
+        write_sidecar(csv_path, df)
+        loaded = read_signal_csv(csv_path)
+        assert dict(loaded.dtypes) == dict(expected.dtypes)
+
+    def test_open_sidecar_is_memory_mapped(self, signal_csv):
+        csv_path, df = signal_csv
+        write_sidecar(csv_path, df)
+        columns = open_sidecar(csv_path)
+        assert isinstance(columns['ns_since_reboot'], np.memmap)
+        assert len(columns['accel_x']) == len(df)
+
+    @pytest.mark.parametrize("start_row,stop_row", [(0, 499), (120, 180), (250, 250)])
+    def test_time_range_matches_csv(self, signal_csv, start_row, stop_row):
+        csv_path, df = signal_csv
+        start_ns = int(df['ns_since_reboot'].iloc[start_row])
+        stop_ns = int(df['ns_since_reboot'].iloc[stop_row])
+        from_csv = load_signal_time_range(csv_path, start_ns, stop_ns)
+        write_sidecar(csv_path, df)
+        from_sidecar = load_signal_time_range(csv_path, start_ns, stop_ns)
+
+        assert len(from_sidecar) == stop_row - start_row + 1
+        pd.testing.assert_frame_equal(from_sidecar, from_csv, check_exact=False, rtol=1e-6)
+
+    def test_time_range_on_unsorted_timestamps(self, signal_csv, tmp_path):
+        _, df = signal_csv
+        shuffled = df.sample(frac=1, random_state=0).reset_index(drop=True)
+        csv_path = str(tmp_path / 'gyroscope_data.csv')
+        shuffled.to_csv(csv_path, index=False)
+        write_sidecar(csv_path, shuffled)
+        assert read_header(sidecar_path(csv_path))['timestamps_sorted'] is False
+
+        start_ns = int(df['ns_since_reboot'].iloc[120])
+        stop_ns = int(df['ns_since_reboot'].iloc[180])
+        from_sidecar = read_sidecar_time_range(csv_path, start_ns, stop_ns)
+        expected = shuffled[(shuffled['ns_since_reboot'] >= start_ns) & (shuffled['ns_since_reboot'] <= stop_ns)]
+
+        assert len(from_sidecar) == 61
+        np.testing.assert_array_equal(from_sidecar['ns_since_reboot'], expected['ns_since_reboot'])
+
+    def test_column_writer_records_sort_order(self, tmp_path):
+        for chunks, expected in (([[1, 2, 3], [3, 4]], True), ([[1, 2], [1, 5]], False), ([[3, 1]], False)):
+            path = str(tmp_path / 'chunks.cols')
+            writer = ColumnWriter(path, {'ns_since_reboot': '<i8'})
+            for chunk in chunks:
+                writer.append({'ns_since_reboot': np.array(chunk)})
+            assert writer.close()['timestamps_sorted'] is expected
+
+    def test_encoded_buffer_matches_file_format(self, signal_csv, tmp_path):
+        _, df = signal_csv
+        buffer = encode_columns({
+            'ns_since_reboot': (df['ns_since_reboot'].to_numpy(), '<f8'),
+            'accel_x': (df['accel_x'].to_numpy(), '<f4'),
+        }, extra_header={'meta': {'bouts': '[]'}})
+        path = tmp_path / 'response.cols'
+        path.write_bytes(buffer)
+
+        columns = open_columns(str(path))
+        assert list(columns) == ['ns_since_reboot', 'accel_x']
+        np.testing.assert_array_equal(columns['ns_since_reboot'], df['ns_since_reboot'].to_numpy(dtype=np.float64))
+        np.testing.assert_allclose(columns['accel_x'], df['accel_x'].to_numpy(), rtol=1e-6)
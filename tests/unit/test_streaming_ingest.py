@@ -0,0 +1,90 @@
+import pytest
+import sys
+import os
+import shutil
+import functools
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import upload_preprocessing
+from app.services.session_service import SessionService
+from app.services.streaming_ingest import StreamingSessionIngest
+from app.services.signal_store import read_sidecar, has_valid_sidecar
+from app.services.signal_pyramid import load_pyramid
+from tests.conftest import make_signal
+
+GAP_NS = 45 * 60 * 1_000_000_000
+
+
+@pytest.fixture(params=['single', 'gaps'])
+def upload(request, tmp_path):
+    """Fixture to provide an accelerometer + gyroscope upload, with or without recording gaps"""
+    start_ns = 1_000_000_000_000
+    pieces = [(start_ns, 3000)]
+    if request.param == 'gaps':
+        pieces.append((start_ns + 3000 * 20_000_000 + GAP_NS, 2500))
+        pieces.append((start_ns + 5500 * 20_000_000 + 2 * GAP_NS, 1200))
+    session_dir = tmp_path / 'project' / 'session'
+    session_dir.mkdir(parents=True)
+    accel = pd.concat([make_signal(begin, rows, 50, i) for i, (begin, rows) in enumerate(pieces)])
+    gyro = pd.concat([make_signal(begin + 3_000_000, rows, 50, 10 + i) for i, (begin, rows) in enumerate(pieces)])
+    accel.to_csv(session_dir / 'accelerometer_data.csv', index=False)
+    gyro.to_csv(session_dir / 'gyroscope_data.csv', index=False)
+    return tmp_path / 'project', request.param
+
+
+def run_upload(project_path, streaming, with_gyro=True, chunk_rows=None, monkeypatch=None):
+    """Preprocess a copy of the upload and return (plan, session directory)"""
+    target = project_path.parent / f'copy_{streaming}_{with_gyro}'
+    shutil.copytree(project_path, target)
+    if not with_gyro:
+        os.remove(target / 'session' / 'gyroscope_data.csv')
+    if chunk_rows:
+        # Small chunks so every piece of carried state crosses chunk boundaries
+        monkeypatch.setattr(upload_preprocessing, 'StreamingSessionIngest', functools.partial(StreamingSessionIngest, chunk_rows=chunk_rows))
+
+    plans = []
+    service = SessionService()
+    service._register_upload = lambda session_name, project_path, project_id, parent_bouts, plan: plans.append(plan) or [session_name]
+    service.preprocess_and_split_session_on_upload('session', str(target), 1, [], streaming=streaming)
+    return plans[0], target / 'session'
+
+
+class TestStreamingIngest:
+
+    @pytest.mark.parametrize('with_gyro', [True, False])
+    def test_matches_in_memory_preprocessing(self, upload, with_gyro, monkeypatch):
+        project_path, kind = upload
+        expected_plan, expected_dir = run_upload(project_path, False, with_gyro)
+        plan, session_dir = run_upload(project_path, True, with_gyro, chunk_rows=700, monkeypatch=monkeypatch)
+
+        assert plan == expected_plan
+        assert plan['split'] == (kind == 'gaps')
+        if plan['split']:
+            assert len(plan['segments']) == 3
+
+        names = ['accelerometer_data.csv'] + (['gyroscope_data.csv'] if with_gyro else [])
+        for name in names:
+            assert (session_dir / name).read_bytes() == (expected_dir / name).read_bytes()
+            assert has_valid_sidecar(str(session_dir / name))
+            streamed = read_sidecar(str(session_dir / name))
+            in_memory = read_sidecar(str(expected_dir / name))
+            pd.testing.assert_frame_equal(streamed, in_memory)
+            assert load_pyramid(str(session_dir / name)) is not None
+        assert sorted(os.listdir(session_dir)) == sorted(os.listdir(expected_dir))
+
+    def test_unsorted_upload_falls_back_to_in_memory(self, upload, monkeypatch):
+        project_path, _ = upload
+        accel_path = project_path / 'session' / 'accelerometer_data.csv'
+        accel = pd.read_csv(accel_path)
+        accel.iloc[[10, 11]] = accel.iloc[[11, 10]].to_numpy()
+        accel.to_csv(accel_path, index=False)
+
+        expected_plan, expected_dir = run_upload(project_path, False)
+        plan, session_dir = run_upload(project_path, True, chunk_rows=700, monkeypatch=monkeypatch)
+
+        assert plan == expected_plan
+        assert (session_dir / 'accelerometer_data.csv').read_bytes() == (expected_dir / 'accelerometer_data.csv').read_bytes()
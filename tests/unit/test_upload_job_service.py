@@ -0,0 +1,78 @@
+import pytest
+import sys
+import os
+import time
+import threading
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.upload_job_service import UploadJobService
+
+
+def wait_for(service, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = service.get_status(job_id)
+        if status['status'] in ('completed', 'failed'):
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+@pytest.fixture
+def service():
+    """Fixture to provide an upload job service"""
+    return UploadJobService()
+
+
+class TestUploadJobService:
+
+    def test_progress_and_result(self, service):
+        release = threading.Event()
+
+        def work(sessions, job=None):
+            job.add_work(len(sessions), 100 * len(sessions))
+            job.session_finished(sessions[0], 100)
+            release.wait(5)
+            for name in sessions[1:]:
+                job.session_finished(name, 100, error='bad file' if name == 'c' else None)
+            return {'sessions_created': len(sessions)}
+
+        job_id = service.start('project_upload', 'test upload', work, ['a', 'b', 'c', 'd'])
+        deadline = time.time() + 5
+        while service.get_status(job_id)['sessions_done'] < 1 and time.time() < deadline:
+            time.sleep(0.01)
+
+        running = service.get_status(job_id)
+        assert running['status'] == 'running'
+        assert (running['sessions_done'], running['sessions_total']) == (1, 4)
+        assert (running['bytes_done'], running['bytes_total']) == (100, 400)
+        assert running['eta_seconds'] is not None and running['eta_seconds'] >= 0
+
+        release.set()
+        finished = wait_for(service, job_id)
+        assert finished['status'] == 'completed'
+        assert finished['result'] == {'sessions_created': 4}
+        assert finished['session_errors'] == {'c': 'bad file'}
+        assert finished['eta_seconds'] is None
+
+    def test_failed_job_reports_error(self, service):
+        def work(job=None):
+            raise ValueError('project folder missing')
+
+        status = wait_for(service, service.start('bulk_upload', 'failing upload', work))
+        assert status['status'] == 'failed'
+        assert status['error'] == 'project folder missing'
+
+    def test_unknown_job(self, service):
+        assert service.get_status('missing') is None
+
+    def test_finished_jobs_are_bounded(self):
+        service = UploadJobService(max_finished_jobs=2)
+        job_ids = [service.start('project_upload', f'upload {i}', lambda job=None: None) for i in range(3)]
+        for job_id in job_ids:
+            wait_for(service, job_id)
+        service.start('project_upload', 'one more', lambda job=None: None)
+        assert service.get_status(job_ids[0]) is None
+        assert service.get_status(job_ids[2]) is not None
@@ -0,0 +1,125 @@
+import pytest
+import sys
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import upload_preprocessing
+from app.services.session_service import SessionService
+from app.services.upload_job_service import UploadJob
+
+GAP_NS = 45 * 60 * 1_000_000_000
+
+
+class RecordingSessionRepository:
+    """Stands in for SessionRepository, recording inserts in call order"""
+
+    def __init__(self):
+        self.inserted = []
+
+    def insert_single_session(self, session_name, project_id, bouts_json, start_ns, stop_ns, **kwargs):
+        self.inserted.append((session_name, start_ns, stop_ns))
+        return [session_name]
+
+
+@pytest.fixture
+def project_path(tmp_path):
+    """Fixture to provide a project with four sessions, one unreadable"""
+    project = tmp_path / 'project'
+    for i in range(4):
+        session_dir = project / f'session_{i}'
+        session_dir.mkdir(parents=True)
+        rows = 3000 + 500 * i
+        ns = 1_000_000_000_000 + np.arange(rows, dtype=np.int64) * 20_000_000
+        if i % 2:
+            ns[rows // 2:] += GAP_NS
+        rng = np.random.default_rng(i)
+        pd.DataFrame({
+            'ns_since_reboot': ns,
+            'x': rng.normal(0, 1, rows).round(5),
+            'y': rng.normal(0, 1, rows).round(5),
+            'z': rng.normal(9.8, 1, rows).round(5),
+        }).to_csv(session_dir / 'accelerometer_data.csv', index=False)
+    (project / 'session_2' / 'accelerometer_data.csv').write_text('not,a,signal\n1,2,3\n')
+    return project
+
+
+class DyingPool:
+    """Runs jobs in-process like ProcessPoolExecutor, except session_1's worker dies once"""
+    died = False
+
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, session_name, *args):
+        future = Future()
+        if session_name == 'session_1' and not DyingPool.died:
+            DyingPool.died = True
+            future.set_exception(BrokenProcessPool('worker killed'))
+        else:
+            future.set_result(fn(session_name, *args))
+        return future
+
+
+def run_project(project_path, target, workers, job=None):
+    shutil.copytree(project_path, target)
+    service = SessionService(session_repository=RecordingSessionRepository())
+    plans = []
+    service._register_upload = lambda session_name, project_path, project_id, parent_bouts, plan: plans.append((session_name, plan)) or [session_name]
+    session_bouts = [(f'session_{i}', []) for i in range(4)]
+    results = service.preprocess_sessions_on_upload(str(target), 1, session_bouts, workers=workers, job=job)
+    return results, plans, service.session_repo.inserted
+
+
+class TestUploadPreprocessing:
+
+    def test_parallel_matches_sequential(self, project_path, tmp_path):
+        sequential = run_project(project_path, tmp_path / 'sequential', workers=1)
+        parallel = run_project(project_path, tmp_path / 'parallel', workers=3)
+
+        assert parallel[1] == sequential[1]
+        assert [r['session_name'] for r in parallel[0]] == [f'session_{i}' for i in range(4)]
+        assert [r['created_sessions'] for r in parallel[0]] == [r['created_sessions'] for r in sequential[0]]
+        for i in (0, 1, 3):
+            name = f'session_{i}/accelerometer_data.csv'
+            assert (tmp_path / 'parallel' / name).read_bytes() == (tmp_path / 'sequential' / name).read_bytes()
+
+    def test_failed_session_is_reported_without_aborting(self, project_path, tmp_path):
+        input_bytes = sum(os.path.getsize(project_path / f'session_{i}' / 'accelerometer_data.csv') for i in range(4))
+        job = UploadJob('job', 'project_upload', 'test')
+        results, plans, inserted = run_project(project_path, tmp_path / 'parallel', workers=2, job=job)
+
+        assert (job.sessions_done, job.sessions_total) == (4, 4)
+        assert job.bytes_done == job.bytes_total == input_bytes
+        assert list(job.session_errors) == ['session_2']
+
+        errors = {r['session_name']: r['error'] for r in results}
+        assert errors['session_2']
+        assert all(errors[name] is None for name in ('session_0', 'session_1', 'session_3'))
+        assert [name for name, _ in plans] == ['session_0', 'session_1', 'session_3']
+        assert [plan['split'] for _, plan in plans] == [False, True, True]
+        # Nothing was read, so there are no bounds to fall back to
+        assert results[2]['created_sessions'] == []
+        assert inserted == []
+
+    def test_dead_worker_result_has_every_key(self, project_path, monkeypatch):
+        monkeypatch.setattr(upload_preprocessing, 'ProcessPoolExecutor', DyingPool)
+        monkeypatch.setattr(DyingPool, 'died', False)
+        results = list(upload_preprocessing.prepare_uploads([f'session_{i}' for i in range(4)], str(project_path), workers=2))
+
+        assert [r['session_name'] for r in results] == [f'session_{i}' for i in range(4)]
+        assert 'Worker process died' in results[1]['error']
+        assert results[1]['timings'] == {}
+        assert all(set(r) == set(results[0]) for r in results)